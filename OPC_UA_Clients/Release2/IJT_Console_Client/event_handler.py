@@ -2,6 +2,7 @@ import asyncio
 import contextlib
 import json
 import traceback
+from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Any
 
@@ -44,10 +45,17 @@ class EventHandler:
     so that asyncio.create_task() is available.
     """
 
-    def __init__(self, websocket: Any, server_url: str, client: Any) -> None:
+    def __init__(
+        self,
+        websocket: Any,
+        server_url: str,
+        client: Any,
+        on_status_change: Callable[[Any], None] | None = None,
+    ) -> None:
         self.websocket = websocket
         self.server_url = server_url
         self.client = client
+        self.on_status_change = on_status_change
         self.queue: asyncio.Queue = asyncio.Queue()
         self.closed = False
         self._queue_task = asyncio.create_task(self.handle_queue())
@@ -92,6 +100,14 @@ class EventHandler:
             ijt_log.error(f"Error handling event notification: {e}")
             ijt_log.error(traceback.format_exc())
 
+    def status_change_notification(self, status: Any) -> None:
+        """asyncua subscription callback for subscription status changes."""
+        if self.closed:
+            return
+        ijt_log.warning(f"Joining-system event subscription status changed: {getattr(status, 'Status', status)}")
+        if self.on_status_change is not None:
+            self.on_status_change(status)
+
     async def handle_queue(self):
         try:
             while True:
@@ -0,0 +1,97 @@
+"""Fan-in mode: one Console Client process subscribed to several controllers.
+
+All sessions run on the same event loop.  Every endpoint gets its own
+supervisor task (:func:`~reconnect.supervise_endpoint`) which connects,
+subscribes, watches the session and reconnects on failure — a controller
+that is down never holds up the others.  Sessions to controllers with the
+same server model share one registration of the IJT type definitions
+(:class:`~type_definition_cache.LoadedModels`), and all of them feed one
+:class:`~result_store.ResultStore` and the process-wide result log, so
+results land in a single sink in the order they were received.
+
+Endpoints come from ``--urls`` (comma separated) and/or ``--endpoints FILE``.
+A ``.yaml``/``.yml`` file holds a list of URLs, either top-level or under an
+``endpoints`` key, whose items are strings or mappings with a ``url`` key;
+reading it needs PyYAML.  Any other file lists one URL per line, ``#`` starts
+a comment.
+"""
+
+import asyncio
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+from client_config import URL_PATTERN
+from ijt_logger import ijt_log
+from opcua_client import OPCUAClient
+from reconnect import supervise_endpoint
+from result_log import close_result_log
+from result_store import ResultStore
+from type_definition_cache import LoadedModels
+
+try:
+    import yaml
+except ImportError:  # pragma: no cover - optional dependency
+    yaml = None  # type: ignore[assignment]
+
+
+def _yaml_urls(text: str, path: Path) -> list[str]:
+    if yaml is None:
+        raise ValueError(f"Reading {path} requires PyYAML (pip install pyyaml).")
+    data = yaml.safe_load(text) or []
+    if isinstance(data, dict):
+        data = data.get("endpoints") or []
+    if not isinstance(data, list):
+        raise ValueError(f"{path}: expected a list of endpoints.")
+    urls = []
+    for item in data:
+        url = item.get("url") if isinstance(item, dict) else item
+        if not isinstance(url, str):
+            raise ValueError(f"{path}: endpoint {item!r} has no url.")
+        urls.append(url)
+    return urls
+
+
+def read_endpoints_file(path: str | Path) -> list[str]:
+    """Return the endpoint URLs listed in ``path``, in file order."""
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    if path.suffix.lower() in (".yaml", ".yml"):
+        return _yaml_urls(text, path)
+    return [line.split("#", 1)[0].strip() for line in text.splitlines() if line.split("#", 1)[0].strip()]
+
+
+def parse_endpoints(urls: str | None = None, endpoints_file: str | None = None) -> list[str]:
+    """Combine ``--urls`` and ``--endpoints`` into a validated list without duplicates.
+
+    Raises ``ValueError`` for a malformed URL or when no endpoint is given.
+    """
+    candidates = [url.strip() for url in (urls or "").split(",") if url.strip()]
+    if endpoints_file:
+        candidates += [url.strip() for url in read_endpoints_file(endpoints_file)]
+    for url in candidates:
+        if not URL_PATTERN.fullmatch(url):
+            raise ValueError(f"Invalid OPC UA URL: {url!r}")
+    if not candidates:
+        raise ValueError("No OPC UA endpoints given.")
+    return list(dict.fromkeys(candidates))
+
+
+async def run_fan_in(urls: Iterable[str], make_client: Callable[..., Any] = OPCUAClient) -> None:
+    """Subscribe to every endpoint in ``urls`` from this event loop until cancelled."""
+    urls = list(urls)
+    result_store = ResultStore.from_env()
+    models = LoadedModels()
+    ijt_log.info(f"Fan-in mode: subscribing to {len(urls)} endpoints: {', '.join(urls)}")
+
+    def connect_to(url: str, **kwargs: Any) -> OPCUAClient:
+        return make_client(url, result_store=result_store, type_models=models, **kwargs)
+
+    try:
+        await asyncio.gather(*(supervise_endpoint(url, connect_to) for url in urls))
+    except asyncio.CancelledError:
+        ijt_log.info("Run loop cancelled.")
+    finally:
+        await asyncio.to_thread(result_store.close)
+        await close_result_log()
+        ijt_log.info(f"Fan-in shutdown complete; type definitions were shared {models.shared} times.")
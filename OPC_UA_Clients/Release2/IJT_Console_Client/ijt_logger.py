@@ -1,7 +1,26 @@
+"""Logging setup of the Console Client.
+
+Records of :data:`ijt_log` are handed unformatted to a queue; a
+:class:`~logging.handlers.QueueListener` thread formats them and writes the
+console and file output, so the event loop never pays for formatting or I/O.
+
+``IJT_LOG_LEVEL``
+    Level of :data:`ijt_log` (default ``INFO``).
+``IJT_EVENT_LOG``
+    How received events are logged: ``pretty`` (default) as a multi-line
+    block, ``structured`` as one JSON object per event.
+"""
+
+import atexit
+import json
 import logging
+import os
+import queue
+from collections.abc import Callable
 from datetime import datetime
-from logging.handlers import TimedRotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 from pathlib import Path
+from typing import Any
 
 
 class MillisecondFormatter(logging.Formatter):
@@ -13,6 +32,70 @@ class MillisecondFormatter(logging.Formatter):
         return ct.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
 
 
+class _DeferredQueueHandler(QueueHandler):
+    """Queues records as they are; the listener thread merges their arguments."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+# An event field is ``(key, label, value)``; ``value`` may be a list of
+# strings or a list of field lists (one per entity or reported value).
+EventFields = list[tuple[str, str, Any]]
+
+EVENT_LOG_FORMAT = os.getenv("IJT_EVENT_LOG", "pretty").strip().lower()
+
+
+def _structured(fields: EventFields) -> dict[str, Any]:
+    return {
+        key: [_structured(item) if isinstance(item, list) else item for item in value]
+        if isinstance(value, list)
+        else value
+        for key, _, value in fields
+    }
+
+
+def _pretty(fields: EventFields, label_width: int, indent: str = "") -> list[str]:
+    lines = []
+    for _, label, value in fields:
+        if isinstance(value, list):
+            lines.append(f"{indent + label:<{label_width}} :")
+            for item in value:
+                if isinstance(item, list):
+                    lines += _pretty(item, label_width, indent + "  ")
+                else:
+                    lines.append(f"{'':<{label_width}} {item}")
+        else:
+            lines.append(f"{indent + label:<{label_width}} : {value}")
+    return lines
+
+
+class EventRecord:
+    """Log message of one received event, rendered only when a handler formats it.
+
+    ``build`` returns the event's fields; it runs on the listener thread, so
+    neither the fields nor their text are produced for filtered records.
+    """
+
+    __slots__ = ("kind", "title", "build", "label_width")
+
+    def __init__(self, kind: str, title: str, build: Callable[[], EventFields], label_width: int = 35) -> None:
+        self.kind = kind
+        self.title = title
+        self.build = build
+        self.label_width = label_width
+
+    def __str__(self) -> str:
+        try:
+            fields = self.build()
+        except Exception as exc:
+            return f"{self.title} : could not format event: {exc}"
+        if EVENT_LOG_FORMAT == "structured":
+            return json.dumps({"event": self.kind, **_structured(fields)}, default=str)
+        separator = "-" * (self.label_width + 40)
+        return "\n".join([separator, *_pretty(fields, self.label_width), separator])
+
+
 LOG_FORMAT = "[%(asctime)s] [%(levelname)s] %(filename)s:%(funcName)s - %(message)s"
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
 
@@ -28,12 +111,32 @@ _log_dir.mkdir(exist_ok=True)
 _file_handler = TimedRotatingFileHandler(_log_dir / "client.log", when="midnight", backupCount=7, encoding="utf-8")
 _file_handler.setFormatter(_formatter)
 
+# Both handlers run on the listener thread.
+_queue: queue.SimpleQueue = queue.SimpleQueue()
+_listener = QueueListener(_queue, _console_handler, _file_handler, respect_handler_level=True)
+_listener.start()
+atexit.register(_listener.stop)
+
 # Logger setup
 ijt_log = logging.getLogger("ijt_logger")
-ijt_log.setLevel(logging.INFO)
-ijt_log.addHandler(_console_handler)
-ijt_log.addHandler(_file_handler)
+try:
+    ijt_log.setLevel(os.getenv("IJT_LOG_LEVEL", "INFO").strip().upper() or "INFO")
+except ValueError:
+    ijt_log.setLevel(logging.INFO)
+ijt_log.addHandler(_DeferredQueueHandler(_queue))
 ijt_log.propagate = False
 
 # Reduce verbosity of external libraries
 logging.getLogger("asyncua").setLevel(logging.ERROR)
+
+
+def env_number(name: str, default: float, minimum: float = 0.0) -> float:
+    """Read a numeric setting from the environment, at least ``minimum``; ``default`` when unset or invalid."""
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return max(minimum, float(raw))
+    except ValueError:
+        ijt_log.warning(f"Invalid {name}={raw!r}; using {default}.")
+        return default
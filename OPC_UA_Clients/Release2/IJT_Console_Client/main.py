@@ -6,8 +6,13 @@ import traceback
 
 from client_config import SERVER_URL as DEFAULT_SERVER_URL
 from client_config import URL_PATTERN
+from fan_in import parse_endpoints, run_fan_in
 from ijt_logger import ijt_log
 from opcua_client import OPCUAClient
+from reconnect import supervise_endpoint
+from result_archive import parse_result_ids, parse_time, run_backfill
+from result_log import close_result_log
+from result_store import ResultStore
 
 
 def validate_url(url: str) -> str:
@@ -76,16 +81,19 @@ async def run_method_call(server_url: str, args):
 
 
 async def run_client(server_url: str):
-    client = OPCUAClient(server_url)
-    await client.connect()
-    await client.subscribe_to_events()
+    result_store = ResultStore.from_env()
+
+    def connect_to(url: str, **kwargs) -> OPCUAClient:
+        return OPCUAClient(url, result_store=result_store, **kwargs)
+
     try:
-        while True:
-            await asyncio.sleep(1)
+        # Reconnects and backfills missed results whenever the session is lost.
+        await supervise_endpoint(server_url, connect_to)
     except asyncio.CancelledError:
         ijt_log.info("Run loop cancelled.")
     finally:
-        await client.cleanup()
+        await asyncio.to_thread(result_store.close)
+        await close_result_log()
     ijt_log.info("Client shutdown complete.")
     ijt_log.info("Note: Any late server responses after disconnect can be safely ignored.")
 
@@ -109,18 +117,45 @@ def main():
         help="StartSelectedJoining: true|false",
     )
     parser.add_argument("--no-events", action="store_true", help="(ignored in method mode)")
+    parser.add_argument("--urls", type=str, help="Fan-in mode: comma-separated OPC UA server URLs")
+    parser.add_argument("--endpoints", type=str, help="Fan-in mode: file listing OPC UA server URLs (text or YAML)")
+    parser.add_argument(
+        "--backfill-ids", type=str, help="Backfill: ResultIds to fetch (id, N..M, @FILE; comma separated)"
+    )
+    parser.add_argument(
+        "--backfill-from", type=str, help="Backfill: start of the time window (ISO 8601, UTC by default)"
+    )
+    parser.add_argument("--backfill-to", type=str, help="Backfill: end of the time window (default: now)")
+    parser.add_argument("--checkpoint", type=str, help="Backfill: checkpoint file (default: one per request in .state)")
 
     args = parser.parse_args()
-    server_url = validate_url(args.url)
-    ijt_log.info(f"Using OPC UA server URL: {server_url}")
+    if args.backfill_ids or args.backfill_from:
+        server_url = validate_url(args.url)
+        try:
+            if args.backfill_ids:
+                coro = run_backfill(
+                    server_url, result_ids=parse_result_ids(args.backfill_ids), checkpoint_file=args.checkpoint
+                )
+            else:
+                window = (parse_time(args.backfill_from), parse_time(args.backfill_to) if args.backfill_to else None)
+                if window[1] is not None and window[1] <= window[0]:
+                    parser.error("--backfill-to must be after --backfill-from")
+                coro = run_backfill(server_url, window=window, checkpoint_file=args.checkpoint)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+    elif (args.urls or args.endpoints) and not args.call:
+        try:
+            coro = run_fan_in(parse_endpoints(args.urls, args.endpoints))
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+    else:
+        server_url = validate_url(args.url)
+        ijt_log.info(f"Using OPC UA server URL: {server_url}")
+        coro = run_method_call(server_url, args) if args.call else run_client(server_url)
 
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
-
-    if args.call:
-        task = loop.create_task(run_method_call(server_url, args))
-    else:
-        task = loop.create_task(run_client(server_url))
+    task = loop.create_task(coro)
 
     try:
         loop.run_until_complete(task)
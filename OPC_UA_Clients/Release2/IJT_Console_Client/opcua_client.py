@@ -6,7 +6,7 @@ import time
 import traceback
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Literal
+from typing import Any, Literal
 
 from asyncua import Client, ua
 from asyncua.crypto import security_policies
@@ -16,7 +16,10 @@ from event_handler import EventHandler
 from event_types import get_event_types
 from ijt_logger import ijt_log
 from method_caller import OPCUAMethodCaller
-from result_event_handler import ResultEventHandler
+from result_event_handler import ResultEventHandler, SeenResults
+from result_log import ResultLog
+from result_store import ResultStore
+from type_definition_cache import LoadedModels, RegistrySnapshot, TypeDefinitionCache, read_type_definition_model
 
 _OPCUA_TIMEOUT_S = 60
 _SUBSCRIPTION_PERIOD_MS = 100
@@ -105,8 +108,46 @@ def _preserve_test_artifacts() -> bool:
     return os.environ.get("IJT_PRESERVE_TEST_ARTIFACTS", "0").strip().lower() in {"1", "true", "yes", "on"}
 
 
-async def _load_ijt_type_definitions(client: Client, label: str) -> None:
-    """Load IJT custom structures through legacy and modern asyncua loaders."""
+async def _load_ijt_type_definitions(client: Client, label: str, models: LoadedModels | None = None) -> None:
+    """Load IJT custom structures through legacy and modern asyncua loaders.
+
+    Definitions cached by an earlier run against the same server model are
+    restored from disk instead; a live load refreshes the cache.  With
+    ``models``, a server model already loaded for another connection of this
+    process is not loaded again.
+    """
+    cache = TypeDefinitionCache.from_env()
+    namespaces: list[str] = []
+    metadata: dict[str, list[str]] = {}
+    if cache.enabled or models is not None:
+        try:
+            namespaces, metadata = await read_type_definition_model(client)
+        except Exception as exc:
+            ijt_log.debug(f"Server model unreadable for {label}; not sharing or caching type definitions: {exc}")
+    key = LoadedModels.key(namespaces, metadata) if models is not None else None
+    if models is None or key is None:
+        await _load_model(client, label, cache, namespaces, metadata)
+        return
+    async with models.lock(key):
+        if models.is_loaded(key):
+            models.shared += 1
+            ijt_log.info(f"Reusing type definitions already loaded for the server model of {label}")
+            return
+        await _load_model(client, label, cache, namespaces, metadata)
+        models.mark_loaded(key)
+
+
+async def _load_model(
+    client: Client,
+    label: str,
+    cache: TypeDefinitionCache,
+    namespaces: list[str],
+    metadata: dict[str, list[str]],
+) -> None:
+    if cache.restore(namespaces, metadata):
+        return
+
+    before = RegistrySnapshot.take()
     try:
         await client.load_type_definitions()
     except Exception as exc:
@@ -117,17 +158,33 @@ async def _load_ijt_type_definitions(client: Client, label: str) -> None:
             exc,
         )
     await client.load_data_type_definitions()
+    await cache.record(client, namespaces, metadata, before)
 
 
 class OPCUAClient:
-    def __init__(self, server_url: str, security_config: OPCUASecurityConfig | None = None) -> None:
+    def __init__(
+        self,
+        server_url: str,
+        security_config: OPCUASecurityConfig | None = None,
+        result_store: ResultStore | None = None,
+        type_models: LoadedModels | None = None,
+        seen_results: SeenResults | None = None,
+        result_log: ResultLog | None = None,
+    ) -> None:
         self.server_url = server_url
+        self.result_store = result_store
+        self.type_models = type_models
+        self.seen_results = seen_results
+        self.result_log = result_log
         self.security_config = security_config or OPCUASecurityConfig()
         self._security_configured = False
         # 60-second service-call timeout — methods like SimulateJobResult fire
         # many separate OPC UA publish messages before returning; the default
         # asyncua 4-second window is far too short.
         self.client = Client(server_url, timeout=_OPCUA_TIMEOUT_S)
+        # Set when asyncua reports the session as lost (see reconnect.py).
+        self.session_lost = asyncio.Event()
+        self.client.connection_lost_callback = self._connection_lost
         self.sub_result_event = None
         self.sub_joining_event = None
         # Handlers are created inside subscribe_to_events() which runs in an async
@@ -147,7 +204,10 @@ class OPCUAClient:
         await self.clear_old_logs()
         self.setup_client_metadata()
         await self.configure_security()
+        await self.open_session()
 
+    async def open_session(self) -> None:
+        """Connect and activate a session with retries, then load the IJT type definitions."""
         max_attempts = max(1, int(os.getenv("OPCUA_CONNECT_RETRIES", _CONNECT_RETRIES_DEFAULT)))
         base_backoff = max(0.2, float(os.getenv("OPCUA_CONNECT_DELAY_SEC", _CONNECT_DELAY_DEFAULT)))
         max_backoff = max(
@@ -158,7 +218,11 @@ class OPCUAClient:
             try:
                 start_time = time.time()
                 await self.client.connect()  # type: ignore[union-attr]
-                await _load_ijt_type_definitions(self.client, "console client")  # type: ignore[arg-type]
+                await _load_ijt_type_definitions(
+                    self.client,  # type: ignore[arg-type]
+                    f"console client ({self.server_url})" if self.type_models else "console client",
+                    self.type_models,
+                )
                 duration = time.time() - start_time
                 ijt_log.info(f"Connected to OPC UA server at {self.server_url} in {duration:.2f}s")
                 return
@@ -252,8 +316,10 @@ class OPCUAClient:
     async def subscribe_to_events(self):
         try:
             # Handlers are created here (async context) so asyncio.create_task() works.
-            self.handler_result_event = ResultEventHandler(self.server_url)
-            self.handler_joining_event = EventHandler(None, self.server_url, self.client)
+            self.handler_result_event = ResultEventHandler(
+                self.server_url, self.result_store, self.seen_results, self._status_changed, self.result_log
+            )
+            self.handler_joining_event = EventHandler(None, self.server_url, self.client, self._status_changed)
 
             root = self.client.get_root_node()  # type: ignore[union-attr]
             server_node = await root.get_child(["0:Objects", "0:Server"])
@@ -298,6 +364,28 @@ class OPCUAClient:
             await self.cleanup()
             raise
 
+    async def check_session(self, timeout: float = 5.0) -> bool:
+        """Return ``True`` when the server answers a ServerStatus read within ``timeout`` seconds."""
+        if self.client is None:
+            return False
+        try:
+            node = self.client.get_node(ua.ObjectIds.Server_ServerStatus_State)
+            await asyncio.wait_for(node.read_value(), timeout)
+            return True
+        except Exception as exc:
+            ijt_log.warning(f"Session check failed for {self.server_url}: {exc}")
+            return False
+
+    def _status_changed(self, status: Any) -> None:
+        code = getattr(status, "Status", status)
+        if isinstance(code, ua.StatusCode) and code.is_good():
+            return
+        self.session_lost.set()
+
+    async def _connection_lost(self, exc: Exception) -> None:
+        ijt_log.warning(f"Connection to {self.server_url} lost: {exc}")
+        self.session_lost.set()
+
     async def run_forever(self):
         try:
             while True:
@@ -0,0 +1,196 @@
+"""Session supervision: reconnect without losing results.
+
+:func:`supervise_endpoint` keeps one endpoint connected and subscribed until
+cancelled.  A lost session is noticed from the subscriptions' keep-alive
+status changes and asyncua's connection-lost callback (both set
+:attr:`~opcua_client.OPCUAClient.session_lost`), or from a failed
+ServerStatus read every ``IJT_HEALTH_CHECK_SEC``.
+
+The supervisor then resumes the session (:func:`resume_session`): it opens a
+new session on the same client and moves the subscriptions over with
+TransferSubscriptions, so notifications the server still queues for them
+arrive on the new session.  When the server no longer holds them they are
+re-created.  If even that fails, the client is discarded and a new one
+connects, with exponential backoff between attempts.
+
+Results produced while disconnected are then backfilled through
+ResultManagement (:func:`backfill`): ``RequestResults`` asks the server to
+re-send the results since the session was last known alive as ResultReady
+events, and ``GetLatestResult`` fetches the newest one directly.  Every
+endpoint keeps a :class:`~result_event_handler.SeenResults`, so a result
+received both live and backfilled is written once.
+
+``IJT_HEALTH_CHECK_SEC``
+    Interval between session checks of a connected endpoint (default ``5``).
+``IJT_RECONNECT_DELAY_SEC`` / ``IJT_RECONNECT_MAX_DELAY_SEC``
+    First and largest delay between reconnect attempts (default ``1`` / ``30``).
+"""
+
+import asyncio
+import datetime
+from collections.abc import Callable
+
+from asyncua import Client, ua
+
+from ijt_logger import env_number, ijt_log
+from opcua_client import OPCUAClient
+from result_event_handler import SeenResults, ShortResultEvent
+from result_management import ResultManagement
+
+_HEALTH_CHECK_DEFAULT = 5.0
+_RECONNECT_DELAY_DEFAULT = 1.0
+_RECONNECT_MAX_DELAY_DEFAULT = 30.0
+
+
+async def transfer_subscriptions(client: Client, subscription_ids: list[int]) -> bool:
+    """Move ``subscription_ids`` to the current session of ``client``; ``True`` when all of them moved."""
+    params = ua.TransferSubscriptionsParameters()
+    params.SubscriptionIds = subscription_ids
+    params.SendInitialValues = False
+    try:
+        results = await client.uaclient.transfer_subscriptions(params)
+    except Exception as exc:
+        ijt_log.info(f"TransferSubscriptions failed: {exc}")
+        return False
+    if len(results) != len(subscription_ids) or not all(result.StatusCode.is_good() for result in results):
+        ijt_log.info(f"TransferSubscriptions returned {[str(result.StatusCode) for result in results]}")
+        moved = [sid for sid, result in zip(subscription_ids, results, strict=False) if result.StatusCode.is_good()]
+        if moved:
+            # Only some moved; drop them so re-created subscriptions do not deliver twice.
+            try:
+                await client.uaclient.delete_subscriptions(moved)
+            except Exception as exc:
+                ijt_log.debug(f"Deleting partly transferred subscriptions {moved} failed: {exc}")
+        return False
+    # The subscriptions' callbacks are still registered; make sure publish requests flow again.
+    ensure_publish_loop = getattr(client.uaclient, "ensure_publish_loop", None)
+    if ensure_publish_loop is not None:
+        ensure_publish_loop()
+    return True
+
+
+async def resume_session(client: OPCUAClient) -> str:
+    """Open a new session on ``client`` and resume its subscriptions.
+
+    Returns ``"transferred"`` or ``"re-created"``.  Raises when no session
+    can be opened.
+    """
+    if client.client is None:
+        raise ConnectionError("client was cleaned up")
+    subscriptions = [sub for sub in (client.sub_result_event, client.sub_joining_event) if sub is not None]
+    ids = [sub.subscription_id for sub in subscriptions if sub.subscription_id]
+    client.session_lost.clear()
+    # Drop the dead transport only: closing the session would delete its subscriptions.
+    client.client.disconnect_socket()
+    await client.open_session()
+    if ids and len(ids) == len(subscriptions) and await transfer_subscriptions(client.client, ids):
+        return "transferred"
+    client.sub_result_event = client.sub_joining_event = None
+    await client.subscribe_to_events()
+    return "re-created"
+
+
+async def backfill(client: OPCUAClient, since: datetime.datetime) -> int:
+    """Recover the results of ``client``'s endpoint created after ``since``.
+
+    Returns the number of results fetched directly; results re-sent as events
+    arrive through the subscription.
+    """
+    if client.client is None or client.handler_result_event is None:
+        return 0
+    try:
+        management = await ResultManagement.find(client.client)
+    except Exception as exc:
+        ijt_log.warning(f"Browsing the ResultManagement of {client.server_url} failed: {exc}")
+        return 0
+    if management is None:
+        ijt_log.warning(f"{client.server_url} has no ResultManagement; results missed while disconnected are lost.")
+        return 0
+    now = datetime.datetime.now(datetime.UTC)
+    try:
+        if await management.request_results(since, now):
+            ijt_log.info(f"Requested the results of {client.server_url} since {since.isoformat()}.")
+    except Exception as exc:
+        ijt_log.warning(f"RequestResults failed for {client.server_url}: {exc}")
+    try:
+        latest = await management.get_latest_result()
+    except Exception as exc:
+        ijt_log.warning(f"GetLatestResult failed for {client.server_url}: {exc}")
+        return 0
+    if latest is None:
+        return 0
+    await client.handler_result_event.process_event(
+        ShortResultEvent(EventType="GetLatestResult", Result=latest, Message="Backfilled after reconnect", EventId="")
+    )
+    return 1
+
+
+async def watch_session(client: OPCUAClient, health_check: float) -> datetime.datetime:
+    """Wait until the session of ``client`` is lost; return when it was last known to be alive."""
+    alive_at = datetime.datetime.now(datetime.UTC)
+    while True:
+        try:
+            await asyncio.wait_for(client.session_lost.wait(), health_check)
+            break
+        except TimeoutError:
+            if not await client.check_session():
+                break
+            alive_at = datetime.datetime.now(datetime.UTC)
+    return alive_at
+
+
+async def supervise_endpoint(
+    server_url: str,
+    make_client: Callable[..., OPCUAClient],
+    health_check: float | None = None,
+    reconnect_delay: float | None = None,
+    max_reconnect_delay: float | None = None,
+) -> None:
+    """Keep one endpoint connected and subscribed until cancelled.
+
+    ``make_client(server_url, seen_results=...)`` builds a new client.
+    """
+    health_check = health_check or env_number("IJT_HEALTH_CHECK_SEC", _HEALTH_CHECK_DEFAULT, 0.1)
+    delay = reconnect_delay or env_number("IJT_RECONNECT_DELAY_SEC", _RECONNECT_DELAY_DEFAULT, 0.1)
+    max_delay = max(
+        delay, max_reconnect_delay or env_number("IJT_RECONNECT_MAX_DELAY_SEC", _RECONNECT_MAX_DELAY_DEFAULT, 0.1)
+    )
+    seen = SeenResults()
+    client: OPCUAClient | None = None
+    # When the lost session was last known alive; results after it are backfilled.
+    lost_since: datetime.datetime | None = None
+    backoff = delay
+    try:
+        while True:
+            try:
+                if client is not None:
+                    try:
+                        ijt_log.info(f"Resumed session to {server_url}; subscriptions {await resume_session(client)}.")
+                    except Exception as exc:
+                        ijt_log.warning(f"Resuming the session to {server_url} failed: {exc}")
+                        await client.cleanup()
+                        client = None
+                if client is None:
+                    client = make_client(server_url, seen_results=seen)
+                    await client.connect()
+                    await client.subscribe_to_events()
+                backoff = delay
+                if lost_since is not None:
+                    await backfill(client, lost_since)
+                    lost_since = None
+                lost_since = await watch_session(client, health_check)
+                ijt_log.warning(f"Lost session to {server_url}.")
+                continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                ijt_log.warning(f"Endpoint {server_url} failed: {exc}")
+                if client is not None:
+                    await client.cleanup()
+                    client = None
+            ijt_log.info(f"Reconnecting to {server_url} in {backoff:.1f} seconds...")
+            await asyncio.sleep(backoff)
+            backoff = min(max_delay, backoff * 2)
+    finally:
+        if client is not None:
+            await client.cleanup()
@@ -0,0 +1,273 @@
+"""Backfill command: pull a controller's stored results into the result log.
+
+``python main.py --url URL --backfill-ids 1000..1999``
+    Fetches every listed ResultId with ``GetResultById``; several calls are
+    in flight at once.  Items are comma separated; ``N..M`` is a numeric
+    range and ``@FILE`` lists one ResultId per line.
+``python main.py --url URL --backfill-from 2026-10-01T06:00Z [--backfill-to ...]``
+    Asks the controller with ``RequestResults`` to re-send the results of the
+    window (up to now by default) chunk by chunk; they arrive as ResultReady
+    events over the client's subscription.  A chunk is complete once no new
+    result arrived for ``IJT_BACKFILL_IDLE_SEC``.
+
+Results go to the configured result sinks (see :mod:`result_sinks`), also when
+``ENABLE_RESULT_FILE_LOGGING`` is off.
+Progress is saved in a checkpoint file (``--checkpoint``, by default one per
+endpoint and request below ``.state``) after the results before it were handed
+to the sinks, so a crashed or interrupted run started again with the same
+arguments skips what is done.  ResultIds that could not be fetched are not
+checkpointed and are retried by the next run.
+
+``IJT_BACKFILL_CONCURRENCY``
+    ``GetResultById`` calls in flight (default ``4``).
+``IJT_BACKFILL_CHUNK_MIN``
+    Minutes of the time window requested per ``RequestResults`` call
+    (default ``60``).
+``IJT_BACKFILL_IDLE_SEC``
+    Quiet time after which a requested chunk counts as delivered
+    (default ``5``).
+"""
+
+import asyncio
+import datetime
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from ijt_logger import env_number, ijt_log
+from opcua_client import OPCUAClient
+from result_event_handler import SeenResults, ShortResultEvent
+from result_log import ResultLog, close_result_log, default_result_log
+from result_management import REQUEST_RESULTS, ResultManagement
+
+_STATE_DIR = Path(__file__).resolve().parent / ".state"
+_CONCURRENCY_DEFAULT = 4
+_CHUNK_MIN_DEFAULT = 60.0
+_IDLE_SEC_DEFAULT = 5.0
+_SAVE_EVERY = 100
+
+
+def parse_result_ids(spec: str) -> list[str]:
+    """Expand a ResultId list (``id``, ``N..M`` ranges, ``@FILE``) in order, without duplicates.
+
+    Raises ``ValueError`` for a malformed range or an empty list, ``OSError``
+    for an unreadable file.
+    """
+    ids: list[str] = []
+    for item in (part.strip() for part in spec.split(",")):
+        if item.startswith("@"):
+            ids += [line.strip() for line in Path(item[1:]).read_text(encoding="utf-8").splitlines() if line.strip()]
+        elif ".." in item:
+            first, last = (bound.strip() for bound in item.split("..", 1))
+            if not (first.isdigit() and last.isdigit()) or int(last) < int(first):
+                raise ValueError(f"Invalid ResultId range: {item!r}")
+            # Keep the zero padding of ranges like 0001..0100.
+            width = len(first) if first.startswith("0") else 0
+            ids += [str(number).zfill(width) for number in range(int(first), int(last) + 1)]
+        elif item:
+            ids.append(item)
+    if not ids:
+        raise ValueError("No ResultIds given.")
+    return list(dict.fromkeys(ids))
+
+
+def parse_time(value: str) -> datetime.datetime:
+    """Parse an ISO 8601 time; times without an offset are UTC."""
+    parsed = datetime.datetime.fromisoformat(value.strip())
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=datetime.UTC)
+
+
+def checkpoint_path(server_url: str, request: str) -> Path:
+    """Default checkpoint file of backfilling ``request`` from ``server_url``."""
+    digest = hashlib.sha1(f"{server_url}\n{request}".encode(), usedforsecurity=False).hexdigest()[:12]
+    return _STATE_DIR / f"backfill-{digest}.json"
+
+
+class Checkpoint:
+    """Progress of one backfill, saved atomically as JSON.
+
+    By ResultId, progress is the number of leading items done plus the done
+    items after them (calls complete out of order); by time window, it is the
+    end of the last delivered chunk.
+    """
+
+    def __init__(self, path: Path, request: str) -> None:
+        self.path = path
+        self.request = request
+        self.done_below = 0
+        self.done: set[int] = set()
+        self.until: str | None = None
+        self.lock = asyncio.Lock()
+
+    @classmethod
+    def load(cls, path: Path, request: str) -> "Checkpoint":
+        checkpoint = cls(path, request)
+        try:
+            state = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return checkpoint
+        except (OSError, ValueError) as exc:
+            ijt_log.warning(f"Ignoring unreadable checkpoint {path}: {exc}")
+            return checkpoint
+        if state.get("request") != request:
+            ijt_log.warning(f"Checkpoint {path} belongs to another backfill; starting over.")
+            return checkpoint
+        checkpoint.done_below = int(state.get("done_below", 0))
+        checkpoint.done = {int(index) for index in state.get("done", ())}
+        checkpoint.until = state.get("until")
+        ijt_log.info(f"Resuming backfill from checkpoint {path}.")
+        return checkpoint
+
+    def is_done(self, index: int) -> bool:
+        return index < self.done_below or index in self.done
+
+    def mark(self, index: int) -> None:
+        self.done.add(index)
+        while self.done_below in self.done:
+            self.done.remove(self.done_below)
+            self.done_below += 1
+
+    def state(self) -> dict[str, Any]:
+        return {"request": self.request, "done_below": self.done_below, "done": sorted(self.done), "until": self.until}
+
+    def save(self, state: dict[str, Any] | None = None) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(state or self.state()), encoding="utf-8")
+        os.replace(temporary, self.path)
+
+
+async def _save(checkpoint: Checkpoint, result_log: ResultLog) -> None:
+    async with checkpoint.lock:
+        # Only progress whose results were already queued counts; wait until the sinks have them.
+        state = checkpoint.state()
+        await result_log.flush()
+        await asyncio.to_thread(checkpoint.save, state)
+
+
+async def _find_management(client: OPCUAClient) -> ResultManagement:
+    management = await ResultManagement.find(client.client)  # type: ignore[arg-type]
+    if management is None:
+        raise RuntimeError(f"{client.server_url} has no ResultManagement.")
+    return management
+
+
+async def backfill_ids(
+    client: OPCUAClient,
+    result_ids: list[str],
+    checkpoint: Checkpoint,
+    result_log: ResultLog,
+    concurrency: int = _CONCURRENCY_DEFAULT,
+) -> dict[str, int]:
+    """Fetch ``result_ids`` with up to ``concurrency`` ``GetResultById`` calls in flight.
+
+    Returns the counts of ``written``, ``missing`` (no such result) and
+    ``failed`` (call failed; retried by the next run) results.
+    """
+    management = await _find_management(client)
+    pending = iter([index for index in range(len(result_ids)) if not checkpoint.is_done(index)])
+    counts = {"written": 0, "missing": 0, "failed": 0}
+
+    async def worker() -> None:
+        # The workers share one iterator, so every index is fetched once.
+        for index in pending:
+            try:
+                result = await management.get_result_by_id(result_ids[index])
+            except Exception as exc:
+                counts["failed"] += 1
+                ijt_log.warning(f"GetResultById({result_ids[index]!r}) failed: {exc}")
+                continue
+            if result is None:
+                counts["missing"] += 1
+            else:
+                event = ShortResultEvent("GetResultById", result, "Backfilled by GetResultById", "")
+                await result_log.put(event, client.server_url)
+                counts["written"] += 1
+            checkpoint.mark(index)
+            if (counts["written"] + counts["missing"]) % _SAVE_EVERY == 0:
+                await _save(checkpoint, result_log)
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    finally:
+        await _save(checkpoint, result_log)
+    return counts
+
+
+async def backfill_window(
+    client: OPCUAClient,
+    start: datetime.datetime,
+    end: datetime.datetime,
+    checkpoint: Checkpoint,
+    result_log: ResultLog,
+    chunk: datetime.timedelta,
+    idle: float = _IDLE_SEC_DEFAULT,
+) -> int:
+    """Have the results created between ``start`` and ``end`` re-sent, one ``chunk`` at a time.
+
+    The client must have been created with ``seen_results`` and
+    ``result_log``; returns the number of results received.
+    """
+    management = await _find_management(client)
+    if not management.supports(REQUEST_RESULTS):
+        raise RuntimeError(f"{client.server_url} does not offer {REQUEST_RESULTS}.")
+    seen: SeenResults = client.seen_results  # type: ignore[assignment]
+    received = seen.accepted
+    await client.subscribe_to_events()
+    cursor = max(start, parse_time(checkpoint.until)) if checkpoint.until else start
+    while cursor < end:
+        chunk_end = min(end, cursor + chunk)
+        if not await management.request_results(cursor, chunk_end):
+            raise RuntimeError(f"{REQUEST_RESULTS} {cursor.isoformat()} .. {chunk_end.isoformat()} was rejected.")
+        count = -1
+        while count != seen.accepted:
+            count = seen.accepted
+            await asyncio.sleep(idle)
+        ijt_log.info(f"Backfilled {cursor.isoformat()} .. {chunk_end.isoformat()}; {count - received} results so far.")
+        checkpoint.until = chunk_end.isoformat()
+        await _save(checkpoint, result_log)
+        cursor = chunk_end
+    return seen.accepted - received
+
+
+async def run_backfill(
+    server_url: str,
+    result_ids: list[str] | None = None,
+    window: tuple[datetime.datetime, datetime.datetime | None] | None = None,
+    checkpoint_file: str | None = None,
+) -> None:
+    """Connect to ``server_url``, backfill ``result_ids`` or the time ``window``, and exit.
+
+    A window without an end runs up to now; its checkpoint is shared by all
+    such runs from the same start.
+    """
+    if result_ids is not None:
+        digest = hashlib.sha1(",".join(result_ids).encode(), usedforsecurity=False).hexdigest()
+        request = f"ids:{len(result_ids)}:{digest}"
+    elif window is not None:
+        request = f"window:{window[0].isoformat()}/{window[1].isoformat() if window[1] else 'now'}"
+    else:
+        raise ValueError("Nothing to backfill: give ResultIds or a time window.")
+    path = Path(checkpoint_file) if checkpoint_file else checkpoint_path(server_url, request)
+    checkpoint = Checkpoint.load(path, request)
+    result_log = default_result_log()
+    # Results re-sent by RequestResults go to result_log even when result file logging is off.
+    client = OPCUAClient(server_url, seen_results=SeenResults(), result_log=result_log)
+    try:
+        await client.connect()
+        if result_ids is not None:
+            concurrency = int(env_number("IJT_BACKFILL_CONCURRENCY", _CONCURRENCY_DEFAULT, 1))
+            counts = await backfill_ids(client, result_ids, checkpoint, result_log, concurrency)
+            ijt_log.info(f"Backfill of {len(result_ids)} ResultIds from {server_url} done: {counts}")
+        elif window is not None:
+            start, end = window[0], window[1] or datetime.datetime.now(datetime.UTC)
+            chunk = datetime.timedelta(minutes=env_number("IJT_BACKFILL_CHUNK_MIN", _CHUNK_MIN_DEFAULT, 1))
+            idle = env_number("IJT_BACKFILL_IDLE_SEC", _IDLE_SEC_DEFAULT, 1)
+            count = await backfill_window(client, start, end, checkpoint, result_log, chunk, idle)
+            ijt_log.info(f"Backfill of {start.isoformat()} .. {end.isoformat()} done: {count} results.")
+        ijt_log.info(f"Checkpoint saved to {path}")
+    finally:
+        await client.cleanup()
+        await close_result_log()
@@ -1,5 +1,7 @@
 import asyncio
 import traceback
+from collections import OrderedDict
+from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
@@ -7,6 +9,8 @@ from typing import Any
 import pytz  # type: ignore[import-untyped]
 
 from ijt_logger import ijt_log
+from result_log import ResultLog
+from result_store import ResultStore, result_id
 from utils import log_result_event_details, log_result_to_file
 
 
@@ -26,6 +30,33 @@ class ShortResultEvent:
         }
 
 
+class SeenResults:
+    """The most recent ``size`` ResultIds handled for one endpoint.
+
+    Results re-sent after a reconnect are recognized by their ResultId, so a
+    result received both live and backfilled is only written once.
+    """
+
+    def __init__(self, size: int = 10000) -> None:
+        self.size = max(1, size)
+        self.accepted = 0
+        self.duplicates = 0
+        self._ids: OrderedDict[str, None] = OrderedDict()
+
+    def add(self, result_id: str | None) -> bool:
+        """Record ``result_id``; ``False`` when it was seen before.  Results without an id always count as new."""
+        if result_id in self._ids:
+            self._ids.move_to_end(result_id)
+            self.duplicates += 1
+            return False
+        self.accepted += 1
+        if result_id is not None:
+            self._ids[result_id] = None
+            if len(self._ids) > self.size:
+                self._ids.popitem(last=False)
+        return True
+
+
 class ResultEventHandler:
     """
     Async handler for OPC UA ResultReadyEvent notifications.
@@ -35,14 +66,35 @@ class ResultEventHandler:
     Must be instantiated from within an async context (e.g. inside subscribe_to_events).
     """
 
-    def __init__(self, server_url: str) -> None:
+    def __init__(
+        self,
+        server_url: str,
+        result_store: ResultStore | None = None,
+        seen_results: SeenResults | None = None,
+        on_status_change: Callable[[Any], None] | None = None,
+        result_log: ResultLog | None = None,
+    ) -> None:
         self.server_url = server_url
+        # Queryable history every result is written to (see result_store.py).
+        self.result_store = result_store
+        self.seen_results = seen_results
+        self.on_status_change = on_status_change
+        # Written to regardless of ENABLE_RESULT_FILE_LOGGING (see result_archive.py).
+        self.result_log = result_log
         ijt_log.info("ResultEventHandler initialized.")
 
     async def process_event(self, event: ShortResultEvent):
         try:
+            if self.seen_results is not None and not self.seen_results.add(result_id(event.Result)):
+                ijt_log.info(f"Skipping result {result_id(event.Result)} of {self.server_url}; already received.")
+                return
             ijt_log.info(f"Processing Result Event: {event.Message}")
-            await log_result_to_file(event)
+            if self.result_log is not None:
+                await self.result_log.put(event, self.server_url)
+            else:
+                await log_result_to_file(event, self.server_url)
+            if self.result_store is not None:
+                self.result_store.add(self.server_url, event)
         except Exception as e:
             ijt_log.error("Exception: " + str(e))
             ijt_log.error(traceback.format_exc())
@@ -61,3 +113,9 @@ class ResultEventHandler:
         except Exception as e:
             ijt_log.error(f"Error handling result event notification: {e}")
             ijt_log.error(traceback.format_exc())
+
+    def status_change_notification(self, status: Any) -> None:
+        """asyncua subscription callback for subscription status changes."""
+        ijt_log.warning(f"Result event subscription status changed: {getattr(status, 'Status', status)}")
+        if self.on_status_change is not None:
+            self.on_status_change(status)
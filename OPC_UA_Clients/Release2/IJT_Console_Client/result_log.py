@@ -0,0 +1,190 @@
+"""Result log: every received result, written to the configured output sinks.
+
+:func:`utils.log_result_to_file` hands each result to the process-wide
+:class:`ResultLog`, which only queues it; a writer task collects whatever has
+queued up while the previous batch was written and serializes the batch in a
+worker thread, where every sink of :mod:`result_sinks` writes it.  The event
+loop never waits on disk.
+
+Each result becomes one record ``{"time", "endpoint", "eventid", "message",
+"resultid", "result"}``.  The default sink writes it as a JSON line to
+``results-<UTC start time>.ndjson`` (``.ndjson.gz`` when compressed); a
+segment is closed after ``IJT_RESULT_LOG_SEGMENT_MB`` of JSON or
+``IJT_RESULT_LOG_SEGMENT_SEC`` seconds, whichever comes first.  With an index
+every segment gets a ``.idx.ndjson`` companion holding the record without its
+result plus the ``offset``/``length`` of its line in the uncompressed segment.
+
+``IJT_RESULT_LOG_DIR``
+    Directory of the segments (default ``logs/results``).
+``IJT_RESULT_LOG_SEGMENT_MB`` / ``IJT_RESULT_LOG_SEGMENT_SEC``
+    Rotation size (default ``64``) and age (default ``3600``).
+``IJT_RESULT_LOG_COMPRESS``
+    ``1`` writes gzip segments (default ``0``).
+``IJT_RESULT_LOG_INDEX``
+    ``1`` writes the per-result index files (default ``0``).
+``IJT_RESULT_SINKS``
+    Where results go, see :mod:`result_sinks` (default ``file``).
+"""
+
+import asyncio
+import datetime
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+from ijt_logger import env_number, ijt_log
+from result_sinks import ResultSink, sinks_from_env
+from serialize_data import serialize_full_event
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+_SEGMENT_MB_DEFAULT = 64
+_SEGMENT_SEC_DEFAULT = 3600
+_QUEUE_SIZE = 10000
+_BATCH_MAX = 512
+_ENABLED = {"1", "true", "yes", "on"}
+
+
+def _dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def _record(event: Any, endpoint: str | None, received: float) -> tuple[dict[str, Any], bytes]:
+    """Serialize one result event to its record and NDJSON line."""
+    result = getattr(event, "Result", None)
+    message = getattr(event, "Message", None)
+    meta = getattr(result, "ResultMetaData", None)
+    result_id = getattr(meta, "ResultId", None)
+    record = {
+        "time": datetime.datetime.fromtimestamp(received, datetime.UTC).isoformat().replace("+00:00", "Z"),
+        "endpoint": endpoint,
+        "eventid": getattr(event, "EventId", None),
+        "message": str(getattr(message, "Text", message)) if message is not None else None,
+        "resultid": None if result_id is None else str(result_id),
+        "result": serialize_full_event(result),
+    }
+    return record, _dumps(record) + b"\n"
+
+
+class ResultLog:
+    """Batched writer of results to a list of output sinks."""
+
+    def __init__(self, sinks: list[ResultSink], queue_size: int = _QUEUE_SIZE) -> None:
+        self.sinks = sinks
+        self.written = 0
+        self.dropped = 0
+        self._tick = min((sink.interval for sink in sinks if sink.interval), default=None)
+        self._queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self._task: asyncio.Task | None = None
+
+    @classmethod
+    def from_env(cls) -> "ResultLog":
+        """Build the writer configured by the ``IJT_RESULT_LOG_*`` and ``IJT_RESULT_SINKS`` variables."""
+        return cls(
+            sinks_from_env(
+                Path(os.getenv("IJT_RESULT_LOG_DIR", "").strip() or "logs/results"),
+                int(env_number("IJT_RESULT_LOG_SEGMENT_MB", _SEGMENT_MB_DEFAULT) * 1024 * 1024),
+                env_number("IJT_RESULT_LOG_SEGMENT_SEC", _SEGMENT_SEC_DEFAULT),
+                os.getenv("IJT_RESULT_LOG_COMPRESS", "0").strip().lower() in _ENABLED,
+                os.getenv("IJT_RESULT_LOG_INDEX", "0").strip().lower() in _ENABLED,
+            )
+        )
+
+    def add(self, event: Any, endpoint: str | None = None) -> bool:
+        """Queue a result event received from ``endpoint`` for writing; never blocks.
+
+        Must be called from the event loop.  When the queue is full the
+        result is dropped and counted in :attr:`dropped`.
+        """
+        if not self.sinks:
+            return False
+        self._start()
+        try:
+            self._queue.put_nowait((event, endpoint, time.time()))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            ijt_log.warning("Result log queue is full; result not written.")
+            return False
+        return True
+
+    async def put(self, event: Any, endpoint: str | None = None) -> bool:
+        """Coroutine. Like :meth:`add`, but waits for room in the queue instead of dropping the result."""
+        if not self.sinks:
+            return False
+        self._start()
+        await self._queue.put((event, endpoint, time.time()))
+        return True
+
+    def _start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                batch = [await asyncio.wait_for(self._queue.get(), self._tick)]
+            except TimeoutError:
+                await asyncio.to_thread(self._each_sink, "tick", time.time())
+                continue
+            while len(batch) < _BATCH_MAX and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await asyncio.to_thread(self._write_batch, batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write_batch(self, batch: list[tuple[Any, str | None, float]]) -> None:
+        records = []
+        for event, endpoint, received in batch:
+            try:
+                records.append(_record(event, endpoint, received))
+            except Exception as exc:
+                ijt_log.error(f"Failed to serialize result for the result log: {exc}")
+        if records:
+            self._each_sink("write", records, time.time())
+            self.written += len(records)
+
+    def _each_sink(self, method: str, *args: Any) -> None:
+        for sink in self.sinks:
+            try:
+                getattr(sink, method)(*args)
+            except Exception as exc:
+                ijt_log.error(f"Result sink {type(sink).__name__}.{method} failed: {exc}")
+
+    async def flush(self) -> None:
+        """Coroutine. Wait until every queued result is handed to the sinks."""
+        await self._queue.join()
+
+    async def close(self) -> None:
+        """Coroutine. Write the queued results, stop the writer task and close the sinks."""
+        if self._task is not None:
+            await self.flush()
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await asyncio.to_thread(self._each_sink, "close")
+
+
+_default: ResultLog | None = None
+
+
+def default_result_log() -> ResultLog:
+    """Return the process-wide :class:`ResultLog`, configured from the environment on first use."""
+    global _default
+    if _default is None:
+        _default = ResultLog.from_env()
+    return _default
+
+
+async def close_result_log() -> None:
+    """Coroutine. Flush and close the process-wide result log if it was used."""
+    if _default is not None:
+        await _default.close()
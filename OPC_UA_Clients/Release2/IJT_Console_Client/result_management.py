@@ -0,0 +1,119 @@
+"""Calls of the ResultManagement methods of a joining system.
+
+A joining system exposes its result history through a ``ResultManagement``
+object (Machinery Result ``ResultManagementType``):
+
+``GetLatestResult`` / ``GetResultById``
+    Return one result directly, with a handle that is released again with
+    ``ReleaseResultHandle``.
+``RequestResults``
+    IJT Base extension: the server re-sends the results of a sequence-number
+    or time range as ResultReady events over the existing subscriptions.
+"""
+
+import datetime
+from typing import Any
+
+from asyncua import Client, ua
+
+from ijt_logger import ijt_log
+
+RESULT_MANAGEMENT = "ResultManagement"
+GET_LATEST_RESULT = "GetLatestResult"
+GET_RESULT_BY_ID = "GetResultById"
+RELEASE_RESULT_HANDLE = "ReleaseResultHandle"
+REQUEST_RESULTS = "RequestResults"
+
+_TIMEOUT_MS_DEFAULT = 5000
+
+
+async def _child(parent: Any, name: str) -> Any:
+    for child in await parent.get_children():
+        browse_name = await child.read_browse_name()
+        if getattr(browse_name, "Name", None) == name:
+            return child
+    return None
+
+
+def _result_output(outputs: Any) -> Any:
+    """Return ``(handle, result)`` from the ``[ResultHandle, Result, Error]`` outputs of a get-result call."""
+    if not isinstance(outputs, (list, tuple)):
+        return None, outputs
+    if len(outputs) > 2 and outputs[2]:
+        ijt_log.warning(f"Result request returned error {outputs[2]}.")
+        return outputs[0], None
+    return outputs[0], outputs[1] if len(outputs) > 1 else None
+
+
+class ResultManagement:
+    """The ResultManagement object of a joining system and its methods by BrowseName."""
+
+    def __init__(self, node: Any, methods: dict[str, Any]) -> None:
+        self.node = node
+        self.methods = methods
+
+    @classmethod
+    async def find(cls, client: Client) -> "ResultManagement | None":
+        """Return the ResultManagement of the first joining system below Objects, or ``None``."""
+        for system in await client.nodes.objects.get_children():
+            try:
+                node = await _child(system, RESULT_MANAGEMENT)
+            except Exception as exc:
+                ijt_log.debug(f"Skipping {system} while looking for {RESULT_MANAGEMENT}: {exc}")
+                continue
+            if node is not None:
+                methods = {}
+                for child in await node.get_children():
+                    methods[(await child.read_browse_name()).Name] = child
+                return cls(node, methods)
+        return None
+
+    def supports(self, method: str) -> bool:
+        return method in self.methods
+
+    async def _call(self, method: str, *args: ua.Variant) -> Any:
+        return await self.node.call_method(self.methods[method], *args)
+
+    async def _get_result(self, method: str, *args: ua.Variant) -> Any:
+        handle, result = _result_output(await self._call(method, *args))
+        if handle and self.supports(RELEASE_RESULT_HANDLE):
+            try:
+                await self._call(RELEASE_RESULT_HANDLE, ua.Variant(handle, ua.VariantType.UInt32))
+            except Exception as exc:
+                ijt_log.debug(f"ReleaseResultHandle({handle}) failed: {exc}")
+        return result
+
+    async def get_latest_result(self, timeout_ms: int = _TIMEOUT_MS_DEFAULT) -> Any:
+        """Return the newest result of the joining system, or ``None``."""
+        return await self._get_result(GET_LATEST_RESULT, ua.Variant(timeout_ms, ua.VariantType.Int32))
+
+    async def get_result_by_id(self, result_id: str, timeout_ms: int = _TIMEOUT_MS_DEFAULT) -> Any:
+        """Return the result with ``result_id``, or ``None``."""
+        return await self._get_result(
+            GET_RESULT_BY_ID,
+            ua.Variant(result_id, ua.VariantType.String),
+            ua.Variant(timeout_ms, ua.VariantType.Int32),
+        )
+
+    async def request_results(
+        self, from_time: datetime.datetime, to_time: datetime.datetime, min_interval_ms: float = 0.0
+    ) -> bool:
+        """Ask the server to re-send the results created between ``from_time`` and ``to_time`` as events.
+
+        Returns ``False`` when the server does not offer ``RequestResults`` or rejects the request.
+        """
+        if not self.supports(REQUEST_RESULTS):
+            return False
+        outputs = await self._call(
+            REQUEST_RESULTS,
+            ua.Variant(0, ua.VariantType.UInt64),
+            ua.Variant(0, ua.VariantType.UInt64),
+            ua.Variant(from_time, ua.VariantType.DateTime),
+            ua.Variant(to_time, ua.VariantType.DateTime),
+            ua.Variant(min_interval_ms, ua.VariantType.Double),
+        )
+        status = outputs[1] if isinstance(outputs, (list, tuple)) and len(outputs) > 1 else 0
+        if status:
+            ijt_log.warning(f"RequestResults was rejected with status {status}: {outputs[2:]}")
+            return False
+        return True
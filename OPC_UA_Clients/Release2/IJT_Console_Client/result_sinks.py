@@ -0,0 +1,323 @@
+"""Output sinks of the result log.
+
+:class:`~result_log.ResultLog` turns every received result into one record
+(``{"time", "endpoint", "eventid", "message", "resultid", "result"}``) and
+hands batches of records to each configured sink in a worker thread.  A sink
+implements ``write(batch, now)`` for a list of ``(record, NDJSON line)``
+pairs, ``tick(now)`` for time-based flushing while no results arrive, and
+``close()``; ``interval`` is the longest it wants to wait for a tick
+(``None`` when it has no time-based work).
+
+``IJT_RESULT_SINKS``
+    Comma-separated sinks (default ``file``):
+
+    ``file``
+        Rolling NDJSON segment files, see :class:`NdjsonFileSink`.
+    ``stdout``
+        One NDJSON line per result on standard output; the client's own
+        log goes to standard error.
+    ``parquet``
+        Parquet files with one row per result and its traces as a list
+        column, see :class:`ParquetSink`.  Requires ``pyarrow``.
+``IJT_RESULT_PARQUET_ROWS`` / ``IJT_RESULT_PARQUET_FLUSH_SEC``
+    Buffered results written as one Parquet row group (default ``1000``), or
+    after this many seconds (default ``60``), whichever comes first.
+"""
+
+import datetime
+import gzip
+import json
+import os
+import sys
+from pathlib import Path
+from typing import IO, Any, Protocol
+
+from ijt_logger import env_number, ijt_log
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = pq = None  # type: ignore[assignment]
+
+_PARQUET_ROWS_DEFAULT = 1000
+_PARQUET_FLUSH_SEC_DEFAULT = 60.0
+
+Batch = list[tuple[dict[str, Any], bytes]]
+
+
+def _stamp(micros: int) -> str:
+    seconds, micros = divmod(micros, 1_000_000)
+    stamp = datetime.datetime.fromtimestamp(seconds, datetime.UTC).replace(microsecond=micros)
+    return stamp.strftime("%Y%m%dT%H%M%S%fZ")
+
+
+class ResultSink(Protocol):
+    interval: float | None
+
+    def write(self, batch: Batch, now: float) -> None: ...
+
+    def tick(self, now: float) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class NdjsonStdoutSink:
+    """Writes one NDJSON line per result to a binary stream, standard output by default."""
+
+    interval = None
+
+    def __init__(self, stream: IO[bytes] | None = None) -> None:
+        self.stream = stream if stream is not None else sys.stdout.buffer
+
+    def write(self, batch: Batch, now: float) -> None:
+        self.stream.write(b"".join(line for _, line in batch))
+        self.stream.flush()
+
+    def tick(self, now: float) -> None:
+        pass
+
+    def close(self) -> None:
+        self.stream.flush()
+
+
+class NdjsonFileSink:
+    """Rolling NDJSON segment files.
+
+    Each result is one line in ``results-<UTC start time>.ndjson``
+    (``.ndjson.gz`` when compressed).  A segment is closed after
+    ``segment_bytes`` of JSON or ``segment_seconds`` seconds, whichever comes
+    first.  With ``index`` every segment gets a ``.idx.ndjson`` companion
+    holding the record without its result plus the ``offset``/``length`` of
+    the result's line in the uncompressed segment.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        segment_bytes: int,
+        segment_seconds: float,
+        compress: bool = False,
+        index: bool = False,
+    ) -> None:
+        self.directory = directory
+        self.segment_bytes = max(1, segment_bytes)
+        self.segment_seconds = segment_seconds
+        self.compress = compress
+        self.index = index
+        self.segments = 0
+        self.interval = segment_seconds or None
+        self._file: IO[bytes] | None = None
+        self._index_file: IO[bytes] | None = None
+        self._segment_size = 0
+        self._segment_started = 0.0
+        self._name_us = 0
+
+    def write(self, batch: Batch, now: float) -> None:
+        for record, line in batch:
+            segment = self._segment_for(now)
+            if self._index_file is not None:
+                entry = {key: value for key, value in record.items() if key != "result"}
+                self._index_file.write(
+                    json.dumps({**entry, "offset": self._segment_size, "length": len(line)}).encode() + b"\n"
+                )
+            segment.write(line)
+            self._segment_size += len(line)
+        for handle in (self._file, self._index_file):
+            if handle is not None:
+                handle.flush()
+
+    def tick(self, now: float) -> None:
+        if self._file is not None and self._expired(now):
+            self._close_segment()
+
+    def close(self) -> None:
+        self._close_segment()
+
+    def _expired(self, now: float) -> bool:
+        return self._segment_size >= self.segment_bytes or bool(
+            self.segment_seconds and now - self._segment_started >= self.segment_seconds
+        )
+
+    def _segment_for(self, now: float) -> IO[bytes]:
+        """Return the open segment, rotating to a new one when it is full or too old."""
+        self.tick(now)
+        if self._file is not None:
+            return self._file
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Segments rotated within one batch share its time; keep their names apart.
+        self._name_us = max(int(now * 1_000_000), self._name_us + 1)
+        name = f"results-{_stamp(self._name_us)}"
+        path = self.directory / f"{name}.ndjson"
+        self._file = gzip.open(path.with_suffix(".ndjson.gz"), "ab") if self.compress else open(path, "ab")  # noqa: SIM115
+        if self.index:
+            self._index_file = open(self.directory / f"{name}.idx.ndjson", "ab")  # noqa: SIM115
+        self._segment_size = 0
+        self._segment_started = now
+        self.segments += 1
+        ijt_log.info(f"Writing results to {path.name}{'.gz' if self.compress else ''}")
+        return self._file
+
+    def _close_segment(self) -> None:
+        for handle in (self._file, self._index_file):
+            if handle is not None:
+                handle.close()
+        self._file = self._index_file = None
+
+
+def _content_value(entry: Any) -> Any:
+    """Return the structure inside a serialized, possibly Variant-wrapped ResultContent entry."""
+    if isinstance(entry, dict) and "Trace" not in entry and isinstance(entry.get("Value"), dict):
+        return entry["Value"]
+    return entry
+
+
+def _text(value: Any) -> str | None:
+    if isinstance(value, dict):
+        value = value.get("Text", value.get("Identifier"))
+    return None if value is None else str(value)
+
+
+def trace_rows(result: Any) -> list[dict[str, Any]]:
+    """Return one entry per trace channel of a serialized result, in trace order."""
+    rows: list[dict[str, Any]] = []
+    if not isinstance(result, dict):
+        return rows
+    for index, entry in enumerate(result.get("ResultContent") or ()):
+        content = _content_value(entry)
+        trace = content.get("Trace") if isinstance(content, dict) else None
+        for step in (trace or {}).get("StepTraces") or ():
+            for channel in step.get("StepTraceContent") or ():
+                rows.append(
+                    {
+                        "content": index,
+                        "step_trace_id": _text(step.get("StepTraceId")),
+                        "step_result_id": _text(step.get("StepResultId")),
+                        "sampling_interval": step.get("SamplingInterval"),
+                        "name": _text(channel.get("Name")),
+                        "sensor_id": _text(channel.get("SensorId")),
+                        "values": [float(value) for value in channel.get("Values") or ()],
+                    }
+                )
+    return rows
+
+
+def _parquet_schema() -> Any:
+    trace = pa.struct(
+        [
+            ("content", pa.int32()),
+            ("step_trace_id", pa.string()),
+            ("step_result_id", pa.string()),
+            ("sampling_interval", pa.float64()),
+            ("name", pa.string()),
+            ("sensor_id", pa.string()),
+            ("values", pa.list_(pa.float64())),
+        ]
+    )
+    return pa.schema(
+        [
+            ("time", pa.timestamp("us", tz="UTC")),
+            ("endpoint", pa.string()),
+            ("eventid", pa.string()),
+            ("resultid", pa.string()),
+            ("message", pa.string()),
+            ("traces", pa.list_(trace)),
+            ("result", pa.string()),
+        ]
+    )
+
+
+class ParquetSink:
+    """Parquet files with one row per result and its trace channels as a list column.
+
+    Rows are buffered and written as one row group once ``batch_rows`` results
+    have arrived or ``batch_seconds`` have passed since the first buffered
+    one.  A file is closed — and only then readable — when it reaches
+    ``segment_seconds`` of age, so a day of results is a handful of files.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        batch_rows: int = _PARQUET_ROWS_DEFAULT,
+        batch_seconds: float = _PARQUET_FLUSH_SEC_DEFAULT,
+        segment_seconds: float = 3600,
+    ) -> None:
+        if pa is None:
+            raise RuntimeError("The parquet result sink requires pyarrow (pip install pyarrow).")
+        self.directory = directory
+        self.batch_rows = max(1, batch_rows)
+        self.batch_seconds = batch_seconds
+        self.segment_seconds = segment_seconds
+        self.interval = batch_seconds or None
+        self.schema = _parquet_schema()
+        self.row_groups = 0
+        self._rows: list[dict[str, Any]] = []
+        self._buffered_since = 0.0
+        self._writer: Any = None
+        self._file_started = 0.0
+
+    def write(self, batch: Batch, now: float) -> None:
+        if not self._rows:
+            self._buffered_since = now
+        for record, _ in batch:
+            row = {key: value for key, value in record.items() if key != "result"}
+            row["time"] = datetime.datetime.fromisoformat(record["time"])
+            row["traces"] = trace_rows(record["result"])
+            row["result"] = json.dumps(record["result"], default=str)
+            self._rows.append(row)
+        if len(self._rows) >= self.batch_rows:
+            self._flush(now)
+
+    def tick(self, now: float) -> None:
+        if self._rows and self.batch_seconds and now - self._buffered_since >= self.batch_seconds:
+            self._flush(now)
+
+    def close(self) -> None:
+        if self._rows:
+            self._flush(self._buffered_since)
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def _flush(self, now: float) -> None:
+        if self._writer is not None and self.segment_seconds and now - self._file_started >= self.segment_seconds:
+            self._writer.close()
+            self._writer = None
+        if self._writer is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.directory / f"results-{_stamp(int(now * 1_000_000))}.parquet"
+            self._writer = pq.ParquetWriter(path, self.schema)
+            self._file_started = now
+            ijt_log.info(f"Writing results to {path.name}")
+        table = pa.Table.from_pylist(self._rows, schema=self.schema)
+        self._rows = []
+        self._writer.write_table(table)
+        self.row_groups += 1
+
+
+def sinks_from_env(
+    directory: Path, segment_bytes: int, segment_seconds: float, compress: bool, index: bool
+) -> list[ResultSink]:
+    """Build the sinks named by ``IJT_RESULT_SINKS``; unknown or unavailable sinks are skipped with a warning."""
+    sinks: list[ResultSink] = []
+    for name in dict.fromkeys(n.strip().lower() for n in os.getenv("IJT_RESULT_SINKS", "file").split(",")):
+        if name == "file":
+            sinks.append(NdjsonFileSink(directory, segment_bytes, segment_seconds, compress, index))
+        elif name == "stdout":
+            sinks.append(NdjsonStdoutSink())
+        elif name == "parquet":
+            try:
+                sinks.append(
+                    ParquetSink(
+                        directory,
+                        int(env_number("IJT_RESULT_PARQUET_ROWS", _PARQUET_ROWS_DEFAULT)),
+                        env_number("IJT_RESULT_PARQUET_FLUSH_SEC", _PARQUET_FLUSH_SEC_DEFAULT),
+                        segment_seconds,
+                    )
+                )
+            except RuntimeError as exc:
+                ijt_log.warning(f"Result sink 'parquet' disabled: {exc}")
+        elif name:
+            ijt_log.warning(f"Unknown result sink {name!r} in IJT_RESULT_SINKS; ignored.")
+    return sinks
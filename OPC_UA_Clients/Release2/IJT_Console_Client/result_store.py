@@ -0,0 +1,490 @@
+"""Queryable on-disk history of received results.
+
+Every result event the client receives is written to an SQLite database in
+WAL mode, so a shift's results can be searched (:meth:`ResultStore.query`, or
+any SQLite tool) while new ones are being written.  Writes are queued and
+committed in batches by a background thread; the event loop only enqueues the
+event.
+
+``results``
+    One row per result with the indexed columns — the result time
+    (``ResultMetaData.CreationTime``, else the receive time), ``ResultId``,
+    joint id, classification and evaluation — and the result as JSON with its
+    trace sample arrays emptied.
+``result_assets``
+    The ``EntityId`` (the asset's ProductInstanceUri) of every asset entity
+    associated with a result, indexed.
+``trace_channels``
+    One row per trace channel and step: the samples as one packed
+    little-endian ``float64`` column (JSON for non-numeric channels), read
+    back only when a query asks for ``details``.
+
+``IJT_RESULT_STORE``
+    ``0`` disables the store (default ``1``).
+``IJT_RESULT_STORE_PATH``
+    Database file (default ``.state/results.sqlite3`` in the Console Client
+    directory).
+``IJT_RESULT_STORE_BATCH``
+    Results committed per transaction (default ``256``); a partial batch is
+    committed after one second.
+"""
+
+import asyncio
+import datetime
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Any
+
+from ijt_logger import ijt_log
+from serialize_data import serialize_full_event
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+_DEFAULT_PATH = Path(__file__).resolve().parent / ".state" / "results.sqlite3"
+_BATCH_DEFAULT = 256
+_FLUSH_INTERVAL_S = 1.0
+_QUEUE_SIZE = 10000
+_PAGE_DEFAULT = 100
+_PAGE_MAX = 1000
+# EntityType values: asset (2) up to sub_component (13) describe assets, 23 is a joint.
+_ASSET_ENTITY_TYPES = frozenset(range(2, 14))
+_JOINT_ENTITY_TYPE = 23
+_STOP = object()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    result_id TEXT,
+    created REAL NOT NULL,
+    received REAL NOT NULL,
+    classification INTEGER,
+    evaluation INTEGER,
+    joint_id TEXT,
+    event_id TEXT,
+    message TEXT,
+    result BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_created ON results (created);
+CREATE INDEX IF NOT EXISTS results_result_id ON results (result_id);
+CREATE INDEX IF NOT EXISTS results_joint_id ON results (joint_id, created);
+CREATE INDEX IF NOT EXISTS results_classification ON results (classification, created);
+CREATE TABLE IF NOT EXISTS result_assets (
+    result INTEGER NOT NULL REFERENCES results (id) ON DELETE CASCADE,
+    uri TEXT NOT NULL,
+    PRIMARY KEY (uri, result)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS trace_channels (
+    result INTEGER NOT NULL REFERENCES results (id) ON DELETE CASCADE,
+    content INTEGER NOT NULL,
+    step INTEGER NOT NULL,
+    channel INTEGER NOT NULL,
+    name TEXT,
+    dtype TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    samples BLOB NOT NULL,
+    PRIMARY KEY (result, content, step, channel)
+) WITHOUT ROWID;
+"""
+
+
+def _int(value: Any) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _timestamp(value: Any) -> float | None:
+    """Return ``value`` (datetime, ISO-8601 string or epoch seconds) as epoch seconds."""
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.UTC)
+        return value.timestamp()
+    if isinstance(value, int | float):
+        return float(value)
+    if isinstance(value, str) and value.strip():
+        try:
+            return _timestamp(datetime.datetime.fromisoformat(value.strip().replace("Z", "+00:00")))
+        except ValueError:
+            return None
+    return None
+
+
+def _iso(timestamp: float) -> str:
+    return datetime.datetime.fromtimestamp(timestamp, datetime.UTC).isoformat().replace("+00:00", "Z")
+
+
+def _dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+
+def _content_value(entry: Any) -> Any:
+    """Return the structure inside a (possibly Variant-wrapped) ResultContent entry."""
+    if not hasattr(entry, "Trace") and getattr(entry, "Value", None) is not None:
+        return entry.Value
+    return entry
+
+
+def result_traces(result: Any) -> list[tuple[int, Any]]:
+    """Return ``(content index, Trace)`` for every ResultContent entry that has a trace."""
+    traces = []
+    for index, entry in enumerate(getattr(result, "ResultContent", None) or ()):
+        trace = getattr(_content_value(entry), "Trace", None)
+        if trace is not None:
+            traces.append((index, trace))
+    return traces
+
+
+def result_id(result: Any) -> str | None:
+    """Return ``ResultMetaData.ResultId`` as a string, or ``None``."""
+    value = getattr(getattr(result, "ResultMetaData", None), "ResultId", None)
+    return None if value is None or value == "" else str(value)
+
+
+def pack_values(values: Any) -> bytes:
+    """Return ``values`` as a little-endian ``float64`` buffer.
+
+    Raises:
+        TypeError: If a sample is not a number.
+    """
+    packed = array("d", values)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _clear_samples(document: Any) -> Any:
+    """Empty the trace sample arrays of a serialized result (they go to ``trace_channels``)."""
+    for entry in document.get("ResultContent") or () if isinstance(document, dict) else ():
+        if isinstance(entry, dict) and "Trace" not in entry and isinstance(entry.get("Value"), dict):
+            entry = entry["Value"]
+        for step_trace in ((entry or {}).get("Trace") or {}).get("StepTraces") or ():
+            for channel in step_trace.get("StepTraceContent") or ():
+                channel["Values"] = []
+    return document
+
+
+def _entity_ids(meta: Any, entity_types: frozenset[int]) -> list[str]:
+    ids = []
+    for entity in getattr(meta, "AssociatedEntities", None) or ():
+        entity_id = getattr(entity, "EntityId", None)
+        if _int(getattr(entity, "EntityType", None)) in entity_types and entity_id not in (None, ""):
+            ids.append(str(entity_id))
+    return ids
+
+
+def _channel_rows(result: Any) -> list[tuple]:
+    rows = []
+    for content, trace in result_traces(result):
+        for step, step_trace in enumerate(getattr(trace, "StepTraces", None) or ()):
+            for channel, entry in enumerate(getattr(step_trace, "StepTraceContent", None) or ()):
+                values = list(getattr(entry, "Values", None) or ())
+                try:
+                    dtype, samples = "float64", pack_values(values)
+                except TypeError:
+                    dtype, samples = "json", _dumps(serialize_full_event(values))
+                rows.append((content, step, channel, getattr(entry, "Name", None), dtype, len(values), samples))
+    return rows
+
+
+def _unpack(dtype: str, samples: bytes) -> list:
+    if dtype == "json":
+        return json.loads(samples)
+    values = array("d")
+    values.frombytes(samples)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values.tolist()
+
+
+def _restore_samples(result: dict, channels: list[tuple]) -> None:
+    """Put the stored channel samples back into the JSON ``result``."""
+    contents = result.get("ResultContent") or []
+    for content, step, channel, dtype, samples in channels:
+        try:
+            entry = contents[content]
+            if "Trace" not in entry and isinstance(entry.get("Value"), dict):
+                entry = entry["Value"]
+            entry["Trace"]["StepTraces"][step]["StepTraceContent"][channel]["Values"] = _unpack(dtype, samples)
+        except (IndexError, KeyError, TypeError):
+            continue
+
+
+class ResultStore:
+    """SQLite result history written by a background batch writer."""
+
+    def __init__(self, path: Path | None, batch_size: int = _BATCH_DEFAULT, queue_size: int = _QUEUE_SIZE) -> None:
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.written = 0
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(queue_size)
+        self._writer: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ResultStore":
+        """Build the store configured by ``IJT_RESULT_STORE`` / ``IJT_RESULT_STORE_PATH``."""
+        if os.getenv("IJT_RESULT_STORE", "1").strip().lower() in {"0", "false", "no", "off"}:
+            return cls(None)
+        path = os.getenv("IJT_RESULT_STORE_PATH", "").strip()
+        try:
+            batch_size = int(os.getenv("IJT_RESULT_STORE_BATCH", _BATCH_DEFAULT))
+        except ValueError:
+            ijt_log.warning(f"Invalid IJT_RESULT_STORE_BATCH; using {_BATCH_DEFAULT}.")
+            batch_size = _BATCH_DEFAULT
+        return cls(Path(path) if path else _DEFAULT_PATH, batch_size)
+
+    @property
+    def enabled(self) -> bool:
+        """``True`` unless the store was disabled."""
+        return self.path is not None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.path is None:
+            raise ValueError("result store is disabled")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(self.path, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("PRAGMA foreign_keys=ON")
+        return db
+
+    def add(self, endpoint: str, event: Any) -> bool:
+        """Queue a result event (``Result``, ``EventId``, ``Message``) for writing.
+
+        Never blocks; when the write queue is full the result is dropped and
+        counted in :attr:`dropped`.
+        """
+        if not self.enabled:
+            return False
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run, name="ijt-result-store", daemon=True)
+                self._writer.start()
+        try:
+            self._queue.put_nowait((endpoint, event, time.time()))
+        except queue.Full:
+            self.dropped += 1
+            ijt_log.warning(f"Result store queue is full; result of {endpoint} not stored.")
+            return False
+        return True
+
+    def _run(self) -> None:
+        try:
+            db = self._connect()
+            db.executescript(_SCHEMA)
+        except Exception as exc:
+            ijt_log.error(f"Result store {self.path} unavailable: {exc}")
+            self.path = None
+            self._drain()
+            return
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + _FLUSH_INTERVAL_S
+            while batch[-1] is not _STOP and len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            stop = batch[-1] is _STOP
+            items = [item for item in batch if item is not _STOP]
+            try:
+                with db:
+                    for item in items:
+                        self._write(db, *item)
+                self.written += len(items)
+            except Exception as exc:
+                ijt_log.error(f"Failed to store {len(items)} result(s): {exc}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        db.close()
+
+    def _drain(self) -> None:
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return
+            self._queue.task_done()
+
+    @staticmethod
+    def _write(db: sqlite3.Connection, endpoint: str, event: Any, received: float) -> None:
+        result = getattr(event, "Result", None)
+        meta = getattr(result, "ResultMetaData", None)
+        message = getattr(event, "Message", None)
+        created = _timestamp(getattr(meta, "CreationTime", None)) or received
+        joints = _entity_ids(meta, frozenset({_JOINT_ENTITY_TYPE}))
+        document = _dumps(_clear_samples(serialize_full_event(result)))
+        row = db.execute(
+            "INSERT INTO results (endpoint, result_id, created, received, classification, evaluation,"
+            " joint_id, event_id, message, result) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                endpoint,
+                result_id(result),
+                created,
+                received,
+                _int(getattr(meta, "Classification", None)),
+                _int(getattr(meta, "ResultEvaluation", None)),
+                joints[0] if joints else None,
+                str(getattr(event, "EventId", "") or "") or None,
+                str(getattr(message, "Text", message) or "") or None,
+                document,
+            ),
+        ).lastrowid
+        db.executemany(
+            "INSERT OR IGNORE INTO result_assets (result, uri) VALUES (?, ?)",
+            [(row, uri) for uri in _entity_ids(meta, _ASSET_ENTITY_TYPES)],
+        )
+        db.executemany(
+            "INSERT INTO trace_channels (result, content, step, channel, name, dtype, length, samples)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(row, *channel) for channel in _channel_rows(result)],
+        )
+
+    def flush(self) -> None:
+        """Block until every queued result is written."""
+        if self._writer is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Write the queued results and stop the writer thread."""
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None and writer.is_alive():
+            self._queue.put(_STOP)
+            writer.join()
+
+    async def query(self, data: dict) -> dict[str, Any]:
+        """Coroutine. Return one page of stored results, newest first.
+
+        Args:
+            data: Search criteria; every key is optional:
+                ``"from"``/``"to"`` (ISO-8601 or epoch seconds, on the result
+                time), ``"resultid"``, ``"jointid"``, ``"asset"`` (asset
+                ProductInstanceUri), ``"classification"`` and ``"evaluation"``
+                (a value or a list), and ``"endpoint"``.  ``"limit"`` sets the
+                page size (default 100, at most 1000), ``"cursor"`` continues
+                after the page that returned it and ``"details": true`` adds
+                each complete ``result`` including its traces.
+
+        Returns:
+            ``{"results": [...], "next": cursor or None}``, or
+            ``{"exception": "…"}`` for an invalid request or a disabled store.
+        """
+        if not self.enabled:
+            return {"exception": "Result store is disabled"}
+        try:
+            sql, params, limit = self._select(data)
+        except ValueError as exc:
+            return {"exception": str(exc)}
+        details = data.get("details") is True
+        try:
+            return await asyncio.to_thread(self._query, sql, params, limit, details)
+        except sqlite3.Error as exc:
+            ijt_log.error(f"Result query failed: {exc}")
+            return {"exception": f"Result query failed: {exc}"}
+
+    @staticmethod
+    def _select(data: dict) -> tuple[str, list, int]:
+        where: list[str] = []
+        params: list[Any] = []
+        for key, op in (("from", ">="), ("to", "<=")):
+            if data.get(key) not in (None, ""):
+                value = _timestamp(data[key])
+                if value is None:
+                    raise ValueError(f"{key!r} must be an ISO-8601 time or epoch seconds")
+                where.append(f"created {op} ?")
+                params.append(value)
+        for key, column, kind in (
+            ("resultid", "result_id", str),
+            ("jointid", "joint_id", str),
+            ("classification", "classification", int),
+            ("evaluation", "evaluation", int),
+            ("endpoint", "endpoint", str),
+            ("asset", "asset", str),
+        ):
+            raw = data.get(key)
+            if raw in (None, "", []):
+                continue
+            try:
+                values = [kind(value) for value in (raw if isinstance(raw, list) else [raw])]
+            except (TypeError, ValueError) as exc:
+                raise ValueError(f"Invalid {key!r} value {raw!r}") from exc
+            marks = ", ".join("?" * len(values))
+            if column == "asset":
+                where.append(f"id IN (SELECT result FROM result_assets WHERE uri IN ({marks}))")
+            else:
+                where.append(f"{column} IN ({marks})")
+            params.extend(values)
+        cursor = data.get("cursor")
+        if cursor:
+            try:
+                created, row = str(cursor).split(":", 1)
+                where.append("(created < ? OR (created = ? AND id < ?))")
+                params.extend((float(created), float(created), int(row)))
+            except ValueError as exc:
+                raise ValueError(f"Invalid cursor {cursor!r}") from exc
+        try:
+            limit = min(max(int(data.get("limit") or _PAGE_DEFAULT), 1), _PAGE_MAX)
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"Invalid 'limit' value {data.get('limit')!r}") from exc
+        sql = (
+            "SELECT id, endpoint, result_id, created, received, classification, evaluation, joint_id,"
+            " event_id, message, result FROM results"
+        )
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY created DESC, id DESC LIMIT ?"
+        params.append(limit + 1)
+        return sql, params, limit
+
+    def _query(self, sql: str, params: list, limit: int, details: bool) -> dict[str, Any]:
+        if not self.path or not self.path.exists():
+            return {"results": [], "next": None}
+        db = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        try:
+            rows = db.execute(sql, params).fetchall()
+            page = rows[:limit]
+            results = []
+            for row, endpoint, rid, created, received, classification, evaluation, joint, event, message, doc in page:
+                entry: dict[str, Any] = {
+                    "resultid": rid,
+                    "endpoint": endpoint,
+                    "time": _iso(created),
+                    "received": _iso(received),
+                    "classification": classification,
+                    "evaluation": evaluation,
+                    "jointid": joint,
+                    "assets": [uri for (uri,) in db.execute("SELECT uri FROM result_assets WHERE result = ?", (row,))],
+                    "eventid": event,
+                    "message": message,
+                }
+                if details:
+                    result = json.loads(doc)
+                    channels = db.execute(
+                        "SELECT content, step, channel, dtype, samples FROM trace_channels WHERE result = ?", (row,)
+                    ).fetchall()
+                    _restore_samples(result, channels)
+                    entry["result"] = result
+                results.append(entry)
+        finally:
+            db.close()
+        last = page[-1] if page else None
+        following = f"{last[3]!r}:{last[0]}" if last is not None and len(rows) > limit else None
+        return {"results": results, "next": following}
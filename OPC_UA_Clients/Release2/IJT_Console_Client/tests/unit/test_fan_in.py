@@ -0,0 +1,115 @@
+"""Tests for fan_in.py — several controllers subscribed from one Console Client process."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from fan_in import parse_endpoints, run_fan_in
+from opcua_client import _load_ijt_type_definitions
+from reconnect import supervise_endpoint
+from type_definition_cache import LoadedModels
+
+A = "opc.tcp://line1:4840"
+B = "opc.tcp://line2:4840"
+
+
+def test_endpoints_from_urls_and_files(tmp_path):
+    text = tmp_path / "controllers.txt"
+    text.write_text(f"# assembly hall\n{B}\n\n{A}  # duplicate\n")
+    assert parse_endpoints(f"{A}, {B}") == [A, B]
+    assert parse_endpoints(A, str(text)) == [A, B]
+
+    pytest.importorskip("yaml")
+    listed = tmp_path / "controllers.yaml"
+    listed.write_text(f"endpoints:\n  - {B}\n  - url: {A}\n")
+    assert parse_endpoints(endpoints_file=str(listed)) == [B, A]
+
+    with pytest.raises(ValueError, match="Invalid OPC UA URL"):
+        parse_endpoints("http://line1:4840")
+    with pytest.raises(ValueError, match="No OPC UA endpoints"):
+        parse_endpoints(" , ")
+
+
+@pytest.mark.asyncio
+async def test_controllers_of_the_same_model_share_type_definitions():
+    model = (["http://opcfoundation.org/UA/", "urn:ijt"], {"urn:ijt": ["1.01.0", "2024-06-01"]})
+    other = (["http://opcfoundation.org/UA/", "urn:other"], {})
+    models = LoadedModels()
+    clients = [AsyncMock() for _ in range(3)]
+    cache = MagicMock(enabled=False)
+    cache.restore.return_value = False
+    cache.record = AsyncMock()
+
+    with (
+        patch("opcua_client.TypeDefinitionCache.from_env", return_value=cache),
+        patch("opcua_client.read_type_definition_model", AsyncMock(side_effect=[model, model, other])),
+    ):
+        await asyncio.gather(*(_load_ijt_type_definitions(client, "unit", models) for client in clients))
+
+    loads = [client.load_data_type_definitions.await_count for client in clients]
+    assert sorted(loads[:2]) == [0, 1] and loads[2] == 1 and models.shared == 1
+
+
+def _client(sessions):
+    """A stand-in OPCUAClient whose session checks return ``sessions`` in turn."""
+    client = MagicMock()
+    client.connect = AsyncMock()
+    client.subscribe_to_events = AsyncMock()
+    client.check_session = AsyncMock(side_effect=sessions)
+    client.cleanup = AsyncMock()
+    client.session_lost = asyncio.Event()
+    return client
+
+
+@pytest.mark.asyncio
+async def test_supervisor_reconnects_without_holding_up_other_endpoints():
+    down = _client([])
+    down.connect.side_effect = OSError("unreachable")
+    dropped, healthy = _client([True, False]), _client([True] * 1000)
+    made = {A: [down, dropped, _client([True] * 1000)], B: [healthy]}
+
+    def make_client(url, **kwargs):
+        return made[url].pop(0) if len(made[url]) > 1 else made[url][0]
+
+    with (
+        patch("reconnect.resume_session", AsyncMock(side_effect=OSError("server gone"))),
+        patch("reconnect.backfill", AsyncMock(return_value=0)) as backfill,
+    ):
+        tasks = [asyncio.create_task(supervise_endpoint(url, make_client, 0.01, 0.01, 0.02)) for url in (A, B)]
+        await asyncio.sleep(0.2)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    down.cleanup.assert_awaited_once()
+    dropped.subscribe_to_events.assert_awaited_once()
+    dropped.cleanup.assert_awaited_once()
+    assert made[A][0].subscribe_to_events.await_count == 1 and healthy.check_session.await_count > 5
+    backfill.assert_awaited_once()
+    healthy.cleanup.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_fan_in_shares_one_store_and_model_registry():
+    store = MagicMock()
+    made = []
+
+    def make_client(url, **kwargs):
+        made.append((url, kwargs))
+        return _client([True] * 1000)
+
+    with (
+        patch("fan_in.ResultStore.from_env", return_value=store),
+        patch("fan_in.close_result_log", new_callable=AsyncMock) as close_log,
+    ):
+        task = asyncio.create_task(run_fan_in([A, B], make_client))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await task
+
+    assert [url for url, _ in made] == [A, B]
+    assert all(kwargs["result_store"] is store for _, kwargs in made)
+    assert made[0][1]["type_models"] is made[1][1]["type_models"]
+    store.close.assert_called_once()
+    close_log.assert_awaited_once()
@@ -2,14 +2,19 @@
 Tests for ijt_logger.py (MillisecondFormatter and ijt_log).
 """
 
+import asyncio
 import inspect
+import json
 import logging
 import sys
+from logging.handlers import QueueHandler
 from pathlib import Path
+from unittest.mock import MagicMock, patch
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
-from ijt_logger import MillisecondFormatter, ijt_log
+import utils
+from ijt_logger import EventRecord, MillisecondFormatter, env_number, ijt_log
 
 # ---------------------------------------------------------------------------
 # MillisecondFormatter
@@ -112,3 +117,63 @@ def test_warning_does_not_raise():
 
 def test_error_does_not_raise():
     ijt_log.error("test error from unit test")
+
+
+# ---------------------------------------------------------------------------
+# Queued, lazily formatted event records
+# ---------------------------------------------------------------------------
+
+
+def test_records_are_formatted_on_the_listener_thread():
+    assert isinstance(ijt_log.handlers[0], QueueHandler)
+    record = _make_record("%s")
+    record.args = (object(),)
+    assert ijt_log.handlers[0].prepare(record).args == record.args
+
+
+def test_event_record_renders_pretty_and_structured(monkeypatch):
+    calls = []
+
+    def build():
+        calls.append(1)
+        return [
+            ("message", "RESULT EVENT RECEIVED", "OK"),
+            ("entities", "AssociatedEntities", [[("Name", "Name", "T")]]),
+        ]
+
+    record = EventRecord("result", "RESULT EVENT RECEIVED", build, label_width=20)
+    assert not calls
+    lines = str(record).splitlines()
+    assert lines[1] == "RESULT EVENT RECEIVED : OK" and lines[3] == "  Name               : T"
+
+    monkeypatch.setattr("ijt_logger.EVENT_LOG_FORMAT", "structured")
+    assert json.loads(str(record)) == {"event": "result", "message": "OK", "entities": [{"Name": "T"}]}
+    assert str(EventRecord("x", "X", lambda: 1 / 0)).startswith("X : could not format event")
+
+
+def test_event_fields_are_not_built_below_info():
+    event = MagicMock()
+    event.EventId = b"e-1"
+    original_level = ijt_log.level
+    ijt_log.setLevel(logging.WARNING)
+    try:
+        with patch("utils._result_event_fields") as fields, patch("utils._joining_event_fields") as joining:
+            assert asyncio.run(utils.log_result_event_details(event, "opc.tcp://x:1", MagicMock())) == "e-1"
+            asyncio.run(utils.log_joining_system_event(event))
+    finally:
+        ijt_log.setLevel(original_level)
+    fields.assert_not_called()
+    joining.assert_not_called()
+
+
+def test_env_number_clamps_and_falls_back(monkeypatch):
+    monkeypatch.setenv("IJT_TEST_NUMBER", "0.01")
+    assert env_number("IJT_TEST_NUMBER", 5.0, 0.1) == 0.1
+    monkeypatch.setenv("IJT_TEST_NUMBER", " 2.5 ")
+    assert env_number("IJT_TEST_NUMBER", 5.0) == 2.5
+    monkeypatch.setenv("IJT_TEST_NUMBER", "many")
+    with patch.object(ijt_log, "warning") as warning:
+        assert env_number("IJT_TEST_NUMBER", 5.0) == 5.0
+    warning.assert_called_once()
+    monkeypatch.delenv("IJT_TEST_NUMBER")
+    assert env_number("IJT_TEST_NUMBER", 5.0) == 5.0
@@ -62,6 +62,7 @@ def _endpoint_with_username_token(token_security_policy_uri: str) -> ua.Endpoint
 @pytest.mark.asyncio
 async def test_load_ijt_type_definitions_continues_after_legacy_loader_failure():
     client = AsyncMock()
+    client.get_node = MagicMock()  # synchronous in asyncua
     client.load_type_definitions = AsyncMock(side_effect=RuntimeError("legacy unavailable"))
     client.load_data_type_definitions = AsyncMock()
 
@@ -72,6 +73,28 @@ async def test_load_ijt_type_definitions_continues_after_legacy_loader_failure()
     assert "legacy unavailable" in str(mock_log.warning.call_args)
 
 
+@pytest.mark.asyncio
+async def test_load_ijt_type_definitions_restores_cached_model_without_live_load():
+    client = AsyncMock()
+    model = (["http://opcfoundation.org/UA/"], {"urn:ijt": ["1.01.0", "2024-06-01"]})
+    cache = MagicMock()
+    cache.restore.side_effect = [True, False]
+    cache.record = AsyncMock()
+
+    with (
+        patch("opcua_client.TypeDefinitionCache.from_env", return_value=cache),
+        patch("opcua_client.read_type_definition_model", AsyncMock(return_value=model)),
+    ):
+        await _load_ijt_type_definitions(client, "unit")
+        client.load_data_type_definitions.assert_not_awaited()
+        cache.record.assert_not_awaited()
+
+        await _load_ijt_type_definitions(client, "unit")
+    client.load_type_definitions.assert_awaited_once()
+    client.load_data_type_definitions.assert_awaited_once()
+    assert cache.record.await_args.args[:3] == (client, *model)
+
+
 @pytest.mark.asyncio
 async def test_configure_security_is_idempotent_when_already_configured():
     with patch("opcua_client.Client"):
@@ -265,6 +288,7 @@ async def test_connect_retries_then_succeeds():
     with patch("opcua_client.Client") as MockClient:
         mock_client = AsyncMock()
         mock_client.connect = _connect_mock
+        mock_client.get_node = MagicMock()  # synchronous in asyncua
         mock_client.load_type_definitions = AsyncMock()
         mock_client.load_data_type_definitions = AsyncMock()
         MockClient.return_value = mock_client
@@ -299,6 +323,7 @@ async def test_connect_logs_retry_message():
     with patch("opcua_client.Client") as MockClient:
         mock_client = AsyncMock()
         mock_client.connect = _connect_mock
+        mock_client.get_node = MagicMock()  # synchronous in asyncua
         mock_client.load_type_definitions = AsyncMock()
         mock_client.load_data_type_definitions = AsyncMock()
         MockClient.return_value = mock_client
@@ -0,0 +1,160 @@
+"""Tests for reconnect.py — session resume, TransferSubscriptions and result backfill."""
+
+import asyncio
+import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from asyncua import ua
+
+from opcua_client import OPCUAClient
+from reconnect import backfill, resume_session, supervise_endpoint, transfer_subscriptions
+from result_event_handler import ResultEventHandler, SeenResults, ShortResultEvent
+from result_management import ResultManagement
+
+URL = "opc.tcp://line1:4840"
+
+
+def _result(result_id):
+    return SimpleNamespace(ResultMetaData=SimpleNamespace(ResultId=result_id))
+
+
+def _transfer_results(*codes):
+    return [SimpleNamespace(StatusCode=ua.StatusCode(code)) for code in codes]
+
+
+def _client():
+    """A stand-in OPCUAClient with two live subscriptions."""
+    client = MagicMock()
+    client.server_url = URL
+    client.session_lost = asyncio.Event()
+    client.sub_result_event = SimpleNamespace(subscription_id=7)
+    client.sub_joining_event = SimpleNamespace(subscription_id=8)
+    client.open_session = AsyncMock()
+    client.subscribe_to_events = AsyncMock()
+    client.client.uaclient.transfer_subscriptions = AsyncMock(return_value=_transfer_results(0, 0))
+    client.client.uaclient.delete_subscriptions = AsyncMock()
+    return client
+
+
+@pytest.mark.asyncio
+async def test_results_seen_before_are_not_written_again():
+    seen = SeenResults(size=2)
+    handler = ResultEventHandler(URL, MagicMock(), seen)
+    with patch("result_event_handler.log_result_to_file", new_callable=AsyncMock) as log:
+        for result_id in ("r1", "r2", "r1", None, None, "r3", "r2"):
+            await handler.process_event(ShortResultEvent("ResultReady", _result(result_id), "", ""))
+
+    # The second r1 is a duplicate; after r3, r2 is no longer among the two most recent ids.
+    assert log.await_count == 6 and seen.duplicates == 1
+    assert handler.result_store.add.call_count == 6
+
+
+@pytest.mark.asyncio
+async def test_session_is_resumed_by_transferring_its_subscriptions():
+    client = _client()
+    client.session_lost.set()
+
+    assert await resume_session(client) == "transferred"
+
+    client.client.disconnect_socket.assert_called_once()
+    client.open_session.assert_awaited_once()
+    params = client.client.uaclient.transfer_subscriptions.await_args.args[0]
+    assert params.SubscriptionIds == [7, 8] and params.SendInitialValues is False
+    client.client.uaclient.ensure_publish_loop.assert_called_once()
+    client.subscribe_to_events.assert_not_awaited()
+    assert not client.session_lost.is_set()
+
+
+@pytest.mark.asyncio
+async def test_subscriptions_are_recreated_when_the_server_dropped_them():
+    client = _client()
+    client.client.uaclient.transfer_subscriptions.return_value = _transfer_results(
+        0, ua.StatusCodes.BadSubscriptionIdInvalid
+    )
+
+    assert await resume_session(client) == "re-created"
+
+    client.client.uaclient.delete_subscriptions.assert_awaited_once_with([7])
+    client.subscribe_to_events.assert_awaited_once()
+    assert client.sub_result_event is None and client.sub_joining_event is None
+
+    client.client.uaclient.transfer_subscriptions.side_effect = ua.UaStatusCodeError(
+        ua.StatusCodes.BadServiceUnsupported
+    )
+    assert not await transfer_subscriptions(client.client, [9])
+
+
+@pytest.mark.asyncio
+async def test_backfill_requests_missed_results_and_fetches_the_latest():
+    client = _client()
+    client.handler_result_event.process_event = AsyncMock()
+    management = MagicMock()
+    management.request_results = AsyncMock(return_value=True)
+    management.get_latest_result = AsyncMock(return_value=_result("r9"))
+    since = datetime.datetime(2026, 10, 1, tzinfo=datetime.UTC)
+
+    with patch("reconnect.ResultManagement.find", AsyncMock(return_value=management)):
+        assert await backfill(client, since) == 1
+
+    assert management.request_results.await_args.args[0] == since
+    event = client.handler_result_event.process_event.await_args.args[0]
+    assert event.Result.ResultMetaData.ResultId == "r9"
+
+    with patch("reconnect.ResultManagement.find", AsyncMock(return_value=None)):
+        assert await backfill(client, since) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_result_releases_its_handle():
+    node = MagicMock()
+    node.call_method = AsyncMock(side_effect=[[5, _result("r1"), 0], [0]])
+    management = ResultManagement(node, {"GetLatestResult": "latest", "ReleaseResultHandle": "release"})
+
+    assert (await management.get_latest_result()).ResultMetaData.ResultId == "r1"
+    release = node.call_method.await_args_list[1].args
+    assert release[0] == "release" and release[1].Value == 5
+    assert not await management.request_results(
+        datetime.datetime.now(datetime.UTC), datetime.datetime.now(datetime.UTC)
+    )
+
+
+@pytest.mark.asyncio
+async def test_lost_session_is_resumed_and_backfilled_from_when_it_was_alive():
+    client = _client()
+    client.connect = AsyncMock()
+    client.cleanup = AsyncMock()
+    client.check_session = AsyncMock(return_value=True)
+    made = []
+
+    def make_client(url, **kwargs):
+        made.append(kwargs)
+        return client
+
+    async def resume(client):
+        client.session_lost.clear()
+        return "transferred"
+
+    with (
+        patch("reconnect.resume_session", AsyncMock(side_effect=resume)) as resumed,
+        patch("reconnect.backfill", AsyncMock(return_value=0)) as backfilled,
+    ):
+        task = asyncio.create_task(supervise_endpoint(URL, make_client, 10, 0.01, 0.02))
+        await asyncio.sleep(0.05)
+        before_loss = datetime.datetime.now(datetime.UTC)
+        # What asyncua's keep-alive watchdog reports to the subscriptions when the server stops answering.
+        OPCUAClient._status_changed(client, ua.StatusChangeNotification(Status=ua.StatusCode(ua.StatusCodes.Good)))
+        assert not client.session_lost.is_set()
+        OPCUAClient._status_changed(
+            client, ua.StatusChangeNotification(Status=ua.StatusCode(ua.StatusCodes.BadTimeout))
+        )
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    assert len(made) == 1 and isinstance(made[0]["seen_results"], SeenResults)
+    resumed.assert_awaited_once_with(client)
+    since = backfilled.await_args.args[1]
+    assert backfilled.await_args.args[0] is client and since <= before_loss
+    client.cleanup.assert_awaited_once()
@@ -0,0 +1,131 @@
+"""Tests for result_archive.py — bulk backfill of stored results with checkpoints."""
+
+import asyncio
+import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from result_archive import Checkpoint, backfill_ids, backfill_window, parse_result_ids
+from result_event_handler import ResultEventHandler, SeenResults, ShortResultEvent
+from result_log import ResultLog
+from result_sinks import NdjsonFileSink
+
+URL = "opc.tcp://line1:4840"
+
+
+def _result(result_id):
+    return SimpleNamespace(ResultMetaData=SimpleNamespace(ResultId=result_id))
+
+
+def test_result_ids_expand_ranges_and_files(tmp_path):
+    listed = tmp_path / "ids.txt"
+    listed.write_text("a-1\n\nb-2\n")
+    assert parse_result_ids(f"0008..0011, x, @{listed}, 9..10") == [
+        "0008",
+        "0009",
+        "0010",
+        "0011",
+        "x",
+        "a-1",
+        "b-2",
+        "9",
+        "10",
+    ]
+    with pytest.raises(ValueError, match="Invalid ResultId range"):
+        parse_result_ids("5..2")
+    with pytest.raises(ValueError, match="No ResultIds"):
+        parse_result_ids(" , ")
+
+
+def test_checkpoint_tracks_out_of_order_progress(tmp_path):
+    path = tmp_path / "backfill.json"
+    checkpoint = Checkpoint(path, "ids:4")
+    for index in (2, 0, 3):
+        checkpoint.mark(index)
+    checkpoint.save()
+
+    restored = Checkpoint.load(path, "ids:4")
+    assert (restored.done_below, restored.done) == (1, {2, 3})
+    assert [index for index in range(4) if not restored.is_done(index)] == [1]
+    assert Checkpoint.load(path, "ids:other").done_below == 0
+
+
+@pytest.mark.asyncio
+async def test_backfill_by_id_is_concurrent_and_resumes_after_a_crash(tmp_path):
+    ids = [str(number) for number in range(20)]
+    in_flight = peak = 0
+
+    async def get_result_by_id(result_id):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        if result_id == "13" and not crashed.is_set():
+            crashed.set()
+            raise ConnectionError("session lost")
+        return None if result_id == "7" else _result(result_id)
+
+    crashed = asyncio.Event()
+    management = MagicMock(get_result_by_id=get_result_by_id)
+    client = MagicMock(server_url=URL)
+    path = tmp_path / "backfill.json"
+    log = ResultLog([NdjsonFileSink(tmp_path / "results", 1 << 20, 0)])
+
+    with patch("result_archive.ResultManagement.find", AsyncMock(return_value=management)):
+        first = await backfill_ids(client, ids, Checkpoint(path, "ids"), log, concurrency=3)
+        assert first == {"written": 18, "missing": 1, "failed": 1} and peak == 3
+        # A second run only fetches what failed.
+        second = await backfill_ids(client, ids, Checkpoint.load(path, "ids"), log, concurrency=3)
+    await log.close()
+
+    assert second == {"written": 1, "missing": 0, "failed": 0}
+    assert Checkpoint.load(path, "ids").done_below == 20
+    lines = b"".join(segment.read_bytes() for segment in (tmp_path / "results").glob("*.ndjson")).splitlines()
+    assert len(lines) == 19 and b'"endpoint":"opc.tcp://line1:4840"' in lines[0].replace(b" ", b"")
+
+
+@pytest.mark.asyncio
+async def test_time_window_is_requested_chunk_by_chunk_from_the_checkpoint(tmp_path):
+    seen = SeenResults()
+    client = MagicMock(server_url=URL, seen_results=seen, subscribe_to_events=AsyncMock())
+    requested = []
+
+    async def request_results(start, end):
+        requested.append((start.hour, end.hour))
+        seen.add(f"r{start.hour}")
+        return True
+
+    management = MagicMock(request_results=request_results, supports=lambda name: True)
+    start = datetime.datetime(2026, 10, 1, 6, tzinfo=datetime.UTC)
+    checkpoint = Checkpoint(tmp_path / "backfill.json", "window")
+    checkpoint.until = (start + datetime.timedelta(hours=1)).isoformat()
+    log = MagicMock(flush=AsyncMock())
+
+    with patch("result_archive.ResultManagement.find", AsyncMock(return_value=management)):
+        count = await backfill_window(
+            client,
+            start,
+            start + datetime.timedelta(hours=3, minutes=30),
+            checkpoint,
+            log,
+            datetime.timedelta(hours=1),
+            0,
+        )
+
+    assert requested == [(7, 8), (8, 9), (9, 9)] and count == 3
+    assert Checkpoint.load(checkpoint.path, "window").until == "2026-10-01T09:30:00+00:00"
+
+
+@pytest.mark.asyncio
+async def test_backfilled_events_are_written_with_result_file_logging_off():
+    log = MagicMock(put=AsyncMock())
+    handler = ResultEventHandler(URL, seen_results=SeenResults(), result_log=log)
+    event = ShortResultEvent("ResultReady", _result("r1"), "Backfilled", "")
+
+    with patch("utils.ENABLE_RESULT_FILE_LOGGING", False):
+        await handler.process_event(event)
+
+    log.put.assert_awaited_once_with(event, URL)
@@ -111,7 +111,7 @@ async def test_process_event_calls_log_result_to_file():
     evt = _make_short_result_event("e-1", "TighteningDone")
     with patch("result_event_handler.log_result_to_file", new_callable=AsyncMock) as mock_log:
         await handler.process_event(evt)
-    mock_log.assert_awaited_once_with(evt)
+    mock_log.assert_awaited_once_with(evt, "opc.tcp://localhost:40451")
 
 
 @pytest.mark.asyncio
@@ -330,7 +330,7 @@ async def test_process_event_handles_short_result_event_correctly():
     )
     with patch("result_event_handler.log_result_to_file", new_callable=AsyncMock) as mock_log:
         await handler.process_event(evt)
-    mock_log.assert_awaited_once_with(evt)
+    mock_log.assert_awaited_once_with(evt, "opc.tcp://localhost:40451")
 
 
 @pytest.mark.asyncio
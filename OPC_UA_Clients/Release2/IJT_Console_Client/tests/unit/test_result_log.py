@@ -0,0 +1,114 @@
+"""Tests for result_log.py and result_sinks.py — batched result output of the Console Client."""
+
+import asyncio
+import gzip
+import io
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from result_log import ResultLog
+from result_sinks import NdjsonFileSink, NdjsonStdoutSink, ParquetSink, sinks_from_env, trace_rows
+
+
+def _event(number):
+    meta = SimpleNamespace(ResultId=f"R-{number}")
+    trace = SimpleNamespace(Values=[float(v) for v in range(8)])
+    return SimpleNamespace(
+        Result=SimpleNamespace(ResultMetaData=meta, ResultContent=[trace]),
+        Message=f"result {number}",
+        EventId=f"ev-{number}",
+    )
+
+
+@pytest.mark.asyncio
+async def test_segments_rotate_by_size_and_index_points_at_lines(tmp_path):
+    sink = NdjsonFileSink(tmp_path, segment_bytes=600, segment_seconds=0, index=True)
+    result_log = ResultLog([sink])
+    for number in range(6):
+        assert result_log.add(_event(number), "opc.tcp://line1:4840")
+    await result_log.close()
+
+    segments = sorted(tmp_path.glob("results-*Z.ndjson"))
+    assert len(segments) == sink.segments > 1 and result_log.written == 6
+    resultids = []
+    for segment in segments:
+        data = segment.read_bytes()
+        for entry in map(json.loads, segment.with_suffix(".idx.ndjson").read_text().splitlines()):
+            line = json.loads(data[entry["offset"] : entry["offset"] + entry["length"]])
+            assert line["resultid"] == entry["resultid"] and line["message"] == f"result {entry['resultid'][2:]}"
+            assert line["endpoint"] == entry["endpoint"] == "opc.tcp://line1:4840"
+            resultids.append(line["resultid"])
+    assert resultids == [f"R-{number}" for number in range(6)]
+
+
+@pytest.mark.asyncio
+async def test_compressed_segments_and_full_queue(tmp_path):
+    result_log = ResultLog([NdjsonFileSink(tmp_path, 1 << 20, 0, compress=True)], queue_size=2)
+    assert [result_log.add(_event(number)) for number in range(3)] == [True, True, False]
+    await result_log.close()
+
+    (segment,) = tmp_path.glob("*.ndjson.gz")
+    with gzip.open(segment, "rt") as handle:
+        assert [json.loads(line)["resultid"] for line in handle] == ["R-0", "R-1"]
+
+
+def _traced_event(number, samples):
+    channel = SimpleNamespace(Name="TORQUE", SensorId=None, Values=[0.5] * samples)
+    step = SimpleNamespace(StepTraceId="s1", StepResultId="r1", SamplingInterval=1.0, StepTraceContent=[channel])
+    content = SimpleNamespace(Trace=SimpleNamespace(StepTraces=[step]))
+    meta = SimpleNamespace(ResultId=f"R-{number}")
+    return SimpleNamespace(
+        Result=SimpleNamespace(ResultMetaData=meta, ResultContent=[content]),
+        Message=f"result {number}",
+        EventId=f"ev-{number}",
+    )
+
+
+@pytest.mark.asyncio
+async def test_stdout_sink_and_sink_selection(tmp_path, monkeypatch):
+    stream = io.BytesIO()
+    result_log = ResultLog([NdjsonStdoutSink(stream)])
+    result_log.add(_traced_event(1, 3), "opc.tcp://line1:4840")
+    await result_log.close()
+    (line,) = map(json.loads, stream.getvalue().splitlines())
+    assert line["resultid"] == "R-1" and line["endpoint"] == "opc.tcp://line1:4840"
+    assert trace_rows(line["result"]) == [
+        {
+            "content": 0,
+            "step_trace_id": "s1",
+            "step_result_id": "r1",
+            "sampling_interval": 1.0,
+            "name": "TORQUE",
+            "sensor_id": None,
+            "values": [0.5, 0.5, 0.5],
+        }
+    ]
+
+    monkeypatch.setenv("IJT_RESULT_SINKS", "stdout, file, bogus")
+    sinks = sinks_from_env(tmp_path, 1 << 20, 0, False, False)
+    assert [type(sink) for sink in sinks] == [NdjsonStdoutSink, NdjsonFileSink]
+    assert not ResultLog([]).add(_event(1))
+
+
+@pytest.mark.asyncio
+async def test_parquet_batches_flush_on_size_and_time(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    sink = ParquetSink(tmp_path, batch_rows=2, batch_seconds=0.05)
+    result_log = ResultLog([sink])
+    for number in range(3):
+        result_log.add(_traced_event(number, 4), "opc.tcp://line1:4840")
+        await result_log.flush()
+    assert sink.row_groups == 1
+    for _ in range(50):
+        await asyncio.sleep(0.02)
+        if sink.row_groups == 2:
+            break
+    assert sink.row_groups == 2
+    await result_log.close()
+
+    (path,) = tmp_path.glob("results-*.parquet")
+    table = pq.read_table(path)
+    assert table.column("resultid").to_pylist() == ["R-0", "R-1", "R-2"]
+    assert table.column("traces").to_pylist()[2][0]["values"] == [0.5] * 4
@@ -0,0 +1,68 @@
+"""Tests for result_store.py — SQLite result history written by the Console Client."""
+
+import datetime
+import sqlite3
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+_ = pytest.importorskip("asyncua", reason="asyncua not installed")
+
+from asyncua import ua  # noqa: E402
+
+from result_event_handler import ResultEventHandler, ShortResultEvent  # noqa: E402
+from result_store import ResultStore  # noqa: E402
+
+URL = "opc.tcp://controller:4840"
+
+
+def _event(number, joint="J1"):
+    meta = SimpleNamespace(
+        ResultId=f"R-{number}",
+        CreationTime=datetime.datetime(2026, 10, 18, 6, number, tzinfo=datetime.UTC),
+        Classification=1,
+        ResultEvaluation=1,
+        AssociatedEntities=[
+            SimpleNamespace(EntityId="urn:tool:1", EntityType=4),
+            SimpleNamespace(EntityId=joint, EntityType=23),
+        ],
+    )
+    channels = [SimpleNamespace(Name="TORQUE", Values=[1.0, 2.0])]
+    trace = SimpleNamespace(StepTraces=[SimpleNamespace(StepTraceId="s1", StepTraceContent=channels)])
+    result = SimpleNamespace(ResultMetaData=meta, ResultContent=[SimpleNamespace(Trace=trace)])
+    return ShortResultEvent(
+        EventType="e", Result=result, Message=ua.LocalizedText(f"result {number}", "en"), EventId=f"ev-{number}"
+    )  # type: ignore[arg-type]
+
+
+@pytest.mark.asyncio
+async def test_handler_writes_results_to_store(tmp_path):
+    store = ResultStore(tmp_path / "results.sqlite3", batch_size=2)
+    handler = ResultEventHandler(URL, store)
+    with patch("result_event_handler.log_result_to_file"):
+        for number in range(3):
+            await handler.process_event(_event(number, joint="J7" if number else "J1"))
+    store.flush()
+
+    db = sqlite3.connect(store.path)
+    stored = db.execute("SELECT samples FROM trace_channels").fetchall()
+    assert len(stored) == 3 and db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    db.close()
+    event = _event(0)
+    assert event.Result.ResultContent[0].Trace.StepTraces[0].StepTraceContent[0].Values == [1.0, 2.0]
+
+    page = await store.query({"jointid": "J7", "limit": 1, "details": True})
+    assert [row["resultid"] for row in page["results"]] == ["R-2"] and page["next"]
+    assert page["results"][0]["message"] == "result 2"
+    channel = page["results"][0]["result"]["ResultContent"][0]["Trace"]["StepTraces"][0]["StepTraceContent"][0]
+    assert channel["Values"] == [1.0, 2.0]
+    following = await store.query({"jointid": "J7", "limit": 1, "cursor": page["next"]})
+    assert [row["resultid"] for row in following["results"]] == ["R-1"]
+    store.close()
+
+
+def test_store_can_be_disabled(monkeypatch):
+    monkeypatch.setenv("IJT_RESULT_STORE", "off")
+    store = ResultStore.from_env()
+    assert not store.enabled and store.add(URL, _event(1)) is False
@@ -0,0 +1,100 @@
+# ruff: noqa: E402
+"""Tests for type_definition_cache.py — validating and restoring cached data types."""
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+_ = pytest.importorskip("asyncua", reason="asyncua not installed")
+
+from asyncua import ua
+
+from type_definition_cache import (
+    _FORMAT,
+    TypeDefinitionCache,
+    _asyncua_version,
+    _encode_definition,
+    read_namespace_metadata,
+)
+
+_NAMESPACES = ["http://opcfoundation.org/UA/", "http://opcfoundation.org/UA/IJT/"]
+_METADATA = {"http://opcfoundation.org/UA/IJT/": ["1.01.0", "2024-06-01T00:00:00+00:00"]}
+
+
+def _enum_definition():
+    edef = ua.EnumDefinition()
+    for value, name in enumerate(("Ok", "Nok")):
+        field = ua.EnumField()
+        field.Name = name
+        field.Value = value
+        edef.Fields.append(field)
+    return edef
+
+
+def _write(cache, metadata, enums):
+    payload = {
+        "format": _FORMAT,
+        "asyncua": _asyncua_version(),
+        "namespaces": _NAMESPACES,
+        "metadata": metadata,
+        "legacy": {"dictionaries": [], "typeids": {}},
+        "basetypes": [],
+        "enums": enums,
+        "structures": [],
+    }
+    path = cache.path_for(_NAMESPACES)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload), encoding="utf-8")
+
+
+def test_restore_registers_cached_enum_only_for_matching_versions(tmp_path):
+    data_type = ua.NodeId(9201, 1)
+    cache = TypeDefinitionCache(tmp_path)
+    _write(
+        cache,
+        _METADATA,
+        [
+            {
+                "name": "ConsoleCacheTestResult",
+                "data_type": data_type.to_string(),
+                "option_set": False,
+                "definition": _encode_definition(_enum_definition()),
+            }
+        ],
+    )
+
+    assert cache.restore(_NAMESPACES, {"http://opcfoundation.org/UA/IJT/": ["1.02.0", ""]}) is False
+    assert data_type not in ua.enums_by_datatype
+    assert cache.restore(_NAMESPACES, {}) is False
+    assert cache.restore(_NAMESPACES, _METADATA) is True
+    assert ua.enums_by_datatype[data_type].Nok == 1
+
+
+def test_from_env_disable(monkeypatch):
+    monkeypatch.setenv("IJT_TYPE_CACHE", "off")
+    assert not TypeDefinitionCache.from_env().enabled
+
+
+@pytest.mark.asyncio
+async def test_read_namespace_metadata_reads_all_properties_at_once():
+    def _found(identifier):
+        result = ua.BrowsePathResult()
+        target = ua.BrowsePathTarget()
+        target.TargetId = ua.ExpandedNodeId(identifier, 1)
+        result.Targets = [target]
+        return result
+
+    client = MagicMock()
+    client.get_node.return_value.get_children = AsyncMock(return_value=[MagicMock()])
+    client.uaclient.translate_browsepaths_to_nodeids = AsyncMock(return_value=[_found(1), _found(2), _found(3)])
+    client.uaclient.read = AsyncMock(
+        return_value=[ua.DataValue(ua.Variant(v)) for v in ("urn:ijt", "1.01.0", "2024-06-01")]
+    )
+
+    assert await read_namespace_metadata(client) == {"urn:ijt": ["1.01.0", "2024-06-01"]}
+    client.uaclient.read.assert_awaited_once()
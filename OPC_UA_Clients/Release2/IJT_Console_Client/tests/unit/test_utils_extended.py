@@ -18,6 +18,8 @@ _ = pytest.importorskip("asyncua", reason="asyncua not installed")
 
 from asyncua import ua
 
+from result_log import ResultLog
+from result_sinks import NdjsonFileSink
 from utils import (
     _to_json_bytes,
     _to_json_str,
@@ -587,28 +589,32 @@ def test_localizedtext_to_str_none_text():
 
 @pytest.mark.asyncio
 async def test_log_result_to_file_enabled_writes_file(monkeypatch):
-    """log_result_to_file creates a JSON file when ENABLE_RESULT_FILE_LOGGING is True."""
+    """log_result_to_file appends to an NDJSON segment when ENABLE_RESULT_FILE_LOGGING is True."""
     orig_cwd = Path.cwd()
     work_dir = orig_cwd / "tmp" / f"pytest-local-{uuid.uuid4().hex}"
     work_dir.mkdir(parents=True, exist_ok=False)
     try:
         monkeypatch.chdir(work_dir)
         monkeypatch.setattr("utils.ENABLE_RESULT_FILE_LOGGING", True)
-        # mkdir(exist_ok=True) without parents=True requires the parent dir to exist
-        (work_dir / "logs").mkdir()
+        result_log = ResultLog([NdjsonFileSink(work_dir / "logs" / "results", 1 << 20, 0)])
 
         event = MagicMock()
         event.Result = MagicMock()
         event.Message = "TestMessage"
         event.EventId = "evt001"
 
-        with patch("utils.serialize_full_event", return_value={"key": "value"}):
+        with (
+            patch("utils.default_result_log", return_value=result_log),
+            patch("result_log.serialize_full_event", return_value={"key": "value"}),
+        ):
             await log_result_to_file(event)
+            await result_log.close()
 
         result_dir = work_dir / "logs" / "results"
         assert result_dir.exists()
-        json_files = list(result_dir.glob("*.json"))
-        assert len(json_files) >= 1
+        segments = list(result_dir.glob("*.ndjson"))
+        assert len(segments) == 1
+        assert b'"key":"value"' in segments[0].read_bytes()
     finally:
         monkeypatch.chdir(orig_cwd)
         if not _preserve_test_artifacts():
@@ -638,7 +644,7 @@ async def test_log_result_to_file_disabled_does_nothing(monkeypatch):
 
 @pytest.mark.asyncio
 async def test_log_result_to_file_exception_is_caught(monkeypatch):
-    """log_result_to_file logs error and does not raise when serialization fails."""
+    """log_result_to_file logs error and does not raise when the result log fails."""
     orig_cwd = Path.cwd()
     work_dir = orig_cwd / "tmp" / f"pytest-local-{uuid.uuid4().hex}"
     work_dir.mkdir(parents=True, exist_ok=False)
@@ -651,7 +657,7 @@ async def test_log_result_to_file_exception_is_caught(monkeypatch):
         event.Message = "msg"
         event.EventId = "e1"
 
-        with patch("utils.serialize_full_event", side_effect=RuntimeError("serialize boom")):
+        with patch("utils.default_result_log", side_effect=RuntimeError("result log boom")):
             with patch("utils.ijt_log") as mock_log:
                 await log_result_to_file(event)  # must not raise
                 mock_log.error.assert_called()
@@ -0,0 +1,469 @@
+"""On-disk cache of the IJT data-type definitions a server reports.
+
+Loading the IJT and Machinery.Result structures live crawls the server's
+DataType hierarchy and reads every DataTypeDefinition, which costs seconds per
+cold start.  :class:`TypeDefinitionCache` records what a live load registered in
+asyncua's ``ua`` namespace — the legacy OPC Binary dictionaries and the OPC UA
+1.04 base-type aliases, enumerations and structure definitions — in one JSON
+file per NamespaceArray, and rebuilds the same classes from it without any
+server round-trip.
+
+A cache file is only used while the server reports the recorded NamespaceArray
+and the same ``NamespaceVersion``/``NamespacePublicationDate`` for every
+namespace.  Servers that publish no NamespaceMetadata are never cached because
+a changed model could not be detected.
+
+Files live in ``IJT_TYPE_CACHE_DIR`` (default ``.state/type_cache`` in the
+Console Client directory); ``IJT_TYPE_CACHE=0`` disables the cache.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from enum import EnumMeta, IntFlag
+from importlib import metadata as importlib_metadata
+from pathlib import Path
+from typing import Any
+
+from asyncua import ua
+from asyncua.common.structures import StructGenerator
+from asyncua.common.structures104 import make_enum, make_structure
+from asyncua.ua import ua_binary
+from asyncua.ua.uatypes import NodeId
+
+from ijt_logger import ijt_log
+
+_FORMAT = 1
+_METADATA_PROPERTIES = ("NamespaceUri", "NamespaceVersion", "NamespacePublicationDate")
+_DEFAULT_DIR = Path(__file__).resolve().parent / ".state" / "type_cache"
+_READ_CHUNK_NODES = 100  # nodes per Read service call
+_STRUCTURE_PASSES = 3  # same retry budget asyncua uses for out-of-order dependencies
+
+
+@dataclass(frozen=True)
+class RegistrySnapshot:
+    """The data types registered in asyncua's ``ua`` namespace at one point in time."""
+
+    basetypes: frozenset[NodeId]
+    enums: frozenset[NodeId]
+    structures: frozenset[type]
+
+    @classmethod
+    def take(cls) -> "RegistrySnapshot":
+        """Capture the current ``ua`` registrations."""
+        return cls(
+            frozenset(ua.basetype_by_datatype),
+            frozenset(ua.enums_by_datatype),
+            frozenset(ua.typeid_by_extension_objects),
+        )
+
+
+# asyncua's built-in registrations, before any server model was loaded.
+_BUILTIN_TYPES = RegistrySnapshot.take()
+
+
+async def read_namespace_metadata(client: Any) -> dict[str, list[str]]:
+    """Coroutine. Return ``NamespaceUri -> [NamespaceVersion, NamespacePublicationDate]``.
+
+    Browses ``Server.Namespaces`` once, resolves the metadata properties of
+    every namespace object with one TranslateBrowsePathsToNodeIds call and
+    reads them with one Read call.  Missing properties are reported as ``""``.
+    """
+    children = await client.get_node(ua.ObjectIds.Server_Namespaces).get_children()
+    if not children:
+        return {}
+
+    browse_paths = []
+    for child in children:
+        for name in _METADATA_PROPERTIES:
+            element = ua.RelativePathElement()
+            element.ReferenceTypeId = ua.NodeId(ua.ObjectIds.HasProperty)
+            element.IsInverse = False  # type: ignore[assignment]
+            element.IncludeSubtypes = True  # type: ignore[assignment]
+            element.TargetName = ua.QualifiedName(name, 0)
+            browse_path = ua.BrowsePath()
+            browse_path.StartingNode = child.nodeid
+            browse_path.RelativePath.Elements.append(element)
+            browse_paths.append(browse_path)
+    path_results = await client.uaclient.translate_browsepaths_to_nodeids(browse_paths)
+
+    params = ua.ReadParameters()
+    positions: list[int] = []
+    for position, path_result in enumerate(path_results):
+        if path_result.StatusCode.is_good() and path_result.Targets:
+            read_value = ua.ReadValueId()
+            read_value.NodeId = path_result.Targets[0].TargetId
+            read_value.AttributeId = ua.AttributeIds.Value
+            params.NodesToRead.append(read_value)
+            positions.append(position)
+    values = [""] * len(browse_paths)
+    if positions:
+        for position, data_value in zip(positions, await client.uaclient.read(params)):
+            if data_value.StatusCode.is_good() and data_value.Value is not None and data_value.Value.Value is not None:
+                value = data_value.Value.Value
+                values[position] = value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+    metadata: dict[str, list[str]] = {}
+    width = len(_METADATA_PROPERTIES)
+    for start in range(0, len(values), width):
+        uri, version, publication_date = values[start : start + width]
+        if uri:
+            metadata[uri] = [version, publication_date]
+    return metadata
+
+
+async def read_type_definition_model(client: Any) -> tuple[list[str], dict[str, list[str]]]:
+    """Coroutine. Return the NamespaceArray and NamespaceMetadata of ``client``.
+
+    Servers without readable NamespaceMetadata objects report ``{}``.
+    """
+    namespaces = list(await client.get_namespace_array())
+    try:
+        metadata = await read_namespace_metadata(client)
+    except Exception as e:
+        ijt_log.debug(f"NamespaceMetadata not readable; type-definition cache disabled: {e}")
+        metadata = {}
+    return namespaces, metadata
+
+
+def _asyncua_version() -> str:
+    try:
+        return importlib_metadata.version("asyncua")
+    except importlib_metadata.PackageNotFoundError:
+        return ""
+
+
+def _encode(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+def _decode(text: str) -> bytes:
+    return base64.b64decode(text.encode("ascii"))
+
+
+def _encode_definition(definition: Any) -> str:
+    return _encode(ua_binary.struct_to_binary(definition))
+
+
+def _decode_definition(kind: type, text: str) -> Any:
+    return ua_binary.struct_from_binary(kind, ua.utils.Buffer(_decode(text)))
+
+
+async def _read_values(client: Any, node_ids: list[NodeId], attribute: int) -> list[Any]:
+    """Coroutine. Read one attribute of many nodes in chunked Read calls; unreadable values are ``None``."""
+    values: list[Any] = []
+    for start in range(0, len(node_ids), _READ_CHUNK_NODES):
+        params = ua.ReadParameters()
+        for node_id in node_ids[start : start + _READ_CHUNK_NODES]:
+            read_value = ua.ReadValueId()
+            read_value.NodeId = node_id
+            read_value.AttributeId = attribute
+            params.NodesToRead.append(read_value)
+        for data_value in await client.uaclient.read(params):
+            good = data_value.StatusCode.is_good() and data_value.Value is not None
+            values.append(data_value.Value.Value if good else None)
+    return values
+
+
+def _merge_inherited_fields(structures: dict[NodeId, ua.StructureDefinition]) -> None:
+    """Prepend missing base-structure fields, as asyncua's DataType crawl does."""
+    merged: set[NodeId] = set()
+
+    def _merge(data_type: NodeId, seen: frozenset[NodeId]) -> ua.StructureDefinition:
+        sdef = structures[data_type]
+        base = sdef.BaseDataType
+        if data_type not in merged and base in structures and base not in seen:
+            parent = _merge(base, seen | {data_type})
+            existing = {f.Name for f in sdef.Fields}
+            inherited = [f for f in parent.Fields if f.Name not in existing]
+            if inherited:
+                sdef.Fields = inherited + list(sdef.Fields)
+        merged.add(data_type)
+        return sdef
+
+    for data_type in structures:
+        _merge(data_type, frozenset())
+
+
+class TypeDefinitionCache:
+    """Directory of per-server type-definition cache files."""
+
+    def __init__(self, directory: Path | None) -> None:
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    @classmethod
+    def from_env(cls) -> "TypeDefinitionCache":
+        """Build the cache configured by ``IJT_TYPE_CACHE`` / ``IJT_TYPE_CACHE_DIR``."""
+        if os.getenv("IJT_TYPE_CACHE", "1").strip().lower() in {"0", "false", "no", "off"}:
+            return cls(None)
+        directory = os.getenv("IJT_TYPE_CACHE_DIR", "").strip()
+        return cls(Path(directory) if directory else _DEFAULT_DIR)
+
+    @property
+    def enabled(self) -> bool:
+        """``True`` unless the cache was disabled."""
+        return self.directory is not None
+
+    def path_for(self, namespaces: list[str]) -> Path:
+        """Return the cache file for a server with this NamespaceArray."""
+        if self.directory is None:
+            raise ValueError("type-definition cache is disabled")
+        digest = hashlib.sha256(json.dumps(list(namespaces)).encode("utf-8")).hexdigest()
+        return self.directory / f"types-{digest[:16]}.json"
+
+    def restore(self, namespaces: list[str], metadata: dict[str, list[str]]) -> bool:
+        """Register the cached definitions for this server model.
+
+        Returns:
+            ``True`` if a current cache file was found and every cached type
+            was registered; ``False`` if the caller must load the definitions
+            live (no file, a changed namespace version, or a corrupt entry).
+        """
+        if not self.enabled or not metadata:
+            return False
+        path = self.path_for(namespaces)
+        started = time.perf_counter()
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            self.misses += 1
+            return False
+        except (OSError, ValueError) as e:
+            ijt_log.warning(f"Type-definition cache {path} unreadable; loading live: {e}")
+            self.misses += 1
+            return False
+        if (
+            payload.get("format") != _FORMAT
+            or payload.get("asyncua") != _asyncua_version()
+            or payload.get("namespaces") != list(namespaces)
+            or payload.get("metadata") != metadata
+        ):
+            ijt_log.info(f"Type-definition cache {path} is out of date; loading live.")
+            self.misses += 1
+            return False
+        try:
+            count = _register(payload)
+        except Exception as e:
+            ijt_log.warning(f"Type-definition cache {path} unusable; loading live: {e}")
+            self.misses += 1
+            return False
+        self.hits += 1
+        ijt_log.info(
+            f"Loaded {count} IJT type definitions from {path} in {(time.perf_counter() - started) * 1000:.0f} ms."
+        )
+        return True
+
+    async def record(
+        self,
+        client: Any,
+        namespaces: list[str],
+        metadata: dict[str, list[str]],
+        before: RegistrySnapshot,
+    ) -> bool:
+        """Coroutine. Write the definitions registered since ``before`` to this server's cache file.
+
+        Nothing is written when the server publishes no NamespaceMetadata or
+        when another server's types were already loaded in this process (the
+        registrations made by this load would then be incomplete).  Failures
+        are logged and never propagate.
+
+        Returns:
+            ``True`` if the cache file was written.
+        """
+        if not self.enabled or not metadata:
+            return False
+        if before != _BUILTIN_TYPES:
+            ijt_log.debug("Other data types already loaded in this process; not caching type definitions.")
+            return False
+        path = self.path_for(namespaces)
+        try:
+            payload = {
+                "format": _FORMAT,
+                "asyncua": _asyncua_version(),
+                "namespaces": list(namespaces),
+                "metadata": metadata,
+                **await _collect(client, before),
+            }
+            path.parent.mkdir(parents=True, exist_ok=True)
+            scratch = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            scratch.write_text(json.dumps(payload), encoding="utf-8")
+            os.replace(scratch, path)
+        except Exception as e:
+            ijt_log.warning(f"Could not write type-definition cache {path}: {e}")
+            return False
+        self.writes += 1
+        ijt_log.info(f"Cached IJT type definitions in {path}.")
+        return True
+
+
+class LoadedModels:
+    """Server models whose type definitions are already registered in this process.
+
+    asyncua registers decoded types in its process-wide ``ua`` namespace, so
+    controllers reporting the same NamespaceArray and NamespaceMetadata can
+    share one registration.  Connections to such controllers wait for the
+    first load of their model instead of each loading it again.
+    """
+
+    def __init__(self) -> None:
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._loaded: set[str] = set()
+        self.shared = 0
+
+    @staticmethod
+    def key(namespaces: list[str], metadata: dict[str, list[str]]) -> str | None:
+        """Return the identity of a server model, or ``None`` when the model is unknown."""
+        return json.dumps([list(namespaces), metadata], sort_keys=True) if namespaces else None
+
+    def lock(self, key: str) -> asyncio.Lock:
+        """Return the lock serializing loads of the model ``key``."""
+        return self._locks.setdefault(key, asyncio.Lock())
+
+    def is_loaded(self, key: str) -> bool:
+        """``True`` once :meth:`mark_loaded` was called for ``key``."""
+        return key in self._loaded
+
+    def mark_loaded(self, key: str) -> None:
+        """Record that the types of model ``key`` are registered."""
+        self._loaded.add(key)
+
+
+async def _collect(client: Any, before: RegistrySnapshot) -> dict[str, Any]:
+    """Coroutine. Describe every data type registered since ``before``.
+
+    Legacy dictionary XML and DataTypeDefinitions are re-read with one
+    browse and chunked Read calls.
+    """
+    legacy_typeids: dict[str, str] = {}
+    structure_classes: list[type] = []
+    for cls, typeid in ua.typeid_by_extension_objects.items():
+        if cls in before.structures:
+            continue
+        if cls in ua.datatype_by_extension_object:
+            structure_classes.append(cls)
+        else:
+            legacy_typeids[cls.__name__] = typeid.to_string()
+
+    dictionaries: list[str] = []
+    if legacy_typeids:
+        descriptions = await client.nodes.opc_binary.get_children_descriptions()
+        dictionary_ids = [d.NodeId for d in descriptions if d.BrowseName != ua.QualifiedName("Opc.Ua")]
+        for xml in await _read_values(client, dictionary_ids, ua.AttributeIds.Value):
+            if xml:
+                dictionaries.append(_encode(xml.encode("utf-8") if isinstance(xml, str) else xml))
+
+    basetypes = [
+        {"name": name, "data_type": data_type.to_string(), "parent": getattr(ua, name).__name__}
+        for data_type, name in ua.basetype_by_datatype.items()
+        if data_type not in before.basetypes
+    ]
+    enum_items = [(data_type, cls) for data_type, cls in ua.enums_by_datatype.items() if data_type not in before.enums]
+    structure_types = [ua.datatype_by_extension_object[cls] for cls in structure_classes]
+
+    definitions = await _read_values(
+        client,
+        [data_type for data_type, _cls in enum_items] + structure_types,
+        ua.AttributeIds.DataTypeDefinition,
+    )
+    enum_definitions = definitions[: len(enum_items)]
+    structure_definitions = {
+        data_type: sdef
+        for data_type, sdef in zip(structure_types, definitions[len(enum_items) :], strict=True)
+        if isinstance(sdef, ua.StructureDefinition)
+    }
+    _merge_inherited_fields(structure_definitions)
+
+    return {
+        "legacy": {"dictionaries": dictionaries, "typeids": legacy_typeids},
+        "basetypes": basetypes,
+        "enums": [
+            {
+                "name": cls.__name__,
+                "data_type": data_type.to_string(),
+                "option_set": issubclass(cls, IntFlag),
+                "definition": _encode_definition(edef),
+            }
+            for (data_type, cls), edef in zip(enum_items, enum_definitions, strict=True)
+            if isinstance(edef, ua.EnumDefinition)
+        ],
+        "structures": [
+            {
+                "name": cls.__name__,
+                "data_type": data_type.to_string(),
+                "encoding_id": ua.typeid_by_extension_objects[cls].to_string(),
+                "definition": _encode_definition(structure_definitions[data_type]),
+            }
+            for cls, data_type in zip(structure_classes, structure_types, strict=True)
+            if data_type in structure_definitions
+        ],
+    }
+
+
+def _already_registered(name: str, data_type: NodeId) -> bool:
+    existing = getattr(ua, name, None)
+    return existing is not None and getattr(existing, "data_type", None) == data_type
+
+
+def _register(payload: dict[str, Any]) -> int:
+    """Rebuild and register the classes described by a cache payload; return how many were registered.
+
+    Mirrors asyncua's loaders: legacy dictionaries first, then base-type
+    aliases, enumerations and structures, skipping types already registered.
+
+    Raises:
+        RuntimeError: If some structures cannot be rebuilt.
+    """
+    count = 0
+    legacy = payload["legacy"]
+    structs_dict: dict[str, Any] = {}
+    for dictionary in legacy["dictionaries"]:
+        generator = StructGenerator()
+        generator.make_model_from_string(_decode(dictionary))
+        generator.get_python_classes(structs_dict)
+    for name, typeid in legacy["typeids"].items():
+        if name in structs_dict:
+            ua.register_extension_object(name, NodeId.from_string(typeid), structs_dict[name])
+            count += 1
+    for name, cls in structs_dict.items():
+        if isinstance(cls, EnumMeta) and name != "IntEnum" and not hasattr(ua, name):
+            setattr(ua, name, cls)
+
+    for entry in payload["basetypes"]:
+        if not hasattr(ua, entry["name"]):
+            ua.register_basetype(entry["name"], NodeId.from_string(entry["data_type"]), getattr(ua, entry["parent"]))
+            count += 1
+
+    for entry in payload["enums"]:
+        data_type = NodeId.from_string(entry["data_type"])
+        if _already_registered(entry["name"], data_type):
+            continue
+        edef = _decode_definition(ua.EnumDefinition, entry["definition"])
+        ua.register_enum(entry["name"], data_type, make_enum(entry["name"], edef, entry["option_set"])[entry["name"]])
+        count += 1
+
+    pending = payload["structures"]
+    for _ in range(_STRUCTURE_PASSES):
+        failed = []
+        for entry in pending:
+            data_type = NodeId.from_string(entry["data_type"])
+            if _already_registered(entry["name"], data_type):
+                continue
+            try:
+                sdef = _decode_definition(ua.StructureDefinition, entry["definition"])
+                cls = make_structure(data_type, entry["name"], sdef, log_error=False)[entry["name"]]
+            except (AttributeError, RuntimeError, KeyError, TypeError, ValueError, NotImplementedError):
+                failed.append(entry)
+                continue
+            ua.register_extension_object(entry["name"], NodeId.from_string(entry["encoding_id"]), cls, data_type)
+            count += 1
+        if not failed:
+            return count
+        pending = failed
+    raise RuntimeError(f"cannot rebuild {', '.join(entry['name'] for entry in pending)}")
@@ -1,10 +1,9 @@
-import re
+import logging
 import traceback
-from datetime import datetime, timezone
-from pathlib import Path
+from collections.abc import Callable
+from datetime import datetime
 from typing import Any
 
-import aiofiles  # type: ignore[import-untyped]
 import pytz  # type: ignore[import-untyped]
 from asyncua import Client, ua
 from asyncua.ua import String
@@ -37,8 +36,8 @@ def _to_json_bytes(obj) -> bytes:
 # ---- END: robust JSON import ----
 
 from client_config import ENABLE_RESULT_FILE_LOGGING
-from ijt_logger import ijt_log
-from serialize_data import serialize_full_event
+from ijt_logger import EventFields, EventRecord, ijt_log
+from result_log import default_result_log
 
 _NS_APP_URI = "urn:AtlasCopco:IJT:Tightening:Server/"
 
@@ -179,66 +178,17 @@ async def log_result_event_details(event, _server_url: str, client_received_time
         # Do NOT perform OPC UA reads here — this callback fires concurrently with
         # pending method calls and concurrent OPC UA requests on the same client
         # cause "Unhandled exception while sending request to OPC UA server".
-        server_time = client_received_time
-        event_time = event.Time
         event_id = event.EventId.decode("utf-8", errors="replace")
-
-        meta = getattr(event.Result, "ResultMetaData", None)
-        times = getattr(meta, "ProcessingTimes", None) if meta else None
-        start_time = getattr(times, "StartTime", None)
-        end_time = getattr(times, "EndTime", None)
-        creation_time = getattr(meta, "CreationTime", None) if meta else None
-
-        if end_time and end_time.tzinfo is None:
-            end_time = pytz.utc.localize(end_time)
-
-        latency_ms = (client_received_time - end_time).total_seconds() * 1000 if end_time else None
-
-        label_width = 35
-
-        log_separator(label_width)
-        log_field(
-            "RESULT EVENT RECEIVED",
-            getattr(event.Message, "Text", "Unavailable"),
-            label_width,
-        )
-        log_field(
-            "1. StartTime of Tightening",
-            format_local_time(start_time) if start_time else "Unavailable",
-            label_width,
-        )
-        log_field(
-            "2. EndTime of Tightening",
-            format_local_time(end_time) if end_time else "Unavailable",
-            label_width,
-        )
-        log_field(
-            "3. Result Creation Time",
-            format_local_time(creation_time) if creation_time else "Unavailable",
-            label_width,
-        )
-        log_field(
-            "4. Result Event Generated Time",
-            format_local_time(event_time) if event_time else "Unavailable",
-            label_width,
-        )
-        log_field("5. Client Time", format_local_time(client_received_time), label_width)
-        log_field(
-            "6. Server Time",
-            format_local_time(server_time) if server_time else "Unavailable",
-            label_width,
-        )
-
-        if latency_ms is not None:
-            log_field(
-                "*** Turn around Time (EndTime -> Client)",
-                f"{abs(latency_ms):.3f} ms",
-                label_width,
+        if ijt_log.isEnabledFor(logging.INFO):
+            message = getattr(event.Message, "Text", "Unavailable")
+            ijt_log.info(
+                "%s",
+                EventRecord(
+                    "result",
+                    "RESULT EVENT RECEIVED",
+                    lambda: _result_event_fields(event, message, event_id, client_received_time),
+                ),
             )
-        else:
-            log_field("*** Turn around Time (EndTime -> Client)", "Unavailable", label_width)
-
-        log_separator(label_width)
         return event_id
     except Exception as e:
         ijt_log.error(f"Error logging result event details: {e}")
@@ -246,114 +196,127 @@ async def log_result_event_details(event, _server_url: str, client_received_time
         return "unknown"
 
 
-async def log_joining_system_event(event: Any) -> None:
-    label_width = 35
-    log_separator(label_width)
-    log_field(
-        "JOINING SYSTEM EVENT",
-        getattr(event.Message, "Text", "Unavailable"),
-        label_width,
-    )
-
-    log_field("EventType", nodeid_to_str(event.EventType), label_width)
-    log_field("EventId", event.EventId, label_width)
-    log_field("Message", event.Message, label_width)
-    log_field("SourceName", event.SourceName, label_width)
-    log_field("SourceNode", event.SourceNode, label_width)
-    log_field("Severity", event.Severity, label_width)
-    log_field(
-        "Time",
-        format_local_time(event.Time) if event.Time else "Unavailable",
-        label_width,
-    )
-    log_field(
-        "ReceiveTime",
-        format_local_time(event.ReceiveTime) if event.ReceiveTime else "Unavailable",
-        label_width,
-    )
+def _local(dt: Any) -> str:
+    return format_local_time(dt) if dt else "Unavailable"
+
+
+def _result_event_fields(event: Any, message: str, event_id: str, client_received_time: datetime) -> EventFields:
+    server_time = client_received_time
+    meta = getattr(event.Result, "ResultMetaData", None)
+    times = getattr(meta, "ProcessingTimes", None) if meta else None
+    start_time = getattr(times, "StartTime", None)
+    end_time = getattr(times, "EndTime", None)
+    creation_time = getattr(meta, "CreationTime", None) if meta else None
+
+    if end_time and end_time.tzinfo is None:
+        end_time = pytz.utc.localize(end_time)
+
+    latency_ms = (client_received_time - end_time).total_seconds() * 1000 if end_time else None
 
+    return [
+        ("message", "RESULT EVENT RECEIVED", message),
+        ("eventid", "EventId", event_id),
+        ("start_time", "1. StartTime of Tightening", _local(start_time)),
+        ("end_time", "2. EndTime of Tightening", _local(end_time)),
+        ("creation_time", "3. Result Creation Time", _local(creation_time)),
+        ("event_time", "4. Result Event Generated Time", _local(event.Time)),
+        ("client_time", "5. Client Time", _local(client_received_time)),
+        ("server_time", "6. Server Time", _local(server_time)),
+        (
+            "turnaround_ms",
+            "*** Turn around Time (EndTime -> Client)",
+            f"{abs(latency_ms):.3f} ms" if latency_ms is not None else "Unavailable",
+        ),
+    ]
+
+
+async def log_joining_system_event(event: Any) -> None:
+    if ijt_log.isEnabledFor(logging.INFO):
+        ijt_log.info("%s", EventRecord("joining_system", "JOINING SYSTEM EVENT", lambda: _joining_event_fields(event)))
+
+
+def _joining_event_fields(event: Any) -> EventFields:
+    fields: EventFields = [
+        ("message", "JOINING SYSTEM EVENT", getattr(event.Message, "Text", "Unavailable")),
+        ("event_type", "EventType", nodeid_to_str(event.EventType)),
+        ("eventid", "EventId", event.EventId),
+        ("source_name", "SourceName", event.SourceName),
+        ("source_node", "SourceNode", event.SourceNode),
+        ("severity", "Severity", event.Severity),
+        ("time", "Time", _local(event.Time)),
+        ("receive_time", "ReceiveTime", _local(event.ReceiveTime)),
+    ]
     if event.LocalTime:
-        log_field(
-            "LocalTime.Offset",
-            getattr(event.LocalTime, "Offset", "Unavailable"),
-            label_width,
-        )
-        log_field(
-            "LocalTime.DaylightSavingInOffset",
-            getattr(event.LocalTime, "DaylightSavingInOffset", "Unavailable"),
-            label_width,
-        )
+        fields += [
+            ("local_time_offset", "LocalTime.Offset", getattr(event.LocalTime, "Offset", "Unavailable")),
+            (
+                "local_time_dst",
+                "LocalTime.DaylightSavingInOffset",
+                getattr(event.LocalTime, "DaylightSavingInOffset", "Unavailable"),
+            ),
+        ]
     else:
-        log_field("LocalTime", "Unavailable", label_width)
-
-    log_field("ConditionClassId", nodeid_to_str(event.ConditionClassId), label_width)
-    log_field(
-        "ConditionClassName",
-        localizedtext_to_str(event.ConditionClassName),
-        label_width,
-    )
-
-    subclass_ids = [nodeid_to_str(nid) for nid in event.ConditionSubClassId]
-    log_field("ConditionSubClassId", "", label_width)
-    for item in subclass_ids:
-        log_field("", item, label_width)
-
-    subclass_names = [localizedtext_to_str(lt) for lt in event.ConditionSubClassName]
-    log_field("ConditionSubClassName", "", label_width)
-    for item in subclass_names:
-        log_field("", item, label_width)
-
-    log_field("EventCode", event.EventCode, label_width)
-    log_field("EventText", event.EventText, label_width)
-    log_field("JoiningTechnology", event.JoiningTechnology, label_width)
-
-    if isinstance(event.AssociatedEntities, list) and event.AssociatedEntities:
-        log_field("AssociatedEntities", "", label_width)
-        for entity in event.AssociatedEntities:
-            try:
-                log_entity(entity)
-            except Exception as e:
-                log_field("Error logging entity", str(e), label_width)
-    else:
-        log_field("AssociatedEntities", str(event.AssociatedEntities), label_width)
-
-    if isinstance(event.ReportedValues, list) and event.ReportedValues:
-        log_field("ReportedValues", "", label_width)
-        for rv in event.ReportedValues:
-            try:
-                log_reported_value(rv)
-            except Exception as e:
-                log_field("Error logging reported value", str(e), label_width)
-    else:
-        log_field("ReportedValues", str(event.ReportedValues), label_width)
+        fields.append(("local_time", "LocalTime", "Unavailable"))
+    return [
+        *fields,
+        ("condition_class_id", "ConditionClassId", nodeid_to_str(event.ConditionClassId)),
+        ("condition_class_name", "ConditionClassName", localizedtext_to_str(event.ConditionClassName)),
+        ("condition_subclass_ids", "ConditionSubClassId", [nodeid_to_str(nid) for nid in event.ConditionSubClassId]),
+        (
+            "condition_subclass_names",
+            "ConditionSubClassName",
+            [localizedtext_to_str(lt) for lt in event.ConditionSubClassName],
+        ),
+        ("event_code", "EventCode", event.EventCode),
+        ("event_text", "EventText", event.EventText),
+        ("joining_technology", "JoiningTechnology", event.JoiningTechnology),
+        _nested("associated_entities", "AssociatedEntities", event.AssociatedEntities, _entity_fields, "entity"),
+        _nested("reported_values", "ReportedValues", event.ReportedValues, _reported_value_fields, "reported value"),
+    ]
+
+
+def _nested(key: str, label: str, items: Any, fields_of: Callable[[Any], EventFields], what: str) -> tuple:
+    """Return the field of a list of structures, or of its plain value when it is not a non-empty list."""
+    if not (isinstance(items, list) and items):
+        return (key, label, str(items))
+    nested = []
+    for item in items:
+        try:
+            nested.append(fields_of(item))
+        except Exception as e:
+            nested.append([("error", f"Error logging {what}", str(e))])
+    return (key, label, nested)
+
 
-    log_separator(label_width)
+def _entity_fields(entity: Any) -> EventFields:
+    return [
+        (field, field, f"{getattr(entity, field, '')}")
+        for field in ["Name", "Description", "EntityId", "EntityType", "IsExternal"]
+    ]
+
+
+def _reported_value_fields(rv: Any) -> EventFields:
+    eu = getattr(rv, "EngineeringUnits", None)
+    return [
+        ("Name", "Name", f"{getattr(rv, 'Name', '')}"),
+        ("Current", "Current", getattr(getattr(rv, "CurrentValue", None), "Value", "")),
+        ("Previous", "Previous", getattr(getattr(rv, "PreviousValue", None), "Value", "")),
+        ("PhysicalQuantity", "PhysicalQuantity", getattr(rv, "PhysicalQuantity", "")),
+        ("LowLimit", "LowLimit", getattr(rv, "LowLimit", "")),
+        ("HighLimit", "HighLimit", getattr(rv, "HighLimit", "")),
+        ("Units", "Units", getattr(eu, "DisplayName", "")),
+        ("Description", "Description", getattr(eu, "Description", "")),
+    ]
 
 
 def log_entity(entity: Any) -> None:
-    label_width = 35
-    for field in ["Name", "Description", "EntityId", "EntityType", "IsExternal"]:
-        log_field(field, getattr(entity, field, ""), label_width)
+    for _, label, value in _entity_fields(entity):
+        log_field(label, value)
 
 
 def log_reported_value(rv: Any) -> None:
-    label_width = 35
-    eu = getattr(rv, "EngineeringUnits", None)
-    eu_display = getattr(eu, "DisplayName", "")
-    eu_desc = getattr(eu, "Description", "")
-
-    log_field("Name", getattr(rv, "Name", ""), label_width)
-    log_field("Current", getattr(getattr(rv, "CurrentValue", None), "Value", ""), label_width)
-    log_field(
-        "Previous",
-        getattr(getattr(rv, "PreviousValue", None), "Value", ""),
-        label_width,
-    )
-    log_field("PhysicalQuantity", getattr(rv, "PhysicalQuantity", ""), label_width)
-    log_field("LowLimit", getattr(rv, "LowLimit", ""), label_width)
-    log_field("HighLimit", getattr(rv, "HighLimit", ""), label_width)
-    log_field("Units", eu_display, label_width)
-    log_field("Description", eu_desc, label_width)
+    for _, label, value in _reported_value_fields(rv):
+        log_field(label, value)
 
 
 def nodeid_to_str(nodeid: ua.NodeId) -> str:
@@ -396,28 +359,12 @@ def format_list_for_logging(label: str, items: list[str], label_width: int = 35)
     return lines
 
 
-async def log_result_to_file(event: Any) -> None:
+async def log_result_to_file(event: Any, endpoint: str | None = None) -> None:
+    # Only queues the event; the result log serializes batches of results in a
+    # worker thread and writes them to the configured output sinks.
     if ENABLE_RESULT_FILE_LOGGING:
         try:
-            json_data = serialize_full_event(event.Result)
-            json_str = _to_json_str(json_data)
-
-            log_dir = Path("logs") / "results"
-            log_dir.mkdir(exist_ok=True)
-
-            safe_message = re.sub(r"[^\w\-_\. ]", "_", str(event.Message).replace(":", "_"))
-            timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S_%f")
-            event_id = getattr(event, "EventId", "unknown")
-
-            filename = f"{safe_message}_{event_id}_{timestamp}.json"
-            temp_file = log_dir / f"{filename}.tmp"
-            final_file = log_dir / filename
-
-            async with aiofiles.open(temp_file, mode="w", encoding="utf-8") as f:
-                await f.write(json_str)
-            temp_file.rename(final_file)
-
-            ijt_log.info(f"Event Result logged to {final_file}")
+            default_result_log().add(event, endpoint)
         except Exception as e:
             ijt_log.error(f"Failed to log result to file: {e}")
             ijt_log.error(traceback.format_exc())
@@ -19,13 +19,28 @@ if _SRC not in sys.path:
 import websockets
 from dotenv import load_dotenv
 
+from python.encode_pool import close_encode_pool
 from python.ijt_interface import IJTInterface
 from python.ijt_logger import ijt_log
+from python.json_codec import loads, send_json
+from python.loop_lag import LoopLagMonitor
+from python.metrics import metrics, serve_prometheus
+from python.result_log import close_result_log
+from python.result_store import ResultStore
+from python.session_pool import SessionPool
 
 # Load environment variables
 load_dotenv()
 
 websocket_server = None
+# OPC UA sessions shared by all browser tabs, keyed by endpoint.
+session_pool = SessionPool.from_env()
+# History of every received result, searched with "queryresults".
+result_store = ResultStore.from_env()
+# How late the event loop services callbacks such as OPC UA publish responses.
+loop_lag = LoopLagMonitor.from_env()
+metrics.loop_lag = loop_lag
+metrics_server = None
 active_handlers: Set[IJTInterface] = set()
 active_websockets: Set[websockets.ServerConnection] = set()
 active_handlers_lock = asyncio.Lock()
@@ -55,7 +70,7 @@ def _websocket_server_logger() -> logging.Logger:
 
 
 async def handler(websocket):
-    """Handle one browser websocket session and isolate OPC UA state per client."""
+    """Handle one browser websocket session; OPC UA sessions are shared through the pool."""
     if shutdown_started:
         await websocket.close(code=1012, reason="Server shutting down")
         return
@@ -63,7 +78,9 @@ async def handler(websocket):
     client_ip = websocket.remote_address[0] if websocket.remote_address else "unknown"
     ijt_log.info(f"Client connected: {client_ip}")
 
-    opcua_handler = IJTInterface()
+    opcua_handler = IJTInterface(session_pool, result_store)
+    # Everything sent to this tab goes through the metered socket, which counts its traffic.
+    metered = metrics.meter_socket(websocket)
     async with active_handlers_lock:
         active_handlers.add(opcua_handler)
         active_websockets.add(websocket)
@@ -71,24 +88,23 @@ async def handler(websocket):
     try:
         async for message in websocket:
             try:
-                payload = json.loads(message)
+                payload = loads(message)
             except json.JSONDecodeError as exc:
-                await websocket.send(
-                    json.dumps(
-                        {
-                            "command": "invalid request",
-                            "endpoint": "common",
-                            "data": {"exception": f"Invalid JSON payload: {exc.msg}"},
-                            "error": {
-                                "code": "INVALID_JSON",
-                                "message": "Request payload is not valid JSON.",
-                            },
-                        }
-                    )
+                await send_json(
+                    metered,
+                    {
+                        "command": "invalid request",
+                        "endpoint": "common",
+                        "data": {"exception": f"Invalid JSON payload: {exc.msg}"},
+                        "error": {
+                            "code": "INVALID_JSON",
+                            "message": "Request payload is not valid JSON.",
+                        },
+                    },
                 )
                 continue
 
-            await opcua_handler.handle(websocket, payload)
+            await opcua_handler.handle(metered, payload)
     except websockets.exceptions.ConnectionClosed:
         ijt_log.info(f"Client disconnected: {client_ip}")
     except Exception:
@@ -97,6 +113,7 @@ async def handler(websocket):
     finally:
         ijt_log.info(f"Cleaning up for client: {client_ip}")
         await opcua_handler.disconnect()
+        metrics.release_socket(metered)
         async with active_handlers_lock:
             active_handlers.discard(opcua_handler)
             active_websockets.discard(websocket)
@@ -104,7 +121,7 @@ async def handler(websocket):
 
 async def shutdown():
     """Graceful shutdown for all active websocket sessions and OPC UA connections."""
-    global websocket_server, shutdown_started
+    global websocket_server, metrics_server, shutdown_started
     async with shutdown_lock:
         if shutdown_started:
             return
@@ -117,6 +134,10 @@ async def shutdown():
             websocket_server.close()
             await websocket_server.wait_closed()
             websocket_server = None
+        if metrics_server:
+            metrics_server.close()
+            await metrics_server.wait_closed()
+            metrics_server = None
 
         async with active_handlers_lock:
             handlers = list(active_handlers)
@@ -134,13 +155,18 @@ async def shutdown():
                 *(handler.disconnect() for handler in handlers),
                 return_exceptions=True,
             )
+        await session_pool.close()
+        await asyncio.to_thread(result_store.close)
+        await close_result_log()
+        close_encode_pool()
+        await loop_lag.stop()
 
-        ijt_log.info("Shutdown complete.")
+        ijt_log.info(f"Shutdown complete. Event loop lag: {loop_lag.as_dict()}")
 
 
 async def main():
     """Main entrypoint for websocket server."""
-    global websocket_server
+    global websocket_server, metrics_server
 
     try:
         port = int(os.getenv("WS_PORT", "8001"))
@@ -163,6 +189,8 @@ async def main():
         "\n========================================"
     )
     ijt_log.info("Server setup complete. Awaiting connections...")
+    loop_lag.start()
+    metrics_server = await serve_prometheus(lambda: metrics.prometheus_text(session_pool.queue_stats()))
 
     loop = asyncio.get_running_loop()
 
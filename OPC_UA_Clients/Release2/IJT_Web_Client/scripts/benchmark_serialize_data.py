@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Benchmark the compiled result serializer against ``serialize_full_event``.
+
+Builds a synthetic JoiningResultDataType-shaped payload out of slotted
+dataclasses (the same layout asyncua generates for IJT structures), checks
+that both serializers produce identical output, and prints the timings.
+
+Usage:
+    python scripts/benchmark_serialize_data.py [--steps 5] [--samples 5000] [--repeat 20]
+"""
+
+import argparse
+import sys
+import timeit
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+_SRC = str(Path(__file__).resolve().parent.parent / "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+from asyncua import ua  # noqa: E402
+
+from python.serialize_data import serialize_compiled_event, serialize_full_event  # noqa: E402
+
+
+@dataclass(slots=True)
+class TraceValueDataType:
+    PhysicalQuantity: int = 0
+    EngineeringUnits: Any = None
+    Values: list[float] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class StepTraceDataType:
+    StepTraceId: str = ""
+    StepResultId: str = ""
+    NumberOfTracePoints: int = 0
+    SamplingInterval: float = 0.0
+    StartTimeOffset: float = 0.0
+    StepTraceContent: list[TraceValueDataType] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class ResultValueDataType:
+    MeasuredValue: float = 0.0
+    Name: str = ""
+    ResultEvaluation: int = 0
+    PhysicalQuantity: int = 0
+    LowLimit: float = 0.0
+    HighLimit: float = 0.0
+    TargetValue: float = 0.0
+
+
+@dataclass(slots=True)
+class JoiningResultDataType:
+    ResultId: str = ""
+    CreationTime: datetime | None = None
+    Classification: int = 0
+    Name: ua.LocalizedText | None = None
+    OverallResultValues: list[ResultValueDataType] = field(default_factory=list)
+    StepTraces: list[StepTraceDataType] = field(default_factory=list)
+
+
+def build_result(steps: int, samples: int) -> JoiningResultDataType:
+    """Return a result with ``steps`` step traces of ``samples`` points per channel."""
+    units = ua.EUInformation()
+    traces = []
+    for step in range(steps):
+        content = [
+            TraceValueDataType(
+                PhysicalQuantity=quantity, EngineeringUnits=units, Values=[i * 0.01 for i in range(samples)]
+            )
+            for quantity in (1, 2, 3, 4)  # time, torque, angle, current
+        ]
+        traces.append(
+            StepTraceDataType(
+                StepTraceId=f"trace-{step}",
+                StepResultId=f"step-{step}",
+                NumberOfTracePoints=samples,
+                SamplingInterval=0.001,
+                StepTraceContent=content,
+            )
+        )
+    return JoiningResultDataType(
+        ResultId="benchmark-result",
+        CreationTime=datetime.now(UTC),
+        Classification=1,
+        Name=ua.LocalizedText("Benchmark", "en"),
+        OverallResultValues=[ResultValueDataType(MeasuredValue=12.5, Name="Torque") for _ in range(4)],
+        StepTraces=traces,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=5, help="number of step traces")
+    parser.add_argument("--samples", type=int, default=5000, help="samples per trace channel")
+    parser.add_argument("--repeat", type=int, default=20, help="serializations per measurement")
+    args = parser.parse_args()
+
+    result = build_result(args.steps, args.samples)
+    if serialize_compiled_event(result) != serialize_full_event(result):
+        print("ERROR: serializers disagree", file=sys.stderr)
+        return 1
+
+    reference = min(timeit.repeat(lambda: serialize_full_event(result), number=args.repeat, repeat=3))
+    compiled = min(timeit.repeat(lambda: serialize_compiled_event(result), number=args.repeat, repeat=3))
+
+    per_call_reference_ms = reference / args.repeat * 1000
+    per_call_compiled_ms = compiled / args.repeat * 1000
+    print(f"payload: {args.steps} steps x 4 channels x {args.samples} samples")
+    print(f"serialize_full_event      : {per_call_reference_ms:9.3f} ms/result")
+    print(f"serialize_compiled_event  : {per_call_compiled_ms:9.3f} ms/result")
+    print(f"speed-up                  : {per_call_reference_ms / per_call_compiled_ms:9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
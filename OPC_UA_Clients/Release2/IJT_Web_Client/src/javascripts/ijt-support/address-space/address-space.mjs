@@ -10,6 +10,7 @@ export class AddressSpace {
     this.listOfTSPromises = []
     this.newNodeSubscription = []
     this.status = []
+    this._pendingPaths = []
 
     this.connectionManager.subscribe('connection', (setToTrue) => {
       if (setToTrue) {
@@ -151,31 +152,55 @@ export class AddressSpace {
     }
   }
 
+  /**
+   * Supportfunction that takes read data and turns it into an actual node
+   * @param {*} nodeData structure with nodeid, attributes, relations and value
+   * @returns a node
+   */
+  createNode (nodeData) {
+    let newNode = this.getNodeMapping(nodeData.nodeid)
+
+    if (!newNode) {
+      newNode = NodeFactory(nodeData)
+      this.setNodeMapping(newNode.nodeId, newNode)
+    }
+
+    for (const callback of this.newNodeSubscription) {
+      callback(newNode)
+    }
+    return newNode
+  }
+
+  /**
+   * Load several nodes with a single readmany request and add them to the node mapping.
+   * Nodes the server could not read are left for findOrLoadNode to report individually.
+   * @param {Array} nodeIds the node identities
+   * @returns a promise that resolves when the batch has been handled
+   */
+  preloadNodes (nodeIds) {
+    return this.socketHandler.readManyPromise(nodeIds).then(
+      (response) => {
+        for (const result of Object.values(response.message.results ?? {})) {
+          if (result.exception) continue
+          this.createNode({
+            nodeid: result.nodeid,
+            attributes: this.parseMaybeJson(result.attributes),
+            relations: this.parseMaybeJson(result.relations),
+            value: this.parseMaybeJson(result.value)
+          })
+        }
+      },
+      (error) => {
+        ijtLog.warn('Batched node read failed; loading nodes one by one', error)
+      })
+  }
+
   /**
   * This is the main promise for creating a node
   * @param {*} nodeId the node identity
   * @returns a Promise of a node
   */
   findOrLoadNode (nodeId) {
-    /**
-     * Supportfunction that takes the data from browseAndRead and turn it into an actual node
-     * @param {*} nodeData the data from browseAndRead
-     * @returns a node
-     */
-    const createNode = (nodeData) => {
-      let newNode = this.getNodeMapping(nodeData.nodeid)
-
-      if (!newNode) {
-        newNode = NodeFactory(nodeData)
-        this.setNodeMapping(newNode.nodeId, newNode)
-      }
-
-      for (const callback of this.newNodeSubscription) {
-        callback(newNode)
-      }
-      return newNode
-    }
-
     /**
      * This function is a promise to load the relevant data and then resolve a special structure that
      * can be set up to create a node. Most often loadAndCreate works better
@@ -213,7 +238,7 @@ export class AddressSpace {
     } else {
       return new Promise((resolve, reject) => {
         readAndStructure(nodeId, true).then((m) => {
-          resolve(createNode(m), true)
+          resolve(this.createNode(m), true)
         }).catch(reject)
       })
     }
@@ -250,7 +275,7 @@ export class AddressSpace {
   findNodeFromPathPromise (path) {
     return new Promise((resolve, reject) =>
       this.addressSpacePromise().then((tgtSystem) => {
-        this.socketHandler.pathtoidPromise(tgtSystem.nodeId, path).then(
+        this._resolvePath(tgtSystem.nodeId, path).then(
           (msg) => { // Path node found
             this.findOrLoadNode(this.parseMaybeJson(msg.message.nodeid)).then(
               (node) => {
@@ -267,6 +292,55 @@ export class AddressSpace {
     )
   }
 
+  /**
+   * Resolve a path to a nodeId. Lookups requested in the same tick are sent as one
+   * pathstoids request; a single lookup uses pathtoid.
+   * @param {*} startNodeId the node the path starts from
+   * @param {*} path the path as sent to pathtoid
+   * @returns a Promise of { message: { nodeid } }, rejected with { error } if the path is not found
+   */
+  _resolvePath (startNodeId, path) {
+    if (!this.socketHandler.pathstoidsPromise) {
+      return this.socketHandler.pathtoidPromise(startNodeId, path)
+    }
+    return new Promise((resolve, reject) => {
+      this._pendingPaths.push({ request: { nodeid: startNodeId, path }, resolve, reject })
+      if (this._pendingPaths.length === 1) {
+        setTimeout(() => this._flushPaths(), 0)
+      }
+    })
+  }
+
+  /**
+   * Send the path lookups collected by _resolvePath
+   */
+  _flushPaths () {
+    const pending = this._pendingPaths
+    this._pendingPaths = []
+    if (pending.length === 1) {
+      const { request, resolve, reject } = pending[0]
+      this.socketHandler.pathtoidPromise(request.nodeid, request.path).then(resolve, reject)
+      return
+    }
+    this.socketHandler.pathstoidsPromise(pending.map((entry) => entry.request)).then(
+      (response) => {
+        const results = response.message.results ?? []
+        pending.forEach(({ resolve, reject }, index) => {
+          const result = results[index]
+          if (!result || result.exception) {
+            reject({ error: result?.exception ?? 'PathToId Exception: no result' })
+          } else {
+            resolve({ message: result })
+          }
+        })
+      },
+      (error) => {
+        for (const { reject } of pending) {
+          reject(error)
+        }
+      })
+  }
+
   subscribeToNewNode (callback) {
     this.newNodeSubscription.push(callback)
   }
@@ -277,6 +351,20 @@ export class AddressSpace {
    * @returns a Promise of a list of nodes
    */
   relationsToNodes (relations) {
+    const unloaded = relations.filter((relation) => !this.getNodeMapping(relation.NodeId))
+    if (unloaded.length > 1 && this.socketHandler.readManyPromise) {
+      return this.preloadNodes(unloaded.map((relation) => relation.NodeId))
+        .then(() => this.loadRelations(relations))
+    }
+    return this.loadRelations(relations)
+  }
+
+  /**
+   * Load each relation's node, one request per node that is not mapped yet
+   * @param {*} relations a list of relations
+   * @returns a Promise of a list of nodes
+   */
+  loadRelations (relations) {
     const promiseList = []
     // const nodeList = []
     for (const relation of relations) {
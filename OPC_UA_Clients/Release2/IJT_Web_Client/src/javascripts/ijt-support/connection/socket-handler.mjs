@@ -11,13 +11,19 @@ export class SocketHandler {
     this.mandatoryLists = {}
     this.uniqueId = 1
     this.registerMandatory('read')
+    this.registerMandatory('readmany')
     this.registerMandatory('browseresult')
+    this.registerMandatory('browsemany')
     this.registerMandatory('pathtoid')
+    this.registerMandatory('pathstoids')
     this.registerMandatory('callresult')
     this.registerMandatory('methodcall')
     this.registerMandatory('namespaces')
     this.registerMandatory('event', (_a, _b, _c) => {})
     this.registerMandatory('read product instance uri')
+    this.registerMandatory('gettrace')
+    this.registerMandatory('queryresults')
+    this.registerMandatory('get metrics')
   }
 
   /**
@@ -38,9 +44,14 @@ export class SocketHandler {
    * Subscribe to an event
    * @param {*} msg
    * @param {*} subscriberDetails - Optional label to help debugging
+   * @param {object} [selection] - Optional server-side selection for this tab:
+   *   `projection` ('full' | 'no-traces' | 'lazy-traces' | 'overall'),
+   *   `traceencoding` ('json' | 'float32' | 'float64'), `tracepoints` (display resolution,
+   *   0 for full), `downsample` ('lttb' | 'minmax') and `filter`
+   *   ({ classification, evaluation, asset, jointid })
    */
-  subscribeEvent (msg, subscriberDetails) {
-    this.webSocketManager.send('subscribe', this.endpointUrl, null, { message: msg, details: subscriberDetails })
+  subscribeEvent (msg, subscriberDetails, selection = {}) {
+    this.webSocketManager.send('subscribe', this.endpointUrl, null, { ...selection, message: msg, details: subscriberDetails })
   }
 
   /**
@@ -70,6 +81,15 @@ export class SocketHandler {
     return this._sendRequest('pathtoid', { nodeid: nodeId, path })
   }
 
+  /**
+   * A promise to resolve several paths with one TranslateBrowsePathsToNodeIds call
+   * @param {Array} paths - list of { nodeid, path } as sent by pathtoidPromise
+   * @returns {Promise} Resolves with { message: { results: [{ nodeid } | { exception }] } } in request order
+   */
+  pathstoidsPromise (paths) {
+    return this._sendRequest('pathstoids', { paths })
+  }
+
   /**
    * A promise to call a method
    * @param {*} objectNode
@@ -95,6 +115,58 @@ export class SocketHandler {
     return this._sendRequest('read', { nodeid: this.stringify(nodeid), attribute })
   }
 
+  /**
+   * A promise to read several nodes with one Read and one Browse service call
+   * @param {Array} nodeIds - nodeId strings or objects
+   * @returns {Promise} Resolves with { message: { results: { [nodeId]: readresult | { exception } } } }
+   */
+  readManyPromise (nodeIds) {
+    return this._sendRequest('readmany', { nodeids: nodeIds.map((nodeId) => this.stringify(nodeId)) })
+  }
+
+  /**
+   * A promise to fetch the trace of a result delivered with the 'lazy-traces' projection
+   * or downsampled with `tracepoints` (full resolution unless `tracepoints` is given).
+   * The server streams the step traces as 'trace chunk' frames before its reply.
+   * @param {string} resultId - ResultMetaData.ResultId of the result
+   * @param {object} [options] - `traceencoding` ('json' | 'float32' | 'float64'),
+   *   `binary` (true for binary chunk frames; packed channels arrive as typed arrays),
+   *   `tracepoints` and `downsample` ('lttb' | 'minmax')
+   * @returns {Promise} Resolves with { resultid, stepTraces: [[contentIndex, StepTrace], ...] } in trace order
+   */
+  getTrace (resultId, options = {}) {
+    const chunks = []
+    const onChunk = (msg) => {
+      if (msg?.resultid === resultId) {
+        chunks[msg.index] = msg.steptraces
+      }
+    }
+    this.webSocketManager.subscribe(this.endpointUrl, 'trace chunk', onChunk)
+    return this._sendRequest('gettrace', { ...options, resultid: resultId })
+      .then(() => ({ resultid: resultId, stepTraces: chunks.flat() }))
+      .finally(() => this.webSocketManager.unsubscribe(this.endpointUrl, 'trace chunk', onChunk))
+  }
+
+  /**
+   * A promise to search the results stored by the server for this endpoint, newest first.
+   * @param {object} [query] - Optional `from`/`to` (ISO-8601), `resultid`, `jointid`, `asset`
+   *   (ProductInstanceUri), `classification`, `evaluation`, `limit`, `cursor` (the `next`
+   *   of the previous page) and `details` (true to include each complete result with traces)
+   * @returns {Promise} Resolves with { message: { results: [...], next } }
+   */
+  queryResults (query = {}) {
+    return this._sendRequest('queryresults', query)
+  }
+
+  /**
+   * A promise to get the backend metrics: command latency, OPC UA round-trip time per
+   * service, event-loop lag, event queue depths and bytes sent per browser socket.
+   * @returns {Promise} Resolves with { message: { commands, opcua, loop_lag, queues, sockets, ... } }
+   */
+  getMetrics () {
+    return this._sendRequest('get metrics', {})
+  }
+
   /**
    * A promise to get the namespaces
    * @returns {Promise}
@@ -121,6 +193,16 @@ export class SocketHandler {
     return this._sendRequest('browse', { nodeid: nodeId, details })
   }
 
+  /**
+   * A promise to browse several nodes with one Browse service call.
+   * @param {Array} nodeIds - nodeId strings or objects
+   * @param {*} details - if TRUE more relations are included in the response
+   * @returns {Promise} Resolves with { message: { results: { [nodeId]: { nodes } | { exception } } } }
+   */
+  browseManyPromise (nodeIds, details) {
+    return this._sendRequest('browsemany', { nodeids: nodeIds.map((nodeId) => this.stringify(nodeId)), details })
+  }
+
   /**
    * Support function — converts a nodeId object or string to OPC UA node string format.
    * @param {string|object} nodeId
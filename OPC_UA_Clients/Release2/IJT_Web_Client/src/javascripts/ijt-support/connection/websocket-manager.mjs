@@ -8,6 +8,7 @@
  *  - Preserves all subscriptions across reconnects
  */
 import { ijtLog } from '../ijt-logger.mjs'
+import { decodePackedTraces, parseBinaryFrame } from '../results/result-serialization.mjs'
 
 const RECONNECT_BASE_MS = 1_000
 const RECONNECT_MAX_MS = 30_000
@@ -37,6 +38,8 @@ export class WebSocketManager {
     }
 
     this.websocket = new WebSocket(url)
+    // Binary frames carry packed trace samples (see parseBinaryFrame).
+    this.websocket.binaryType = 'arraybuffer'
 
     this.websocket.onopen = () => {
       ijtLog.info('WebSocket connected')
@@ -66,7 +69,14 @@ export class WebSocketManager {
     this._messageHandler = ({ data }) => {
       let event
       try {
-        event = JSON.parse(data)
+        if (data instanceof ArrayBuffer) {
+          event = parseBinaryFrame(data)
+        } else {
+          event = JSON.parse(data)
+          if (data.includes('"b64"')) {
+            decodePackedTraces(event?.data)
+          }
+        }
       } catch (error) {
         ijtLog.error('Invalid websocket payload:', error)
         return
@@ -78,23 +88,35 @@ export class WebSocketManager {
       }
 
       const { command, endpoint, data: msgData, uniqueid } = event
-      const endpointSubscribes = this.subscribers[endpoint]
-      if (endpointSubscribes?.[command]) {
-        for (const subscription of endpointSubscribes[command]) {
-          if (subscription) {
-            try {
-              subscription(msgData, uniqueid)
-            } catch (error) {
-              ijtLog.error('Subscriber callback failed:', error)
-            }
-          }
+      if (command === 'events' && Array.isArray(msgData)) {
+        // Batched delivery: unpack into individual 'event' notifications in order
+        for (const item of msgData) {
+          this._dispatch(endpoint, 'event', item, uniqueid)
         }
+        return
       }
+      this._dispatch(endpoint, command, msgData, uniqueid)
     }
 
     this.websocket.addEventListener('message', this._messageHandler)
   }
 
+  /** Call every subscriber registered for this endpoint and command. */
+  _dispatch (endpoint, command, msgData, uniqueid) {
+    const endpointSubscribes = this.subscribers[endpoint]
+    if (endpointSubscribes?.[command]) {
+      for (const subscription of endpointSubscribes[command]) {
+        if (subscription) {
+          try {
+            subscription(msgData, uniqueid)
+          } catch (error) {
+            ijtLog.error('Subscriber callback failed:', error)
+          }
+        }
+      }
+    }
+  }
+
   /** Exponential-backoff reconnect with jitter. */
   _scheduleReconnect () {
     if (this._reconnecting) return
@@ -42,6 +42,11 @@ function sanitizeValue (value, depth = 0, maxDepth = DEFAULT_MAX_DEPTH, ancestor
     return value
   }
 
+  if (ArrayBuffer.isView(value)) {
+    // Decoded trace channels (Float32Array / Float64Array) are stored as plain lists.
+    return Array.from(value)
+  }
+
   if (Array.isArray(value)) {
     const lineage = ancestors || new WeakSet()
     if (lineage.has(value)) {
@@ -202,6 +207,101 @@ export function parseResultBundle (rawText, options = {}) {
   }
 }
 
+const PACKED_ARRAY_TYPES = Object.freeze({ float32: Float32Array, float64: Float64Array })
+const LITTLE_ENDIAN_HOST = new Uint8Array(new Uint16Array([1]).buffer)[0] === 1
+
+function isPackedSamples (value) {
+  return value !== null && typeof value === 'object' && !Array.isArray(value) &&
+    typeof value.dtype === 'string' && Number.isInteger(value.length) &&
+    (typeof value.b64 === 'string' || Number.isInteger(value.offset))
+}
+
+function base64ToBytes (text) {
+  const binary = atob(text)
+  const bytes = new Uint8Array(binary.length)
+  for (let index = 0; index < binary.length; index++) {
+    bytes[index] = binary.charCodeAt(index)
+  }
+  return bytes
+}
+
+/**
+ * Decode one packed trace channel ({ dtype, length, b64 | offset }) into a typed array.
+ * @param {object} field - descriptor produced by the backend (python/trace_codec.py)
+ * @param {ArrayBuffer} [buffer] - frame buffer for `offset` descriptors
+ * @param {number} [baseOffset] - byte offset of the payload inside `buffer`
+ * @returns {Float32Array|Float64Array}
+ */
+export function decodePackedSamples (field, buffer = null, baseOffset = 0) {
+  const ArrayType = PACKED_ARRAY_TYPES[field.dtype]
+  if (!ArrayType) {
+    throw new Error(`Unsupported packed sample type '${field.dtype}'`)
+  }
+  let bytes
+  if (typeof field.b64 === 'string') {
+    bytes = base64ToBytes(field.b64)
+  } else {
+    if (!buffer) {
+      throw new Error('Packed samples reference a binary frame that is not available')
+    }
+    bytes = new Uint8Array(buffer, baseOffset + field.offset, field.length * ArrayType.BYTES_PER_ELEMENT)
+  }
+  if (LITTLE_ENDIAN_HOST) {
+    if (bytes.byteOffset % ArrayType.BYTES_PER_ELEMENT === 0) {
+      return new ArrayType(bytes.buffer, bytes.byteOffset, field.length)
+    }
+    return new ArrayType(bytes.slice().buffer, 0, field.length)
+  }
+  const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength)
+  const values = new ArrayType(field.length)
+  for (let index = 0; index < field.length; index++) {
+    values[index] = ArrayType === Float32Array
+      ? view.getFloat32(index * 4, true)
+      : view.getFloat64(index * 8, true)
+  }
+  return values
+}
+
+/**
+ * Replace every packed `Values` descriptor inside a received message with its typed array (in place).
+ * @param {*} value - parsed message data
+ * @param {ArrayBuffer} [buffer] - binary frame buffer for `offset` descriptors
+ * @param {number} [baseOffset] - byte offset of the payload inside `buffer`
+ * @returns {*} the same value
+ */
+export function decodePackedTraces (value, buffer = null, baseOffset = 0) {
+  if (value === null || typeof value !== 'object' || ArrayBuffer.isView(value)) {
+    return value
+  }
+  if (Array.isArray(value)) {
+    for (const item of value) {
+      decodePackedTraces(item, buffer, baseOffset)
+    }
+    return value
+  }
+  for (const [key, item] of Object.entries(value)) {
+    if (key === 'Values' && isPackedSamples(item)) {
+      value[key] = decodePackedSamples(item, buffer, baseOffset)
+    } else {
+      decodePackedTraces(item, buffer, baseOffset)
+    }
+  }
+  return value
+}
+
+/**
+ * Parse a binary WebSocket frame: uint32 LE header length, JSON header, 8-byte aligned sample buffers.
+ * @param {ArrayBuffer} buffer
+ * @returns {object} the message with its packed trace channels decoded
+ */
+export function parseBinaryFrame (buffer) {
+  const headerLength = new DataView(buffer).getUint32(0, true)
+  const header = new TextDecoder().decode(new Uint8Array(buffer, 4, headerLength))
+  const message = JSON.parse(header)
+  decodePackedTraces(message.data, buffer, 4 + headerLength)
+  return message
+}
+
 export const RESULT_BUNDLE_CONSTANTS = Object.freeze({
   EXPORT_TYPE,
   EXPORT_VERSION,
@@ -10,17 +10,29 @@ the front-end.
 import asyncio
 import datetime
 import json
+import math
 import os
 import socket
+from collections.abc import Callable
 from typing import Any
 
 from asyncua import Client, ua
 
 from python.call_structure import create_call_structure
 from python.event_handler import EventHandler
+from python.event_selection import EventSelection, downsampling_request
 from python.ijt_logger import ijt_log
+from python.json_codec import send_json
+from python.metrics import observe_client
+from python.node_cache import MISSING, AssetChangeHandler, ModelChangeHandler, NodeCache
 from python.result_event_handler import ResultEventHandler
-from python.serialize_data import serialize_full_event, serialize_tuple, serialize_value
+from python.result_store import ResultStore
+from python.serialize_data import serialize_compiled_event, serialize_full_event, serialize_tuple, serialize_value
+from python.session_pool import WebSocketFanout
+from python.trace_codec import TRACE_ENCODINGS, BufferSink, binary_frame, pack_step_trace
+from python.trace_downsample import downsample_traces
+from python.trace_store import TraceStore
+from python.type_definitions import TYPE_DEFINITIONS
 
 _OPCUA_TIMEOUT_S = 60  # per-request timeout for long-running operations (method calls, reads)
 _OPCUA_TIMEOUT_SHORT_S = 15  # wall-clock limit for OPC UA session establishment (SecureChannel + Session handshake)
@@ -33,6 +45,33 @@ _CONNECT_DELAY_DEFAULT = "1.0"
 _CONNECT_MAX_DELAY_DEFAULT = "4.0"
 _EXPONENTIAL_BACKOFF_BASE = 2
 
+_READ_ATTRIBUTE_NAMES = (
+    "NodeId",
+    "NodeClass",
+    "BrowseName",
+    "DisplayName",
+    "Description",
+    "EventNotifier",
+    "WriteMask",
+    "UserWriteMask",
+    "RolePermissions",
+    "UserRolePermissions",
+    "AccessRestrictions",
+    "Value",
+)
+_READ_ATTRIBUTE_IDS = [ua.AttributeIds[name] for name in _READ_ATTRIBUTE_NAMES]
+_NODE_CLASS_INDEX = _READ_ATTRIBUTE_NAMES.index("NodeClass")
+_VALUE_INDEX = _READ_ATTRIBUTE_NAMES.index("Value")
+_PATH_MEMO_SIZE = 1024
+_METHOD_CACHE_SIZE = 256
+_TOOLS_PATHS = (  # simulator layout first, then the AssetManagement layout of real controllers
+    "TighteningSystem/Assets/Tools",
+    "TighteningSystem/AssetManagement/Assets/Tools",
+)
+# Operations per Read/Browse service call, lowered to the server's MaxNodesPerRead/MaxNodesPerBrowse.
+_BATCH_READ_VALUES = 500  # ReadValueIds; readmany needs len(_READ_ATTRIBUTE_IDS) per node
+_BATCH_BROWSE_NODES = 100
+
 
 async def _load_ijt_type_definitions(client: Any, label: str) -> None:
     """Load IJT custom structures through both asyncua type-definition paths.
@@ -55,6 +94,14 @@ async def _load_ijt_type_definitions(client: Any, label: str) -> None:
     await asyncio.wait_for(client.load_data_type_definitions(), timeout=_OPCUA_TIMEOUT_BROWSE_S)
 
 
+async def _disconnect_quietly(client: Any) -> None:
+    """Close a session opened by a failed connect attempt, ignoring errors."""
+    try:
+        await asyncio.wait_for(client.disconnect(), timeout=5.0)
+    except Exception as e:
+        ijt_log.debug(f"Disconnecting a half-open session failed: {e}")
+
+
 def id_object_to_string(inp: Any) -> str:
     """Convert a node-id object (string, dict, or unknown) to an OPC UA string form.
 
@@ -78,6 +125,122 @@ def id_object_to_string(inp: Any) -> str:
     return str(inp)
 
 
+def _unique_node_keys(node_ids: Any) -> list[str]:
+    """Return the distinct node-id strings of a ``nodeids`` payload, in request order.
+
+    Raises:
+        ValueError: If ``node_ids`` is not a non-empty list.
+    """
+    if not isinstance(node_ids, list) or not node_ids:
+        raise ValueError("'nodeids' must be a non-empty list")
+    return list(dict.fromkeys(id_object_to_string(node_id) for node_id in node_ids))
+
+
+def _path_steps(path: Any) -> list[dict]:
+    """Return the browse-path steps of a ``path`` payload (a JSON string or an already decoded list)."""
+    return json.loads(path) if isinstance(path, str) else path
+
+
+def _relative_path(steps: list[dict]) -> ua.RelativePath:
+    """Build a forward, exact-reference-type ``RelativePath`` from browse-path steps."""
+    relative_path = ua.RelativePath()
+    for step in steps:
+        element = ua.RelativePathElement()
+        element.IsInverse = False  # type: ignore[assignment]
+        element.IncludeSubtypes = False  # type: ignore[assignment]
+        element.TargetName = ua.QualifiedName(step["identifier"], step["namespaceindex"])
+        relative_path.Elements.append(element)
+    return relative_path
+
+
+def _path_start(node_id: dict) -> str:
+    """Return the string node-id of a ``pathtoid`` starting node."""
+    return f"ns={node_id['NamespaceIndex']};s={node_id['Identifier']}"
+
+
+def _path_memo_key(start: str, steps: list[dict]) -> str:
+    """Return the path-memo key of a (start node, browse path) pair."""
+    return start + "".join(f"/{step['namespaceindex']}:{step['identifier']}" for step in steps)
+
+
+def _reference_entry(ref: Any, details: bool) -> dict[str, Any]:
+    """Convert an asyncua ``ReferenceDescription`` into a browse-result entry."""
+    entry = {
+        "NodeId": str(ref.NodeId),
+        "BrowseName": str(ref.BrowseName),
+        "DisplayName": str(ref.DisplayName),
+        "NodeClass": str(ref.NodeClass),
+        "ReferenceTypeId": str(ref.ReferenceTypeId),
+        "IsForward": ref.IsForward,
+    }
+    if details:
+        entry["TypeDefinition"] = str(ref.TypeDefinition)
+    return entry
+
+
+def _prepare_localized_text(_index: int, value: Any) -> Any:
+    """Convert a LocalizedText dict (or ``None``) from the GUI to ``ua.LocalizedText``."""
+    if isinstance(value, dict):
+        return ua.LocalizedText(Text=value.get("Text", ""), Locale=value.get("Locale", "en"))
+    if value is None:
+        return ua.LocalizedText(Text="", Locale="en")
+    return value
+
+
+def _prepare_datetime(_index: int, value: Any) -> Any:
+    """Convert an ISO timestamp from the browser to a naive UTC ``datetime``."""
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if value.tzinfo is not None:
+            value = value.astimezone(datetime.UTC).replace(tzinfo=None)
+    return value
+
+
+def _prepare_string(index: int, value: Any) -> Any:
+    """Sanitize ``None`` to ``""`` and warn on empty strings."""
+    if value is None:
+        value = ""
+    if isinstance(value, str) and value.strip() == "":
+        ijt_log.warning(f"[methodcall] Argument {index} is empty string - server may reject it.")
+    return value
+
+
+_ARGUMENT_PREPARERS: dict[ua.VariantType, Callable[[int, Any], Any]] = {
+    ua.VariantType.LocalizedText: _prepare_localized_text,
+    ua.VariantType.DateTime: _prepare_datetime,
+    ua.VariantType.String: _prepare_string,
+}
+
+
+def _compile_argument_converter(variant_type: ua.VariantType) -> Callable[[int, Any], ua.Variant]:
+    """Build the function that converts one front-end argument value into a ``ua.Variant``.
+
+    The type-dependent branches are resolved once here, so a cached plan of
+    converters only runs the value-dependent corrections on each call.
+    """
+    prepare = _ARGUMENT_PREPARERS.get(variant_type)
+    unsigned = variant_type in (ua.VariantType.UInt32, ua.VariantType.UInt64)
+    floating = variant_type in (ua.VariantType.Float, ua.VariantType.Double)
+
+    def convert(index: int, value: Any) -> ua.Variant:
+        if prepare is not None:
+            value = prepare(index, value)
+        if isinstance(value, list):
+            ijt_log.info(f"[methodcall] Argument {index} mapped to Array of {variant_type.name}")
+            return ua.Variant(value, variant_type, is_array=True)
+        target_type = variant_type
+        if isinstance(value, str) and value.isdigit():
+            value = int(value)
+        elif isinstance(value, int) and unsigned:
+            value = abs(value)
+        elif isinstance(value, float) and not floating:
+            target_type = ua.VariantType.Double
+        ijt_log.info(f"[methodcall] Argument {index} mapped to {target_type.name} with value {value}")
+        return ua.Variant(value, target_type)
+
+    return convert
+
+
 def _opcua_watchdog_interval() -> float:
     """Return asyncua watchdog interval in seconds.
 
@@ -102,9 +265,10 @@ class Connection:
     to an OPC UA server using the Industrial Joining Technique specification.
     """
 
-    def __init__(self, server_url: str, websocket: Any) -> None:
+    def __init__(self, server_url: str, websocket: Any, result_store: ResultStore | None = None) -> None:
         self.server_url = server_url
         self.websocket = websocket
+        self.result_store = result_store
         self.terminated = False
 
         self.handle_result_event = "handle"
@@ -128,6 +292,29 @@ class Connection:
         # messages never share the same asyncua request pipeline.
         self.subscription_client: Any = None
 
+        # Attributes/references of browsed nodes and resolved browse paths,
+        # cleared on model changes and NamespaceArray changes.
+        self.node_cache = NodeCache.from_env()
+        self.path_cache = NodeCache(_PATH_MEMO_SIZE, ttl_s=math.inf)
+        self.tool_cache = NodeCache(1, ttl_s=math.inf)
+        # Method InputArguments signatures and compiled argument-conversion plans.
+        self.method_cache = NodeCache(_METHOD_CACHE_SIZE, ttl_s=math.inf)
+        # Traces of results forwarded with the lazy-traces projection.
+        self.trace_store = TraceStore.from_env()
+        self.model_change_handler = ModelChangeHandler(
+            self.node_cache, self.path_cache, self.tool_cache, self.method_cache
+        )
+        self.sub_model_change: Any = None
+        self._model_change_watch_started = False
+        # (ReadValueIds per Read, nodes per Browse), see _operation_limits().
+        self._limits: tuple[int, int] | None = None
+
+        # Tool list of read_product_instance_uri, cleared when an asset is
+        # connected or disconnected.
+        self.asset_change_handler = AssetChangeHandler(self.tool_cache, self.node_cache)
+        self.sub_asset_change: Any = None
+        self._asset_watch_started = False
+
     async def is_connection_open(self) -> bool:
         """Coroutine. Check whether the underlying OPC UA secure channel is open.
 
@@ -193,6 +380,8 @@ class Connection:
             watchdog_intervall=_opcua_watchdog_interval(),
         )
         self.client.session_timeout = _OPCUA_SESSION_TIMEOUT_MS
+        self._limits = None
+        observe_client(self.client, self.server_url)
 
         # Security policy: asyncua Client defaults to no-security (SecurityPolicy.None_,
         # MessageSecurityMode.None_), which is exactly what this client requires.
@@ -214,6 +403,7 @@ class Connection:
         last_error: Exception | None = None
 
         for attempt in range(retries):
+            subscription_client = None
             try:
                 computer_name = socket.getfqdn()
                 self.client.name = f"urn:{computer_name}:IJT:WebClient"
@@ -221,46 +411,56 @@ class Connection:
                 self.client.application_uri = f"urn:{computer_name}:IJT:WebClient"
                 self.client.product_uri = "urn:IJT:WebClient"
 
-                # _OPCUA_TIMEOUT_SHORT_S caps the connection handshake itself;
-                # _OPCUA_TIMEOUT_S (set on the Client above) governs subsequent
-                # per-request operations such as method calls and reads.
-                await asyncio.wait_for(self.client.connect(), timeout=_OPCUA_TIMEOUT_SHORT_S)
-
-                # Small wait to avoid races right after SecureChannel/Session creation
-                await asyncio.sleep(0.1)
-
-                await _load_ijt_type_definitions(self.client, "method client")
-                self.root = self.client.get_root_node()
-
-                # Connect the dedicated subscription client (separate OPC UA session).
+                # Dedicated subscription client (separate OPC UA session).
                 # This eliminates concurrent-request issues when SimulateJobResult
                 # fires many Publish messages while a CallResponse is still in-flight.
-                try:
-                    self.subscription_client = Client(
-                        server_url,
-                        timeout=_OPCUA_TIMEOUT_S,
-                        watchdog_intervall=_opcua_watchdog_interval(),
-                    )
-                    self.subscription_client.session_timeout = _OPCUA_SESSION_TIMEOUT_MS
-                    sub_client_name = f"urn:{computer_name}:IJT:WebClient:Sub"
-                    self.subscription_client.name = sub_client_name
-                    self.subscription_client.description = sub_client_name
-                    self.subscription_client.application_uri = sub_client_name
-                    await asyncio.wait_for(
-                        self.subscription_client.connect(),
-                        timeout=_OPCUA_TIMEOUT_SHORT_S,
-                    )
-                    await asyncio.sleep(0.1)
-                    await _load_ijt_type_definitions(self.subscription_client, "subscription client")
-                    ijt_log.info("Subscription client connected.")
-                except Exception as sub_err:
+                subscription_client = Client(
+                    server_url,
+                    timeout=_OPCUA_TIMEOUT_S,
+                    watchdog_intervall=_opcua_watchdog_interval(),
+                )
+                subscription_client.session_timeout = _OPCUA_SESSION_TIMEOUT_MS
+                observe_client(subscription_client, self.server_url)
+                sub_client_name = f"urn:{computer_name}:IJT:WebClient:Sub"
+                subscription_client.name = sub_client_name
+                subscription_client.description = sub_client_name
+                subscription_client.application_uri = sub_client_name
+
+                # Both sessions are established concurrently.  _OPCUA_TIMEOUT_SHORT_S
+                # caps each connection handshake; _OPCUA_TIMEOUT_S (set on the
+                # Client above) governs subsequent per-request operations such as
+                # method calls and reads.
+                method_result, sub_result = await asyncio.gather(
+                    asyncio.wait_for(self.client.connect(), timeout=_OPCUA_TIMEOUT_SHORT_S),
+                    asyncio.wait_for(subscription_client.connect(), timeout=_OPCUA_TIMEOUT_SHORT_S),
+                    return_exceptions=True,
+                )
+                if isinstance(sub_result, BaseException):
                     ijt_log.warning(
                         "Subscription client failed to connect — falling back to "
                         "single-session mode; OPC UA events will not be received. "
                         "Check server connectivity and session limits. Error: %s",
-                        sub_err,
+                        sub_result,
                     )
-                    self.subscription_client = None
+                    subscription_client = None
+                if isinstance(method_result, BaseException):
+                    raise method_result
+
+                # Small wait to avoid races right after SecureChannel/Session creation
+                await asyncio.sleep(0.1)
+
+                # asyncua registers generated data types process-wide, so one load
+                # serves both sessions (and later connections to the same model).
+                await TYPE_DEFINITIONS.ensure_loaded(self.client, "method client", _load_ijt_type_definitions)
+                self.root = self.client.get_root_node()
+                self.subscription_client = subscription_client
+                if subscription_client is not None:
+                    ijt_log.info("Subscription client connected.")
+
+                # A new session may see a different address space.
+                self.model_change_handler.reset()
+                self._model_change_watch_started = False
+                self._asset_watch_started = False
 
                 event = {
                     "command": "connection established",
@@ -268,11 +468,13 @@ class Connection:
                 }
 
                 if self.websocket:
-                    await self.websocket.send(json.dumps(event))
+                    await send_json(self.websocket, event)
 
                 return event
             except Exception as e:
                 last_error = e
+                if subscription_client is not None:
+                    await _disconnect_quietly(subscription_client)
                 delay = min(max_delay, base_delay * (_EXPONENTIAL_BACKOFF_BASE**attempt))
                 ijt_log.error(f"Connect attempt {attempt + 1}/{retries} failed for {self.server_url}: {e}")
                 if attempt + 1 < retries:
@@ -325,6 +527,10 @@ class Connection:
                     ijt_log.warning(f"Subscription client disconnect failed: {e}")
                 self.subscription_client = None
 
+            ijt_log.info(
+                f"Node cache stats for {self.server_url}: {self.node_cache.stats()}, paths: {self.path_cache.stats()}"
+            )
+
             # Shutdown event handlers
             if self.handler_joining_event:
                 await self.handler_joining_event.close()
@@ -383,7 +589,91 @@ class Connection:
                 ijt_log.warning(f"Delete subscription failed (JoiningEvent). Continuing shutdown: {e}")
             self.sub_joining_event = "sub"
 
-    async def subscribe(self, data: dict) -> dict[str, Any]:
+        # Model-change watch for the node cache
+        if self.sub_model_change is not None:
+            try:
+                await asyncio.wait_for(
+                    delete_client.delete_subscriptions([self.sub_model_change.subscription_id]),  # type: ignore[union-attr]
+                    timeout=5.0,
+                )
+            except Exception as e:
+                ijt_log.warning(f"Delete subscription failed (ModelChangeEvent). Continuing shutdown: {e}")
+            self.sub_model_change = None
+
+        # Asset connect/disconnect watch for the tool cache
+        if self.sub_asset_change is not None:
+            try:
+                await asyncio.wait_for(
+                    delete_client.delete_subscriptions([self.sub_asset_change.subscription_id]),  # type: ignore[union-attr]
+                    timeout=5.0,
+                )
+            except Exception as e:
+                ijt_log.warning(f"Delete subscription failed (AssetChange). Continuing shutdown: {e}")
+            self.sub_asset_change = None
+
+    async def _watch_model_changes(self) -> None:
+        """Coroutine. Watch model changes so the node caches are cleared when the address space changes.
+
+        Subscribes to BaseModelChangeEventType events and to the server's
+        NamespaceArray.  Attempted once per session.  When the server refuses
+        the subscription the node cache still expires entries after its TTL.
+        """
+        if self._model_change_watch_started:
+            return
+        self._model_change_watch_started = True
+        sub_client = self.subscription_client or self.client
+        try:
+            self.sub_model_change = await sub_client.create_subscription(
+                _SUBSCRIPTION_PERIOD_MS, self.model_change_handler
+            )
+            await self.sub_model_change.subscribe_events(
+                sub_client.get_node(ua.ObjectIds.Server),
+                sub_client.get_node(ua.ObjectIds.BaseModelChangeEventType),
+            )
+            await self.sub_model_change.subscribe_data_change(sub_client.get_node(ua.ObjectIds.Server_NamespaceArray))
+        except Exception as e:
+            ijt_log.warning(f"Model-change subscription failed; node cache relies on its TTL only: {e}")
+            self.sub_model_change = None
+
+    async def _watch_asset_changes(self) -> None:
+        """Coroutine. Subscribe to JoiningSystemEventType so the tool cache is cleared when assets change.
+
+        Attempted once per session.  While no subscription exists the tool
+        list is not cached.
+        """
+        if self._asset_watch_started:
+            return
+        self._asset_watch_started = True
+        sub_client = self.subscription_client or self.client
+        try:
+            ns_joining_base = await sub_client.get_namespace_index("http://opcfoundation.org/UA/IJT/Base/")
+            joining_system_event_node = await sub_client.nodes.root.get_child(
+                [
+                    "0:Types",
+                    "0:EventTypes",
+                    "0:BaseEventType",
+                    f"{ns_joining_base}:JoiningSystemEventType",
+                ]
+            )
+            self.sub_asset_change = await sub_client.create_subscription(
+                _SUBSCRIPTION_PERIOD_MS, self.asset_change_handler
+            )
+            await self.sub_asset_change.subscribe_events(
+                sub_client.get_node(ua.ObjectIds.Server), joining_system_event_node
+            )
+        except Exception as e:
+            ijt_log.warning(f"Asset-change subscription failed; tool list will not be cached: {e}")
+            self.sub_asset_change = None
+
+    async def _cached_references(self, node: Any, cache_key: str) -> list:
+        """Coroutine. Return ``node.get_references()``, served from the node cache when fresh."""
+        references = self.node_cache.get("references", cache_key)
+        if references is MISSING:
+            references = await node.get_references()
+            self.node_cache.put("references", cache_key, references)
+        return references
+
+    async def subscribe(self, data: dict, owner: Any = None) -> dict[str, Any]:
         """Coroutine. Create OPC UA event subscriptions as requested by the front-end.
 
         Args:
@@ -395,13 +685,31 @@ class Connection:
                 * ``"joiningsystemevent"`` — joining-system events only.
                 * Absent or empty — both subscription types are created.
 
+                The optional ``"projection"`` and ``"filter"`` keys select
+                which events, and which parts of them, are forwarded (see
+                :mod:`python.event_selection`).
+            owner: Browser tab issuing the command when the connection is
+                shared through a :class:`~python.session_pool.WebSocketFanout`;
+                the selection then applies to that tab only.
+
         Returns:
             An empty dict ``{}`` on success, or ``{"exception": "…"}`` on
             failure.
         """
+        try:
+            selection = EventSelection.from_request(data)
+        except ValueError as e:
+            return {"exception": f"Subscribe exception: {e}"}
         try:
             self.handler_joining_event = self.handler_joining_event or EventHandler(self.websocket, self.server_url)
-            self.handler_result_event = self.handler_result_event or ResultEventHandler(self.websocket, self.server_url)
+            self.handler_result_event = self.handler_result_event or ResultEventHandler(
+                self.websocket, self.server_url, trace_store=self.trace_store, result_store=self.result_store
+            )
+            if owner is not None and isinstance(self.websocket, WebSocketFanout):
+                self.websocket.select(owner, selection)
+            else:
+                self.handler_joining_event.selection = selection
+                self.handler_result_event.selection = selection
 
             # Use the dedicated subscription client when available.  Fall back
             # to the method client only if subscription_client failed to connect.
@@ -475,13 +783,79 @@ class Connection:
             ijt_log.error(f"Exception: {e}")
             return {"exception": f"Subscribe exception: {e}"}
 
+    async def gettrace(self, data: dict, owner: Any = None) -> dict[str, Any]:
+        """Coroutine. Stream the stored traces of one result to the requesting tab.
+
+        Results forwarded with the ``lazy-traces`` projection or downsampled
+        with ``tracepoints`` keep their full traces in :attr:`trace_store`.  The step traces are sent as ``trace chunk``
+        frames (``{"resultid", "index", "total", "steptraces": [[content
+        index, StepTrace], ...]}``) before the command reply.
+
+        Args:
+            data: Command payload with the ``"resultid"`` to fetch, an optional
+                ``"traceencoding"`` (``json``, ``float32``, ``float64``) and
+                ``"binary": true`` for binary chunk frames with the samples as
+                raw buffers (``float64`` unless ``float32`` is requested; see
+                :mod:`python.trace_codec`).  ``"tracepoints"`` and
+                ``"downsample"`` reduce the trace to about that many samples
+                (see :mod:`python.trace_downsample`); without them the full
+                resolution is sent.
+            owner: Browser tab issuing the command when the connection is
+                shared; the chunks are sent to that tab only.
+
+        Returns:
+            ``{"resultid": …, "chunks": n}``, or ``{"exception": "…"}`` for an
+            invalid option or if no trace is stored for the result.
+        """
+        result_id = str(data.get("resultid") or "")
+        encoding = str(data.get("traceencoding") or "json").lower()
+        binary = data.get("binary") is True
+        if encoding not in TRACE_ENCODINGS:
+            return {"exception": f"traceencoding must be one of {TRACE_ENCODINGS}"}
+        try:
+            points, method = downsampling_request(data)
+        except ValueError as exc:
+            return {"exception": str(exc)}
+        reduce = (lambda traces: downsample_traces(traces, points, method)) if points else None
+        chunks = self.trace_store.chunks(result_id, reduce)
+        if chunks is None:
+            return {"exception": f"No stored trace for result {result_id!r}"}
+        websocket = self.websocket
+        if owner is not None and isinstance(websocket, WebSocketFanout):
+            websocket = websocket.socket_of(owner)
+            if websocket is None:
+                return {"exception": "Requesting tab is no longer attached"}
+        dtype = encoding if encoding != "json" else ("float64" if binary else None)
+        for index, chunk in enumerate(chunks):
+            sink = BufferSink() if binary else None
+            steps = [step if dtype is None else pack_step_trace(step, dtype, sink) for _, step in chunk]
+            frame = {
+                "command": "trace chunk",
+                "endpoint": self.server_url,
+                "data": {
+                    "resultid": result_id,
+                    "index": index,
+                    "total": len(chunks),
+                    "steptraces": [
+                        [content, serialize_compiled_event(step)] for (content, _), step in zip(chunk, steps)
+                    ],
+                },
+            }
+            if sink is not None:
+                await websocket.send(binary_frame(frame, sink), text=False)
+            else:
+                await send_json(websocket, frame)
+        return {"resultid": result_id, "chunks": len(chunks)}
+
     async def read(self, data: dict) -> dict[str, Any]:
         """Coroutine. Read a set of standard OPC UA attributes for a single node.
 
         Reads NodeId, NodeClass, BrowseName, DisplayName, Description,
         EventNotifier, WriteMask, UserWriteMask, RolePermissions,
-        UserRolePermissions, AccessRestrictions, and Value in one round-trip.
-        Also fetches the node's references and (for Variable nodes) its value.
+        UserRolePermissions, AccessRestrictions, and Value in one round-trip
+        and fetches the node's references.  Both are kept in
+        :attr:`node_cache`; on a cache hit only the Value of a Variable node
+        is re-read from the server.
 
         Args:
             data: Command payload containing ``"nodeid"`` — the OPC UA node-id
@@ -497,38 +871,32 @@ class Connection:
 
         try:
             node = self.client.get_node(node_id)
-
-            attr_ids_strings = [
-                "NodeId",
-                "NodeClass",
-                "BrowseName",
-                "DisplayName",
-                "Description",
-                "EventNotifier",
-                "WriteMask",
-                "UserWriteMask",
-                "RolePermissions",
-                "UserRolePermissions",
-                "AccessRestrictions",
-                "Value",
-            ]
-            attr_ids = [ua.AttributeIds[name] for name in attr_ids_strings]
+            cache_key = id_object_to_string(node_id)
+            await self._watch_model_changes()
 
             last_read_state = "READ_ATTRIBUTES_SETUP"
-            attribute_reply = await node.read_attributes(attr_ids)
+            cached_values = self.node_cache.get("attributes", cache_key)
+            if cached_values is MISSING:
+                attribute_reply = await node.read_attributes(_READ_ATTRIBUTE_IDS)
+                attribute_values = [reply.Value.Value for reply in attribute_reply]
+                self.node_cache.put("attributes", cache_key, attribute_values)
+            else:
+                attribute_values = list(cached_values)
+                if attribute_values[_NODE_CLASS_INDEX] == ua.NodeClass.Variable:
+                    # Only the Value attribute is live data — refresh it on every read.
+                    data_value = await node.read_attribute(ua.AttributeIds.Value)
+                    attribute_values[_VALUE_INDEX] = data_value.Value.Value
 
             last_read_state = "READ_ATTRIBUTES_READ"
-            attribute_values = [reply.Value.Value for reply in attribute_reply]
-            zipped = list(zip(attr_ids_strings, attribute_values))
-            serialized_attributes = serialize_tuple(zipped)
+            serialized_attributes = serialize_tuple(list(zip(_READ_ATTRIBUTE_NAMES, attribute_values)))
 
             last_read_state = "READ_SERIALIZED"
-            relations = await node.get_references()
+            relations = await self._cached_references(node, cache_key)
 
+            # NodeClass and Value are part of the attribute reply — no extra round-trips.
             value = {}
-            node_class = await node.read_node_class()
-            if node_class == ua.NodeClass.Variable:
-                value = await node.get_value()
+            if attribute_values[_NODE_CLASS_INDEX] == ua.NodeClass.Variable:
+                value = attribute_values[_VALUE_INDEX]
                 last_read_state = "READ_SERIALIZED_VALUE_GENERATION"
 
             return {
@@ -548,7 +916,8 @@ class Connection:
         """Coroutine. Resolve a relative browse path to a node-id.
 
         Uses ``TranslateBrowsePathsToNodeIds`` to walk the address space
-        starting from a given node.
+        starting from a given node.  Resolved paths are memoised in
+        :attr:`path_cache` until the model or the NamespaceArray changes.
 
         Args:
             data: Command payload with:
@@ -563,18 +932,15 @@ class Connection:
             ``{"exception": "…"}`` on failure.
         """
         try:
-            node_id = data["nodeid"]
-            path = json.loads(data["path"])
-
-            node = self.client.get_node(f"ns={node_id['NamespaceIndex']};s={node_id['Identifier']}")
+            start = _path_start(data["nodeid"])
+            steps = _path_steps(data["path"])
+            memo_key = _path_memo_key(start, steps)
+            await self._watch_model_changes()
+            target = self.path_cache.get("path", memo_key)
+            if target is not MISSING:
+                return {"nodeid": target}
 
-            relative_path = ua.RelativePath()
-            for step in path:
-                element = ua.RelativePathElement()
-                element.IsInverse = False  # type: ignore[assignment]
-                element.IncludeSubtypes = False  # type: ignore[assignment]
-                element.TargetName = ua.QualifiedName(step["identifier"], step["namespaceindex"])
-                relative_path.Elements.append(element)
+            node = self.client.get_node(start)
 
             # Prefer the public Client.translate_browsepaths() API over the
             # internal client.uaclient.translate_browsepaths_to_nodeids()
@@ -582,13 +948,71 @@ class Connection:
             # As of master SHA 35a77c6b (2026-05-11) the public method signature
             # is translate_browsepaths(starting_node: NodeId, [RelativePath]).
             # It wraps BrowsePath construction internally.
-            result = await self.client.translate_browsepaths(node.nodeid, [relative_path])
-            return {"nodeid": serialize_full_event(result[0].Targets[0].TargetId)}
+            result = await self.client.translate_browsepaths(node.nodeid, [_relative_path(steps)])
+            target = serialize_full_event(result[0].Targets[0].TargetId)
+            self.path_cache.put("path", memo_key, target)
+            return {"nodeid": target}
         except Exception as e:
             ijt_log.error("Exception in PathToId path")
             ijt_log.error("Exception: " + str(e))
             return {"exception": "PathToId Exception: " + str(e)}
 
+    async def pathstoids(self, data: dict) -> dict[str, Any]:
+        """Coroutine. Resolve many browse paths with one TranslateBrowsePathsToNodeIds call.
+
+        Paths already in :attr:`path_cache` are answered without a request;
+        the remaining ones (each with its own starting node) share a single
+        service call.
+
+        Args:
+            data: Command payload with ``"paths"`` — a list of dicts, each
+                holding the ``"nodeid"`` and ``"path"`` of a :meth:`pathtoid`
+                request.
+
+        Returns:
+            ``{"results": [...]}`` with, in request order, either
+            ``{"nodeid": <serialized TargetId>}`` or ``{"exception": "…"}``
+            per path; or ``{"exception": "…"}`` on failure.
+        """
+        try:
+            requests = data.get("paths")
+            if not isinstance(requests, list) or not requests:
+                raise ValueError("'paths' must be a non-empty list")
+            await self._watch_model_changes()
+
+            results: list[dict[str, Any] | None] = [None] * len(requests)
+            browse_paths: list[ua.BrowsePath] = []
+            pending: list[tuple[int, str]] = []
+            for index, request in enumerate(requests):
+                start = _path_start(request["nodeid"])
+                steps = _path_steps(request["path"])
+                memo_key = _path_memo_key(start, steps)
+                target = self.path_cache.get("path", memo_key)
+                if target is not MISSING:
+                    results[index] = {"nodeid": target}
+                    continue
+                browse_path = ua.BrowsePath()
+                browse_path.StartingNode = self.client.get_node(start).nodeid
+                browse_path.RelativePath = _relative_path(steps)
+                browse_paths.append(browse_path)
+                pending.append((index, memo_key))
+
+            if browse_paths:
+                # The public translate_browsepaths() takes a single starting node;
+                # the session service accepts one per path, so use it directly.
+                path_results = await self.client.uaclient.translate_browsepaths_to_nodeids(browse_paths)
+                for (index, memo_key), path_result in zip(pending, path_results):
+                    if not path_result.StatusCode.is_good() or not path_result.Targets:
+                        results[index] = {"exception": f"PathToId Exception: {path_result.StatusCode.name}"}
+                        continue
+                    target = serialize_full_event(path_result.Targets[0].TargetId)
+                    self.path_cache.put("path", memo_key, target)
+                    results[index] = {"nodeid": target}
+            return {"results": results}
+        except Exception as e:
+            ijt_log.error(f"Exception in pathstoids: {e}")
+            return {"exception": f"PathsToIds Exception: {e}"}
+
     async def namespaces(self, _data: dict) -> dict[str, Any]:
         """Coroutine. Retrieve the server's namespace array.
 
@@ -601,6 +1025,7 @@ class Connection:
         """
         try:
             namespaces_reply = await self.client.get_namespace_array()
+            self.model_change_handler.note_namespace_array(namespaces_reply)
             return {"namespaces": namespaces_reply}
         except Exception as e:
             ijt_log.error("Exception in Namespaces")
@@ -610,6 +1035,9 @@ class Connection:
     async def browse(self, data: dict) -> dict[str, Any]:
         """Coroutine. Browse the references of a single OPC UA node.
 
+        References are shared with :meth:`read` through :attr:`node_cache`,
+        so re-expanding a folder does not hit the server again.
+
         Args:
             data: Command payload with:
 
@@ -625,25 +1053,291 @@ class Connection:
         details = data.get("details", False)
         try:
             node = self.client.get_node(node_id)
-            references = await node.get_references()
-            nodes = []
-            for ref in references:
-                entry = {
-                    "NodeId": str(ref.NodeId),
-                    "BrowseName": str(ref.BrowseName),
-                    "DisplayName": str(ref.DisplayName),
-                    "NodeClass": str(ref.NodeClass),
-                    "ReferenceTypeId": str(ref.ReferenceTypeId),
-                    "IsForward": ref.IsForward,
-                }
-                if details:
-                    entry["TypeDefinition"] = str(ref.TypeDefinition)
-                nodes.append(entry)
-            return {"nodes": nodes}
+            await self._watch_model_changes()
+            references = await self._cached_references(node, id_object_to_string(node_id))
+            return {"nodes": [_reference_entry(ref, details) for ref in references]}
         except Exception as e:
             ijt_log.error(f"Exception in browse for node {node_id}: {e}")
             return {"exception": f"Browse exception: {e}"}
 
+    async def _operation_limits(self) -> tuple[int, int]:
+        """Coroutine. Return the ReadValueIds per Read call and nodes per Browse call to send.
+
+        ``_BATCH_READ_VALUES`` and ``_BATCH_BROWSE_NODES``, lowered to the
+        server's ``MaxNodesPerRead`` and ``MaxNodesPerBrowse`` operation limits
+        (0 means no limit) when they are readable.  Read once per connection.
+        """
+        if self._limits is None:
+            limits = [_BATCH_READ_VALUES, _BATCH_BROWSE_NODES]
+            try:
+                nodes = [
+                    self.client.get_node(
+                        ua.NodeId(ua.ObjectIds.Server_ServerCapabilities_OperationLimits_MaxNodesPerRead)
+                    ),
+                    self.client.get_node(
+                        ua.NodeId(ua.ObjectIds.Server_ServerCapabilities_OperationLimits_MaxNodesPerBrowse)
+                    ),
+                ]
+                values = await self.client.read_values(nodes)
+                limits = [min(limit, int(value)) if value else limit for limit, value in zip(limits, values)]
+            except Exception as e:
+                ijt_log.debug(f"Operation limits of {self.server_url} not readable, using defaults: {e}")
+            self._limits = (limits[0], limits[1])
+        return self._limits
+
+    async def _read_chunked(self, read_values: list) -> list:
+        """Coroutine. Read ``read_values`` with as many Read calls as the operation limit requires."""
+        read_limit, _ = await self._operation_limits()
+        data_values: list = []
+        for start in range(0, len(read_values), read_limit):
+            params = ua.ReadParameters()
+            params.NodesToRead = read_values[start : start + read_limit]
+            # asyncua has no public multi-node, multi-attribute read — use the session's Read service directly.
+            data_values.extend(await self.client.uaclient.read(params))
+        return data_values
+
+    async def _read_attributes_many(self, keys: list[str]) -> dict[str, list | str]:
+        """Coroutine. Read the :meth:`read` attribute set of many nodes in batched Read service calls.
+
+        Nodes with fresh :attr:`node_cache` entries contribute only their
+        Value attribute (Variables) or nothing at all (other node classes).
+
+        Returns:
+            Per node-id either the attribute values in ``_READ_ATTRIBUTE_NAMES``
+            order or the name of the bad status code that prevented the read.
+        """
+        results: dict[str, list | str] = {}
+        requests: list[tuple[str, int]] = []  # (node key, attribute index) per ReadValueId
+        read_values: list = []
+        for key in keys:
+            cached_values = self.node_cache.get("attributes", key)
+            if cached_values is MISSING:
+                indexes = list(range(len(_READ_ATTRIBUTE_IDS)))
+            elif cached_values[_NODE_CLASS_INDEX] == ua.NodeClass.Variable:
+                results[key] = list(cached_values)
+                indexes = [_VALUE_INDEX]  # only the live Value is re-read
+            else:
+                results[key] = list(cached_values)
+                continue
+            node_id = self.client.get_node(key).nodeid
+            for index in indexes:
+                read_value = ua.ReadValueId()
+                read_value.NodeId = node_id
+                read_value.AttributeId = _READ_ATTRIBUTE_IDS[index]
+                read_values.append(read_value)
+                requests.append((key, index))
+
+        if not requests:
+            return results
+
+        data_values = await self._read_chunked(read_values)
+        fresh: dict[str, list] = {}
+        for (key, index), data_value in zip(requests, data_values):
+            if index == _NODE_CLASS_INDEX and not data_value.StatusCode.is_good():
+                results[key] = data_value.StatusCode.name
+                continue
+            values = results.get(key)
+            if isinstance(values, str):
+                continue
+            if values is None:
+                values = fresh.setdefault(key, [None] * len(_READ_ATTRIBUTE_IDS))
+            values[index] = data_value.Value.Value if data_value.Value is not None else None
+        for key, values in fresh.items():
+            if key not in results:
+                results[key] = values
+                self.node_cache.put("attributes", key, values)
+        return results
+
+    async def _browse_many(self, keys: list[str]) -> dict[str, list | str]:
+        """Coroutine. Fetch the references of many nodes with one Browse service call.
+
+        Uses the same filter as ``Node.get_references()`` and follows
+        continuation points with batched BrowseNext calls.
+
+        Returns:
+            Per node-id either its ``ReferenceDescription`` list or the name of
+            the bad status code returned by the server.  A list cut short by a
+            failed BrowseNext is returned but not cached.
+        """
+        results: dict[str, list | str] = {}
+        params = ua.BrowseParameters()
+        params.View.Timestamp = ua.get_win_epoch()
+        params.RequestedMaxReferencesPerNode = 0
+        pending: list[str] = []
+        for key in keys:
+            references = self.node_cache.get("references", key)
+            if references is not MISSING:
+                results[key] = references
+                continue
+            description = ua.BrowseDescription()
+            description.NodeId = self.client.get_node(key).nodeid
+            description.BrowseDirection = ua.BrowseDirection.Both
+            description.ReferenceTypeId = ua.NodeId(ua.ObjectIds.References)
+            description.IncludeSubtypes = True
+            description.NodeClassMask = ua.NodeClass.Unspecified
+            description.ResultMask = ua.BrowseResultMask.All
+            params.NodesToBrowse.append(description)
+            pending.append(key)
+
+        if not pending:
+            return results
+
+        browse_results = await self.client.uaclient.browse(params)
+        continuations: dict[bytes, str] = {}
+        collected: dict[str, list] = {}
+        truncated: set[str] = set()
+        for key, browse_result in zip(pending, browse_results):
+            if not browse_result.StatusCode.is_good():
+                results[key] = browse_result.StatusCode.name
+                continue
+            collected[key] = list(browse_result.References)
+            if browse_result.ContinuationPoint:
+                continuations[browse_result.ContinuationPoint] = key
+
+        while continuations:
+            next_params = ua.BrowseNextParameters()
+            next_params.ContinuationPoints = list(continuations)
+            next_params.ReleaseContinuationPoints = False
+            next_results = await self.client.uaclient.browse_next(next_params)
+            following: dict[bytes, str] = {}
+            for key, browse_result in zip(continuations.values(), next_results):
+                if not browse_result.StatusCode.is_good():
+                    ijt_log.warning(f"BrowseNext for {key} stopped early: {browse_result.StatusCode.name}")
+                    truncated.add(key)
+                    continue
+                collected[key].extend(browse_result.References)
+                if browse_result.ContinuationPoint:
+                    following[browse_result.ContinuationPoint] = key
+            continuations = following
+
+        for key, references in collected.items():
+            results[key] = references
+            if key not in truncated:
+                self.node_cache.put("references", key, references)
+        return results
+
+    async def readmany(self, data: dict) -> dict[str, Any]:
+        """Coroutine. Read attributes and references of many nodes in batched service calls.
+
+        Issues Read calls for all (node, attribute) pairs and Browse calls for
+        all nodes, each sized to the :meth:`_operation_limits`, instead of the
+        several round-trips :meth:`read` needs per node.
+
+        Args:
+            data: Command payload containing ``"nodeids"`` — a list of node-id
+                strings or dicts.
+
+        Returns:
+            ``{"results": {<node-id>: <entry>}}`` where each entry has the
+            ``"attributes"``, ``"relations"``, ``"value"`` and ``"nodeid"``
+            keys of a :meth:`read` reply, or ``{"exception": "…"}`` for nodes
+            the server could not read.  ``{"exception": "…"}`` on failure.
+        """
+        try:
+            keys = _unique_node_keys(data.get("nodeids"))
+            await self._watch_model_changes()
+            results: dict[str, Any] = {}
+            _, browse_limit = await self._operation_limits()
+            for start in range(0, len(keys), browse_limit):
+                chunk = keys[start : start + browse_limit]
+                attributes = await self._read_attributes_many(chunk)
+                references = await self._browse_many([key for key in chunk if not isinstance(attributes[key], str)])
+                for key in chunk:
+                    attribute_values = attributes[key]
+                    if isinstance(attribute_values, str):
+                        results[key] = {"exception": f"Read failed: {attribute_values}"}
+                        continue
+                    relations = references.get(key, [])
+                    value = {}
+                    if attribute_values[_NODE_CLASS_INDEX] == ua.NodeClass.Variable:
+                        value = attribute_values[_VALUE_INDEX]
+                    results[key] = {
+                        "attributes": serialize_tuple(list(zip(_READ_ATTRIBUTE_NAMES, attribute_values))),
+                        "relations": serialize_value(relations if isinstance(relations, list) else []),
+                        "value": serialize_value(value),
+                        "nodeid": key,
+                    }
+            return {"results": results}
+        except Exception as e:
+            ijt_log.error(f"Exception in readmany: {e}")
+            return {"exception": f"ReadMany exception: {e}"}
+
+    async def browsemany(self, data: dict) -> dict[str, Any]:
+        """Coroutine. Browse the references of many nodes with batched Browse/BrowseNext calls.
+
+        Args:
+            data: Command payload with:
+
+                * ``"nodeids"`` — list of node-id strings or dicts to browse.
+                * ``"details"`` *(optional, default False)* — when ``True``,
+                  includes the ``"TypeDefinition"`` field in each entry.
+
+        Returns:
+            ``{"results": {<node-id>: {"nodes": [...]}}}`` mirroring
+            :meth:`browse` per node (``{"exception": "…"}`` for nodes the
+            server rejected), or ``{"exception": "…"}`` on failure.
+        """
+        details = data.get("details", False)
+        try:
+            keys = _unique_node_keys(data.get("nodeids"))
+            await self._watch_model_changes()
+            results: dict[str, Any] = {}
+            _, browse_limit = await self._operation_limits()
+            for start in range(0, len(keys), browse_limit):
+                chunk = keys[start : start + browse_limit]
+                references = await self._browse_many(chunk)
+                for key in chunk:
+                    node_references = references[key]
+                    if isinstance(node_references, str):
+                        results[key] = {"exception": f"Browse failed: {node_references}"}
+                    else:
+                        results[key] = {"nodes": [_reference_entry(ref, details) for ref in node_references]}
+            return {"results": results}
+        except Exception as e:
+            ijt_log.error(f"Exception in browsemany: {e}")
+            return {"exception": f"BrowseMany exception: {e}"}
+
+    async def _argument_plan(self, method: Any, method_id: str, arguments: list) -> list:
+        """Coroutine. Return the cached argument-conversion plan of a method call.
+
+        The method's ``InputArguments`` are read once per method node-id and
+        kept in :attr:`method_cache`, which is cleared on model changes.  The
+        plan (one converter per argument, ``None`` where the argument cannot
+        be mapped) is compiled once per combination of front-end data types.
+        """
+        data_types = [arg.get("dataType") if isinstance(arg, dict) else None for arg in arguments]
+        plan_key = f"{method_id}|{data_types}"
+        plan = self.method_cache.get("plan", plan_key)
+        if plan is not MISSING:
+            return plan
+
+        expected_args = self.method_cache.get("signature", method_id)
+        if expected_args is MISSING:
+            await self._watch_model_changes()
+            input_args_node = await method.get_child("0:InputArguments")
+            expected_args = await input_args_node.get_value()
+            ijt_log.info(f"[methodcall] InputArguments of {method_id}: {[str(arg.DataType) for arg in expected_args]}")
+            self.method_cache.put("signature", method_id, expected_args)
+
+        if len(arguments) != len(expected_args):
+            ijt_log.warning(
+                f"[methodcall] Argument count mismatch: expected {len(expected_args)}, got {len(arguments)}"
+            )
+
+        plan = []
+        for i, data_type in enumerate(data_types):
+            try:
+                if i >= len(expected_args) or data_type is None:
+                    plan.append(None)
+                    continue
+                plan.append(
+                    _compile_argument_converter(self.map_nodeid_to_varianttype(data_type) or ua.VariantType.String)
+                )
+            except Exception:  # e.g. an unhashable dataType from the GUI
+                plan.append(None)
+        self.method_cache.put("plan", plan_key, plan)
+        return plan
+
     def map_nodeid_to_varianttype(self, nodeid: int) -> ua.VariantType:
         """Map an OPC UA built-in data-type node identifier to an asyncua VariantType.
 
@@ -682,43 +1376,68 @@ class Connection:
         BrowseName + ProductInstanceUri as a list.
 
         Tries both known address-space paths so the method works for both
-        the simulator and real controllers.
+        the simulator and real controllers.  Both containers are browsed in
+        one Browse call and every candidate ProductInstanceUri is read in one
+        Read call.  The list is cached until an asset is connected or
+        disconnected (or the model changes).
         """
-        TOOLS_PATHS = [
-            "TighteningSystem/Assets/Tools",
-            "TighteningSystem/AssetManagement/Assets/Tools",
-        ]
-        tools: list = []
-        for tools_path in TOOLS_PATHS:
-            try:
-                tools_node = self.client.get_node(f"ns=1;s={tools_path}")
-                children = await tools_node.get_children()
-                for child in children:
-                    tool_name = ""
-                    try:
-                        browse_name = await child.read_browse_name()
-                        tool_name = browse_name.Name
-                        pi_node = self.client.get_node(
-                            f"ns=1;s={tools_path}/{tool_name}/Identification/ProductInstanceUri"
-                        )
-                        pi_value = await pi_node.read_value()
-                        tools.append(
-                            {
-                                "toolName": tool_name,
-                                "productInstanceUri": str(pi_value) if pi_value else "",
-                                "path": f"{tools_path}/{tool_name}",
-                            }
-                        )
-                        ijt_log.info(f"[read_product_instance_uri] {tool_name} → {pi_value}")
-                    except Exception as child_err:
-                        ijt_log.debug(f"[read_product_instance_uri] Skipping '{tool_name}': {child_err}")
-                if tools:
-                    break  # found tools — no need to try alternative path
-            except Exception as path_err:
-                ijt_log.debug(f"[read_product_instance_uri] Path '{tools_path}' not accessible: {path_err}")
-
+        tools = self.tool_cache.get("tools", "")
+        if tools is not MISSING:
+            return {"tools": tools}
+        await self._watch_asset_changes()
+        tools = await self._discover_tools()
+        if self.sub_asset_change is not None:
+            self.tool_cache.put("tools", "", tools)
         return {"tools": tools}
 
+    async def _discover_tools(self) -> list[dict[str, str]]:
+        """Coroutine. Return the tools of the first ``_TOOLS_PATHS`` container that has readable tools."""
+        try:
+            containers = [f"ns=1;s={tools_path}" for tools_path in _TOOLS_PATHS]
+            references = await self._browse_many(containers)
+
+            candidates: list[tuple[str, str]] = []  # (tools path, tool name)
+            for tools_path, container in zip(_TOOLS_PATHS, containers):
+                container_refs = references.get(container)
+                if isinstance(container_refs, str):
+                    ijt_log.debug(f"[read_product_instance_uri] Path '{tools_path}' not accessible: {container_refs}")
+                    continue
+                for ref in container_refs or []:
+                    if ref.IsForward and ref.ReferenceTypeId != ua.NodeId(ua.ObjectIds.HasTypeDefinition):
+                        candidates.append((tools_path, ref.BrowseName.Name))
+
+            read_values: list = []
+            for tools_path, tool_name in candidates:
+                read_value = ua.ReadValueId()
+                read_value.NodeId = self.client.get_node(
+                    f"ns=1;s={tools_path}/{tool_name}/Identification/ProductInstanceUri"
+                ).nodeid
+                read_value.AttributeId = ua.AttributeIds.Value
+                read_values.append(read_value)
+            data_values = await self._read_chunked(read_values)
+        except Exception as e:
+            ijt_log.debug(f"[read_product_instance_uri] Tool discovery failed: {e}")
+            return []
+
+        found: dict[str, list[dict[str, str]]] = {}
+        for (tools_path, tool_name), data_value in zip(candidates, data_values):
+            if not data_value.StatusCode.is_good():
+                ijt_log.debug(f"[read_product_instance_uri] Skipping '{tool_name}': {data_value.StatusCode.name}")
+                continue
+            pi_value = data_value.Value.Value if data_value.Value is not None else None
+            found.setdefault(tools_path, []).append(
+                {
+                    "toolName": tool_name,
+                    "productInstanceUri": str(pi_value) if pi_value else "",
+                    "path": f"{tools_path}/{tool_name}",
+                }
+            )
+            ijt_log.info(f"[read_product_instance_uri] {tool_name} → {pi_value}")
+        for tools_path in _TOOLS_PATHS:
+            if found.get(tools_path):
+                return found[tools_path]
+        return []
+
     async def methodcall(self, data: dict) -> dict[str, Any]:
         """Coroutine. Invoke an OPC UA method node on an object node.
 
@@ -767,80 +1486,13 @@ class Connection:
             obj = self.client.get_node(obj_id)
             method = self.client.get_node(method_id)
 
-            input_args_node = await method.get_child("0:InputArguments")
-            expected_args = await input_args_node.get_value()
-
-            if len(arguments) != len(expected_args):
-                ijt_log.warning(
-                    f"[methodcall] Argument count mismatch: expected {len(expected_args)}, got {len(arguments)}"
-                )
-
+            plan = await self._argument_plan(method, method_id, arguments)
             input_args = []
-            for i, arg in enumerate(arguments):
+            for i, (arg, convert) in enumerate(zip(arguments, plan)):
                 try:
-                    expected_type_node = expected_args[i].DataType
-                    value = arg["value"]
-
-                    ijt_log.info(f"[methodcall] Argument {i + 1} expected type NodeId: {expected_type_node}")
-                    ijt_log.info(
-                        f"[methodcall] Argument {i + 1} Identifier type: {type(expected_type_node.Identifier)}"
-                    )
-
-                    variant_type = self.map_nodeid_to_varianttype(arg["dataType"]) or ua.VariantType.String
-
-                    # Convert LocalizedText dict from GUI to ua.LocalizedText
-                    if variant_type == ua.VariantType.LocalizedText:
-                        if isinstance(value, dict):
-                            value = ua.LocalizedText(
-                                Text=value.get("Text", ""),
-                                Locale=value.get("Locale", "en"),
-                            )
-                        elif value is None:
-                            value = ua.LocalizedText(Text="", Locale="en")
-
-                    if variant_type == ua.VariantType.DateTime and isinstance(value, str):
-                        normalized_datetime = value.replace("Z", "+00:00")
-                        value = datetime.datetime.fromisoformat(normalized_datetime)
-                        if value.tzinfo is not None:
-                            value = value.astimezone(datetime.UTC).replace(tzinfo=None)
-
-                    # Sanitize None for strings
-                    if value is None and variant_type == ua.VariantType.String:
-                        value = ""
-
-                    # Optional: warn on empty strings
-                    if isinstance(value, str) and value.strip() == "" and variant_type == ua.VariantType.String:
-                        ijt_log.warning(f"[methodcall] Argument {i + 1} is empty string - server may reject it.")
-
-                    # Handle arrays
-                    if isinstance(value, list):
-                        if variant_type == ua.VariantType.String:
-                            input_args.append(ua.Variant(value, variant_type, is_array=True))
-                            ijt_log.info(
-                                f"[methodcall] Argument {i + 1} mapped to Array of {variant_type.name} with value {value}"
-                            )
-                        else:
-                            input_args.append(ua.Variant(value, variant_type, is_array=True))
-                            ijt_log.info(f"[methodcall] Argument {i + 1} mapped to Array of {variant_type.name}")
-                    else:
-                        # Type correction logic
-                        if isinstance(value, str) and value.isdigit():
-                            value = int(value)
-                        elif isinstance(value, int) and variant_type in [
-                            ua.VariantType.UInt32,
-                            ua.VariantType.UInt64,
-                        ]:
-                            value = abs(value)
-                        elif isinstance(value, float) and variant_type not in [
-                            ua.VariantType.Float,
-                            ua.VariantType.Double,
-                        ]:
-                            variant_type = ua.VariantType.Double
-                        elif isinstance(value, bool):
-                            pass
-
-                        input_args.append(ua.Variant(value, variant_type))
-                        ijt_log.info(f"[methodcall] Argument {i + 1} mapped to {variant_type.name} with value {value}")
+                    if convert is None:
+                        raise ValueError("no InputArguments entry or dataType for this argument")
+                    input_args.append(convert(i + 1, arg["value"]))
                 except Exception as map_err:
                     ijt_log.warning(
                         f"[methodcall] Failed to map argument {i + 1}, fallback to original type: {map_err}"
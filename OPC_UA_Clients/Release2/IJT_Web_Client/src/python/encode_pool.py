@@ -0,0 +1,92 @@
+"""Off-loop encoding of large result events.
+
+Serializing a result with long traces takes long enough to delay the OPC UA
+publish responses handled on the same event loop.  :class:`EncodePool` runs
+such encodings in worker threads: the loop only hands over the work, and a
+worker's bytecode is interleaved with the loop at the interpreter's switch
+interval.  Steps that run in C, such as converting a trace channel or the
+final JSON dump, still hold the interpreter, so how much this shortens loop
+stalls depends on the results; compare the loop lag (:mod:`python.loop_lag`)
+with ``IJT_ENCODE_WORKERS=0`` before relying on it.
+
+:class:`~python.result_event_handler.ResultEventHandler` queues the pending
+future in arrival order and awaits it when it reaches the front of its queue,
+so results still leave in the order they arrived.
+
+``IJT_ENCODE_WORKERS``
+    Worker threads (default ``2``); ``0`` encodes every result on the loop.
+``IJT_ENCODE_OFFLOAD_SAMPLES``
+    Trace samples from which a result is encoded off the loop (default
+    ``20000``).
+"""
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from python.ijt_logger import env_number
+from python.trace_store import result_samples
+
+_WORKERS_DEFAULT = 2
+_OFFLOAD_SAMPLES_DEFAULT = 20000
+
+
+class EncodePool:
+    """Thread pool encoding results that carry at least ``offload_samples`` trace samples."""
+
+    def __init__(self, workers: int = _WORKERS_DEFAULT, offload_samples: int = _OFFLOAD_SAMPLES_DEFAULT) -> None:
+        self.workers = max(0, workers)
+        self.offload_samples = max(0, offload_samples)
+        self.offloaded = 0
+        self._executor: ThreadPoolExecutor | None = None
+
+    @classmethod
+    def from_env(cls) -> "EncodePool":
+        """Build a pool sized by ``IJT_ENCODE_WORKERS`` / ``IJT_ENCODE_OFFLOAD_SAMPLES``."""
+        return cls(
+            int(env_number("IJT_ENCODE_WORKERS", _WORKERS_DEFAULT, 0)),
+            int(env_number("IJT_ENCODE_OFFLOAD_SAMPLES", _OFFLOAD_SAMPLES_DEFAULT, 0)),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """``True`` unless the pool was configured without workers."""
+        return self.workers > 0
+
+    def offloads(self, result: Any) -> bool:
+        """Return ``True`` when ``result`` is large enough to be encoded off the loop."""
+        return self.enabled and result_samples(result) >= self.offload_samples
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> asyncio.Future:
+        """Run ``fn(*args)`` in a worker thread and return the loop future of its result.
+
+        Must be called from the event loop.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="ijt-encode")
+        self.offloaded += 1
+        return asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def close(self) -> None:
+        """Stop the worker threads; encodings that have not started are cancelled."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_default: EncodePool | None = None
+
+
+def default_encode_pool() -> EncodePool:
+    """Return the process-wide :class:`EncodePool`, configured from the environment on first use."""
+    global _default
+    if _default is None:
+        _default = EncodePool.from_env()
+    return _default
+
+
+def close_encode_pool() -> None:
+    """Stop the process-wide encode pool if it was used."""
+    if _default is not None:
+        _default.close()
@@ -0,0 +1,215 @@
+"""Bounded, optionally batched delivery of subscription events to the browser.
+
+:class:`~python.event_handler.EventHandler` and
+:class:`~python.result_event_handler.ResultEventHandler` share the helpers in
+this module to decide what happens when their queue is full and how queued
+events are grouped into WebSocket frames.  A queued event is either one encoded
+payload for every subscriber or a :class:`ViewPayloads` when the tabs sharing
+the connection subscribed with different projections or filters (see
+:mod:`python.event_selection`).
+
+Configuration is read from the environment:
+
+``IJT_EVENT_BATCH_SIZE``
+    Maximum number of events per frame.  ``0``/``1`` (default) keeps the
+    one-frame-per-event behaviour; larger values enable batching and send
+    ``{"command": "events", "endpoint": ..., "data": [...]}`` frames.
+``IJT_EVENT_BATCH_INTERVAL_MS``
+    Longest time the worker waits for a batch to fill up (default ``50``).
+``IJT_EVENT_QUEUE_SIZE``
+    Maximum number of queued events per handler (default ``200``).
+``IJT_EVENT_QUEUE_POLICY``
+    What to do when the queue is full: ``block`` (default — the subscription
+    callback waits), ``drop-oldest`` (discard the oldest queued event) or
+    ``drop-traces`` (strip trace data from the incoming result, then wait).
+"""
+
+import asyncio
+import os
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from python.ijt_logger import env_number, ijt_log
+
+QUEUE_POLICIES = ("block", "drop-oldest", "drop-traces")
+
+_BATCH_SIZE_DEFAULT = 0
+_BATCH_INTERVAL_MS_DEFAULT = 50.0
+_QUEUE_SIZE_DEFAULT = 200
+_QUEUE_POLICY_DEFAULT = "block"
+
+
+@dataclass(frozen=True)
+class DeliveryOptions:
+    """Queue bound, full-queue policy and batching limits for one handler."""
+
+    batch_size: int = _BATCH_SIZE_DEFAULT
+    batch_interval_ms: float = _BATCH_INTERVAL_MS_DEFAULT
+    queue_size: int = _QUEUE_SIZE_DEFAULT
+    queue_policy: str = _QUEUE_POLICY_DEFAULT
+
+    def __post_init__(self) -> None:
+        if self.queue_policy not in QUEUE_POLICIES:
+            raise ValueError(f"queue_policy must be one of {QUEUE_POLICIES}, got {self.queue_policy!r}")
+
+    @property
+    def batching(self) -> bool:
+        """``True`` when more than one event may share a frame."""
+        return self.batch_size > 1
+
+    @classmethod
+    def from_env(cls) -> "DeliveryOptions":
+        """Build options from the ``IJT_EVENT_*`` environment variables."""
+        policy = os.getenv("IJT_EVENT_QUEUE_POLICY", _QUEUE_POLICY_DEFAULT).strip().lower()
+        if policy not in QUEUE_POLICIES:
+            ijt_log.warning(f"Invalid IJT_EVENT_QUEUE_POLICY={policy!r}; using {_QUEUE_POLICY_DEFAULT!r}.")
+            policy = _QUEUE_POLICY_DEFAULT
+        return cls(
+            batch_size=int(env_number("IJT_EVENT_BATCH_SIZE", _BATCH_SIZE_DEFAULT, 0)),
+            batch_interval_ms=env_number("IJT_EVENT_BATCH_INTERVAL_MS", _BATCH_INTERVAL_MS_DEFAULT, 0),
+            queue_size=int(env_number("IJT_EVENT_QUEUE_SIZE", _QUEUE_SIZE_DEFAULT, 1)),
+            queue_policy=policy,
+        )
+
+
+@dataclass
+class DeliveryStats:
+    """Counters describing how a handler's queue and batching behave."""
+
+    events_enqueued: int = 0
+    events_sent: int = 0
+    frames_sent: int = 0
+    dropped_events: int = 0
+    stripped_traces: int = 0
+    filtered_events: int = 0
+    max_queue_depth: int = 0
+    last_batch_size: int = 0
+    max_batch_size: int = 0
+
+    def record_batch(self, size: int) -> None:
+        """Account for one frame carrying ``size`` events."""
+        self.frames_sent += 1
+        self.events_sent += size
+        self.last_batch_size = size
+        self.max_batch_size = max(self.max_batch_size, size)
+
+    def as_dict(self, queue: asyncio.Queue) -> dict[str, int]:
+        """Return the counters plus the current ``queue_depth`` of ``queue``."""
+        return {"queue_depth": queue.qsize(), **asdict(self)}
+
+
+async def enqueue_event(queue: asyncio.Queue, item: Any, options: DeliveryOptions, stats: DeliveryStats) -> None:
+    """Coroutine. Put ``item`` on ``queue``, applying the ``drop-oldest`` policy when full.
+
+    ``block`` and ``drop-traces`` simply wait for room; trace stripping for
+    ``drop-traces`` happens before the item is encoded (see :func:`strip_traces`).
+    """
+    if options.queue_policy == "drop-oldest" and queue.full():
+        dropped = queue.get_nowait()
+        queue.task_done()
+        if dropped is None:
+            # Never discard the shutdown sentinel — drop the incoming event instead.
+            queue.put_nowait(None)
+            stats.dropped_events += 1
+            return
+        stats.dropped_events += 1
+    await queue.put(item)
+    stats.events_enqueued += 1
+    stats.max_queue_depth = max(stats.max_queue_depth, queue.qsize())
+
+
+def strip_traces(serialized_event: Any) -> bool:
+    """Remove ``Trace`` payloads from the ``ResultContent`` of a serialized result event.
+
+    Returns:
+        ``True`` if at least one trace was removed.
+    """
+    result = serialized_event.get("Result") if isinstance(serialized_event, dict) else None
+    content = result.get("ResultContent") if isinstance(result, dict) else None
+    stripped = False
+    for entry in content if isinstance(content, list) else ():
+        if isinstance(entry, dict) and entry.get("Trace") is not None:
+            entry["Trace"] = None
+            stripped = True
+    return stripped
+
+
+async def collect_batch(queue: asyncio.Queue, first: Any, options: DeliveryOptions) -> tuple[list[Any], bool]:
+    """Coroutine. Gather up to ``batch_size`` items starting with ``first``.
+
+    Waits at most ``batch_interval_ms`` for further items.  Every dequeued item,
+    including a shutdown sentinel, must be acknowledged with ``task_done`` by
+    the caller.
+
+    Returns:
+        The batch and whether the shutdown sentinel ``None`` was dequeued.
+    """
+    items = [first]
+    if not options.batching:
+        return items, False
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + options.batch_interval_ms / 1000
+    while len(items) < options.batch_size:
+        try:
+            item = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+        if item is None:
+            return items, True
+        items.append(item)
+    return items, False
+
+
+def encode_frame(endpoint: bytes, payloads: list[bytes]) -> bytes:
+    """Assemble a WebSocket frame from pre-encoded JSON fragments.
+
+    Args:
+        endpoint: JSON-encoded server URL.
+        payloads: JSON-encoded ``data`` value of each event.
+
+    Returns:
+        An ``event`` frame for a single payload, otherwise an ``events``
+        frame whose ``data`` is the list of payloads in queue order.
+    """
+    if len(payloads) == 1:
+        return b"".join((b'{"command":"event","endpoint":', endpoint, b',"data":', payloads[0], b"}"))
+    return b"".join((b'{"command":"events","endpoint":', endpoint, b',"data":[', b",".join(payloads), b"]}"))
+
+
+@dataclass(frozen=True)
+class ViewPayloads:
+    """Encoded payloads of one event for subscribers with different selections.
+
+    ``targets`` pairs the owners of a :class:`~python.session_pool.WebSocketFanout`
+    with the payload they receive; owners whose filter rejected the event are
+    absent.
+    """
+
+    targets: tuple[tuple[tuple, bytes], ...]
+
+
+async def send_batch(websocket: Any, endpoint: bytes, batch: list[Any]) -> None:
+    """Coroutine. Send a batch of queued payloads as ``event``/``events`` frames.
+
+    Plain payloads go to every subscriber in one frame; :class:`ViewPayloads`
+    are grouped per set of owners so that each set receives one frame.
+    """
+    if all(isinstance(item, bytes) for item in batch):
+        await websocket.send(encode_frame(endpoint, batch), text=True)
+        return
+    frames: dict[tuple | None, list[bytes]] = {}
+    for item in batch:
+        targets = item.targets if isinstance(item, ViewPayloads) else ((None, item),)
+        for owners, payload in targets:
+            frames.setdefault(owners, []).append(payload)
+    for owners, payloads in frames.items():
+        if owners is None:
+            await websocket.send(encode_frame(endpoint, payloads), text=True)
+        else:
+            await websocket.send(encode_frame(endpoint, payloads), text=True, owners=list(owners))
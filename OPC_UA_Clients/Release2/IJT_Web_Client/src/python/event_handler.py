@@ -7,14 +7,24 @@ WebSocket by the :class:`EventHandler` queue worker.
 
 import asyncio
 import contextlib
-import json
 import traceback
 from typing import Any
 
 import websockets
 
+from python.event_delivery import (
+    DeliveryOptions,
+    DeliveryStats,
+    ViewPayloads,
+    collect_batch,
+    enqueue_event,
+    send_batch,
+)
+from python.event_selection import FULL, EventSelection
 from python.ijt_logger import ijt_log
-from python.serialize_data import serialize_full_event
+from python.json_codec import dumps
+from python.serialize_data import serialize_compiled_event
+from python.session_pool import event_views
 from python.utils import localizedtext_to_str, log_joining_system_event, nodeid_to_str
 
 _SHUTDOWN_TIMEOUT_S = 5.0
@@ -67,7 +77,9 @@ class EventHandler:
     :meth:`close` is called (typically during connection teardown).
     """
 
-    def __init__(self, websocket: Any, server_url: str, client: Any | None = None) -> None:
+    def __init__(
+        self, websocket: Any, server_url: str, client: Any | None = None, delivery: DeliveryOptions | None = None
+    ) -> None:
         """Initialise the handler and start the background queue-worker task.
 
         Args:
@@ -77,14 +89,36 @@ class EventHandler:
                 the front-end can route it to the right connection view.
             client: Optional asyncua :class:`~asyncua.Client` instance.
                 Stored for potential future use; defaults to ``None``.
+            delivery: Queue bound, full-queue policy and batching limits;
+                read from the ``IJT_EVENT_*`` environment variables when
+                omitted.
         """
         self.websocket = websocket
         self.server_url = server_url
         self.client = client
-        self.queue: asyncio.Queue = asyncio.Queue()
+        self.delivery = delivery or DeliveryOptions.from_env()
+        self.stats = DeliveryStats()
+        self.selection: EventSelection = FULL
+        self.queue: asyncio.Queue = asyncio.Queue(self.delivery.queue_size)
         self.closed = False
         self._queue_task = asyncio.create_task(self.handle_queue())
 
+    def _payloads(self, batch: list[Short]) -> list[Any]:
+        """Encode the events of ``batch`` that pass the subscribers' ``asset``/``jointid`` filters."""
+        views = event_views(self.websocket, self.selection)
+        items: list[Any] = []
+        for event in batch:
+            owners = [owners for selection, owners in views if selection.matches_system_event(event)]
+            if not owners:
+                self.stats.filtered_events += 1
+                continue
+            payload = dumps(serialize_compiled_event(event))
+            if owners[0] is None:
+                items.append(payload)
+            else:
+                items.append(ViewPayloads(tuple((tuple(group), payload) for group in owners)))
+        return items
+
     async def process_event(self, short_event: Short):
         """Coroutine. Enqueue a pre-processed event snapshot for WebSocket delivery.
 
@@ -94,7 +128,7 @@ class EventHandler:
         if self.closed:
             return
         try:
-            await self.queue.put(short_event)
+            await enqueue_event(self.queue, short_event, self.delivery, self.stats)
         except Exception as exc:
             ijt_log.error(f"Error handling process_event: {exc}")
             ijt_log.error(traceback.format_exc())
@@ -129,23 +163,24 @@ class EventHandler:
     async def handle_queue(self):
         """Coroutine. Background worker that drains the event queue and sends messages.
 
+        With batching enabled, consecutive events are grouped into a single
+        ``events`` frame (see :func:`~python.event_delivery.collect_batch`).
         Runs until a sentinel ``None`` item is dequeued (placed by
         :meth:`shutdown`).  Breaks out of the loop and closes the WebSocket on
         unrecoverable send errors.
         """
+        endpoint = dumps(self.server_url)
         while True:
             item = await self.queue.get()
             if item is None:
                 self.queue.task_done()
                 break
+            batch, stopping = await collect_batch(self.queue, item, self.delivery)
             try:
-                serialized_event = serialize_full_event(item)
-                return_value = {
-                    "command": "event",
-                    "endpoint": self.server_url,
-                    "data": serialized_event,
-                }
-                await self.websocket.send(json.dumps(return_value))
+                payloads = self._payloads(batch)
+                if payloads:
+                    await send_batch(self.websocket, endpoint, payloads)
+                    self.stats.record_batch(len(payloads))
             except websockets.exceptions.ConnectionClosedOK:
                 ijt_log.info("WebSocket connection closed normally.")
                 break
@@ -158,7 +193,14 @@ class EventHandler:
                     ijt_log.debug(f"WebSocket close failed during error recovery: {close_exc}")
                 break
             finally:
-                self.queue.task_done()
+                for _ in range(len(batch) + stopping):
+                    self.queue.task_done()
+            if stopping:
+                break
+
+    def delivery_stats(self) -> dict[str, int]:
+        """Return queue depth, batch size and dropped-event counters."""
+        return self.stats.as_dict(self.queue)
 
     async def shutdown(self):
         """Coroutine. Signal the queue worker to stop by enqueuing a sentinel ``None``.
@@ -183,4 +225,4 @@ class EventHandler:
                 self._queue_task.cancel()
                 with contextlib.suppress(asyncio.CancelledError):
                     await self._queue_task
-        ijt_log.info("EventHandler closed.")
+        ijt_log.info(f"EventHandler closed. Delivery stats: {self.delivery_stats()}")
@@ -0,0 +1,274 @@
+"""Per-subscriber projection and filtering of subscription events.
+
+The ``subscribe`` command may carry a ``projection``, a ``traceencoding``,
+``tracepoints``/``downsample`` and a ``filter``::
+
+    {"command": "subscribe", "endpoint": "...",
+     "projection": "full", "traceencoding": "float32", "tracepoints": 1000,
+     "filter": {"classification": [1], "evaluation": [2], "asset": ["T-1"], "jointid": ["J7"]}}
+
+``projection``
+    ``full`` (default) forwards results unchanged, ``no-traces`` drops the
+    ``Trace`` of every result content, ``lazy-traces`` empties the trace
+    sample arrays and keeps the traces for ``gettrace`` (see
+    :mod:`python.trace_store`) and ``overall`` keeps only the overall values
+    (``Trace`` and ``StepResults`` are dropped).
+``traceencoding``
+    ``json`` (default) sends trace samples as lists of numbers; ``float32`` /
+    ``float64`` send each channel as a packed base64 buffer (see
+    :mod:`python.trace_codec`).
+``tracepoints`` / ``downsample``
+    A positive ``tracepoints`` reduces every trace to about that many samples
+    with ``lttb`` (default) or ``minmax`` downsampling and keeps the full
+    trace for ``gettrace`` (see :mod:`python.trace_downsample`); ``0``
+    (default) sends traces at full resolution.
+``filter``
+    Every key is optional; a value is a scalar or a list of accepted values.
+    ``classification`` and ``evaluation`` match ``ResultMetaData.Classification``
+    and ``ResultMetaData.ResultEvaluation`` of result events; ``asset`` and
+    ``jointid`` match the ``EntityId`` of an associated asset or joint entity of
+    result and joining-system events.
+
+The IJT event types deliver a result as one ``ResultDataType`` event field, so
+neither the projection nor these filters can be expressed in the select or
+where clause of an OPC UA ``EventFilter``; the event type itself is chosen with
+``eventtype``.  The projection is therefore applied to the event before it is
+serialized, so excluded traces are never encoded.  Subscribers with the same
+projection, trace encoding and trace resolution share one encoded payload.
+"""
+
+import copy
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from python.trace_codec import TRACE_ENCODINGS, pack_trace
+from python.trace_downsample import DOWNSAMPLE_METHODS, MIN_POINTS, downsample_trace
+
+PROJECTIONS = ("full", "no-traces", "lazy-traces", "overall")
+FILTER_KEYS = ("classification", "evaluation", "asset", "jointid")
+
+# EntityType values (see models/entities/entity-data-type.mjs): asset (2) up to
+# sub_component (13) describe assets, 23 is a joint.
+_ASSET_ENTITY_TYPES = frozenset(range(2, 14))
+_JOINT_ENTITY_TYPE = 23
+
+
+def _values(key: str, raw: Any, kind: type) -> frozenset:
+    items = raw if isinstance(raw, list | tuple | set | frozenset) else [raw]
+    try:
+        return frozenset(kind(item) for item in items if item is not None and item != "")
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Invalid {key!r} filter value {raw!r}") from exc
+
+
+def _int(value: Any) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _entity_ids(entities: Any, entity_types: Iterable[int]) -> set[str]:
+    wanted = set(entity_types)
+    return {
+        str(entity.EntityId)
+        for entity in entities or ()
+        if _int(getattr(entity, "EntityType", None)) in wanted and getattr(entity, "EntityId", None) is not None
+    }
+
+
+def _without(value: Any, names: tuple[str, ...]) -> Any:
+    """Return a shallow copy of ``value`` with the attributes in ``names`` cleared."""
+    present = [name for name in names if getattr(value, name, None) is not None]
+    if not present:
+        return value
+    projected = copy.copy(value)
+    for name in present:
+        setattr(projected, name, [] if name == "StepResults" else None)
+    return projected
+
+
+def _without_samples(value: Any) -> Any:
+    """Return a copy of the content ``value`` whose trace keeps its steps but no sample values."""
+    trace = getattr(value, "Trace", None)
+    if trace is None or not getattr(trace, "StepTraces", None):
+        return value
+    step_traces = []
+    for step_trace in trace.StepTraces:
+        step_trace = copy.copy(step_trace)
+        step_trace.StepTraceContent = [_cleared(content, "Values") for content in step_trace.StepTraceContent or ()]
+        step_traces.append(step_trace)
+    projected_trace = copy.copy(trace)
+    projected_trace.StepTraces = step_traces
+    projected = copy.copy(value)
+    projected.Trace = projected_trace
+    return projected
+
+
+def _cleared(value: Any, name: str) -> Any:
+    value = copy.copy(value)
+    setattr(value, name, [])
+    return value
+
+
+def check_downsampling(points: int, method: str) -> None:
+    """Validate a ``tracepoints``/``downsample`` pair.
+
+    Raises:
+        ValueError: For a negative or too small point count or an unknown method.
+    """
+    if points < 0 or 0 < points < MIN_POINTS:
+        raise ValueError(f"tracepoints must be 0 or at least {MIN_POINTS}, got {points!r}")
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"downsample must be one of {DOWNSAMPLE_METHODS}, got {method!r}")
+
+
+def downsampling_request(data: dict) -> tuple[int, str]:
+    """Return the validated ``(tracepoints, downsample)`` of a command payload.
+
+    Raises:
+        ValueError: For a non-integer, negative or too small ``tracepoints``
+            or an unknown ``downsample`` method.
+    """
+    try:
+        points = int(data.get("tracepoints") or 0)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"tracepoints must be an integer, got {data.get('tracepoints')!r}") from exc
+    method = str(data.get("downsample") or "lttb").lower().strip()
+    check_downsampling(points, method)
+    return points, method
+
+
+@dataclass(frozen=True)
+class EventSelection:
+    """Projection and filter requested by one ``subscribe`` command."""
+
+    projection: str = "full"
+    classification: frozenset[int] = field(default_factory=frozenset)
+    evaluation: frozenset[int] = field(default_factory=frozenset)
+    asset: frozenset[str] = field(default_factory=frozenset)
+    jointid: frozenset[str] = field(default_factory=frozenset)
+    traceencoding: str = "json"
+    tracepoints: int = 0
+    downsample: str = "lttb"
+
+    def __post_init__(self) -> None:
+        if self.projection not in PROJECTIONS:
+            raise ValueError(f"projection must be one of {PROJECTIONS}, got {self.projection!r}")
+        if self.traceencoding not in TRACE_ENCODINGS:
+            raise ValueError(f"traceencoding must be one of {TRACE_ENCODINGS}, got {self.traceencoding!r}")
+        check_downsampling(self.tracepoints, self.downsample)
+
+    @classmethod
+    def from_request(cls, data: dict) -> "EventSelection":
+        """Build the selection from a ``subscribe`` payload.
+
+        Raises:
+            ValueError: For an unknown projection, filter key or value.
+        """
+        projection = str(data.get("projection") or "full").lower().strip()
+        traceencoding = str(data.get("traceencoding") or "json").lower().strip()
+        tracepoints, downsample = downsampling_request(data)
+        filters = data.get("filter") or {}
+        if not isinstance(filters, dict):
+            raise ValueError("filter must be an object")
+        unknown = sorted(set(filters) - set(FILTER_KEYS))
+        if unknown:
+            raise ValueError(f"Unknown filter key(s) {unknown}; expected {FILTER_KEYS}")
+        return cls(
+            projection=projection,
+            classification=_values("classification", filters.get("classification", []), int),
+            evaluation=_values("evaluation", filters.get("evaluation", []), int),
+            asset=_values("asset", filters.get("asset", []), str),
+            jointid=_values("jointid", filters.get("jointid", []), str),
+            traceencoding=traceencoding,
+            tracepoints=tracepoints,
+            downsample=downsample,
+        )
+
+    @property
+    def shape(self) -> tuple[str, str, int, str]:
+        """Projection, trace encoding and resolution — selections with the same shape share a payload."""
+        return self.projection, self.traceencoding, self.tracepoints, self.downsample
+
+    @property
+    def keeps_traces(self) -> bool:
+        """``True`` when the full traces must be kept for ``gettrace``."""
+        return self.projection == "lazy-traces" or (self.tracepoints > 0 and self.projection == "full")
+
+    @property
+    def passes_everything(self) -> bool:
+        """``True`` when no filter is set."""
+        return not (self.classification or self.evaluation or self.asset or self.jointid)
+
+    def _matches_entities(self, entities: Any) -> bool:
+        if self.asset and not self.asset & _entity_ids(entities, _ASSET_ENTITY_TYPES):
+            return False
+        return not (self.jointid and not self.jointid & _entity_ids(entities, (_JOINT_ENTITY_TYPE,)))
+
+    def matches_result(self, result: Any) -> bool:
+        """Return whether a result event's ``Result`` passes the filter."""
+        if self.passes_everything:
+            return True
+        meta = getattr(result, "ResultMetaData", None)
+        if self.classification and _int(getattr(meta, "Classification", None)) not in self.classification:
+            return False
+        if self.evaluation and _int(getattr(meta, "ResultEvaluation", None)) not in self.evaluation:
+            return False
+        return self._matches_entities(getattr(meta, "AssociatedEntities", None))
+
+    def matches_system_event(self, event: Any) -> bool:
+        """Return whether a joining-system event passes the ``asset``/``jointid`` filter."""
+        return self._matches_entities(getattr(event, "AssociatedEntities", None))
+
+    def project_result(self, result: Any) -> Any:
+        """Return ``result`` reduced to the projection and trace encoding, without modifying it."""
+        if self.shape == FULL.shape or result is None:
+            return result
+        content = getattr(result, "ResultContent", None)
+        if not content:
+            return result
+        project = self._content_projection()
+
+        projected_content = []
+        for entry in content:
+            inner = getattr(entry, "Value", None)
+            if inner is not None and not hasattr(entry, "Trace"):
+                # Variant-wrapped content: project the wrapped structure.
+                projected_inner = project(inner)
+                if projected_inner is not inner:
+                    entry = copy.copy(entry)
+                    entry.Value = projected_inner
+                projected_content.append(entry)
+            else:
+                projected_content.append(project(entry))
+        projected = copy.copy(result)
+        projected.ResultContent = projected_content
+        return projected
+
+    def _content_projection(self) -> Any:
+        if self.projection in ("no-traces", "overall"):
+            names = ("Trace",) if self.projection == "no-traces" else ("Trace", "StepResults")
+            return lambda value: _without(value, names)
+        strip = _without_samples if self.projection == "lazy-traces" else None
+        points = self.tracepoints if strip is None else 0
+        dtype = self.traceencoding if self.traceencoding != "json" else None
+
+        def project(value: Any) -> Any:
+            if strip is not None:
+                value = strip(value)
+            trace = getattr(value, "Trace", None)
+            if trace is not None and (points or dtype is not None):
+                if points:
+                    trace = downsample_trace(trace, points, self.downsample)
+                if dtype is not None:
+                    trace = pack_trace(trace, dtype)
+                value = copy.copy(value)
+                value.Trace = trace
+            return value
+
+        return project
+
+
+FULL = EventSelection()
@@ -2,7 +2,9 @@
 
 :class:`IJTInterface` is instantiated once per connected browser tab and
 delegates every command arriving over the WebSocket to the appropriate
-:class:`~python.connection.Connection` method.  It also owns the persistent
+:class:`~python.connection.Connection` method.  Connections come from a
+:class:`~python.session_pool.SessionPool`, so tabs attached to the same
+endpoint share one OPC UA session.  It also owns the persistent
 JSON resource files (``connectionpoints.json``, ``settings.json``) under
 ``src/resources/``. The mutable runtime files are generated from committed
 ``*.default.json`` templates on first use.
@@ -21,6 +23,10 @@ from typing import Any, Dict, Optional
 
 from python.connection import Connection
 from python.ijt_logger import ijt_log
+from python.json_codec import send_json
+from python.metrics import metrics
+from python.result_store import ResultStore
+from python.session_pool import SessionPool
 
 
 class _PluginCommandRegistry:
@@ -53,15 +59,42 @@ class IJTInterface:
             "connect",
             "disconnect",
             "subscribe",
+            "gettrace",
             "read",
+            "readmany",
             "browse",
+            "browsemany",
             "namespaces",
             "pathtoid",
+            "pathstoids",
             "methodcall",
             "read_product_instance_uri",
         }
     )
 
+    # Connection methods that take the requesting tab as ``owner``.
+    _PER_TAB_METHODS: frozenset = frozenset({"subscribe", "gettrace"})
+
+    # Commands answered by the interface itself; with the connection methods
+    # and plugin commands these are the labels of the command-latency metrics.
+    _INTERFACE_COMMANDS: frozenset = frozenset(
+        {
+            "get connectionpoints",
+            "get default connectionpoints",
+            "set connectionpoints",
+            "reset connectionpoints",
+            "get settings",
+            "get method metadata",
+            "set settings",
+            "read product instance uri",
+            "connect to",
+            "test connection",
+            "terminate connection",
+            "queryresults",
+            "get metrics",
+        }
+    )
+
     # Resolve resources/ relative to this file so the server works regardless
     # of which directory the process was started from or host filesystem casing.
     _SOURCE_ROOT: Path = Path(__file__).resolve().parent.parent
@@ -131,7 +164,11 @@ class IJTInterface:
     _PLUGIN_HOST_GLOB: str = "javascripts/views/*/host/ijt_plugin_host.py"
     _plugin_commands_cache: Optional[dict] = None
 
-    def __init__(self) -> None:
+    def __init__(self, pool: Optional[SessionPool] = None, result_store: Optional[ResultStore] = None) -> None:
+        # Without a shared pool each tab gets private sessions, closed on detach.
+        self.pool = pool if pool is not None else SessionPool(idle_grace_s=0.0)
+        # Process-wide result history searched by "queryresults"; disabled unless supplied.
+        self.result_store = result_store if result_store is not None else ResultStore(None)
         self.connection_list: Dict[str, Optional[Connection]] = {}
         self.disconnected = False
         self._plugin_commands: dict[str, Any] = self._get_plugin_commands()
@@ -439,6 +476,9 @@ class IJTInterface:
             return {"exception": f"Method '{func}' not found"}
 
         try:
+            if func in self._PER_TAB_METHODS:
+                # On a shared connection these act for the requesting tab only.
+                return await method(data, owner=self)
             return await method(data)
         except Exception as exc:
             ijt_log.error(f"Exception in method call '{func}': {exc}")
@@ -566,40 +606,42 @@ class IJTInterface:
             ijt_log.error(f"Error writing settings: {exc}")
 
     async def handle_connect_to(self, endpoint: str, websocket) -> dict:
-        """Coroutine. Open (or re-open) an OPC UA connection for the given endpoint.
+        """Coroutine. Attach this tab to the pooled OPC UA connection for the given endpoint.
 
-        If a connection for ``endpoint`` already exists it is terminated before
-        the new one is established, ensuring a clean state.
+        A connection this tab already holds is released first.  An open pooled
+        session is shared with the other tabs; otherwise a new connection is
+        created and connected.
 
         Args:
             endpoint: OPC UA server URL (e.g. ``"opc.tcp://192.168.1.1:4840"``).
             websocket: The active WebSocket connection used to forward events.
 
         Returns:
-            The result dict from :meth:`~Python.connection.Connection.connect`,
+            The result dict from :meth:`~Python.connection.Connection.connect`
+            (or the ``connection established`` event of a shared session),
             or ``{"exception": "…"}`` on failure.
         """
         ijt_log.info("SOCKET: connect")
         if endpoint in self.connection_list and self.connection_list[endpoint]:
-            ijt_log.info("Endpoint already connected. Closing old connection first.")
-            try:
-                await self.connection_list[endpoint].terminate()  # type: ignore[union-attr]
-                await asyncio.sleep(0.2)
-            except Exception as exc:
-                ijt_log.warning(f"Error terminating old connection: {exc}")
+            ijt_log.info("Endpoint already connected. Releasing old connection first.")
+            await self._safe_terminate(endpoint, self.connection_list[endpoint])
             self.connection_list[endpoint] = None
 
         try:
-            connection = Connection(endpoint, websocket)
+            connection, result = await self.pool.acquire(endpoint, self, websocket, self._new_connection)
             self.connection_list[endpoint] = connection
-            return await connection.connect()
+            return result
         except Exception as exc:
+            self.connection_list[endpoint] = self.pool.get(endpoint)
             ijt_log.error(f"Exception in connect to '{endpoint}': {exc}")
             return {"exception": str(exc)}
 
+    def _new_connection(self, endpoint: str, websocket: Any) -> Connection:
+        return Connection(endpoint, websocket, result_store=self.result_store)
+
     async def handle_test_connection(self, endpoint: str) -> dict:
         """Probe an OPC UA endpoint without replacing or closing any open tab connection."""
-        existing_connection = self.connection_list.get(endpoint)
+        existing_connection = self.connection_list.get(endpoint) or self.pool.get(endpoint)
         if existing_connection:
             try:
                 if await existing_connection.is_connection_open():
@@ -660,13 +702,16 @@ class IJTInterface:
 
         Parses ``data["command"]``, dispatches to the matching handler method
         or :meth:`call_connection`, serializes the result, and sends it back
-        over the WebSocket as JSON.
+        over the WebSocket as JSON via :func:`~python.json_codec.send_json`.
+        The time from here to the sent response is recorded in the
+        command-latency metrics (:mod:`python.metrics`).
 
         Args:
             websocket: The active WebSocket connection to send the response on.
             data: Parsed JSON payload from the client; must contain at least
                 a ``"command"`` key.
         """
+        started = time.perf_counter()
         return_values: dict[str, Any] = {}
         command = data.get("command") or ""
         endpoint = data.get("endpoint") or ""
@@ -686,6 +731,7 @@ class IJTInterface:
                 return_values = self.build_method_metadata()
             elif command == "set settings":
                 await self.handle_set_settings(data)
+                self._observe(command, started, return_values)
                 return
             elif command == "read product instance uri":
                 return_values = await self.call_connection(data, "read_product_instance_uri")
@@ -695,6 +741,10 @@ class IJTInterface:
                 return_values = await self.handle_test_connection(endpoint)
             elif command == "terminate connection":
                 return_values = await self.handle_terminate_connection(endpoint)
+            elif command == "queryresults":
+                return_values = await self.result_store.query(data)
+            elif command == "get metrics":
+                return_values = metrics.snapshot(self.pool.queue_stats())
             elif command in self._plugin_commands:
                 return_values = await self._plugin_commands[command](self, data)
             else:
@@ -704,13 +754,23 @@ class IJTInterface:
             return_values = {"exception": str(exc)}
 
         response = self._build_response(command, endpoint, data.get("uniqueid"), return_values)
-        await websocket.send(json.dumps(response))
+        await send_json(websocket, response)
+        self._observe(command, started, return_values)
+
+    def _observe(self, command: str, started: float, return_values: Any) -> None:
+        known = command in self._INTERFACE_COMMANDS or command in self._ALLOWED_METHODS
+        metrics.observe_command(
+            command if known or command in self._plugin_commands else "other",
+            time.perf_counter() - started,
+            isinstance(return_values, dict) and "exception" in return_values,
+        )
 
     async def disconnect(self) -> None:
-        """Coroutine. Terminate all OPC UA connections for this WebSocket session.
+        """Coroutine. Release all OPC UA connections of this WebSocket session.
 
-        Idempotent — subsequent calls after the first are no-ops.  Uses
-        ``asyncio.gather`` to terminate all connections concurrently.
+        Pooled sessions are closed once no other tab uses them.  Idempotent —
+        subsequent calls after the first are no-ops.  Uses ``asyncio.gather``
+        to release all connections concurrently.
         """
         if self.disconnected:
             return
@@ -729,18 +789,17 @@ class IJTInterface:
         ijt_log.info("All OPC UA connections cleaned up.")
 
     async def _safe_terminate(self, endpoint: str, connection: Optional[Connection]) -> None:
-        """Coroutine. Terminate a connection, swallowing exceptions.
+        """Coroutine. Release this tab's connection to the pool, swallowing exceptions.
 
         Args:
-            endpoint: Server URL used only for log messages.
-            connection: The :class:`~Python.connection.Connection` to close,
+            endpoint: Server URL of the connection.
+            connection: The :class:`~Python.connection.Connection` to release,
                 or ``None`` (in which case this is a no-op).
         """
         if not connection:
             return
         try:
-            await connection.terminate()
-            ijt_log.info(f"Disconnected from {endpoint}")
+            await self.pool.release(endpoint, self, connection)
         except Exception as exc:
             ijt_log.warning(f"Error disconnecting from {endpoint}: {exc}")
 
@@ -3,10 +3,29 @@
 Provides a pre-configured :data:`ijt_log` logger that emits millisecond-
 precision timestamps via :class:`MillisecondFormatter`, and suppresses noisy
 output from third-party libraries such as *asyncua*.
+
+Records of :data:`ijt_log` are queued unformatted; a
+:class:`~logging.handlers.QueueListener` thread merges their arguments,
+formats them and writes them out, so the event loop pays for neither.
+Received events are logged as one :class:`EventRecord` each, whose text is
+only built on that thread.
+
+``IJT_LOG_LEVEL``
+    Level of :data:`ijt_log` (default ``INFO``).
+``IJT_EVENT_LOG``
+    How received events are logged: ``pretty`` (default) as a multi-line
+    block, ``structured`` as one JSON object per event.
 """
 
+import atexit
+import json
 import logging
+import os
+import queue
+from collections.abc import Callable
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any
 
 
 class MillisecondFormatter(logging.Formatter):
@@ -34,6 +53,79 @@ class MillisecondFormatter(logging.Formatter):
         return ct.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
 
 
+class _DeferredQueueHandler(QueueHandler):
+    """Queue handler that leaves formatting to the listener thread.
+
+    :meth:`QueueHandler.prepare` formats the message in the logging thread;
+    this handler queues the record as it is, so lazy arguments such as
+    :class:`EventRecord` are rendered by the listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Return ``record`` unchanged."""
+        return record
+
+
+# An event field is ``(key, label, value)``; ``value`` may be a list of
+# strings or a list of field lists (one per entity or reported value).
+EventFields = list[tuple[str, str, Any]]
+
+EVENT_LOG_FORMAT = os.getenv("IJT_EVENT_LOG", "pretty").strip().lower()
+
+
+def _structured(fields: EventFields) -> dict[str, Any]:
+    return {
+        key: [_structured(item) if isinstance(item, list) else item for item in value]
+        if isinstance(value, list)
+        else value
+        for key, _, value in fields
+    }
+
+
+def _pretty(fields: EventFields, label_width: int, indent: str = "") -> list[str]:
+    lines = []
+    for _, label, value in fields:
+        if isinstance(value, list):
+            lines.append(f"{indent + label:<{label_width}} :")
+            for item in value:
+                if isinstance(item, list):
+                    lines += _pretty(item, label_width, indent + "  ")
+                else:
+                    lines.append(f"{'':<{label_width}} {item}")
+        else:
+            lines.append(f"{indent + label:<{label_width}} : {value}")
+    return lines
+
+
+class EventRecord:
+    """Log message of one received event, rendered only when a handler formats it.
+
+    Args:
+        kind: Event name used as ``"event"`` in structured output.
+        title: Heading used when the fields cannot be built.
+        build: Returns the event's fields; called on the listener thread, so
+            nothing is built for records filtered out by level.
+        label_width: Label column width of the pretty block.
+    """
+
+    __slots__ = ("kind", "title", "build", "label_width")
+
+    def __init__(self, kind: str, title: str, build: Callable[[], EventFields], label_width: int = 40) -> None:
+        self.kind = kind
+        self.title = title
+        self.build = build
+        self.label_width = label_width
+
+    def __str__(self) -> str:
+        try:
+            fields = self.build()
+        except Exception as exc:
+            return f"{self.title} : could not format event: {exc}"
+        if EVENT_LOG_FORMAT == "structured":
+            return json.dumps({"event": self.kind, **_structured(fields)}, default=str)
+        return "\n".join(["-" * 80, *_pretty(fields, self.label_width), "-" * 80])
+
+
 _formatter = MillisecondFormatter(
     "[%(asctime)s] [%(levelname)s] %(filename)s:%(funcName)s - %(message)s",
     datefmt="%Y-%m-%d %H:%M:%S.%f",
@@ -42,11 +134,31 @@ _formatter = MillisecondFormatter(
 _handler = logging.StreamHandler()
 _handler.setFormatter(_formatter)
 
+_queue: queue.SimpleQueue = queue.SimpleQueue()
+_listener = QueueListener(_queue, _handler, respect_handler_level=True)
+_listener.start()
+atexit.register(_listener.stop)
+
 ijt_log = logging.getLogger("ijt_logger")
-ijt_log.setLevel(logging.INFO)
-ijt_log.addHandler(_handler)
+try:
+    ijt_log.setLevel(os.getenv("IJT_LOG_LEVEL", "INFO").strip().upper() or "INFO")
+except ValueError:
+    ijt_log.setLevel(logging.INFO)
+ijt_log.addHandler(_DeferredQueueHandler(_queue))
 ijt_log.propagate = False
 
 # Reduce verbosity of external libraries
 logging.getLogger("asyncua").setLevel(logging.ERROR)
 logging.getLogger("asyncua.client.ua_client").setLevel(logging.CRITICAL)
+
+
+def env_number(name: str, default: float, minimum: float = 0.0) -> float:
+    """Read a numeric setting from the environment, at least ``minimum``; ``default`` when unset or invalid."""
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return max(minimum, float(raw))
+    except ValueError:
+        ijt_log.warning(f"Invalid {name}={raw!r}; using {default}.")
+        return default
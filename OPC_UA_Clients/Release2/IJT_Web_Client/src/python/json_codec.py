@@ -0,0 +1,96 @@
+"""JSON codec shared by every WebSocket frame the backend sends or receives.
+
+Uses the fastest installed native backend (``orjson``, then ``msgspec``) and
+falls back to the standard-library :mod:`json` module.  :func:`dumps` always
+returns UTF-8 ``bytes`` so :func:`send_json` can hand the buffer to
+``websocket.send`` as a text frame without a second str→bytes encode.
+
+Set ``IJT_JSON_BACKEND`` to ``orjson``, ``msgspec`` or ``json`` to force a
+backend (``auto``, the default, picks the first one that is installed).
+"""
+
+import json
+import os
+from typing import Any
+
+from python.ijt_logger import ijt_log
+
+try:
+    import orjson  # type: ignore[import-not-found]
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgspec  # type: ignore[import-not-found]
+except ImportError:
+    msgspec = None  # type: ignore[assignment]
+
+_BACKEND_ENV = "IJT_JSON_BACKEND"
+
+
+def _select_backend() -> str:
+    requested = os.getenv(_BACKEND_ENV, "auto").strip().lower()
+    available = {"orjson": orjson is not None, "msgspec": msgspec is not None, "json": True}
+    if requested in available and available[requested]:
+        return requested
+    if requested not in ("auto", ""):
+        ijt_log.warning(f"{_BACKEND_ENV}={requested!r} is not available; selecting automatically.")
+    if orjson is not None:
+        return "orjson"
+    if msgspec is not None:
+        return "msgspec"
+    return "json"
+
+
+BACKEND = _select_backend()
+
+_msgspec_encoder = msgspec.json.Encoder() if BACKEND == "msgspec" else None
+_msgspec_decoder = msgspec.json.Decoder() if BACKEND == "msgspec" else None
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    # ensure_ascii=True keeps lone surrogates from breaking the UTF-8 encode.
+    return json.dumps(obj, ensure_ascii=True, separators=(",", ":")).encode("ascii")
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode ``obj`` as compact UTF-8 JSON bytes.
+
+    Values the native backend rejects (e.g. integers beyond 64 bits) are
+    retried with the standard-library encoder, which raises ``TypeError`` /
+    ``ValueError`` exactly as :func:`json.dumps` would.
+    """
+    if BACKEND == "orjson":
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except (TypeError, ValueError) as exc:
+            ijt_log.debug(f"orjson encode failed; using stdlib json fallback: {exc}")
+    elif BACKEND == "msgspec":
+        try:
+            return _msgspec_encoder.encode(obj)  # type: ignore[union-attr]
+        except (TypeError, ValueError, OverflowError) as exc:
+            ijt_log.debug(f"msgspec encode failed; using stdlib json fallback: {exc}")
+    return _stdlib_dumps(obj)
+
+
+def loads(data: str | bytes) -> Any:
+    """Decode a JSON text or UTF-8 bytes payload.
+
+    Raises:
+        json.JSONDecodeError: For malformed input, regardless of backend.
+    """
+    if BACKEND == "orjson":
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError.
+        return orjson.loads(data)
+    if BACKEND == "msgspec":
+        try:
+            return _msgspec_decoder.decode(data)  # type: ignore[union-attr]
+        except msgspec.DecodeError as exc:
+            doc = data if isinstance(data, str) else data.decode("utf-8", errors="replace")
+            raise json.JSONDecodeError(str(exc), doc, 0) from exc
+    return json.loads(data)
+
+
+async def send_json(websocket: Any, obj: Any) -> None:
+    """Coroutine. Encode ``obj`` and send it as a WebSocket text frame."""
+    await websocket.send(dumps(obj), text=True)
@@ -0,0 +1,93 @@
+"""Event-loop lag measurement.
+
+:class:`LoopLagMonitor` sleeps for a fixed interval in a background task and
+records how much later than requested it woke up.  That delay is the time
+callbacks on the loop — OPC UA publish responses, WebSocket frames — wait
+behind whatever currently holds the loop, e.g. serializing a large result.
+
+``IJT_LOOP_LAG_INTERVAL_MS``
+    Sampling interval (default ``100``); ``0`` disables the monitor.
+``IJT_LOOP_LAG_WARN_MS``
+    Lag logged as a warning, at most once per ``10`` seconds (default ``250``).
+"""
+
+import asyncio
+import contextlib
+import math
+from collections import deque
+
+from python.ijt_logger import env_number, ijt_log
+
+_INTERVAL_MS_DEFAULT = 100.0
+_WARN_MS_DEFAULT = 250.0
+_WARN_EVERY_S = 10.0
+_WINDOW = 600
+
+
+class LoopLagMonitor:
+    """Background task sampling the lag of the running event loop."""
+
+    def __init__(self, interval_ms: float = _INTERVAL_MS_DEFAULT, warn_ms: float = _WARN_MS_DEFAULT) -> None:
+        self.interval_s = interval_ms / 1000
+        self.warn_ms = warn_ms
+        self.samples = 0
+        self.max_ms = 0.0
+        self._recent: deque[float] = deque(maxlen=_WINDOW)
+        self._task: asyncio.Task | None = None
+        self._warned_at = -math.inf
+
+    @classmethod
+    def from_env(cls) -> "LoopLagMonitor":
+        """Build a monitor configured by ``IJT_LOOP_LAG_INTERVAL_MS`` / ``IJT_LOOP_LAG_WARN_MS``."""
+        return cls(
+            env_number("IJT_LOOP_LAG_INTERVAL_MS", _INTERVAL_MS_DEFAULT),
+            env_number("IJT_LOOP_LAG_WARN_MS", _WARN_MS_DEFAULT),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """``True`` unless the monitor was configured with a zero interval."""
+        return self.interval_s > 0
+
+    def start(self) -> None:
+        """Start sampling on the running loop; does nothing when disabled or already started."""
+        if self.enabled and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Coroutine. Stop sampling; the collected statistics are kept."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval_s)
+            now = loop.time()
+            self.record(max(0.0, (now - started - self.interval_s) * 1000), now)
+
+    def record(self, lag_ms: float, now: float) -> None:
+        """Account for one lag sample taken at loop time ``now``."""
+        self.samples += 1
+        self.max_ms = max(self.max_ms, lag_ms)
+        self._recent.append(lag_ms)
+        if self.warn_ms and lag_ms >= self.warn_ms and now - self._warned_at >= _WARN_EVERY_S:
+            self._warned_at = now
+            ijt_log.warning(f"Event loop lagged {lag_ms:.0f} ms behind schedule.")
+
+    def as_dict(self) -> dict[str, float]:
+        """Return the sample count, the all-time maximum and the last/mean/p99 lag of recent samples in ms."""
+        recent = sorted(self._recent)
+        if not recent:
+            return {"samples": 0, "last_ms": 0.0, "mean_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        return {
+            "samples": self.samples,
+            "last_ms": round(self._recent[-1], 3),
+            "mean_ms": round(sum(recent) / len(recent), 3),
+            "p99_ms": round(recent[min(len(recent) - 1, math.ceil(len(recent) * 0.99) - 1)], 3),
+            "max_ms": round(self.max_ms, 3),
+        }
@@ -0,0 +1,306 @@
+"""Latency, lag, queue and traffic metrics of the WebSocket backend.
+
+The process-wide :data:`metrics` registry collects what is needed to tell
+whether slowness comes from the controller, the backend or the browser:
+
+* the latency of every WebSocket command, measured by
+  :meth:`~python.ijt_interface.IJTInterface.handle` from receipt to the sent
+  response;
+* the round-trip time of every OPC UA service request per endpoint, reported
+  by asyncua's request observer (:func:`observe_client`);
+* the event-loop lag sampled by a :class:`~python.loop_lag.LoopLagMonitor`;
+* the depth of the event queues of every pooled connection and of the
+  per-tab send queues;
+* the bytes and frames sent on every browser socket (:class:`MeteredSocket`).
+
+The ``get metrics`` WebSocket command returns :meth:`Metrics.snapshot`.  With
+``IJT_METRICS_PORT`` set, :func:`serve_prometheus` also serves
+:meth:`Metrics.prometheus_text` at ``http://<IJT_METRICS_HOST>:<port>/metrics``
+(host default ``127.0.0.1``).
+"""
+
+import asyncio
+import bisect
+import os
+import time
+from collections.abc import Callable
+from typing import Any
+
+from python.ijt_logger import ijt_log
+from python.loop_lag import LoopLagMonitor
+
+try:
+    from asyncua.observer import Observer as _Observer
+except ImportError:  # asyncua builds without request observers
+    _Observer = object  # type: ignore[assignment,misc]
+
+# Histogram bucket upper bounds in seconds, from sub-millisecond reads to the 60 s method-call timeout.
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_HTTP_READ_TIMEOUT_S = 5.0
+
+
+class Histogram:
+    """Bucketed distribution of durations in seconds."""
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.errors = 0
+
+    def observe(self, seconds: float, failed: bool = False) -> None:
+        """Account for one duration; ``failed`` also counts it as an error."""
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+        self.errors += failed
+
+    def quantile(self, q: float) -> float:
+        """Return the upper bound of the bucket holding quantile ``q`` (the maximum for the last bucket)."""
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                return BUCKETS[index] if index < len(BUCKETS) else self.max
+        return 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return count, errors and mean/p50/p95/p99/max in milliseconds."""
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": round(self.sum / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.quantile(0.5) * 1000, 3),
+            "p95_ms": round(self.quantile(0.95) * 1000, 3),
+            "p99_ms": round(self.quantile(0.99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class _RequestObserver(_Observer):
+    """asyncua observer recording the service round trips and notifications of one endpoint."""
+
+    def __init__(self, registry: "Metrics", endpoint: str) -> None:
+        self.registry = registry
+        self.endpoint = endpoint
+
+    def on_request(self, request_type: str, duration: float, error: BaseException | None) -> None:
+        service = request_type.removesuffix("Request")
+        services = self.registry.opcua.setdefault(self.endpoint, {})
+        services.setdefault(service, Histogram()).observe(duration, error is not None)
+
+    def on_notification(self, subscription_id: int | None, event_count: int) -> None:
+        notifications = self.registry.notifications
+        notifications[self.endpoint] = notifications.get(self.endpoint, 0) + event_count
+
+
+def _socket_label(websocket: Any) -> str:
+    address = getattr(websocket, "remote_address", None)
+    if isinstance(address, tuple) and len(address) >= 2:
+        return f"{address[0]}:{address[1]}"
+    return f"socket-{id(websocket):x}"
+
+
+class MeteredSocket:
+    """Browser WebSocket that counts the bytes and frames sent through it.
+
+    Every other attribute is delegated to the wrapped socket.
+    """
+
+    def __init__(self, websocket: Any) -> None:
+        self._websocket = websocket
+        self.label = _socket_label(websocket)
+        self.bytes_sent = 0
+        self.frames_sent = 0
+
+    async def send(self, data: str | bytes, text: bool | None = None) -> None:
+        """Coroutine. Send ``data`` on the wrapped socket and count it."""
+        await self._websocket.send(data, text=text)
+        self.frames_sent += 1
+        self.bytes_sent += len(data.encode("utf-8")) if isinstance(data, str) else len(data)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._websocket, name)
+
+
+class Metrics:
+    """Registry of command latencies, OPC UA round trips, socket traffic and loop lag."""
+
+    def __init__(self) -> None:
+        self.started = time.time()
+        self.loop_lag: LoopLagMonitor | None = None
+        self.commands: dict[str, Histogram] = {}
+        self.opcua: dict[str, dict[str, Histogram]] = {}
+        self.notifications: dict[str, int] = {}
+        self.sockets: dict[str, MeteredSocket] = {}
+        self.closed_bytes_sent = 0
+        self.closed_frames_sent = 0
+
+    def observe_command(self, command: str, seconds: float, failed: bool) -> None:
+        """Account for one handled WebSocket command."""
+        self.commands.setdefault(command, Histogram()).observe(seconds, failed)
+
+    def observer(self, endpoint: str) -> Any:
+        """Return an asyncua request observer recording round trips to ``endpoint``."""
+        return _RequestObserver(self, endpoint)
+
+    def meter_socket(self, websocket: Any) -> MeteredSocket:
+        """Wrap a browser socket so that its traffic is counted until :meth:`release_socket`."""
+        metered = MeteredSocket(websocket)
+        self.sockets[metered.label] = metered
+        return metered
+
+    def release_socket(self, metered: MeteredSocket) -> None:
+        """Stop listing a closed socket; its traffic stays in the totals."""
+        if self.sockets.pop(metered.label, None) is not None:
+            self.closed_bytes_sent += metered.bytes_sent
+            self.closed_frames_sent += metered.frames_sent
+
+    def snapshot(self, queues: dict[str, Any] | None = None) -> dict[str, Any]:
+        """Return every metric as JSON-ready dicts; ``queues`` are the event-queue counters by endpoint."""
+        return {
+            "uptime_s": round(time.time() - self.started, 3),
+            "loop_lag": self.loop_lag.as_dict() if self.loop_lag is not None else None,
+            "commands": {command: hist.as_dict() for command, hist in sorted(self.commands.items())},
+            "opcua": {
+                endpoint: {service: hist.as_dict() for service, hist in sorted(services.items())}
+                for endpoint, services in sorted(self.opcua.items())
+            },
+            "notifications": dict(self.notifications),
+            "sockets": {
+                label: {"bytes_sent": socket.bytes_sent, "frames_sent": socket.frames_sent}
+                for label, socket in self.sockets.items()
+            },
+            "bytes_sent_total": self.closed_bytes_sent + sum(s.bytes_sent for s in self.sockets.values()),
+            "queues": queues or {},
+        }
+
+    def prometheus_text(self, queues: dict[str, Any] | None = None) -> str:
+        """Return the metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+        _histograms(
+            lines,
+            "ijt_command_latency_seconds",
+            "WebSocket command latency.",
+            [({"command": command}, hist) for command, hist in sorted(self.commands.items())],
+        )
+        _histograms(
+            lines,
+            "ijt_opcua_request_seconds",
+            "OPC UA service request round-trip time.",
+            [
+                ({"endpoint": endpoint, "service": service}, hist)
+                for endpoint, services in sorted(self.opcua.items())
+                for service, hist in sorted(services.items())
+            ],
+        )
+        _samples(
+            lines,
+            "ijt_opcua_notifications_total",
+            "counter",
+            "OPC UA notifications received.",
+            [({"endpoint": endpoint}, count) for endpoint, count in sorted(self.notifications.items())],
+        )
+        if self.loop_lag is not None:
+            lag = self.loop_lag.as_dict()
+            _samples(
+                lines,
+                "ijt_event_loop_lag_seconds",
+                "gauge",
+                "Event-loop lag of recent samples.",
+                [({"stat": stat}, lag[f"{stat}_ms"] / 1000) for stat in ("last", "mean", "p99", "max")],
+            )
+        _samples(
+            lines,
+            "ijt_socket_sent_bytes_total",
+            "counter",
+            "Bytes sent per browser socket.",
+            [({"socket": label}, socket.bytes_sent) for label, socket in self.sockets.items()],
+        )
+        _samples(
+            lines,
+            "ijt_event_queue_depth",
+            "gauge",
+            "Events queued per connection and handler.",
+            [
+                ({"endpoint": endpoint, "queue": name}, stats["queue_depth"])
+                for endpoint, handlers in sorted((queues or {}).items())
+                for name, stats in handlers.items()
+                if isinstance(stats, dict)
+            ],
+        )
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict[str, Any]) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _samples(lines: list[str], name: str, kind: str, help_text: str, samples: list[tuple[dict, float]]) -> None:
+    lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    lines += [f"{name}{_labels(labels)} {value}" for labels, value in samples]
+
+
+def _histograms(lines: list[str], name: str, help_text: str, series: list[tuple[dict, Histogram]]) -> None:
+    lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for labels, hist in series:
+        cumulative = 0
+        for bound, count in zip((*BUCKETS, "+Inf"), hist.counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{_labels({**labels, 'le': bound})} {cumulative}")
+        lines.append(f"{name}_sum{_labels(labels)} {hist.sum}")
+        lines.append(f"{name}_count{_labels(labels)} {hist.count}")
+
+
+metrics = Metrics()
+
+
+def observe_client(client: Any, endpoint: str) -> None:
+    """Record the service round trips of an asyncua ``client`` under ``endpoint``.
+
+    Does nothing on asyncua builds without request observers.
+    """
+    uaclient = getattr(client, "uaclient", None)
+    if _Observer is not object and uaclient is not None and hasattr(uaclient, "observer"):
+        uaclient.observer = metrics.observer(endpoint)
+
+
+async def serve_prometheus(render: Callable[[], str]) -> asyncio.Server | None:
+    """Coroutine. Serve ``render()`` at ``/metrics`` on ``IJT_METRICS_PORT``; ``None`` when not configured."""
+    raw = os.getenv("IJT_METRICS_PORT", "").strip()
+    if not raw or raw == "0":
+        return None
+    try:
+        port = int(raw)
+    except ValueError:
+        ijt_log.warning(f"Invalid IJT_METRICS_PORT={raw!r}; Prometheus endpoint disabled.")
+        return None
+    host = os.getenv("IJT_METRICS_HOST", "").strip() or "127.0.0.1"
+
+    async def respond(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), _HTTP_READ_TIMEOUT_S)
+            method, path, *_ = request.split(b"\r\n", 1)[0].decode("latin-1").split(" ")
+            if method == "GET" and path.split("?", 1)[0] == "/metrics":
+                status, content_type, body = "200 OK", "text/plain; version=0.0.4", render().encode("utf-8")
+            else:
+                status, content_type, body = "404 Not Found", "text/plain", b"Not Found\n"
+            head = f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\nContent-Length: {len(body)}\r\n"
+            writer.write(head.encode("latin-1") + b"Connection: close\r\n\r\n" + body)
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, TimeoutError, ValueError) as exc:
+            ijt_log.debug(f"Ignoring malformed metrics request: {exc}")
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(respond, host, port)
+    ijt_log.info(f"Prometheus metrics served at http://{host}:{port}/metrics")
+    return server
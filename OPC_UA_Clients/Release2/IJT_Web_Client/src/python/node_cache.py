@@ -0,0 +1,192 @@
+"""Per-connection LRU cache of OPC UA node attributes and references.
+
+:class:`~python.connection.Connection` keeps one :class:`NodeCache` so that
+repeated ``read``/``browse`` commands for the same node (the address-space
+view re-expanding a folder, the method view re-reading a type) are answered
+without another server round-trip.
+
+Entries expire after ``IJT_NODE_CACHE_TTL_SEC`` seconds (default ``30``) and
+the cache holds at most ``IJT_NODE_CACHE_SIZE`` entries (default ``2048``;
+``0`` disables caching).  :class:`ModelChangeHandler` clears the caches when the
+server reports a ``ModelChangeEvent``/``GeneralModelChangeEvent`` or a new
+NamespaceArray.
+"""
+
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from python.ijt_logger import ijt_log
+
+_CACHE_SIZE_DEFAULT = 2048
+_CACHE_TTL_S_DEFAULT = 30.0
+
+# Sentinel distinguishing "not cached" from a cached falsy value.
+MISSING = object()
+
+
+class NodeCache:
+    """Bounded LRU mapping of ``(kind, node-id)`` to a cached OPC UA reply.
+
+    ``kind`` separates independent facts about the same node (for example
+    ``"attributes"`` and ``"references"``) so they can be cached and
+    invalidated together.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = _CACHE_SIZE_DEFAULT,
+        ttl_s: float = _CACHE_TTL_S_DEFAULT,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max(0, max_entries)
+        self.ttl_s = ttl_s
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str, str], tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @classmethod
+    def from_env(cls) -> "NodeCache":
+        """Build a cache sized by ``IJT_NODE_CACHE_SIZE`` / ``IJT_NODE_CACHE_TTL_SEC``."""
+        try:
+            max_entries = int(os.getenv("IJT_NODE_CACHE_SIZE", str(_CACHE_SIZE_DEFAULT)))
+        except ValueError:
+            ijt_log.warning(f"Invalid IJT_NODE_CACHE_SIZE; using {_CACHE_SIZE_DEFAULT}.")
+            max_entries = _CACHE_SIZE_DEFAULT
+        try:
+            ttl_s = max(0.0, float(os.getenv("IJT_NODE_CACHE_TTL_SEC", str(_CACHE_TTL_S_DEFAULT))))
+        except ValueError:
+            ijt_log.warning(f"Invalid IJT_NODE_CACHE_TTL_SEC; using {_CACHE_TTL_S_DEFAULT}.")
+            ttl_s = _CACHE_TTL_S_DEFAULT
+        return cls(max_entries, ttl_s)
+
+    @property
+    def enabled(self) -> bool:
+        """``True`` unless the cache was configured with zero entries."""
+        return self.max_entries > 0
+
+    def get(self, kind: str, node_id: str) -> Any:
+        """Return the cached value, or :data:`MISSING` if absent or expired."""
+        key = (kind, node_id)
+        entry = self._entries.get(key)
+        if entry is None or self._clock() - entry[0] > self.ttl_s:
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return MISSING
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, kind: str, node_id: str, value: Any) -> None:
+        """Store ``value``, evicting the least recently used entries beyond the bound."""
+        if not self.enabled:
+            return
+        key = (kind, node_id)
+        self._entries[key] = (self._clock(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        if self._entries:
+            self.invalidations += 1
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return entry count and hit/miss/eviction/invalidation counters."""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+class ModelChangeHandler:
+    """asyncua subscription handler that clears caches when the address space changes.
+
+    Clears every registered cache on ``ModelChangeEvent``/``GeneralModelChangeEvent``
+    notifications and whenever the server's NamespaceArray changes, because
+    namespace indexes inside cached node-ids may then point elsewhere.
+    """
+
+    def __init__(self, *caches: Any) -> None:
+        self.caches = caches
+        self._namespaces: list[str] | None = None
+
+    def clear(self) -> None:
+        """Clear every registered cache."""
+        for cache in self.caches:
+            cache.clear()
+
+    def event_notification(self, event: Any) -> None:
+        """asyncua callback for (General)ModelChangeEvent notifications."""
+        ijt_log.info("Address-space model change reported; clearing node caches.")
+        self.clear()
+
+    def datachange_notification(self, node: Any, val: Any, data: Any) -> None:
+        """asyncua callback for Server.NamespaceArray value changes."""
+        self.note_namespace_array(val)
+
+    def note_namespace_array(self, namespaces: Any) -> bool:
+        """Record the server's NamespaceArray and clear the caches if it changed.
+
+        The first array seen only sets the baseline.
+
+        Returns:
+            ``True`` if the caches were cleared.
+        """
+        current = list(namespaces) if namespaces is not None else None
+        changed = self._namespaces is not None and current != self._namespaces
+        self._namespaces = current
+        if changed:
+            ijt_log.info("Server NamespaceArray changed; clearing node caches.")
+            self.clear()
+        return changed
+
+    def reset(self) -> None:
+        """Forget the NamespaceArray baseline and clear the caches (e.g. for a new session)."""
+        self._namespaces = None
+        self.clear()
+
+    def status_change_notification(self, status: Any) -> None:
+        """asyncua callback for subscription status changes.
+
+        Model changes may have been missed while the subscription was
+        unhealthy, so the caches are cleared as well.
+        """
+        ijt_log.warning(f"Model-change subscription status changed: {getattr(status, 'Status', status)}")
+        self.clear()
+
+
+_ASSET_CHANGE_CONDITION_CLASSES = frozenset({"AssetConnectedConditionClassType", "AssetDisconnectedConditionClassType"})
+
+
+def is_asset_change_event(event: Any) -> bool:
+    """Return ``True`` if a JoiningSystemEvent reports an asset being connected or disconnected."""
+    sub_class_names = getattr(event, "ConditionSubClassName", None) or []
+    return any(getattr(name, "Text", name) in _ASSET_CHANGE_CONDITION_CLASSES for name in sub_class_names)
+
+
+class AssetChangeHandler(ModelChangeHandler):
+    """asyncua subscription handler that clears caches when assets are connected or disconnected.
+
+    Receives every JoiningSystemEvent; only those whose ``ConditionSubClassName``
+    is ``AssetConnectedConditionClassType`` or ``AssetDisconnectedConditionClassType``
+    clear the registered caches.
+    """
+
+    def event_notification(self, event: Any) -> None:
+        """asyncua callback for JoiningSystemEvent notifications."""
+        if is_asset_change_event(event):
+            ijt_log.info("Asset connected/disconnected; clearing tool caches.")
+            self.clear()
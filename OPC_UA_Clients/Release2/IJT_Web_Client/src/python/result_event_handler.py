@@ -3,24 +3,39 @@
 Incoming result events are filtered down to a lightweight :class:`Short`
 snapshot, detailed timing information is logged, and the serialized payload is
 forwarded to the browser by the :class:`ResultEventHandler` queue worker.
+Results with long traces are encoded off the event loop by the
+:mod:`python.encode_pool` and sent in their arrival order all the same.
 """
 
 import asyncio
 import contextlib
-import json
 import traceback
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime
 from typing import Any
 
 import pytz  # type: ignore[import-untyped]
 import websockets
 
+from python.encode_pool import EncodePool, default_encode_pool
+from python.event_delivery import (
+    DeliveryOptions,
+    DeliveryStats,
+    ViewPayloads,
+    collect_batch,
+    enqueue_event,
+    send_batch,
+    strip_traces,
+)
+from python.event_selection import FULL, EventSelection
 from python.ijt_logger import ijt_log
-from python.serialize_data import serialize_full_event
-from python.utils import log_result_event_details
+from python.json_codec import dumps
+from python.result_store import ResultStore
+from python.serialize_data import serialize_compiled_event
+from python.session_pool import event_views
+from python.trace_store import TraceStore
+from python.utils import log_result_event_details, log_result_to_file
 
-_QUEUE_SIZE = 200
 _SHUTDOWN_TIMEOUT_S = 5.0
 
 
@@ -50,7 +65,15 @@ class ResultEventHandler:
     and forwarded to the browser via the internal queue worker.
     """
 
-    def __init__(self, websocket: Any, server_url: str) -> None:
+    def __init__(
+        self,
+        websocket: Any,
+        server_url: str,
+        delivery: DeliveryOptions | None = None,
+        trace_store: TraceStore | None = None,
+        result_store: ResultStore | None = None,
+        encode_pool: EncodePool | None = None,
+    ) -> None:
         """Initialise the handler and start the background queue-worker task.
 
         Args:
@@ -58,33 +81,119 @@ class ResultEventHandler:
                 to the browser.
             server_url: OPC UA server URL — included in every event message so
                 the front-end can route it to the correct connection view.
+            delivery: Queue bound, full-queue policy and batching limits;
+                read from the ``IJT_EVENT_*`` environment variables when
+                omitted.
+            trace_store: Where results sent with the ``lazy-traces``
+                projection or downsampled with ``tracepoints`` keep their
+                full traces for ``gettrace``.
+            result_store: History every received result is written to for
+                ``queryresults``.
+            encode_pool: Worker threads encoding large results; the
+                process-wide pool when omitted.
         """
         self.websocket = websocket
         self.server_url = server_url
-        self.queue: asyncio.Queue = asyncio.Queue(_QUEUE_SIZE)
+        self.trace_store = trace_store
+        self.result_store = result_store
+        self.encode_pool = encode_pool or default_encode_pool()
+        self.delivery = delivery or DeliveryOptions.from_env()
+        self.stats = DeliveryStats()
+        self.selection: EventSelection = FULL
+        self.queue: asyncio.Queue = asyncio.Queue(self.delivery.queue_size)
         self.closed = False
         self._queue_task = asyncio.create_task(self.handle_queue())
         ijt_log.info("ResultEventHandler initialized.")
 
+    @staticmethod
+    def _encode(event_obj: Short, selection: EventSelection, strip: bool) -> tuple[bytes, bool]:
+        if selection.shape != FULL.shape:
+            event_obj = replace(event_obj, Result=selection.project_result(event_obj.Result))
+        arg = serialize_compiled_event(event_obj)
+        stripped = strip and strip_traces(arg)
+        return dumps(arg), stripped
+
+    @classmethod
+    def _encode_item(cls, event_obj: Short, matching: list, strip: bool) -> tuple[Any, int]:
+        """Encode ``event_obj`` for every matching selection; return the queue item and the stripped-trace count."""
+        if matching[0][1] is None:
+            payload, stripped = cls._encode(event_obj, matching[0][0], strip)
+            return payload, int(stripped)
+        # Tabs with the same projection, trace encoding and resolution share one encoded payload.
+        encoded: dict[tuple[str, str, int, str], bytes] = {}
+        targets = []
+        stripped_count = 0
+        for selection, owners in matching:
+            if selection.shape not in encoded:
+                encoded[selection.shape], stripped = cls._encode(event_obj, selection, strip)
+                stripped_count += stripped
+            targets.append((tuple(owners), encoded[selection.shape]))
+        return ViewPayloads(tuple(targets)), stripped_count
+
+    @classmethod
+    def _encode_offloaded(cls, event_obj: Short, matching: list, strip: bool) -> tuple[Any, int]:
+        """Worker-thread variant of :meth:`_encode_item`; a failure yields no item instead of raising."""
+        try:
+            return cls._encode_item(event_obj, matching, strip)
+        except Exception as exc:
+            ijt_log.error(f"Result event serialization failed: {exc}")
+            return None, 0
+
     async def process_event(self, event_obj: Short):
         """Coroutine. Serialize and enqueue a result-event snapshot for WebSocket delivery.
 
+        The result is projected and filtered for each distinct subscriber
+        selection (see :mod:`python.event_selection`); a result no subscriber
+        accepts is not queued, but every result is written to the result
+        store.  Under the ``drop-traces`` policy a result arriving while the
+        queue is full is forwarded without its trace data.  A result large
+        enough for the encode pool is queued as the future of its encoding,
+        which the queue worker awaits in turn.
+
         Args:
             event_obj: A :class:`Short` snapshot ready for serialization.
         """
         if self.closed:
             return
         try:
-            arg = serialize_full_event(event_obj)
-            return_value = {
-                "command": "event",
-                "endpoint": self.server_url,
-                "data": arg,
-            }
-            await self.queue.put(json.dumps(return_value))
+            if self.result_store is not None:
+                self.result_store.add(self.server_url, event_obj)
+            await log_result_to_file(event_obj)
+            views = event_views(self.websocket, self.selection)
+            matching = [
+                (selection, owners) for selection, owners in views if selection.matches_result(event_obj.Result)
+            ]
+            if not matching:
+                self.stats.filtered_events += 1
+                return
+            if self.trace_store is not None and any(sel.keeps_traces for sel, _ in matching):
+                self.trace_store.keep(event_obj.Result)
+            strip = self.delivery.queue_policy == "drop-traces" and self.queue.full()
+            if self.encode_pool.offloads(event_obj.Result):
+                item: Any = self.encode_pool.submit(self._encode_offloaded, event_obj, matching, strip)
+            else:
+                item, stripped = self._encode_item(event_obj, matching, strip)
+                self.stats.stripped_traces += stripped
+            await enqueue_event(self.queue, item, self.delivery, self.stats)
         except Exception as exc:
             ijt_log.error(f"Result event serialization failed: {exc}")
 
+    async def _resolve(self, batch: list[Any]) -> list[Any]:
+        """Coroutine. Replace pending encodings in ``batch`` by their payloads, keeping the order."""
+        ready = []
+        for item in batch:
+            if isinstance(item, asyncio.Future):
+                # asyncio.wait does not raise when the pool cancelled the encoding at shutdown.
+                await asyncio.wait([item])
+                if item.cancelled():
+                    continue
+                item, stripped = item.result()
+                if item is None:
+                    continue
+                self.stats.stripped_traces += stripped
+            ready.append(item)
+        return ready
+
     async def event_notification(self, event: Any) -> None:
         """Coroutine. asyncua subscription callback for ResultReadyEventType events.
 
@@ -119,19 +228,27 @@ class ResultEventHandler:
         ijt_log.warning(f"Result event subscription status changed: {status_code}")
 
     async def handle_queue(self):
-        """Coroutine. Background worker that drains the queue and sends JSON messages.
+        """Coroutine. Background worker that drains the queue and sends pre-encoded JSON frames.
 
+        With batching enabled, consecutive results are grouped into a single
+        ``events`` frame (see :func:`~python.event_delivery.collect_batch`);
+        results still being encoded by the encode pool are awaited in place.
         Runs until a sentinel ``None`` item is dequeued (placed by
         :meth:`shutdown`).  Breaks out and closes the WebSocket on
         unrecoverable send errors.
         """
+        endpoint = dumps(self.server_url)
         while True:
             item = await self.queue.get()
             if item is None:
                 self.queue.task_done()
                 break
+            batch, stopping = await collect_batch(self.queue, item, self.delivery)
             try:
-                await self.websocket.send(item)
+                ready = await self._resolve(batch)
+                if ready:
+                    await send_batch(self.websocket, endpoint, ready)
+                    self.stats.record_batch(len(ready))
             except websockets.exceptions.ConnectionClosedOK:
                 ijt_log.info("WebSocket connection closed normally.")
                 break
@@ -143,7 +260,14 @@ class ResultEventHandler:
                     ijt_log.debug(f"WebSocket close failed during error recovery: {close_exc}")
                 break
             finally:
-                self.queue.task_done()
+                for _ in range(len(batch) + stopping):
+                    self.queue.task_done()
+            if stopping:
+                break
+
+    def delivery_stats(self) -> dict[str, int]:
+        """Return queue depth, batch size, dropped-event and stripped-trace counters."""
+        return self.stats.as_dict(self.queue)
 
     async def shutdown(self):
         """Coroutine. Signal the queue worker to stop by enqueuing a sentinel ``None``.
@@ -168,4 +292,4 @@ class ResultEventHandler:
                 self._queue_task.cancel()
                 with contextlib.suppress(asyncio.CancelledError):
                     await self._queue_task
-        ijt_log.info("ResultEventHandler closed.")
+        ijt_log.info(f"ResultEventHandler closed. Delivery stats: {self.delivery_stats()}")
@@ -0,0 +1,201 @@
+"""Rolling NDJSON segment files of received results.
+
+:func:`python.utils.log_result_to_file` hands each result to the process-wide
+:class:`ResultLog`, which only queues it; a writer task collects whatever has
+queued up while the previous batch was written and serializes, compresses and
+appends the batch in a worker thread.  The event loop never waits on disk.
+
+Each result is one JSON line (``{"time", "eventid", "message", "resultid",
+"result"}``) in ``results-<UTC start time>.ndjson`` (``.ndjson.gz`` when
+compressed).  A segment is closed after ``IJT_RESULT_LOG_SEGMENT_MB`` of JSON
+or ``IJT_RESULT_LOG_SEGMENT_SEC`` seconds, whichever comes first.  With an
+index every segment gets a ``.idx.ndjson`` companion holding ``resultid``,
+``eventid``, ``time`` and the ``offset``/``length`` of the result's line in the
+uncompressed segment.
+
+``IJT_RESULT_LOG_DIR``
+    Directory of the segments (default ``logs/results``).
+``IJT_RESULT_LOG_SEGMENT_MB`` / ``IJT_RESULT_LOG_SEGMENT_SEC``
+    Rotation size (default ``64``) and age (default ``3600``).
+``IJT_RESULT_LOG_COMPRESS``
+    ``1`` writes gzip segments (default ``0``).
+``IJT_RESULT_LOG_INDEX``
+    ``1`` writes the per-result index files (default ``0``).
+"""
+
+import asyncio
+import datetime
+import gzip
+import os
+import time
+from pathlib import Path
+from typing import IO, Any
+
+from python.ijt_logger import env_number, ijt_log
+from python.json_codec import dumps
+from python.serialize_data import serialize_full_event
+
+_SEGMENT_MB_DEFAULT = 64
+_SEGMENT_SEC_DEFAULT = 3600
+_QUEUE_SIZE = 10000
+_BATCH_MAX = 512
+_ENABLED = {"1", "true", "yes", "on"}
+
+
+def _record(event: Any, received: float) -> tuple[bytes, dict[str, Any]]:
+    """Serialize one result event to its NDJSON line and index entry."""
+    result = getattr(event, "Result", None)
+    message = getattr(event, "Message", None)
+    meta = getattr(result, "ResultMetaData", None)
+    result_id = getattr(meta, "ResultId", None)
+    entry = {
+        "time": datetime.datetime.fromtimestamp(received, datetime.UTC).isoformat().replace("+00:00", "Z"),
+        "eventid": getattr(event, "EventId", None),
+        "message": str(getattr(message, "Text", message)) if message is not None else None,
+        "resultid": None if result_id is None else str(result_id),
+    }
+    return dumps({**entry, "result": serialize_full_event(result)}) + b"\n", entry
+
+
+class ResultLog:
+    """Batched writer of rolling result segment files."""
+
+    def __init__(
+        self,
+        directory: Path,
+        segment_bytes: int = _SEGMENT_MB_DEFAULT * 1024 * 1024,
+        segment_seconds: float = _SEGMENT_SEC_DEFAULT,
+        compress: bool = False,
+        index: bool = False,
+        queue_size: int = _QUEUE_SIZE,
+    ) -> None:
+        self.directory = directory
+        self.segment_bytes = max(1, segment_bytes)
+        self.segment_seconds = segment_seconds
+        self.compress = compress
+        self.index = index
+        self.written = 0
+        self.dropped = 0
+        self.segments = 0
+        self._queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self._task: asyncio.Task | None = None
+        self._file: IO[bytes] | None = None
+        self._index_file: IO[bytes] | None = None
+        self._segment_size = 0
+        self._segment_started = 0.0
+
+    @classmethod
+    def from_env(cls) -> "ResultLog":
+        """Build the writer configured by the ``IJT_RESULT_LOG_*`` variables."""
+        return cls(
+            Path(os.getenv("IJT_RESULT_LOG_DIR", "").strip() or "logs/results"),
+            int(env_number("IJT_RESULT_LOG_SEGMENT_MB", _SEGMENT_MB_DEFAULT) * 1024 * 1024),
+            env_number("IJT_RESULT_LOG_SEGMENT_SEC", _SEGMENT_SEC_DEFAULT),
+            os.getenv("IJT_RESULT_LOG_COMPRESS", "0").strip().lower() in _ENABLED,
+            os.getenv("IJT_RESULT_LOG_INDEX", "0").strip().lower() in _ENABLED,
+        )
+
+    def add(self, event: Any) -> bool:
+        """Queue a result event for writing; never blocks.
+
+        Must be called from the event loop.  When the queue is full the
+        result is dropped and counted in :attr:`dropped`.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        try:
+            self._queue.put_nowait((event, time.time()))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            ijt_log.warning("Result log queue is full; result not written.")
+            return False
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < _BATCH_MAX and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await asyncio.to_thread(self._write_batch, batch)
+            except Exception as exc:
+                ijt_log.error(f"Failed to write {len(batch)} result(s) to {self.directory}: {exc}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write_batch(self, batch: list[tuple[Any, float]]) -> None:
+        for event, received in batch:
+            try:
+                line, entry = _record(event, received)
+            except Exception as exc:
+                ijt_log.error(f"Failed to serialize result for the result log: {exc}")
+                continue
+            segment = self._segment_for(received)
+            if self._index_file is not None:
+                self._index_file.write(dumps({**entry, "offset": self._segment_size, "length": len(line)}) + b"\n")
+            segment.write(line)
+            self._segment_size += len(line)
+            self.written += 1
+        if self._file is not None:
+            self._file.flush()
+        if self._index_file is not None:
+            self._index_file.flush()
+
+    def _segment_for(self, now: float) -> IO[bytes]:
+        """Return the open segment, rotating to a new one when it is full or too old."""
+        if self._file is not None and (
+            self._segment_size >= self.segment_bytes
+            or (self.segment_seconds and now - self._segment_started >= self.segment_seconds)
+        ):
+            self._close_segment()
+        if self._file is not None:
+            return self._file
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.datetime.fromtimestamp(now, datetime.UTC).strftime("%Y%m%dT%H%M%S%fZ")
+        name = f"results-{stamp}"
+        path = self.directory / f"{name}.ndjson"
+        self._file = gzip.open(path.with_suffix(".ndjson.gz"), "ab") if self.compress else open(path, "ab")  # noqa: SIM115
+        if self.index:
+            self._index_file = open(self.directory / f"{name}.idx.ndjson", "ab")  # noqa: SIM115
+        self._segment_size = 0
+        self._segment_started = now
+        self.segments += 1
+        ijt_log.info(f"Writing results to {path.name}{'.gz' if self.compress else ''}")
+        return self._file
+
+    def _close_segment(self) -> None:
+        for handle in (self._file, self._index_file):
+            if handle is not None:
+                handle.close()
+        self._file = self._index_file = None
+
+    async def flush(self) -> None:
+        """Coroutine. Wait until every queued result is written."""
+        await self._queue.join()
+
+    async def close(self) -> None:
+        """Coroutine. Write the queued results, stop the writer task and close the segment."""
+        if self._task is not None:
+            await self.flush()
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await asyncio.to_thread(self._close_segment)
+
+
+_default: ResultLog | None = None
+
+
+def default_result_log() -> ResultLog:
+    """Return the process-wide :class:`ResultLog`, configured from the environment on first use."""
+    global _default
+    if _default is None:
+        _default = ResultLog.from_env()
+    return _default
+
+
+async def close_result_log() -> None:
+    """Coroutine. Flush and close the process-wide result log if it was used."""
+    if _default is not None:
+        await _default.close()
@@ -3,11 +3,17 @@
 The functions in this module walk arbitrary Python objects (asyncua
 extension-object instances, tuples, plain values, …) and produce nested
 ``dict``/``list`` structures that are safe to pass to :func:`json.dumps`.
+
+:func:`serialize_full_event` is the reference (reflective) implementation.
+:func:`serialize_compiled_event` produces the same output but compiles one
+encoder per Python type the first time that type is seen, so the event hot
+path no longer repeats the type inspection for every node of a large result.
 """
 
 import json
 from datetime import datetime as std_datetime
-from typing import Any
+from operator import attrgetter
+from typing import Any, Callable
 
 from python.ijt_logger import ijt_log
 
@@ -101,3 +107,159 @@ def serialize_class_instance_as_dict(obj: Any) -> dict:
                 )
                 continue
     return result
+
+
+# ---------------------------------------------------------------------------
+# Compiled serializer
+# ---------------------------------------------------------------------------
+
+_Encoder = Callable[[Any], Any]
+
+# One encoder per concrete Python type.  asyncua generates extension-object
+# classes at runtime, so the cache is filled lazily on first sight.
+_ENCODERS: dict[type, _Encoder] = {}
+
+# Element types that _to_jsonable returns unchanged.  A list made only of
+# these (e.g. trace sample arrays) is copied in one C-level pass.
+_BULK_ELEMENT_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+def serialize_compiled_event(value: Any) -> Any:
+    """Serialize recursively into JSON-compatible python types.
+
+    Output is identical to :func:`serialize_full_event`; only the dispatch
+    strategy differs (cached per-type encoders instead of a reflective walk).
+    """
+    return _encode(value)
+
+
+def _encode(value: Any) -> Any:
+    encoder = _ENCODERS.get(type(value))
+    if encoder is None:
+        encoder = _compile_encoder(value)
+        _ENCODERS[type(value)] = encoder
+    return encoder(value)
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _encode_none(_value: Any) -> None:
+    return None
+
+
+def _encode_datetime(value: Any) -> str:
+    return value.isoformat()
+
+
+def _encode_dict(value: dict) -> dict:
+    return {k: _encode(v) for k, v in value.items()}
+
+
+def _encode_sequence(value: Any) -> list:
+    # Bulk path: homogeneous primitive arrays (trace values, counters, …)
+    # need no per-element dispatch.
+    if value and type(value[0]) in _BULK_ELEMENT_TYPES and _BULK_ELEMENT_TYPES.issuperset(map(type, value)):
+        return list(value)
+    return list(map(_encode, value))
+
+
+def _compile_encoder(sample: Any) -> _Encoder:
+    """Build the encoder for ``type(sample)``, mirroring :func:`_to_jsonable`'s dispatch order."""
+    if is_instance_of_class(sample):
+        return _compile_class_instance_encoder(sample)
+    if sample is None:
+        return _encode_none
+    if isinstance(sample, dict):
+        return _encode_dict
+    if isinstance(sample, (list, tuple)):
+        return _encode_sequence
+    if isinstance(sample, std_datetime):
+        return _encode_datetime
+    if isinstance(sample, (str, int, float, bool)):
+        return _identity
+    if hasattr(sample, "__slots__"):
+        return _compile_slots_encoder(type(sample), tuple(getattr(sample, "__slots__", [])))
+    return str
+
+
+def _compile_class_instance_encoder(sample: Any) -> _Encoder:
+    """Encoder equivalent to :func:`serialize_class_instance_as_dict` for one type."""
+    class_name = type(sample).__name__
+
+    if hasattr(sample, "__dict__"):
+
+        def encode_instance_dict(obj: Any) -> dict:
+            result: dict[str, Any] = {"pythonclass": class_name}
+            for key, item in obj.__dict__.items():
+                if key != "_freeze":
+                    result[key] = _encode(item)
+            return result
+
+        return encode_instance_dict
+
+    if hasattr(sample, "__slots__"):
+        slots = tuple(slot for slot in getattr(sample, "__slots__", []) if slot != "_freeze")
+        read_slots = _slot_reader(slots)
+
+        def encode_weakref_slots(obj: Any) -> dict:
+            result: dict[str, Any] = {"pythonclass": class_name}
+            try:
+                result.update(zip(slots, map(_encode, read_slots(obj))))
+            except Exception:
+                # e.g. an unset slot: fall back to the per-slot reader that skips it.
+                result = {"pythonclass": class_name, **_read_slots_individually(obj, slots)}
+            return result
+
+        return encode_weakref_slots
+
+    def encode_class_name_only(_obj: Any) -> dict:
+        return {"pythonclass": class_name}
+
+    return encode_class_name_only
+
+
+def _compile_slots_encoder(cls: type, slots: tuple[str, ...]) -> _Encoder:
+    """Encoder for slotted objects without ``__dict__``/``__weakref__`` (asyncua structures)."""
+    class_name = cls.__name__
+    if not slots:
+        return str
+    read_slots = _slot_reader(slots)
+
+    def encode_slots(obj: Any) -> Any:
+        result: dict[str, Any] = {"pythonclass": class_name}
+        try:
+            result.update(zip(slots, map(_encode, read_slots(obj))))
+        except Exception:
+            result = {"pythonclass": class_name, **_read_slots_individually(obj, slots)}
+            if len(result) == 1:
+                return str(obj)
+        return result
+
+    return encode_slots
+
+
+def _slot_reader(slots: tuple[str, ...]) -> Callable[[Any], tuple]:
+    """Return a callable that reads all ``slots`` of an object as one tuple."""
+    if not slots:
+        return lambda _obj: ()
+    if len(slots) == 1:
+        getter = attrgetter(slots[0])
+        return lambda obj: (getter(obj),)
+    return attrgetter(*slots)
+
+
+def _read_slots_individually(obj: Any, slots: tuple[str, ...]) -> dict[str, Any]:
+    result: dict[str, Any] = {}
+    for slot in slots:
+        try:
+            result[slot] = _encode(getattr(obj, slot))
+        except Exception as exc:
+            ijt_log.debug(
+                "serialize: skipped slot '%s' on %s: %s",
+                slot,
+                type(obj).__name__,
+                exc,
+            )
+    return result
@@ -0,0 +1,373 @@
+"""Process-wide pool of OPC UA sessions shared by every browser tab.
+
+Without pooling every WebSocket session opens its own method and subscription
+session per controller and loads the data types again, so a few operators and
+dashboards on one station exhaust the controller's session limit
+(``BadTooManySessions``).  :class:`SessionPool` keeps one
+:class:`~python.connection.Connection` per endpoint and reference-counts the
+browser tabs attached to it.  The connection talks to a
+:class:`WebSocketFanout` instead of a single WebSocket, so each event frame is
+encoded once and the same bytes are queued for every attached tab; each tab
+has its own bounded send queue so a slow one cannot hold up the others.
+
+A session whose last tab detached is kept for ``IJT_SESSION_IDLE_GRACE_SEC``
+seconds (default ``30``; ``0`` closes it immediately) so that a reloaded page
+re-attaches without a new handshake.
+"""
+
+import asyncio
+import contextlib
+import os
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from python.event_selection import FULL, EventSelection
+from python.ijt_logger import ijt_log
+from python.json_codec import dumps
+
+_IDLE_GRACE_S_DEFAULT = 30.0
+_SOCKET_QUEUE_SIZE_DEFAULT = 64
+_CLOSE_FLUSH_TIMEOUT_S = 1.0
+
+
+def _socket_queue_size() -> int:
+    raw = os.getenv("IJT_SOCKET_SEND_QUEUE_SIZE", str(_SOCKET_QUEUE_SIZE_DEFAULT))
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        ijt_log.warning(f"Invalid IJT_SOCKET_SEND_QUEUE_SIZE={raw!r}; using {_SOCKET_QUEUE_SIZE_DEFAULT}.")
+        return _SOCKET_QUEUE_SIZE_DEFAULT
+
+
+class _SocketSender:
+    """Bounded frame queue and writer task of one attached WebSocket."""
+
+    def __init__(self, fanout: "WebSocketFanout", owner: Any, websocket: Any, queue_size: int) -> None:
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.dropped = 0
+        self._task = asyncio.create_task(self._write(fanout, owner))
+
+    def put(self, frame: tuple[str | bytes, bool | None]) -> None:
+        """Queue ``frame``; when the tab lags behind, its oldest queued frame is dropped."""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.queue.task_done()
+            self.dropped += 1
+        self.queue.put_nowait(frame)
+
+    async def _write(self, fanout: "WebSocketFanout", owner: Any) -> None:
+        while True:
+            data, text = await self.queue.get()
+            try:
+                await self.websocket.send(data, text=text)
+            except Exception as e:
+                ijt_log.info(f"Detaching WebSocket after failed send: {e}")
+                fanout.detach(owner)
+            finally:
+                self.queue.task_done()
+
+    def cancel(self) -> None:
+        """Stop the writer and discard the frames it has not sent yet."""
+        self._task.cancel()
+        while not self.queue.empty():
+            self.queue.get_nowait()
+            self.queue.task_done()
+
+
+class WebSocketFanout:
+    """Sends each frame to every attached WebSocket.
+
+    Stands in for the single ``websocket`` of a
+    :class:`~python.connection.Connection`.  The frame is encoded once by the
+    caller and the same buffer is queued for every socket.  Each socket has its
+    own bounded queue (``IJT_SOCKET_SEND_QUEUE_SIZE`` frames, default ``64``)
+    drained by its own writer task, so a slow tab loses its oldest frames
+    instead of delaying the others.  A socket whose send fails is detached;
+    :meth:`send` itself never raises or waits on the network.
+    """
+
+    def __init__(self, queue_size: int | None = None) -> None:
+        self.queue_size = queue_size if queue_size is not None else _socket_queue_size()
+        self.senders: dict[Any, _SocketSender] = {}
+        self.selections: dict[Any, EventSelection] = {}
+        self.dropped_frames = 0
+
+    @property
+    def sockets(self) -> dict[Any, Any]:
+        """Attached WebSockets by owner."""
+        return {owner: sender.websocket for owner, sender in self.senders.items()}
+
+    def attach(self, owner: Any, websocket: Any) -> None:
+        """Deliver frames to ``websocket`` on behalf of ``owner``."""
+        previous = self.senders.get(owner)
+        if previous is not None:
+            if previous.websocket is websocket:
+                return
+            self.detach(owner)
+        self.senders[owner] = _SocketSender(self, owner, websocket, self.queue_size)
+
+    def detach(self, owner: Any) -> None:
+        """Stop delivering frames for ``owner``."""
+        self.selections.pop(owner, None)
+        sender = self.senders.pop(owner, None)
+        if sender is not None:
+            self.dropped_frames += sender.dropped
+            sender.cancel()
+
+    def socket_of(self, owner: Any) -> Any:
+        """Return the WebSocket attached for ``owner``, or ``None``."""
+        sender = self.senders.get(owner)
+        return sender.websocket if sender else None
+
+    def select(self, owner: Any, selection: EventSelection) -> None:
+        """Record the event projection and filter ``owner`` subscribed with."""
+        self.selections[owner] = selection
+
+    def views(self) -> list[tuple[EventSelection, list | None]]:
+        """Return each distinct selection of the attached tabs with its owners.
+
+        When every tab uses the same selection the owners are ``None``
+        (frames for that selection go to every socket).
+        """
+        groups: dict[EventSelection, list] = {}
+        for owner in self.senders:
+            groups.setdefault(self.selections.get(owner, FULL), []).append(owner)
+        if len(groups) <= 1:
+            return [(next(iter(groups), FULL), None)]
+        return list(groups.items())
+
+    async def send(self, data: str | bytes, text: bool | None = None, owners: list | None = None) -> None:
+        """Coroutine. Queue ``data`` for every attached socket, or only for ``owners``."""
+        if owners is None:
+            for sender in self.senders.values():
+                sender.put((data, text))
+            return
+        for owner in owners:
+            sender = self.senders.get(owner)
+            if sender is not None:
+                sender.put((data, text))
+
+    async def send_to(self, owner: Any, data: str | bytes, text: bool | None = None) -> None:
+        """Coroutine. Queue ``data`` for ``owner``'s socket only, behind its pending frames."""
+        sender = self.senders.get(owner)
+        if sender is not None:
+            sender.put((data, text))
+
+    async def drain(self) -> None:
+        """Coroutine. Wait until every queued frame has been sent or dropped."""
+        await asyncio.gather(*(sender.queue.join() for sender in list(self.senders.values())))
+
+    def pending(self) -> int:
+        """Return the number of frames queued across all sockets."""
+        return sum(sender.queue.qsize() for sender in self.senders.values())
+
+    def dropped(self) -> int:
+        """Return the number of frames dropped for lagging sockets, attached or not."""
+        return self.dropped_frames + sum(sender.dropped for sender in self.senders.values())
+
+    async def close(self) -> None:
+        """Coroutine. Flush pending frames, then detach and close every socket."""
+        with contextlib.suppress(Exception):
+            await asyncio.wait_for(self.drain(), timeout=_CLOSE_FLUSH_TIMEOUT_S)
+        senders = list(self.senders.items())
+        for owner, sender in senders:
+            self.detach(owner)
+            with contextlib.suppress(Exception):
+                await sender.websocket.close()
+
+
+def event_views(websocket: Any, default: EventSelection) -> list[tuple[EventSelection, list | None]]:
+    """Return the event selections in use on ``websocket`` and the owners of each.
+
+    A :class:`WebSocketFanout` reports the selections of its attached tabs;
+    any other WebSocket has ``default`` for all of its frames (``None`` owners).
+    """
+    if isinstance(websocket, WebSocketFanout):
+        return websocket.views()
+    return [(default, None)]
+
+
+def handler_queues(connection: Any) -> dict[str, dict[str, int]]:
+    """Return the delivery counters of a connection's joining and result event handlers."""
+    queues = {}
+    for name in ("joining", "result"):
+        handler = getattr(connection, f"handler_{name}_event", None)
+        if handler is not None:
+            queues[name] = handler.delivery_stats()
+    return queues
+
+
+@dataclass
+class PooledSession:
+    """One pooled connection, the tabs attached to it and its pending idle reap."""
+
+    connection: Any
+    fanout: WebSocketFanout
+    reaper: asyncio.Task | None = field(default=None, repr=False)
+
+    def cancel_reap(self) -> None:
+        """Keep the session: a tab attached again within the grace period."""
+        if self.reaper is not None:
+            self.reaper.cancel()
+            self.reaper = None
+
+
+async def _is_open(connection: Any) -> bool:
+    try:
+        return await connection.is_connection_open() is True
+    except Exception as e:
+        ijt_log.debug(f"Pooled connection probe failed: {e}")
+        return False
+
+
+async def _terminate(endpoint: str, connection: Any) -> None:
+    try:
+        await connection.terminate()
+        ijt_log.info(f"Disconnected from {endpoint}")
+    except Exception as e:
+        ijt_log.warning(f"Error disconnecting from {endpoint}: {e}")
+
+
+class SessionPool:
+    """Reference-counted :class:`~python.connection.Connection` per endpoint."""
+
+    def __init__(self, idle_grace_s: float = _IDLE_GRACE_S_DEFAULT) -> None:
+        self.idle_grace_s = max(0.0, idle_grace_s)
+        self._sessions: dict[str, PooledSession] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self.created = 0
+        self.reused = 0
+        self.reaped = 0
+
+    @classmethod
+    def from_env(cls) -> "SessionPool":
+        """Build a pool whose idle grace period is read from ``IJT_SESSION_IDLE_GRACE_SEC``."""
+        try:
+            idle_grace_s = float(os.getenv("IJT_SESSION_IDLE_GRACE_SEC", str(_IDLE_GRACE_S_DEFAULT)))
+        except ValueError:
+            ijt_log.warning(f"Invalid IJT_SESSION_IDLE_GRACE_SEC; using {_IDLE_GRACE_S_DEFAULT}.")
+            idle_grace_s = _IDLE_GRACE_S_DEFAULT
+        return cls(idle_grace_s)
+
+    def _lock(self, endpoint: str) -> asyncio.Lock:
+        return self._locks.setdefault(endpoint, asyncio.Lock())
+
+    def get(self, endpoint: str) -> Any:
+        """Return the pooled connection for ``endpoint``, or ``None``."""
+        session = self._sessions.get(endpoint)
+        return session.connection if session else None
+
+    async def acquire(
+        self,
+        endpoint: str,
+        owner: Any,
+        websocket: Any,
+        factory: Callable[[str, Any], Any],
+    ) -> tuple[Any, dict[str, Any]]:
+        """Coroutine. Attach ``owner``'s ``websocket`` to the session for ``endpoint``.
+
+        An open pooled session is shared: only ``websocket`` is sent a
+        ``connection established`` event.  Otherwise ``factory(endpoint,
+        fanout)`` builds a fresh connection (replacing a session that lost its
+        channel, whose tabs stay attached) and it is connected.  Concurrent
+        callers for the same endpoint wait for that connect.
+
+        Returns:
+            The connection and the result of its ``connect()`` (or the
+            ``connection established`` event of a shared session).
+
+        Raises:
+            Whatever ``connect()`` raises; the tab stays attached so that a
+            later command can reconnect.
+        """
+        async with self._lock(endpoint):
+            session = self._sessions.get(endpoint)
+            if session is not None:
+                session.cancel_reap()
+                if await _is_open(session.connection):
+                    session.fanout.attach(owner, websocket)
+                    self.reused += 1
+                    result: dict[str, Any] = {"command": "connection established", "endpoint": endpoint}
+                    await session.fanout.send_to(owner, dumps(result), text=True)
+                    ijt_log.info(f"Sharing session to {endpoint} with {len(session.fanout.senders)} tab(s).")
+                    return session.connection, result
+                ijt_log.info(f"Pooled session to {endpoint} is not open; replacing it.")
+                await _terminate(endpoint, session.connection)
+                fanout = session.fanout
+            else:
+                fanout = WebSocketFanout()
+            fanout.attach(owner, websocket)
+            connection = factory(endpoint, fanout)
+            self._sessions[endpoint] = PooledSession(connection, fanout)
+            self.created += 1
+            result = await connection.connect()
+        return connection, result
+
+    async def release(self, endpoint: str, owner: Any, connection: Any) -> None:
+        """Coroutine. Detach ``owner`` from ``endpoint``; close the session once no tab is left.
+
+        The last detach schedules the close after the idle grace period.  A
+        ``connection`` that is not the pooled one is terminated directly.
+        """
+        async with self._lock(endpoint):
+            session = self._sessions.get(endpoint)
+            if session is None or session.connection is not connection:
+                await _terminate(endpoint, connection)
+                return
+            session.fanout.detach(owner)
+            if session.fanout.senders or session.reaper is not None:
+                return
+            if self.idle_grace_s <= 0:
+                del self._sessions[endpoint]
+                self.reaped += 1
+                await _terminate(endpoint, connection)
+                return
+            ijt_log.info(f"Session to {endpoint} idle; closing in {self.idle_grace_s:g} s unless a tab re-attaches.")
+            session.reaper = asyncio.create_task(self._reap_after_grace(endpoint, session))
+
+    async def _reap_after_grace(self, endpoint: str, session: PooledSession) -> None:
+        await asyncio.sleep(self.idle_grace_s)
+        async with self._lock(endpoint):
+            if self._sessions.get(endpoint) is not session or session.fanout.senders:
+                return
+            del self._sessions[endpoint]
+            session.reaper = None
+            self.reaped += 1
+        await _terminate(endpoint, session.connection)
+
+    async def close(self) -> None:
+        """Coroutine. Terminate every pooled session (server shutdown)."""
+        sessions = list(self._sessions.items())
+        self._sessions.clear()
+        for _endpoint, session in sessions:
+            session.cancel_reap()
+        if sessions:
+            await asyncio.gather(*(_terminate(endpoint, session.connection) for endpoint, session in sessions))
+        for _endpoint, session in sessions:
+            for owner in list(session.fanout.senders):
+                session.fanout.detach(owner)
+        ijt_log.info(f"Session pool closed: {self.stats()}")
+
+    def queue_stats(self) -> dict[str, dict[str, dict[str, int]]]:
+        """Return the event-queue counters of every pooled connection and of its tabs' send queues, by endpoint."""
+        return {
+            endpoint: {
+                **handler_queues(session.connection),
+                "send": {"queue_depth": session.fanout.pending(), "dropped_frames": session.fanout.dropped()},
+            }
+            for endpoint, session in self._sessions.items()
+        }
+
+    def stats(self) -> dict[str, int]:
+        """Return pooled-session, attached-tab and lifecycle counters."""
+        return {
+            "sessions": len(self._sessions),
+            "attached": sum(len(session.fanout.senders) for session in self._sessions.values()),
+            "created": self.created,
+            "reused": self.reused,
+            "reaped": self.reaped,
+            "pending_frames": sum(session.fanout.pending() for session in self._sessions.values()),
+            "dropped_frames": sum(session.fanout.dropped() for session in self._sessions.values()),
+        }
@@ -0,0 +1,114 @@
+"""Packed encoding of trace sample arrays.
+
+Trace channels (torque, angle, time, current …) hold tens of thousands of
+floats per result; as JSON lists every sample is converted, written and parsed
+one by one.  With a packed ``traceencoding`` each ``StepTraceContent.Values``
+list is replaced by a descriptor of a little-endian ``float32``/``float64``
+buffer::
+
+    {"dtype": "float32", "length": 15000, "b64": "…"}      # inside a JSON frame
+    {"dtype": "float32", "length": 15000, "offset": 4096}  # inside a binary frame
+
+The browser decodes either form straight into a ``Float32Array`` /
+``Float64Array`` (``decodePackedTraces`` in ``result-serialization.mjs``).
+
+Binary frames (used by ``gettrace`` with ``"binary": true``) are laid out as a
+little-endian ``uint32`` header length, the UTF-8 JSON header (the usual
+``{"command", "endpoint", "data"}`` message) padded to 8 bytes, then the
+channel buffers, each padded to 8 bytes; ``offset`` is relative to the end of
+the header so typed-array views are always aligned.
+"""
+
+import base64
+import copy
+import struct
+import sys
+from array import array
+from typing import Any
+
+from python.json_codec import dumps
+
+TRACE_ENCODINGS = ("json", "float32", "float64")
+
+_TYPECODES = {"float32": "f", "float64": "d"}
+_ALIGN = 8
+
+
+def pack_values(values: Any, dtype: str) -> bytes:
+    """Return ``values`` as a little-endian buffer of ``dtype`` floats.
+
+    Raises:
+        TypeError: If a sample is not a number.
+    """
+    packed = array(_TYPECODES[dtype], values)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _padding(size: int) -> bytes:
+    return b"\0" * (-size % _ALIGN)
+
+
+class BufferSink:
+    """Collects channel buffers of one binary frame and hands out their offsets."""
+
+    def __init__(self) -> None:
+        self.parts: list[bytes] = []
+        self.size = 0
+
+    def add(self, data: bytes) -> int:
+        """Append ``data`` (8-byte aligned) and return its offset."""
+        offset = self.size
+        self.parts.extend((data, _padding(len(data))))
+        self.size += len(data) + len(_padding(len(data)))
+        return offset
+
+
+def packed_field(values: Any, dtype: str, sink: BufferSink | None = None) -> dict[str, Any]:
+    """Return the descriptor replacing a ``Values`` list (base64, or an offset into ``sink``)."""
+    data = pack_values(values, dtype)
+    field: dict[str, Any] = {"dtype": dtype, "length": len(values)}
+    if sink is None:
+        field["b64"] = base64.b64encode(data).decode("ascii")
+    else:
+        field["offset"] = sink.add(data)
+    return field
+
+
+def pack_step_trace(step_trace: Any, dtype: str, sink: BufferSink | None = None) -> Any:
+    """Return a copy of ``step_trace`` whose channel ``Values`` are packed descriptors.
+
+    Channels whose values are not all numbers are left as lists.
+    """
+    contents = []
+    for content in getattr(step_trace, "StepTraceContent", None) or ():
+        values = getattr(content, "Values", None)
+        if values:
+            try:
+                packed = packed_field(values, dtype, sink)
+            except TypeError:
+                packed = None
+            if packed is not None:
+                content = copy.copy(content)
+                content.Values = packed
+        contents.append(content)
+    step_trace = copy.copy(step_trace)
+    step_trace.StepTraceContent = contents
+    return step_trace
+
+
+def pack_trace(trace: Any, dtype: str) -> Any:
+    """Return a copy of ``trace`` with every step's channels packed as base64 descriptors."""
+    if trace is None or not getattr(trace, "StepTraces", None):
+        return trace
+    packed = copy.copy(trace)
+    packed.StepTraces = [pack_step_trace(step_trace, dtype) for step_trace in trace.StepTraces]
+    return packed
+
+
+def binary_frame(message: dict[str, Any], sink: BufferSink) -> bytes:
+    """Assemble a binary WebSocket frame from a JSON ``message`` and the buffers in ``sink``."""
+    header = dumps(message)
+    header += b" " * (-(4 + len(header)) % _ALIGN)
+    return b"".join((struct.pack("<I", len(header)), header, *sink.parts))
@@ -0,0 +1,209 @@
+"""Display-resolution downsampling of result traces.
+
+A tightening trace easily holds more samples per step than a chart has pixels.
+With ``"tracepoints": n`` on ``subscribe`` or ``gettrace`` every trace is
+reduced to roughly ``n`` samples before it is serialized, with one of two
+shape-preserving methods (``"downsample"``):
+
+``lttb`` (default)
+    Largest-Triangle-Three-Buckets keeps, per bucket, the sample spanning the
+    largest triangle with its neighbours — the visual shape of the curve.
+``minmax``
+    Keeps the minimum and the maximum sample of every bucket, so no peak (e.g.
+    the final torque) is ever lost.
+
+The points are distributed over the step traces by their sample count.  Every
+channel of a step trace keeps the same samples, so torque/angle pairs stay
+aligned: each numeric channel selects its share of the budget and the union of
+the selections is kept.  As the samples are no longer equidistant, a ``TIME``
+channel (``index × SamplingInterval``) is added to step traces that lack one.
+
+The full-resolution trace stays in the connection's :class:`TraceStore` and is
+returned by ``gettrace`` without ``tracepoints``.  The bucket maths runs on
+NumPy arrays when NumPy is installed and falls back to plain Python otherwise.
+"""
+
+import copy
+import math
+from collections.abc import Sequence
+from typing import Any
+
+try:
+    import numpy as np  # type: ignore[import-not-found]
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+
+# PhysicalQuantity of the TIME channel (see views/trace/step.mjs).
+_TIME_QUANTITY = 1
+# LTTB always keeps the first and last sample; fewer points cannot describe a curve.
+MIN_POINTS = 3
+
+
+def _float(value: Any) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _lttb_numpy(x: Sequence[float], y: Sequence[float], points: int) -> list[int]:
+    xs = np.asarray(x, dtype=np.float64)
+    ys = np.asarray(y, dtype=np.float64)
+    n = len(ys)
+    edges = (np.arange(points - 1) * ((n - 2) / (points - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+    # Mean of every bucket, the "third point" of the triangle for the bucket before it.
+    counts = np.diff(np.append(edges, n))
+    avg_x = np.add.reduceat(xs, edges) / counts
+    avg_y = np.add.reduceat(ys, edges) / counts
+    selected = [0]
+    a = 0
+    for bucket in range(points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        area = np.abs(
+            (xs[a] - avg_x[bucket + 1]) * (ys[start:end] - ys[a])
+            - (xs[a] - xs[start:end]) * (avg_y[bucket + 1] - ys[a])
+        )
+        a = int(start + np.argmax(area))
+        selected.append(a)
+    selected.append(n - 1)
+    return selected
+
+
+def _lttb_python(x: Sequence[float], y: Sequence[float], points: int) -> list[int]:
+    n = len(y)
+    every = (n - 2) / (points - 2)
+    edges = [int(bucket * every) + 1 for bucket in range(points - 1)]
+    edges[-1] = n - 1
+    edges.append(n)
+    selected = [0]
+    a = 0
+    for bucket in range(points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_start, next_end = end, edges[bucket + 2]
+        count = next_end - next_start
+        avg_x = sum(x[next_start:next_end]) / count
+        avg_y = sum(y[next_start:next_end]) / count
+        best, best_area = start, -1.0
+        for index in range(start, end):
+            area = abs((x[a] - avg_x) * (y[index] - y[a]) - (x[a] - x[index]) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = index, area
+        a = best
+        selected.append(a)
+    selected.append(n - 1)
+    return selected
+
+
+def lttb_indices(x: Sequence[float], y: Sequence[float], points: int) -> list[int]:
+    """Return the indices of the ``points`` samples LTTB keeps (ascending, first and last included)."""
+    if points >= len(y) or points < MIN_POINTS:
+        return list(range(len(y)))
+    if np is not None:
+        return _lttb_numpy(x, y, points)
+    return _lttb_python(x, y, points)
+
+
+def minmax_indices(y: Sequence[float], points: int) -> list[int]:
+    """Return the indices of the minimum and maximum of ``points // 2`` buckets (ascending)."""
+    n = len(y)
+    buckets = points // 2
+    if points >= n or buckets < 1:
+        return list(range(n))
+    size = math.ceil(n / buckets)
+    if np is not None:
+        ys = np.asarray(y, dtype=np.float64)
+        # Repeat the last sample so the samples fill whole buckets.
+        rows = np.pad(ys, (0, size * buckets - n), mode="edge").reshape(buckets, size)
+        offsets = np.arange(buckets) * size
+        kept = np.concatenate((offsets + rows.argmin(axis=1), offsets + rows.argmax(axis=1), (0, n - 1)))
+        return np.unique(np.minimum(kept, n - 1)).tolist()
+    kept = {0, n - 1}
+    for start in range(0, n, size):
+        bucket = range(start, min(start + size, n))
+        kept.add(min(bucket, key=y.__getitem__))
+        kept.add(max(bucket, key=y.__getitem__))
+    return sorted(kept)
+
+
+def _channel_values(content: Any) -> list[float] | None:
+    values = getattr(content, "Values", None)
+    if not isinstance(values, list | tuple) or not values:
+        return None
+    floats = [_float(value) for value in values]
+    return None if any(value is None for value in floats) else floats  # type: ignore[return-value]
+
+
+def _is_time(content: Any) -> bool:
+    return _float(getattr(content, "PhysicalQuantity", None)) == _TIME_QUANTITY
+
+
+def _step_samples(step_trace: Any) -> int:
+    contents = getattr(step_trace, "StepTraceContent", None) or ()
+    return max((len(getattr(content, "Values", None) or ()) for content in contents), default=0)
+
+
+def downsample_step_trace(step_trace: Any, points: int, method: str = "lttb") -> Any:
+    """Return a copy of ``step_trace`` reduced to about ``points`` samples per channel.
+
+    ``step_trace`` itself is returned when it already fits, when its channels
+    differ in length or are not numeric, or when a ``TIME`` channel would be
+    needed but ``SamplingInterval`` is unknown.
+    """
+    contents = list(getattr(step_trace, "StepTraceContent", None) or ())
+    channels = [(content, _channel_values(content)) for content in contents]
+    n = _step_samples(step_trace)
+    if n <= max(points, MIN_POINTS) or any(values is None or len(values) != n for _, values in channels):
+        return step_trace
+    time = next((values for content, values in channels if _is_time(content)), None)
+    interval = _float(getattr(step_trace, "SamplingInterval", None))
+    if time is None and interval is None:
+        return step_trace
+    x = time if time is not None else range(n)
+    measured = [values for content, values in channels if not _is_time(content)] or [x]
+    share = max(points // len(measured), MIN_POINTS)
+    kept: set[int] = set()
+    for values in measured:
+        kept.update(lttb_indices(x, values, share) if method == "lttb" else minmax_indices(values, share))
+    indices = sorted(kept)
+
+    reduced = []
+    for content, _ in channels:
+        content = copy.copy(content)
+        content.Values = [content.Values[index] for index in indices]
+        reduced.append(content)
+    if time is None:
+        time_channel = copy.copy(contents[0])
+        time_channel.Name = "TIME"
+        time_channel.PhysicalQuantity = _TIME_QUANTITY
+        time_channel.Values = [index * interval for index in indices]
+        if hasattr(time_channel, "EngineeringUnits"):
+            time_channel.EngineeringUnits = None
+        reduced.append(time_channel)
+    step_trace = copy.copy(step_trace)
+    step_trace.StepTraceContent = reduced
+    return step_trace
+
+
+def downsample_trace(trace: Any, points: int, method: str = "lttb") -> Any:
+    """Return a copy of ``trace`` whose step traces share a budget of about ``points`` samples."""
+    step_traces = getattr(trace, "StepTraces", None)
+    if not step_traces or points <= 0:
+        return trace
+    sizes = [_step_samples(step_trace) for step_trace in step_traces]
+    total = sum(sizes)
+    if total <= points:
+        return trace
+    reduced = copy.copy(trace)
+    reduced.StepTraces = [
+        downsample_step_trace(step_trace, max(round(points * size / total), MIN_POINTS), method)
+        for step_trace, size in zip(step_traces, sizes)
+    ]
+    return reduced
+
+
+def downsample_traces(traces: list[tuple[int, Any]], points: int, method: str = "lttb") -> list[tuple[int, Any]]:
+    """Apply :func:`downsample_trace` to ``(content index, Trace)`` pairs as kept by the trace store."""
+    return [(index, downsample_trace(trace, points, method)) for index, trace in traces]
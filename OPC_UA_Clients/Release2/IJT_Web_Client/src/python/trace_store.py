@@ -0,0 +1,131 @@
+"""Per-connection store of result traces fetched on demand with ``gettrace``.
+
+Tabs subscribed with the ``lazy-traces`` projection (see
+:mod:`python.event_selection`) receive results whose trace sample arrays are
+emptied; the step-trace structure (names, sampling intervals, offsets) is kept
+so the UI knows a trace exists.  The complete traces are kept here, keyed by
+``ResultMetaData.ResultId``, until the UI asks for them.
+
+``IJT_TRACE_STORE_SIZE``
+    Results whose traces are kept per connection (default ``64``; ``0``
+    disables the store, lazy tabs then cannot fetch traces).
+``IJT_TRACE_CHUNK_SAMPLES``
+    Upper bound of samples per ``trace chunk`` frame (default ``4096``); a
+    step trace is never split, so a single large step may exceed it.
+"""
+
+import math
+from collections.abc import Callable
+from typing import Any
+
+from python.ijt_logger import env_number
+from python.node_cache import MISSING, NodeCache
+
+_STORE_SIZE_DEFAULT = 64
+_CHUNK_SAMPLES_DEFAULT = 4096
+
+
+def _content_value(entry: Any) -> Any:
+    """Return the structure inside a (possibly Variant-wrapped) ResultContent entry."""
+    if not hasattr(entry, "Trace") and getattr(entry, "Value", None) is not None:
+        return entry.Value
+    return entry
+
+
+def result_traces(result: Any) -> list[tuple[int, Any]]:
+    """Return ``(content index, Trace)`` for every ResultContent entry that has a trace."""
+    traces = []
+    for index, entry in enumerate(getattr(result, "ResultContent", None) or ()):
+        trace = getattr(_content_value(entry), "Trace", None)
+        if trace is not None:
+            traces.append((index, trace))
+    return traces
+
+
+def result_id(result: Any) -> str | None:
+    """Return ``ResultMetaData.ResultId`` as a string, or ``None``."""
+    value = getattr(getattr(result, "ResultMetaData", None), "ResultId", None)
+    return None if value is None or value == "" else str(value)
+
+
+def _samples(step_trace: Any) -> int:
+    return sum(
+        len(getattr(content, "Values", None) or ()) for content in getattr(step_trace, "StepTraceContent", None) or ()
+    )
+
+
+def result_samples(result: Any) -> int:
+    """Return the number of trace samples a result carries across all its step traces."""
+    return sum(
+        _samples(step_trace)
+        for _, trace in result_traces(result)
+        for step_trace in getattr(trace, "StepTraces", None) or ()
+    )
+
+
+class TraceStore:
+    """Bounded LRU of result traces keyed by ResultId."""
+
+    def __init__(self, size: int = _STORE_SIZE_DEFAULT, chunk_samples: int = _CHUNK_SAMPLES_DEFAULT) -> None:
+        self._cache = NodeCache(size, ttl_s=math.inf)
+        self.chunk_samples = max(1, chunk_samples)
+        self.stored = 0
+        self.served = 0
+
+    @classmethod
+    def from_env(cls) -> "TraceStore":
+        """Build a store sized by ``IJT_TRACE_STORE_SIZE`` / ``IJT_TRACE_CHUNK_SAMPLES``."""
+        return cls(
+            int(env_number("IJT_TRACE_STORE_SIZE", _STORE_SIZE_DEFAULT, 0)),
+            int(env_number("IJT_TRACE_CHUNK_SAMPLES", _CHUNK_SAMPLES_DEFAULT, 1)),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """``True`` unless the store was configured with zero entries."""
+        return self._cache.enabled
+
+    def keep(self, result: Any) -> bool:
+        """Store the traces of ``result``; returns ``False`` if it has no ResultId or trace."""
+        key = result_id(result)
+        traces = result_traces(result)
+        if not self.enabled or key is None or not traces:
+            return False
+        self._cache.put("trace", key, traces)
+        self.stored += 1
+        return True
+
+    def chunks(
+        self, key: str, reduce: Callable[[list[tuple[int, Any]]], list[tuple[int, Any]]] | None = None
+    ) -> list[list[tuple[int, Any]]] | None:
+        """Return the stored step traces of result ``key`` grouped into frames.
+
+        Each chunk is a list of ``(content index, StepTrace)`` in trace order
+        holding at most :attr:`chunk_samples` samples (at least one step).
+        ``reduce`` maps the stored ``(content index, Trace)`` pairs before they
+        are chunked (e.g. :func:`python.trace_downsample.downsample_traces`);
+        the stored traces are left unchanged.
+
+        Returns:
+            The chunks, or ``None`` if no trace is stored for ``key``.
+        """
+        traces = self._cache.get("trace", key)
+        if traces is MISSING:
+            return None
+        self.served += 1
+        if reduce is not None:
+            traces = reduce(traces)
+        chunks: list[list[tuple[int, Any]]] = []
+        current: list[tuple[int, Any]] = []
+        samples = 0
+        for index, trace in traces:
+            for step_trace in getattr(trace, "StepTraces", None) or ():
+                size = _samples(step_trace)
+                if current and samples + size > self.chunk_samples:
+                    chunks.append(current)
+                    current, samples = [], 0
+                current.append((index, step_trace))
+                samples += size
+        if current or not chunks:
+            chunks.append(current)
+        return chunks
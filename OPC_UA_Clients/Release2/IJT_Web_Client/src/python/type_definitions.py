@@ -0,0 +1,173 @@
+"""Process-wide sharing of loaded IJT data-type definitions.
+
+asyncua registers the structure and enumeration classes it generates in the
+global ``ua`` namespace, so definitions loaded through one session decode
+ExtensionObjects for every session in the process.  :data:`TYPE_DEFINITIONS`
+therefore runs the (slow) DataTypeDefinition crawl once per server model and
+lets the subscription session, reconnects and other connections to the same
+controller reuse it.
+
+A server model is identified by its NamespaceArray together with the
+``NamespaceVersion`` and ``NamespacePublicationDate`` of every namespace that
+publishes NamespaceMetadata.  When the key cannot be read the definitions are
+loaded without sharing.  Models seen by earlier processes are restored from
+the on-disk :class:`~python.type_definition_cache.TypeDefinitionCache`.
+"""
+
+import asyncio
+import hashlib
+import json
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from asyncua import ua
+
+from python.ijt_logger import ijt_log
+from python.type_definition_cache import RegistrySnapshot, TypeDefinitionCache
+
+_METADATA_PROPERTIES = ("NamespaceUri", "NamespaceVersion", "NamespacePublicationDate")
+
+
+async def read_namespace_metadata(client: Any) -> dict[str, list[str]]:
+    """Coroutine. Return ``NamespaceUri -> [NamespaceVersion, NamespacePublicationDate]``.
+
+    Browses ``Server.Namespaces`` once, resolves the metadata properties of
+    every namespace object with one TranslateBrowsePathsToNodeIds call and
+    reads them with one Read call.  Missing properties are reported as ``""``.
+    """
+    children = await client.get_node(ua.ObjectIds.Server_Namespaces).get_children()
+    if not children:
+        return {}
+
+    browse_paths = []
+    for child in children:
+        for name in _METADATA_PROPERTIES:
+            element = ua.RelativePathElement()
+            element.ReferenceTypeId = ua.NodeId(ua.ObjectIds.HasProperty)
+            element.IsInverse = False  # type: ignore[assignment]
+            element.IncludeSubtypes = True  # type: ignore[assignment]
+            element.TargetName = ua.QualifiedName(name, 0)
+            browse_path = ua.BrowsePath()
+            browse_path.StartingNode = child.nodeid
+            browse_path.RelativePath.Elements.append(element)
+            browse_paths.append(browse_path)
+    path_results = await client.uaclient.translate_browsepaths_to_nodeids(browse_paths)
+
+    params = ua.ReadParameters()
+    positions: list[int] = []
+    for position, path_result in enumerate(path_results):
+        if path_result.StatusCode.is_good() and path_result.Targets:
+            read_value = ua.ReadValueId()
+            read_value.NodeId = path_result.Targets[0].TargetId
+            read_value.AttributeId = ua.AttributeIds.Value
+            params.NodesToRead.append(read_value)
+            positions.append(position)
+    values = [""] * len(browse_paths)
+    if positions:
+        for position, data_value in zip(positions, await client.uaclient.read(params)):
+            if data_value.StatusCode.is_good() and data_value.Value is not None and data_value.Value.Value is not None:
+                value = data_value.Value.Value
+                values[position] = value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+    metadata: dict[str, list[str]] = {}
+    width = len(_METADATA_PROPERTIES)
+    for start in range(0, len(values), width):
+        uri, version, publication_date = values[start : start + width]
+        if uri:
+            metadata[uri] = [version, publication_date]
+    return metadata
+
+
+def type_definition_key(namespaces: list[str], metadata: dict[str, list[str]]) -> str:
+    """Return a stable digest of a server's NamespaceArray and namespace versions."""
+    payload = json.dumps({"namespaces": list(namespaces), "metadata": metadata}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def read_type_definition_model(client: Any) -> tuple[list[str], dict[str, list[str]]]:
+    """Coroutine. Return the NamespaceArray and NamespaceMetadata of ``client``.
+
+    Servers without readable NamespaceMetadata objects report ``{}``.
+    """
+    namespaces = list(await client.get_namespace_array())
+    try:
+        metadata = await read_namespace_metadata(client)
+    except Exception as e:
+        ijt_log.debug(f"NamespaceMetadata not readable; keying type definitions by NamespaceArray only: {e}")
+        metadata = {}
+    return namespaces, metadata
+
+
+class TypeDefinitionRegistry:
+    """Remembers which server models have had their data types loaded in this process.
+
+    With a ``cache``, models unknown to this process are first restored from
+    disk, and live loads are recorded for the next process.
+    """
+
+    def __init__(self, cache: TypeDefinitionCache | None = None) -> None:
+        self.cache = cache
+        self._loaded: set[str] = set()
+        self._loading: dict[str, asyncio.Event] = {}
+        self.loads = 0
+        self.reuses = 0
+        self.restores = 0
+
+    async def ensure_loaded(
+        self,
+        client: Any,
+        label: str,
+        loader: Callable[[Any, str], Awaitable[None]],
+    ) -> bool:
+        """Coroutine. Run ``loader(client, label)`` unless this server model is already loaded.
+
+        Concurrent callers for the same model wait for the first load.  A
+        failed load is not remembered, so the next caller retries it.
+
+        Returns:
+            ``True`` if ``loader`` ran, ``False`` if loaded or cached definitions were reused.
+
+        Raises:
+            Whatever ``loader`` raises.
+        """
+        try:
+            namespaces, metadata = await read_type_definition_model(client)
+            key = type_definition_key(namespaces, metadata)
+        except Exception as e:
+            ijt_log.debug(f"Type-definition key unavailable for {label}; loading without sharing: {e}")
+            await loader(client, label)
+            self.loads += 1
+            return True
+
+        while key not in self._loaded and key in self._loading:
+            await self._loading[key].wait()  # a failed first load leaves the key unloaded: retry below
+        if key in self._loaded:
+            self.reuses += 1
+            ijt_log.info(f"Reusing loaded IJT type definitions for {label}.")
+            return False
+
+        done = asyncio.Event()
+        self._loading[key] = done
+        try:
+            if self.cache is not None and self.cache.restore(namespaces, metadata):
+                self._loaded.add(key)
+                self.restores += 1
+                return False
+            before = RegistrySnapshot.take()
+            await loader(client, label)
+            self._loaded.add(key)
+            self.loads += 1
+            if self.cache is not None:
+                await self.cache.record(client, namespaces, metadata, before)
+        finally:
+            del self._loading[key]
+            done.set()
+        return True
+
+    def clear(self) -> None:
+        """Forget every loaded server model (the next connect reloads its definitions)."""
+        self._loaded.clear()
+
+
+# Process-wide registry — asyncua's generated classes are process-wide too.
+TYPE_DEFINITIONS = TypeDefinitionRegistry(TypeDefinitionCache.from_env())
@@ -5,19 +5,17 @@ pipeline: structured log output, local-time formatting, OPC UA node-id and
 localized-text stringification, and optional result-file persistence.
 """
 
-import json
-import re
+import logging
 import traceback
+from collections.abc import Callable
 from datetime import datetime
-from pathlib import Path
 from typing import Any
 
-import aiofiles  # type: ignore[import-untyped]
 import pytz  # type: ignore[import-untyped]
 from asyncua import ua
 
-from python.ijt_logger import ijt_log
-from python.serialize_data import serialize_full_event
+from python.ijt_logger import EventFields, EventRecord, ijt_log
+from python.result_log import default_result_log
 
 ENABLE_RESULT_FILE_LOGGING = False  # Set to True to enable result file logging
 
@@ -52,10 +50,11 @@ def format_local_time(dt: datetime, timezone: str = "Europe/Stockholm") -> str:
 async def log_result_event_details(event: Any, _server_url: str, client_received_time: datetime) -> str:
     """Coroutine. Log timing and metadata for a received ResultReadyEvent.
 
-    Computes the turn-around latency between ``Result.ProcessingTimes.EndTime``
-    and ``client_received_time``, then writes a structured INFO block to the
-    log.  Does **not** perform additional OPC UA reads to avoid races with
-    concurrent method calls.
+    Queues one :class:`~python.ijt_logger.EventRecord` at INFO level; the
+    turn-around latency between ``Result.ProcessingTimes.EndTime`` and
+    ``client_received_time`` and the formatted times are only computed when
+    the record is written, on the logging thread.  Does **not** perform
+    additional OPC UA reads to avoid races with concurrent method calls.
 
     Args:
         event: The raw asyncua event object with at least ``Time``,
@@ -71,196 +70,168 @@ async def log_result_event_details(event: Any, _server_url: str, client_received
     # pending method calls (e.g. SimulateJobResult fires many events before
     # returning) and concurrent OPC UA requests on the same client cause
     # "Unhandled exception while sending request to OPC UA server".
-    # client_received_time is a close-enough approximation for server time.
-    server_time = client_received_time
-
-    event_time = event.Time
     event_id = event.EventId.decode("utf-8", errors="replace")
+    if ijt_log.isEnabledFor(logging.INFO):
+        ijt_log.info(
+            "%s",
+            EventRecord(
+                "result",
+                "RESULT EVENT RECEIVED",
+                lambda: _result_event_fields(event, event_id, client_received_time),
+            ),
+        )
+    return event_id
+
 
-    start_time = getattr(
-        getattr(getattr(event.Result, "ResultMetaData", None), "ProcessingTimes", None),
-        "StartTime",
-        None,
-    )
-    end_time = getattr(
-        getattr(getattr(event.Result, "ResultMetaData", None), "ProcessingTimes", None),
-        "EndTime",
-        None,
-    )
+def _local(dt: Any) -> str:
+    return format_local_time(dt) if dt else "Unavailable"
 
-    creation_time = getattr(getattr(event.Result, "ResultMetaData", None), "CreationTime", None)
+
+def _result_event_fields(event: Any, event_id: str, client_received_time: datetime) -> EventFields:
+    # client_received_time is a close-enough approximation for server time.
+    server_time = client_received_time
+    meta = getattr(event.Result, "ResultMetaData", None)
+    times = getattr(meta, "ProcessingTimes", None)
+    start_time = getattr(times, "StartTime", None)
+    end_time = getattr(times, "EndTime", None)
+    creation_time = getattr(meta, "CreationTime", None)
 
     if end_time and end_time.tzinfo is None:
         end_time = pytz.utc.localize(end_time)
 
     latency_ms = (client_received_time - end_time).total_seconds() * 1000 if end_time else None
 
-    formatted_event_time = format_local_time(event_time) if event_time else "Unavailable"
-    formatted_client_time = format_local_time(client_received_time)
-    formatted_server_time = format_local_time(server_time) if server_time else "Unavailable"
-    formatted_start_time = format_local_time(start_time) if start_time else "Unavailable"
-    formatted_end_time = format_local_time(end_time) if end_time else "Unavailable"
-    formatted_creation_time = format_local_time(creation_time) if creation_time else "Unavailable"
-
-    message = getattr(event.Message, "Text", "Unavailable")
-
-    label_width = 40
-    ijt_log.info("-" * 80)
-    ijt_log.info(f"{'RESULT EVENT RECEIVED':<{label_width}} : {message}")
-    ijt_log.info(f"{'1. StartTime of Tightening':<{label_width}} : {formatted_start_time}")
-    ijt_log.info(f"{'2. EndTime of Tightening':<{label_width}} : {formatted_end_time}")
-    ijt_log.info(f"{'3. Result Creation Time':<{label_width}} : {formatted_creation_time}")
-    ijt_log.info(f"{'4. Result Event Generated Time':<{label_width}} : {formatted_event_time}")
-    ijt_log.info(f"{'5. Client Time':<{label_width}} : {formatted_client_time}")
-    ijt_log.info(f"{'6. Server Time':<{label_width}} : {formatted_server_time}")
-
-    if latency_ms is not None:
-        ijt_log.info(f"{'*** Turn around Time (EndTime → Client)':<{label_width}} : {abs(latency_ms):.3f} ms")
-    else:
-        ijt_log.info(f"{'*** Turn around Time (EndTime → Client)':<{label_width}} : Unavailable")
-    ijt_log.info("-" * 80)
-    return event_id
+    return [
+        ("message", "RESULT EVENT RECEIVED", getattr(event.Message, "Text", "Unavailable")),
+        ("eventid", "EventId", event_id),
+        ("start_time", "1. StartTime of Tightening", _local(start_time)),
+        ("end_time", "2. EndTime of Tightening", _local(end_time)),
+        ("creation_time", "3. Result Creation Time", _local(creation_time)),
+        ("event_time", "4. Result Event Generated Time", _local(event.Time)),
+        ("client_time", "5. Client Time", _local(client_received_time)),
+        ("server_time", "6. Server Time", _local(server_time)),
+        (
+            "turnaround_ms",
+            "*** Turn around Time (EndTime → Client)",
+            f"{abs(latency_ms):.3f} ms" if latency_ms is not None else "Unavailable",
+        ),
+    ]
 
 
 def log_joining_system_event(event: Any) -> None:
-    """Log all fields of a JoiningSystemEvent in a structured INFO block.
+    """Log all fields of a JoiningSystemEvent as one INFO record.
 
-    Iterates over standard OPC UA base-event fields as well as
-    IJT-specific extensions (``AssociatedEntities``, ``ReportedValues``,
-    ``EventCode``, ``JoiningTechnology``, …) and writes each one via
-    :func:`log_field`.
+    Covers standard OPC UA base-event fields as well as IJT-specific
+    extensions (``AssociatedEntities``, ``ReportedValues``, ``EventCode``,
+    ``JoiningTechnology``, …).  The fields are collected and formatted only
+    when the record is written, on the logging thread.
 
     Args:
         event: The event object (or a :class:`~Python.event_handler.Short`
             snapshot) exposing the fields described above as attributes.
     """
-    label_width = 35
-    ijt_log.info("-" * 80)
-    message_text = getattr(event.Message, "Text", "Unavailable")
-    ijt_log.info(f"{'JOINING SYSTEM EVENT':<40} : {message_text}")
-    ijt_log.info("-" * 80)
-
-    def log_entity(entity: Any, label_width: int) -> None:
-        log_field("  Entity Name", getattr(entity, "Name", ""), label_width)
-        log_field("  Description", getattr(entity, "Description", ""), label_width)
-        log_field("  EntityId", getattr(entity, "EntityId", ""), label_width)
-        log_field("  EntityType", getattr(entity, "EntityType", ""), label_width)
-        log_field("  IsExternal", getattr(entity, "IsExternal", ""), label_width)
-
-    def log_reported_value(rv: Any, label_width: int) -> None:
-        eu = getattr(rv, "EngineeringUnits", None)
-        eu_display = getattr(eu, "DisplayName", "")
-        eu_desc = getattr(eu, "Description", "")
-        log_field("  Name", getattr(rv, "Name", ""), label_width)
-        log_field(
-            "  Current",
-            getattr(getattr(rv, "CurrentValue", None), "Value", ""),
-            label_width,
-        )
-        log_field(
-            "  Previous",
-            getattr(getattr(rv, "PreviousValue", None), "Value", ""),
-            label_width,
+    if ijt_log.isEnabledFor(logging.INFO):
+        ijt_log.info(
+            "%s",
+            EventRecord("joining_system", "JOINING SYSTEM EVENT", lambda: _joining_event_fields(event), 35),
         )
-        log_field("  PhysicalQuantity", getattr(rv, "PhysicalQuantity", ""), label_width)
-        log_field("  LowLimit", getattr(rv, "LowLimit", ""), label_width)
-        log_field("  HighLimit", getattr(rv, "HighLimit", ""), label_width)
-        log_field("  Units", eu_display, label_width)
-        log_field("  Description", eu_desc, label_width)
-
-    log_field("EventType", nodeid_to_str(event.EventType), label_width)
-    log_field("EventId", event.EventId, label_width)
-    log_field("Message", event.Message, label_width)
-    log_field("SourceName", event.SourceName, label_width)
-    log_field("SourceNode", event.SourceNode, label_width)
-    log_field("Severity", event.Severity, label_width)
-    log_field(
-        "Time",
-        format_local_time(event.Time) if event.Time else "Unavailable",
-        label_width,
-    )
-    log_field(
-        "ReceiveTime",
-        format_local_time(event.ReceiveTime) if event.ReceiveTime else "Unavailable",
-        label_width,
-    )
+
+
+def _entity_fields(entity: Any) -> EventFields:
+    return [
+        ("Name", "Entity Name", f"{getattr(entity, 'Name', '')}"),
+        *((field, field, f"{getattr(entity, field, '')}") for field in ("Description", "EntityId", "EntityType")),
+        ("IsExternal", "IsExternal", f"{getattr(entity, 'IsExternal', '')}"),
+    ]
+
+
+def _reported_value_fields(rv: Any) -> EventFields:
+    eu = getattr(rv, "EngineeringUnits", None)
+    return [
+        ("Name", "Name", f"{getattr(rv, 'Name', '')}"),
+        ("Current", "Current", getattr(getattr(rv, "CurrentValue", None), "Value", "")),
+        ("Previous", "Previous", getattr(getattr(rv, "PreviousValue", None), "Value", "")),
+        ("PhysicalQuantity", "PhysicalQuantity", getattr(rv, "PhysicalQuantity", "")),
+        ("LowLimit", "LowLimit", getattr(rv, "LowLimit", "")),
+        ("HighLimit", "HighLimit", getattr(rv, "HighLimit", "")),
+        ("Units", "Units", getattr(eu, "DisplayName", "")),
+        ("Description", "Description", getattr(eu, "Description", "")),
+    ]
+
+
+def _nested(key: str, label: str, items: Any, fields_of: Callable[[Any], EventFields], what: str) -> tuple:
+    """Return the field of a list of structures, or of the plain value when it is not a non-empty list."""
+    if not (isinstance(items, list) and items):
+        return (key, label, f"{items}")
+    nested = []
+    for item in items:
+        try:
+            nested.append(fields_of(item))
+        except (AttributeError, TypeError) as e:
+            nested.append([("error", f"Error logging {what}", str(e))])
+    return (key, label, nested)
+
+
+def _joining_event_fields(event: Any) -> EventFields:
+    fields: EventFields = [
+        ("message", "JOINING SYSTEM EVENT", getattr(event.Message, "Text", "Unavailable")),
+        ("event_type", "EventType", nodeid_to_str(event.EventType)),
+        ("eventid", "EventId", event.EventId),
+        ("message_full", "Message", event.Message),
+        ("source_name", "SourceName", event.SourceName),
+        ("source_node", "SourceNode", event.SourceNode),
+        ("severity", "Severity", event.Severity),
+        ("time", "Time", _local(event.Time)),
+        ("receive_time", "ReceiveTime", _local(event.ReceiveTime)),
+    ]
     if event.LocalTime:
-        offset = getattr(event.LocalTime, "Offset", "Unavailable")
-        dst = getattr(event.LocalTime, "DaylightSavingInOffset", "Unavailable")
-        log_field("LocalTime.Offset", offset, label_width)
-        log_field("LocalTime.DaylightSavingInOffset", dst, label_width)
-    else:
-        log_field("LocalTime", "Unavailable", label_width)
-    log_field("ConditionClassId", event.ConditionClassId, label_width)
-    log_field("ConditionClassName", event.ConditionClassName, label_width)
-
-    subclass_ids = [nodeid_to_str(nid) for nid in event.ConditionSubClassId]
-    subclass_names = [localizedtext_to_str(lt) for lt in event.ConditionSubClassName]
-
-    for line in format_list_for_logging("ConditionSubClassId", subclass_ids, label_width):
-        ijt_log.info(line)
-
-    for line in format_list_for_logging("ConditionSubClassName", subclass_names, label_width):
-        ijt_log.info(line)
-
-    log_field("EventCode", event.EventCode, label_width)
-    log_field("EventText", event.EventText, label_width)
-    log_field("JoiningTechnology", event.JoiningTechnology, label_width)
-
-    # AssociatedEntities
-    if isinstance(event.AssociatedEntities, list) and event.AssociatedEntities:
-        ijt_log.info(f"{'AssociatedEntities':<{label_width}} :")
-        for entity in event.AssociatedEntities:
-            try:
-                log_entity(entity, label_width)
-            except (AttributeError, TypeError) as e:
-                log_field("Error logging entity", str(e), label_width)
-    else:
-        log_field("AssociatedEntities", event.AssociatedEntities, label_width)
-
-    # ReportedValues
-    if isinstance(event.ReportedValues, list) and event.ReportedValues:
-        ijt_log.info(f"{'ReportedValues':<{label_width}} :")
-        for rv in event.ReportedValues:
-            try:
-                log_reported_value(rv, label_width)
-            except (AttributeError, TypeError) as e:
-                log_field("Error logging reported value", str(e), label_width)
+        fields += [
+            ("local_time_offset", "LocalTime.Offset", getattr(event.LocalTime, "Offset", "Unavailable")),
+            (
+                "local_time_dst",
+                "LocalTime.DaylightSavingInOffset",
+                getattr(event.LocalTime, "DaylightSavingInOffset", "Unavailable"),
+            ),
+        ]
     else:
-        log_field("ReportedValues", event.ReportedValues, label_width)
-
-    ijt_log.info("-" * 80)
+        fields.append(("local_time", "LocalTime", "Unavailable"))
+    return [
+        *fields,
+        ("condition_class_id", "ConditionClassId", event.ConditionClassId),
+        ("condition_class_name", "ConditionClassName", event.ConditionClassName),
+        ("condition_subclass_ids", "ConditionSubClassId", [nodeid_to_str(nid) for nid in event.ConditionSubClassId]),
+        (
+            "condition_subclass_names",
+            "ConditionSubClassName",
+            [localizedtext_to_str(lt) for lt in event.ConditionSubClassName],
+        ),
+        ("event_code", "EventCode", event.EventCode),
+        ("event_text", "EventText", event.EventText),
+        ("joining_technology", "JoiningTechnology", event.JoiningTechnology),
+        _nested("associated_entities", "AssociatedEntities", event.AssociatedEntities, _entity_fields, "entity"),
+        _nested("reported_values", "ReportedValues", event.ReportedValues, _reported_value_fields, "reported value"),
+    ]
 
 
 async def log_result_to_file(event: Any) -> None:
-    """Coroutine. Optionally persist a result event to a JSON file in ``logs/results/``.
+    """Coroutine. Optionally append a result event to the rolling result log.
 
     Writing is controlled by the module-level flag
-    :data:`ENABLE_RESULT_FILE_LOGGING`.  The file is written atomically via a
-    ``.tmp`` staging file.  Errors are logged but never propagated.
+    :data:`ENABLE_RESULT_FILE_LOGGING`.  The event is only queued on the
+    process-wide :class:`~python.result_log.ResultLog`; serialization and disk
+    writes happen in batches off the event loop, into NDJSON segments under
+    ``logs/results/`` (see :mod:`python.result_log`).  Errors are logged but
+    never propagated.
 
     Args:
         event: The raw asyncua result event; ``event.Result`` is serialized and
-            ``event.Message.Text`` is used to derive the filename.
+            ``event.Message.Text`` is stored alongside it.
     """
-    # Below logic writes the Result content to a file in logs/results/.
-    # This logic can be used to parse the Result and use it accordingly.
+    # Each line of a segment holds one serialized Result; parse the
+    # segments to use the results accordingly.
     if ENABLE_RESULT_FILE_LOGGING:
         try:
-            json_str = json.dumps(serialize_full_event(event.Result), ensure_ascii=False)
-
-            log_dir = Path("logs/results")
-            log_dir.mkdir(parents=True, exist_ok=True)
-
-            safe_message = re.sub(r"[^\w\-_\. ]", "_", str(event.Message.Text).replace(":", "_"))
-            temp_file = log_dir / f"{safe_message}.tmp"
-            final_file = log_dir / f"{safe_message}.json"
-
-            async with aiofiles.open(temp_file, mode="w", encoding="utf-8") as f:
-                await f.write(json_str)
-
-            temp_file.rename(final_file)
-            ijt_log.info(f"Event Result logged to {final_file}")
+            default_result_log().add(event)
         except Exception as e:
             ijt_log.error(f"failed to log result to file: {e}")
             ijt_log.error(traceback.format_exc())
@@ -60,8 +60,8 @@ def pytest_configure(config):
 class FakeWebSocket:
     sent_messages: list[str] = field(default_factory=list)
 
-    async def send(self, payload: str):
-        self.sent_messages.append(payload)
+    async def send(self, payload: str | bytes, text: bool | None = None):
+        self.sent_messages.append(payload.decode("utf-8") if isinstance(payload, bytes) else payload)
 
     async def close(self):
         return None
@@ -255,6 +255,42 @@ describe('AddressSpace — relationsToNodes', () => {
     const nodes = await addressSpace.relationsToNodes([])
     expect(nodes).toEqual([])
   })
+
+  it('preloads unmapped nodes with one readmany request when available', async () => {
+    socketHandler.readManyPromise = vi.fn().mockResolvedValue({
+      message: {
+        results: {
+          'ns=1;i=100': makeNodeMessage(1, 100),
+          'ns=1;i=200': makeNodeMessage(1, 200)
+        }
+      }
+    })
+
+    const relations = [{ NodeId: 'ns=1;i=100' }, { NodeId: 'ns=1;i=200' }]
+    const nodes = await addressSpace.relationsToNodes(relations)
+
+    expect(nodes).toHaveLength(2)
+    expect(socketHandler.readManyPromise).toHaveBeenCalledOnce()
+    expect(socketHandler.readPromise).not.toHaveBeenCalled()
+  })
+
+  it('falls back to per-node reads for nodes the batch could not load', async () => {
+    socketHandler.readManyPromise = vi.fn().mockResolvedValue({
+      message: {
+        results: {
+          'ns=1;i=100': makeNodeMessage(1, 100),
+          'ns=1;i=200': { exception: 'Read failed: BadNodeIdUnknown' }
+        }
+      }
+    })
+    socketHandler.readPromise.mockResolvedValueOnce({ message: makeNodeMessage(1, 200) })
+
+    const relations = [{ NodeId: 'ns=1;i=100' }, { NodeId: 'ns=1;i=200' }]
+    const nodes = await addressSpace.relationsToNodes(relations)
+
+    expect(nodes).toHaveLength(2)
+    expect(socketHandler.readPromise).toHaveBeenCalledOnce()
+  })
 })
 
 // ---------------------------------------------------------------------------
@@ -381,6 +417,28 @@ describe('AddressSpace — findNodeFromPathPromise', () => {
 
     await expect(addressSpace.findNodeFromPathPromise('"BadPath"')).rejects.toThrow('path not found')
   })
+
+  it('coalesces concurrent path lookups into one pathstoids request', async () => {
+    addressSpace.tighteningSystem = { nodeId: { NamespaceIndex: 1, Identifier: 999 } }
+    addressSpace.status.push('tighteningsystem')
+    socketHandler.pathstoidsPromise = vi.fn().mockResolvedValue({
+      message: {
+        results: [
+          { nodeid: { NamespaceIndex: 1, Identifier: 100 } },
+          { exception: 'PathToId Exception: BadNoMatch' }
+        ]
+      }
+    })
+    socketHandler.readPromise.mockResolvedValue({ message: makeNodeMessage(1, 100) })
+
+    const found = addressSpace.findNodeFromPathPromise('"GoodPath"')
+    const missing = addressSpace.findNodeFromPathPromise('"BadPath"')
+
+    await expect(found).resolves.toBeDefined()
+    await expect(missing).rejects.toEqual({ error: 'PathToId Exception: BadNoMatch' })
+    expect(socketHandler.pathstoidsPromise).toHaveBeenCalledOnce()
+    expect(socketHandler.pathtoidPromise).not.toHaveBeenCalled()
+  })
 })
 
 // ---------------------------------------------------------------------------
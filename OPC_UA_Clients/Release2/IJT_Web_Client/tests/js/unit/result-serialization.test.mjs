@@ -1,6 +1,9 @@
 import { afterEach, describe, expect, it, vi } from 'vitest'
 import {
   createResultBundle,
+  decodePackedSamples,
+  decodePackedTraces,
+  parseBinaryFrame,
   parseResultBundle,
   RESULT_BUNDLE_CONSTANTS,
   serializeResultForStorage,
@@ -226,4 +229,30 @@ describe('result-serialization', () => {
       results: { ResultMetaData: { ResultId: 'not-array' } }
     })).toThrow(/results must be an array/)
   })
+
+  it('decodes base64 packed trace channels into typed arrays', () => {
+    const samples = decodePackedSamples({ dtype: 'float32', length: 3, b64: 'AADAPwAAEMAAAEBA' })
+    expect(samples).toBeInstanceOf(Float32Array)
+    expect(Array.from(samples)).toEqual([1.5, -2.25, 3])
+
+    const message = { Trace: { StepTraces: [{ StepTraceContent: [{ Name: 'T', Values: { dtype: 'float32', length: 3, b64: 'AADAPwAAEMAAAEBA' } }] }] } }
+    decodePackedTraces(message)
+    expect(message.Trace.StepTraces[0].StepTraceContent[0].Values).toBeInstanceOf(Float32Array)
+    // Stored results keep plain lists.
+    const stored = serializeResultForStorage({ ResultMetaData: { ResultId: 'r1' }, ResultContent: [message] })
+    expect(stored.ResultContent[0].Trace.StepTraces[0].StepTraceContent[0].Values).toEqual([1.5, -2.25, 3])
+  })
+
+  it('parses binary trace frames produced by the backend', () => {
+    // python/trace_codec.binary_frame: ANGLE as float64 [0.5, 1, 2], TORQUE as float32 [4, 8]
+    const frame = '7AAAAHsiY29tbWFuZCI6InRyYWNlIGNodW5rIiwiZW5kcG9pbnQiOiJlcCIsImRhdGEiOnsic3RlcHRyYWNlcyI6W1swLHsiU3RlcFRyYWNlQ29udGVudCI6W3siTmFtZSI6IkFOR0xFIiwiVmFsdWVzIjp7ImR0eXBlIjoiZmxvYXQ2NCIsImxlbmd0aCI6Mywib2Zmc2V0IjowfX0seyJOYW1lIjoiVE9SUVVFIiwiVmFsdWVzIjp7ImR0eXBlIjoiZmxvYXQzMiIsImxlbmd0aCI6Miwib2Zmc2V0IjoyNH19XX1dXX19ICAgICAgAAAAAAAA4D8AAAAAAADwPwAAAAAAAABAAACAQAAAAEE='
+    const bytes = Uint8Array.from(atob(frame), (c) => c.charCodeAt(0))
+    const message = parseBinaryFrame(bytes.buffer)
+
+    expect(message.command).toBe('trace chunk')
+    const [angle, torque] = message.data.steptraces[0][1].StepTraceContent
+    expect(angle.Values).toBeInstanceOf(Float64Array)
+    expect(Array.from(angle.Values)).toEqual([0.5, 1, 2])
+    expect(Array.from(torque.Values)).toEqual([4, 8])
+  })
 })
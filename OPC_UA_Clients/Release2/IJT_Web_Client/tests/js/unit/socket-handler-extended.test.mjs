@@ -26,6 +26,7 @@ function makeMockWSM () {
       if (!callbacks[endpointUrl]) callbacks[endpointUrl] = {}
       callbacks[endpointUrl][command] = fn
     }),
+    unsubscribe: vi.fn(),
     /** Simulate an incoming message for a given command */
     fire (endpointUrl, command, msg, uniqueid) {
       const fn = callbacks[endpointUrl]?.[command]
@@ -103,6 +104,35 @@ describe('SocketHandler — subscribeEvent', () => {
     expect(subCall).toBeDefined()
     expect(subCall[3]).toMatchObject({ details: 'MySubscriber' })
   })
+
+  it('passes an optional projection and filter to the server', () => {
+    const { wsm, sh } = makeHandler()
+    sh.subscribeEvent(null, 'Dashboard', { projection: 'overall', filter: { evaluation: [2] } })
+    const subCall = wsm.send.mock.calls.find(c => c[0] === 'subscribe')
+    expect(subCall[3]).toMatchObject({ projection: 'overall', filter: { evaluation: [2] }, details: 'Dashboard' })
+  })
+})
+
+// ---------------------------------------------------------------------------
+// getTrace
+// ---------------------------------------------------------------------------
+
+describe('SocketHandler — getTrace', () => {
+  it('collects the trace chunks in order and resolves on the reply', async () => {
+    const { wsm, sh } = makeHandler()
+    const promise = sh.getTrace('R-1')
+    const id = sh.uniqueId
+    expect(wsm.send).toHaveBeenCalledWith('gettrace', ENDPOINT, id, { resultid: 'R-1' })
+
+    wsm.fire(ENDPOINT, 'trace chunk', { resultid: 'R-1', index: 1, total: 2, steptraces: [[0, { StepTraceId: 's2' }]] })
+    wsm.fire(ENDPOINT, 'trace chunk', { resultid: 'R-0', index: 0, total: 1, steptraces: [[0, { StepTraceId: 'x' }]] })
+    wsm.fire(ENDPOINT, 'trace chunk', { resultid: 'R-1', index: 0, total: 2, steptraces: [[0, { StepTraceId: 's1' }]] })
+    wsm.fire(ENDPOINT, 'gettrace', { resultid: 'R-1', chunks: 2 }, id)
+
+    const trace = await promise
+    expect(trace.stepTraces.map(([, step]) => step.StepTraceId)).toEqual(['s1', 's2'])
+    expect(wsm.unsubscribe).toHaveBeenCalledWith(ENDPOINT, 'trace chunk', expect.any(Function))
+  })
 })
 
 // ---------------------------------------------------------------------------
@@ -177,4 +177,24 @@ describe('SocketHandler — other payload key contracts', () => {
     const payload = wsm.lastPayloadFor('read')
     expect(payload).toHaveProperty('attribute', 'Value')
   })
+
+  it('readManyPromise sends stringified node ids under "nodeids"', () => {
+    handler.readManyPromise(['ns=0;i=85', { NamespaceIndex: 1, Identifier: 'Tools' }])
+    const payload = wsm.lastPayloadFor('readmany')
+    expect(payload).toHaveProperty('nodeids', ['ns=0;i=85', 'ns=1;s=Tools'])
+  })
+
+  it('pathstoidsPromise sends the path requests under "paths"', () => {
+    const paths = [{ nodeid: { NamespaceIndex: 1, Identifier: 'T' }, path: '[]' }]
+    handler.pathstoidsPromise(paths)
+    const payload = wsm.lastPayloadFor('pathstoids')
+    expect(payload).toHaveProperty('paths', paths)
+  })
+
+  it('browseManyPromise sends "nodeids" and "details" keys', () => {
+    handler.browseManyPromise(['ns=0;i=85'], true)
+    const payload = wsm.lastPayloadFor('browsemany')
+    expect(payload).toHaveProperty('nodeids', ['ns=0;i=85'])
+    expect(payload).toHaveProperty('details', true)
+  })
 })
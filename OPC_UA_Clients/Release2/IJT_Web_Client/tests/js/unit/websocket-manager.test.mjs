@@ -60,6 +60,19 @@ describe('WebSocketManager', () => {
     expect(callback).toHaveBeenCalledWith({ ok: true }, 'u1')
   })
 
+  it('unpacks batched events frames into individual event callbacks in order', () => {
+    const manager = new WebSocketManager(vi.fn(), 'ws://test')
+    const ws = MockWebSocket.instances[0]
+    const callback = vi.fn()
+
+    manager.subscribe('ep1', 'event', callback)
+    ws.open()
+    ws.emitMessage({ command: 'events', endpoint: 'ep1', data: [{ n: 1 }, { n: 2 }] })
+
+    expect(callback).toHaveBeenCalledTimes(2)
+    expect(callback.mock.calls.map(([msg]) => msg.n)).toEqual([1, 2])
+  })
+
   it('re-establishes connection and flushes queued message after reconnect', () => {
     const manager = new WebSocketManager(() => {}, 'ws://first')
 
@@ -21,7 +21,7 @@ class FakeWebSocket:
         except StopIteration:
             raise StopAsyncIteration
 
-    async def send(self, value):
+    async def send(self, value, text=None):
         self.sent.append(value)
 
 
@@ -94,17 +94,23 @@ async def test_connect_returns_exception_when_all_retries_fail(monkeypatch):
 async def test_connect_uses_explicit_single_probe_attempt(monkeypatch):
     monkeypatch.setenv("OPCUA_CONNECT_RETRIES", "8")
 
-    mock_client = MagicMock()
-    mock_client.connect = AsyncMock(side_effect=ConnectionRefusedError("refused"))
-    mock_client.set_security_string = MagicMock(return_value=None)
+    created: list = []
 
-    with patch("python.connection.Client", return_value=mock_client):
+    def _fake_client(url, timeout=60, **_kwargs):
+        mock_client = MagicMock()
+        mock_client.connect = AsyncMock(side_effect=ConnectionRefusedError("refused"))
+        mock_client.disconnect = AsyncMock()
+        created.append(mock_client)
+        return mock_client
+
+    with patch("python.connection.Client", side_effect=_fake_client):
         conn = _make_connection()
         result = await conn.connect(max_retries=1)
 
     assert "after 1 attempts" in result["exception"]
-    assert mock_client.connect.await_count == 1
-    assert mock_client.session_timeout == 600_000
+    assert len(created) == 2  # method and subscription session, attempted once each
+    assert all(client.connect.await_count == 1 for client in created)
+    assert all(client.session_timeout == 600_000 for client in created)
 
 
 # ---------------------------------------------------------------------------
@@ -133,9 +139,8 @@ async def test_connect_docker_url_rewrite(monkeypatch):
         conn = _make_connection(server_url="opc.tcp://localhost:40451")
         await conn.connect()
 
-    assert len(created_urls) == 1
-    assert "host.docker.internal" in created_urls[0]
-    assert "localhost" not in created_urls[0]
+    assert len(created_urls) == 2  # method and subscription session
+    assert all("host.docker.internal" in url and "localhost" not in url for url in created_urls)
 
 
 @pytest.mark.asyncio
@@ -159,7 +164,7 @@ async def test_connect_docker_mode_does_not_rewrite_without_host_bridge_opt_in(m
         conn = _make_connection(server_url="opc.tcp://localhost:40451")
         await conn.connect()
 
-    assert created_urls == ["opc.tcp://localhost:40451"]
+    assert created_urls == ["opc.tcp://localhost:40451", "opc.tcp://localhost:40451"]
 
 
 # ---------------------------------------------------------------------------
@@ -191,7 +196,7 @@ async def test_connect_sends_connection_established_on_success(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_connect_loads_ijt_type_definitions_on_both_clients(monkeypatch):
+async def test_connect_loads_ijt_type_definitions_once_for_both_sessions(monkeypatch):
     monkeypatch.setenv("OPCUA_CONNECT_RETRIES", "1")
 
     calls: list[str] = []
@@ -214,7 +219,56 @@ async def test_connect_loads_ijt_type_definitions_on_both_clients(monkeypatch):
         result = await conn.connect()
 
     assert result.get("command") == "connection established"
-    assert calls == ["main_legacy", "main_modern", "sub_legacy", "sub_modern"]
+    assert calls == ["main_legacy", "main_modern"]
+    assert conn.subscription_client is sub_mock
+
+
+@pytest.mark.asyncio
+async def test_connect_establishes_both_sessions_concurrently(monkeypatch):
+    """The method session handshake waits for the subscription session's — only possible when concurrent."""
+    import asyncio
+
+    monkeypatch.setenv("OPCUA_CONNECT_RETRIES", "1")
+    sub_started = asyncio.Event()
+
+    async def _main_connect():
+        await asyncio.wait_for(sub_started.wait(), timeout=1.0)
+
+    async def _sub_connect():
+        sub_started.set()
+
+    main_mock = MagicMock()
+    main_mock.connect = AsyncMock(side_effect=_main_connect)
+    main_mock.load_type_definitions = AsyncMock(return_value=None)
+    main_mock.load_data_type_definitions = AsyncMock(return_value=None)
+    sub_mock = MagicMock()
+    sub_mock.connect = AsyncMock(side_effect=_sub_connect)
+
+    with patch("python.connection.Client", side_effect=[main_mock, sub_mock]):
+        conn = _make_connection(server_url="opc.tcp://localhost:40451")
+        result = await conn.connect()
+
+    assert result.get("command") == "connection established"
+    assert conn.subscription_client is sub_mock
+
+
+@pytest.mark.asyncio
+async def test_connect_failure_closes_connected_subscription_session(monkeypatch):
+    monkeypatch.setenv("OPCUA_CONNECT_RETRIES", "1")
+
+    main_mock = MagicMock()
+    main_mock.connect = AsyncMock(side_effect=ConnectionRefusedError("refused"))
+    sub_mock = MagicMock()
+    sub_mock.connect = AsyncMock(return_value=None)
+    sub_mock.disconnect = AsyncMock()
+
+    with patch("python.connection.Client", side_effect=[main_mock, sub_mock]):
+        conn = _make_connection(server_url="opc.tcp://localhost:40451")
+        result = await conn.connect()
+
+    assert "exception" in result
+    sub_mock.disconnect.assert_awaited_once()
+    assert conn.subscription_client is None
 
 
 @pytest.mark.asyncio
@@ -1121,10 +1175,17 @@ async def test_subscribe_skips_already_active_subscriptions():
 
 def _make_read_node(node_class_value):
     """Return a MagicMock node ready for read() with the given NodeClass."""
-    mock_reply = MagicMock()
-    mock_reply.Value.Value = "v"
+
+    def _reply(value):
+        reply = MagicMock()
+        reply.Value.Value = value
+        return reply
+
     mock_node = MagicMock()
-    mock_node.read_attributes = AsyncMock(return_value=[mock_reply] * 12)
+    mock_node.read_attributes = AsyncMock(
+        return_value=[_reply("v"), _reply(node_class_value)] + [_reply("v")] * 9 + [_reply(99)]
+    )
+    mock_node.read_attribute = AsyncMock(return_value=_reply(100))
     mock_node.get_references = AsyncMock(return_value=[])
     mock_node.read_node_class = AsyncMock(return_value=node_class_value)
     mock_node.get_value = AsyncMock(return_value=99)
@@ -1132,8 +1193,8 @@ def _make_read_node(node_class_value):
 
 
 @pytest.mark.asyncio
-async def test_read_variable_node_fetches_value():
-    """read() on a Variable node calls get_value() and returns a readresult dict."""
+async def test_read_variable_node_takes_value_from_attribute_reply():
+    """read() on a Variable node uses NodeClass/Value from the single attribute read."""
     from asyncua import ua
 
     conn = _make_connection()
@@ -1141,18 +1202,19 @@ async def test_read_variable_node_fetches_value():
     conn.client = MagicMock()
     conn.client.get_node = MagicMock(return_value=mock_node)
 
-    with patch("python.connection.serialize_tuple", return_value="{}"):
-        with patch("python.connection.serialize_value", return_value="{}"):
-            result = await conn.read({"nodeid": "ns=1;s=Var1"})
+    result = await conn.read({"nodeid": "ns=1;s=Var1"})
 
     assert result.get("command") == "readresult"
     assert result.get("nodeid") == "ns=1;s=Var1"
-    mock_node.get_value.assert_awaited_once()
+    assert json.loads(result["value"]) == 99
+    mock_node.read_attributes.assert_awaited_once()
+    mock_node.read_node_class.assert_not_awaited()
+    mock_node.get_value.assert_not_awaited()
 
 
 @pytest.mark.asyncio
 async def test_read_non_variable_node_does_not_fetch_value():
-    """read() on a non-Variable (Object) node skips the get_value() call."""
+    """read() on a non-Variable (Object) node returns an empty value."""
     from asyncua import ua
 
     conn = _make_connection()
@@ -1166,6 +1228,86 @@ async def test_read_non_variable_node_does_not_fetch_value():
 
     assert result.get("command") == "readresult"
     mock_node.get_value.assert_not_awaited()
+    mock_node.read_attribute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_read_repeated_object_read_is_served_from_node_cache():
+    """A second read() of an Object node costs no server round-trips."""
+    from asyncua import ua
+
+    conn = _make_connection()
+    mock_node = _make_read_node(ua.NodeClass.Object)
+    conn.client = MagicMock()
+    conn.client.get_node = MagicMock(return_value=mock_node)
+
+    first = await conn.read({"nodeid": "ns=1;s=Obj1"})
+    second = await conn.read({"nodeid": "ns=1;s=Obj1"})
+
+    assert first == second
+    mock_node.read_attributes.assert_awaited_once()
+    mock_node.get_references.assert_awaited_once()
+    assert conn.node_cache.stats()["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_read_cached_variable_refreshes_only_value():
+    """A cached Variable node re-reads just its Value attribute."""
+    from asyncua import ua
+
+    conn = _make_connection()
+    mock_node = _make_read_node(ua.NodeClass.Variable)
+    conn.client = MagicMock()
+    conn.client.get_node = MagicMock(return_value=mock_node)
+
+    await conn.read({"nodeid": "ns=1;s=Var1"})
+    result = await conn.read({"nodeid": "ns=1;s=Var1"})
+
+    assert json.loads(result["value"]) == 100
+    assert json.loads(result["attributes"])["Value"] == 100
+    mock_node.read_attributes.assert_awaited_once()
+    mock_node.read_attribute.assert_awaited_once_with(ua.AttributeIds.Value)
+
+
+@pytest.mark.asyncio
+async def test_browse_reuses_references_cached_by_read():
+    """browse() after read() of the same node does not fetch references again."""
+    from asyncua import ua
+
+    conn = _make_connection()
+    mock_node = _make_read_node(ua.NodeClass.Object)
+    conn.client = MagicMock()
+    conn.client.get_node = MagicMock(return_value=mock_node)
+
+    await conn.read({"nodeid": "ns=1;s=Obj1"})
+    result = await conn.browse({"nodeid": "ns=1;s=Obj1"})
+
+    assert result == {"nodes": []}
+    mock_node.get_references.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_model_change_watch_subscribes_once_and_clears_cache():
+    """The first cached read subscribes to model changes and the NamespaceArray exactly once."""
+    conn = _make_connection()
+    subscription = MagicMock()
+    subscription.subscribe_events = AsyncMock()
+    subscription.subscribe_data_change = AsyncMock()
+    conn.client = MagicMock()
+    conn.client.create_subscription = AsyncMock(return_value=subscription)
+
+    await conn._watch_model_changes()
+    await conn._watch_model_changes()
+
+    conn.client.create_subscription.assert_awaited_once()
+    subscription.subscribe_events.assert_awaited_once()
+    subscription.subscribe_data_change.assert_awaited_once()
+    handler = conn.client.create_subscription.await_args.args[1]
+    conn.node_cache.put("references", "ns=1;s=Obj1", [])
+    conn.path_cache.put("path", "ns=1;s=Parent/1:Child", "ns=1;s=Child")
+    handler.event_notification(MagicMock())
+    assert conn.node_cache.stats()["entries"] == 0
+    assert conn.path_cache.stats()["entries"] == 0
 
 
 @pytest.mark.asyncio
@@ -1236,6 +1378,103 @@ async def test_pathtoid_exception_returns_exception_dict():
     assert "PathToId Exception" in result["exception"]
 
 
+def _make_path_connection():
+    conn = _make_connection()
+    conn.client = MagicMock()
+    conn.client.translate_browsepaths = AsyncMock()
+    conn.client.uaclient.translate_browsepaths_to_nodeids = AsyncMock()
+    return conn
+
+
+def _path_request(start, *names):
+    return {
+        "nodeid": {"NamespaceIndex": 1, "Identifier": start},
+        "path": json.dumps([{"identifier": name, "namespaceindex": 1} for name in names]),
+    }
+
+
+def _path_result(target=None, status=None):
+    from asyncua import ua
+
+    result = ua.BrowsePathResult()
+    if status is not None:
+        result.StatusCode = ua.StatusCode(status)
+    if target is not None:
+        path_target = ua.BrowsePathTarget()
+        path_target.TargetId = ua.ExpandedNodeId(target, 1)
+        result.Targets = [path_target]
+    return result
+
+
+@pytest.mark.asyncio
+async def test_pathtoid_repeated_path_is_served_from_memo():
+    """A resolved (start node, path) pair is not translated again."""
+    conn = _make_path_connection()
+    conn.client.translate_browsepaths.return_value = [_path_result("Child")]
+
+    first = await conn.pathtoid(_path_request("Parent", "Child"))
+    second = await conn.pathtoid(_path_request("Parent", "Child"))
+
+    assert first == second
+    assert "exception" not in first
+    conn.client.translate_browsepaths.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_pathtoid_memo_cleared_when_namespace_array_changes():
+    conn = _make_path_connection()
+    conn.client.translate_browsepaths.return_value = [_path_result("Child")]
+    conn.client.get_namespace_array = AsyncMock(return_value=["http://opcfoundation.org/UA/", "urn:a"])
+
+    await conn.namespaces({})
+    await conn.pathtoid(_path_request("Parent", "Child"))
+    await conn.namespaces({})
+    await conn.pathtoid(_path_request("Parent", "Child"))
+    assert conn.client.translate_browsepaths.await_count == 1
+
+    conn.client.get_namespace_array.return_value = ["http://opcfoundation.org/UA/", "urn:b", "urn:a"]
+    await conn.namespaces({})
+    await conn.pathtoid(_path_request("Parent", "Child"))
+    assert conn.client.translate_browsepaths.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_pathstoids_resolves_misses_in_one_call_in_request_order():
+    from asyncua import ua
+
+    conn = _make_path_connection()
+    conn.client.translate_browsepaths.return_value = [_path_result("A")]
+    cached = await conn.pathtoid(_path_request("Parent", "A"))
+    conn.client.uaclient.translate_browsepaths_to_nodeids.return_value = [
+        _path_result("B"),
+        _path_result(status=ua.StatusCodes.BadNoMatch),
+    ]
+
+    result = await conn.pathstoids(
+        {"paths": [_path_request("Parent", "B"), _path_request("Parent", "A"), _path_request("Parent", "Missing")]}
+    )
+
+    conn.client.uaclient.translate_browsepaths_to_nodeids.assert_awaited_once()
+    browse_paths = conn.client.uaclient.translate_browsepaths_to_nodeids.await_args.args[0]
+    assert [bp.RelativePath.Elements[0].TargetName.Name for bp in browse_paths] == ["B", "Missing"]
+    results = result["results"]
+    assert results[1] == cached
+    assert "exception" not in results[0]
+    assert results[2] == {"exception": "PathToId Exception: BadNoMatch"}
+
+    again = await conn.pathstoids({"paths": [_path_request("Parent", "B")]})
+    assert again["results"] == [results[0]]
+    conn.client.uaclient.translate_browsepaths_to_nodeids.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_pathstoids_rejects_missing_paths():
+    conn = _make_path_connection()
+    result = await conn.pathstoids({"paths": []})
+    assert "exception" in result
+    conn.client.uaclient.translate_browsepaths_to_nodeids.assert_not_awaited()
+
+
 # ---------------------------------------------------------------------------
 # browse — details=True adds TypeDefinition to each entry (lines 574-575)
 # ---------------------------------------------------------------------------
@@ -1263,65 +1502,289 @@ async def test_browse_with_details_true_includes_type_definition_field():
 
 
 # ---------------------------------------------------------------------------
-# read_product_instance_uri — tools found on first path (lines 628-649)
+# readmany / browsemany — batched Read and Browse service calls
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_read_product_instance_uri_returns_tools_found_on_first_path():
-    """read_product_instance_uri returns tool list when first path has accessible tools."""
-    conn = _make_connection()
+def _data_value(value, status=None):
+    from asyncua import ua
 
-    mock_pi_node = MagicMock()
-    mock_pi_node.read_value = AsyncMock(return_value="urn:tool:SN001")
-    mock_browse_name = MagicMock()
-    mock_browse_name.Name = "Wrench1"
-    mock_child = MagicMock()
-    mock_child.read_browse_name = AsyncMock(return_value=mock_browse_name)
-    mock_tools_node = MagicMock()
-    mock_tools_node.get_children = AsyncMock(return_value=[mock_child])
+    data_value = ua.DataValue(ua.Variant(value))
+    if status is not None:
+        data_value.StatusCode = ua.StatusCode(status)
+    return data_value
 
-    def _get_node(path):
-        if "ProductInstanceUri" in path:
-            return mock_pi_node
-        return mock_tools_node
 
+def _reference(name):
+    from asyncua import ua
+
+    ref = ua.ReferenceDescription()
+    ref.NodeId = ua.NodeId(name, 1)
+    ref.BrowseName = ua.QualifiedName(name, 1)
+    ref.DisplayName = ua.LocalizedText(name)
+    ref.NodeClass = ua.NodeClass.Object
+    return ref
+
+
+def _make_batch_connection():
+    conn = _make_connection()
     conn.client = MagicMock()
-    conn.client.get_node = MagicMock(side_effect=_get_node)
+    conn.client.uaclient.read = AsyncMock()
+    conn.client.uaclient.browse = AsyncMock()
+    conn.client.uaclient.browse_next = AsyncMock()
+    return conn
+
+
+def _attribute_reply(node_class, value=None):
+    return [_data_value("x"), _data_value(node_class)] + [_data_value("x")] * 9 + [_data_value(value)]
+
+
+@pytest.mark.asyncio
+async def test_readmany_uses_one_read_and_one_browse_call():
+    from asyncua import ua
+
+    conn = _make_batch_connection()
+    conn.client.uaclient.read.return_value = _attribute_reply(ua.NodeClass.Object) + _attribute_reply(
+        ua.NodeClass.Variable, 42
+    )
+    conn.client.uaclient.browse.return_value = [
+        ua.BrowseResult(References=[_reference("A")]),
+        ua.BrowseResult(References=[]),
+    ]
+
+    result = await conn.readmany({"nodeids": ["ns=1;s=Obj", "ns=1;s=Var", "ns=1;s=Obj"]})
+
+    assert list(result["results"]) == ["ns=1;s=Obj", "ns=1;s=Var"]
+    assert len(conn.client.uaclient.read.await_args.args[0].NodesToRead) == 24
+    assert len(conn.client.uaclient.browse.await_args.args[0].NodesToBrowse) == 2
+    obj, var = result["results"]["ns=1;s=Obj"], result["results"]["ns=1;s=Var"]
+    assert obj["nodeid"] == "ns=1;s=Obj"
+    assert json.loads(obj["value"]) == {}
+    assert len(json.loads(obj["relations"])) == 1
+    assert json.loads(var["value"]) == 42
+
+
+@pytest.mark.asyncio
+async def test_readmany_reports_bad_nodes_individually():
+    from asyncua import ua
+
+    conn = _make_batch_connection()
+    bad_reply = [_data_value(None, ua.StatusCodes.BadNodeIdUnknown)] * 12
+    conn.client.uaclient.read.return_value = bad_reply + _attribute_reply(ua.NodeClass.Object)
+    conn.client.uaclient.browse.return_value = [ua.BrowseResult()]
+
+    result = await conn.readmany({"nodeids": ["ns=1;s=Missing", "ns=1;s=Obj"]})
+
+    assert result["results"]["ns=1;s=Missing"] == {"exception": "Read failed: BadNodeIdUnknown"}
+    assert "attributes" in result["results"]["ns=1;s=Obj"]
+    assert len(conn.client.uaclient.browse.await_args.args[0].NodesToBrowse) == 1
+
+
+@pytest.mark.asyncio
+async def test_readmany_splits_calls_at_the_server_operation_limits():
+    from asyncua import ua
+
+    conn = _make_batch_connection()
+    conn.client.read_values = AsyncMock(return_value=[10, 1])
+    replies = _attribute_reply(ua.NodeClass.Object) + _attribute_reply(ua.NodeClass.Variable, 42)
+    conn.client.uaclient.read.side_effect = lambda params: [replies.pop(0) for _ in params.NodesToRead]
+    conn.client.uaclient.browse.side_effect = lambda params: [ua.BrowseResult() for _ in params.NodesToBrowse]
+
+    result = await conn.readmany({"nodeids": ["ns=1;s=Obj", "ns=1;s=Var"]})
+
+    reads = [len(call.args[0].NodesToRead) for call in conn.client.uaclient.read.await_args_list]
+    assert reads == [10, 2, 10, 2] and conn.client.uaclient.browse.await_count == 2
+    assert json.loads(result["results"]["ns=1;s=Var"]["value"]) == 42
+    await conn.readmany({"nodeids": ["ns=1;s=Var"]})
+    conn.client.read_values.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_readmany_second_call_reads_only_variable_values():
+    from asyncua import ua
+
+    conn = _make_batch_connection()
+    conn.client.uaclient.read.return_value = _attribute_reply(ua.NodeClass.Object) + _attribute_reply(
+        ua.NodeClass.Variable, 1
+    )
+    conn.client.uaclient.browse.return_value = [ua.BrowseResult(), ua.BrowseResult()]
+    await conn.readmany({"nodeids": ["ns=1;s=Obj", "ns=1;s=Var"]})
+
+    conn.client.uaclient.read.return_value = [_data_value(2)]
+    result = await conn.readmany({"nodeids": ["ns=1;s=Obj", "ns=1;s=Var"]})
+
+    assert len(conn.client.uaclient.read.await_args.args[0].NodesToRead) == 1
+    conn.client.uaclient.browse.assert_awaited_once()
+    assert json.loads(result["results"]["ns=1;s=Var"]["value"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_browsemany_follows_continuation_points():
+    from asyncua import ua
+
+    conn = _make_batch_connection()
+    conn.client.uaclient.browse.return_value = [
+        ua.BrowseResult(References=[_reference("A")], ContinuationPoint=b"cp1"),
+        ua.BrowseResult(References=[_reference("B")]),
+    ]
+    conn.client.uaclient.browse_next.side_effect = [
+        [ua.BrowseResult(References=[_reference("A2")], ContinuationPoint=b"cp2")],
+        [ua.BrowseResult(References=[_reference("A3")])],
+    ]
+
+    result = await conn.browsemany({"nodeids": ["ns=1;s=P", "ns=1;s=Q"], "details": True})
+
+    names = [entry["BrowseName"] for entry in result["results"]["ns=1;s=P"]["nodes"]]
+    assert names == [
+        "QualifiedName(NamespaceIndex=1, Name='A')",
+        "QualifiedName(NamespaceIndex=1, Name='A2')",
+        "QualifiedName(NamespaceIndex=1, Name='A3')",
+    ]
+    assert "TypeDefinition" in result["results"]["ns=1;s=Q"]["nodes"][0]
+    first_next = conn.client.uaclient.browse_next.await_args_list[0].args[0]
+    assert first_next.ContinuationPoints == [b"cp1"]
+    assert conn.client.uaclient.browse_next.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_browsemany_reports_bad_status_per_node():
+    from asyncua import ua
+
+    conn = _make_batch_connection()
+    conn.client.uaclient.browse.return_value = [
+        ua.BrowseResult(StatusCode=ua.StatusCode(ua.StatusCodes.BadNodeIdUnknown)),
+    ]
+
+    result = await conn.browsemany({"nodeids": ["ns=1;s=Missing"]})
+
+    assert result == {"results": {"ns=1;s=Missing": {"exception": "Browse failed: BadNodeIdUnknown"}}}
+
+
+@pytest.mark.asyncio
+async def test_browsemany_does_not_cache_references_cut_short():
+    from asyncua import ua
+
+    conn = _make_batch_connection()
+    conn.client.uaclient.browse.return_value = [
+        ua.BrowseResult(References=[_reference("A")], ContinuationPoint=b"cp1"),
+    ]
+    conn.client.uaclient.browse_next.return_value = [
+        ua.BrowseResult(StatusCode=ua.StatusCode(ua.StatusCodes.BadContinuationPointInvalid)),
+    ]
+
+    first = await conn.browsemany({"nodeids": ["ns=1;s=P"]})
+    await conn.browsemany({"nodeids": ["ns=1;s=P"]})
+
+    assert len(first["results"]["ns=1;s=P"]["nodes"]) == 1
+    assert conn.client.uaclient.browse.await_count == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("command", ["readmany", "browsemany"])
+@pytest.mark.parametrize("node_ids", [None, [], "ns=1;s=A"])
+async def test_batch_commands_reject_missing_nodeids(command, node_ids):
+    conn = _make_batch_connection()
+    result = await getattr(conn, command)({"nodeids": node_ids})
+    assert "nodeids" in result["exception"]
+
+
+# ---------------------------------------------------------------------------
+# read_product_instance_uri — tools found on first path (lines 628-649)
+# ---------------------------------------------------------------------------
+
+
+def _make_tools_connection(subscription_error=None):
+    conn = _make_batch_connection()
+    subscription = MagicMock()
+    subscription.subscribe_events = AsyncMock()
+    conn.client.get_namespace_index = AsyncMock(return_value=3)
+    conn.client.nodes.root.get_child = AsyncMock()
+    conn.client.create_subscription = AsyncMock(return_value=subscription, side_effect=subscription_error)
+    return conn
+
+
+@pytest.mark.asyncio
+async def test_read_product_instance_uri_reads_all_tools_in_one_browse_and_one_read():
+    """Both Tools containers are probed in one Browse; all ProductInstanceUris in one Read."""
+    from asyncua import ua
+
+    conn = _make_tools_connection()
+    conn.client.uaclient.browse.return_value = [
+        ua.BrowseResult(StatusCode=ua.StatusCode(ua.StatusCodes.BadNodeIdUnknown)),
+        ua.BrowseResult(References=[_reference("Wrench1"), _reference("Wrench2")]),
+    ]
+    conn.client.uaclient.read.return_value = [
+        _data_value("urn:tool:SN001"),
+        _data_value(None, ua.StatusCodes.BadNodeIdUnknown),
+    ]
 
     result = await conn.read_product_instance_uri({})
 
-    assert len(result["tools"]) == 1
-    assert result["tools"][0]["toolName"] == "Wrench1"
-    assert result["tools"][0]["productInstanceUri"] == "urn:tool:SN001"
+    assert result == {
+        "tools": [
+            {
+                "toolName": "Wrench1",
+                "productInstanceUri": "urn:tool:SN001",
+                "path": "TighteningSystem/AssetManagement/Assets/Tools/Wrench1",
+            }
+        ]
+    }
+    conn.client.uaclient.browse.assert_awaited_once()
+    conn.client.uaclient.read.assert_awaited_once()
+    assert len(conn.client.uaclient.read.await_args.args[0].NodesToRead) == 2
 
 
 @pytest.mark.asyncio
-async def test_read_product_instance_uri_child_pi_read_raises_skips_child():
-    """read_product_instance_uri skips a child when pi_node.read_value raises."""
-    conn = _make_connection()
+async def test_read_product_instance_uri_cached_until_asset_change_event():
+    from asyncua import ua
 
-    mock_pi_node = MagicMock()
-    mock_pi_node.read_value = AsyncMock(side_effect=RuntimeError("node inaccessible"))
-    mock_browse_name = MagicMock()
-    mock_browse_name.Name = "Wrench2"
-    mock_child = MagicMock()
-    mock_child.read_browse_name = AsyncMock(return_value=mock_browse_name)
-    mock_tools_node = MagicMock()
-    mock_tools_node.get_children = AsyncMock(return_value=[mock_child])
+    conn = _make_tools_connection()
+    conn.client.uaclient.browse.return_value = [
+        ua.BrowseResult(References=[_reference("Wrench1")]),
+        ua.BrowseResult(StatusCode=ua.StatusCode(ua.StatusCodes.BadNodeIdUnknown)),
+    ]
+    conn.client.uaclient.read.return_value = [_data_value("urn:tool:SN001")]
 
-    def _get_node(path):
-        if "ProductInstanceUri" in path:
-            return mock_pi_node
-        return mock_tools_node
+    first = await conn.read_product_instance_uri({})
+    second = await conn.read_product_instance_uri({})
+    assert first == second
+    conn.client.uaclient.read.assert_awaited_once()
+    conn.client.create_subscription.assert_awaited_once()
 
-    conn.client = MagicMock()
-    conn.client.get_node = MagicMock(side_effect=_get_node)
+    handler = conn.client.create_subscription.await_args.args[1]
+    handler.event_notification(MagicMock(ConditionSubClassName=[ua.LocalizedText("ToolErrorConditionClassType")]))
+    await conn.read_product_instance_uri({})
+    conn.client.uaclient.read.assert_awaited_once()
 
+    handler.event_notification(MagicMock(ConditionSubClassName=[ua.LocalizedText("AssetConnectedConditionClassType")]))
+    await conn.read_product_instance_uri({})
+    assert conn.client.uaclient.read.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_read_product_instance_uri_not_cached_without_asset_subscription():
+    from asyncua import ua
+
+    conn = _make_tools_connection(subscription_error=RuntimeError("BadTooManySubscriptions"))
+    conn.client.uaclient.browse.return_value = [
+        ua.BrowseResult(References=[_reference("Wrench1")]),
+        ua.BrowseResult(),
+    ]
+    conn.client.uaclient.read.return_value = [_data_value("urn:tool:SN001")]
+
+    await conn.read_product_instance_uri({})
     result = await conn.read_product_instance_uri({})
 
-    # Child is silently skipped; both paths try and both fail → empty list
-    assert result == {"tools": []}
+    assert result["tools"][0]["toolName"] == "Wrench1"
+    assert conn.client.uaclient.read.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_read_product_instance_uri_returns_empty_list_when_browse_fails():
+    conn = _make_tools_connection()
+    conn.client.uaclient.browse.side_effect = RuntimeError("channel closed")
+
+    assert await conn.read_product_instance_uri({}) == {"tools": []}
 
 
 # ---------------------------------------------------------------------------
@@ -1502,6 +1965,42 @@ async def test_methodcall_arg_mapping_exception_falls_back_to_create_call_struct
     assert fallback_variant in captured
 
 
+# ---------------------------------------------------------------------------
+# methodcall — cached InputArguments signature and conversion plan
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_methodcall_reads_input_arguments_once_per_method():
+    """Repeated calls reuse the cached signature and the compiled conversion plan."""
+    from asyncua import ua
+
+    mock_arg_desc = MagicMock()
+    mock_arg_desc.DataType = ua.NodeId(7)
+    conn, captured = _make_methodcall_conn(expected_args=[mock_arg_desc])
+    mock_obj, mock_method = conn.client.get_node.side_effect
+    conn.client.get_node = MagicMock(side_effect=lambda node_id: mock_method if "Simulate" in node_id else mock_obj)
+    payload = {**_MC_PAYLOAD, "arguments": [{"dataType": 7, "value": -5}]}
+
+    with patch("python.connection.serialize_full_event", return_value=[]):
+        with patch.object(conn, "is_connection_open", new=AsyncMock(return_value=True)):
+            await conn.methodcall(payload)
+            plan = conn.method_cache.get("plan", "ns=1;s=SimulateResult|[7]")
+            await conn.methodcall({**payload, "arguments": [{"dataType": 7, "value": "12"}]})
+
+            assert mock_method.get_child.await_count == 1
+            assert conn.method_cache.get("plan", "ns=1;s=SimulateResult|[7]") is plan
+            assert [(v.Value, v.VariantType) for v in captured] == [
+                (5, ua.VariantType.UInt32),
+                (12, ua.VariantType.UInt32),
+            ]
+
+            conn.model_change_handler.event_notification(MagicMock())
+            await conn.methodcall(payload)
+
+    assert mock_method.get_child.await_count == 2
+
+
 # ---------------------------------------------------------------------------
 # methodcall — except ua.UaError handling (lines 787-796)
 # ---------------------------------------------------------------------------
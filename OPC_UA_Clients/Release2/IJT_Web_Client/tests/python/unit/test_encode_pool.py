@@ -0,0 +1,91 @@
+"""Tests for python/encode_pool.py and python/loop_lag.py — off-loop encoding of large results."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from python.encode_pool import EncodePool
+from python.event_delivery import DeliveryOptions
+from python.loop_lag import LoopLagMonitor
+from python.result_event_handler import ResultEventHandler, Short
+
+EP = "opc.tcp://controller:4840"
+
+
+def _event(number, samples, steps=0):
+    channel = SimpleNamespace(Name="TORQUE", Values=[0.5 + index for index in range(samples)])
+    trace = SimpleNamespace(StepTraces=[SimpleNamespace(StepTraceId="s1", StepTraceContent=[channel])])
+    step_results = [
+        SimpleNamespace(StepResultId=f"s{index}", StepResultValues=[SimpleNamespace(ValueId="v", MeasuredValue=index)])
+        for index in range(steps)
+    ]
+    meta = SimpleNamespace(ResultId=f"R-{number}")
+    result = SimpleNamespace(
+        ResultMetaData=meta, ResultContent=[SimpleNamespace(Trace=trace, StepResults=step_results)]
+    )
+    return Short(EventType="e", Result=result, Message=f"result {number}", EventId=f"ev-{number}")
+
+
+async def _deliver(pool, events):
+    """Feed ``events`` through a handler with the real serializer; return the sent frames."""
+    websocket = AsyncMock()
+    handler = ResultEventHandler(websocket, EP, delivery=DeliveryOptions(), encode_pool=pool)
+    for event in events:
+        await handler.process_event(event)
+        await asyncio.sleep(0)
+    await handler.close()
+    pool.close()
+    return [json.loads(call.args[0]) for call in websocket.send.call_args_list]
+
+
+def test_pool_offloads_only_large_results(monkeypatch):
+    monkeypatch.setenv("IJT_ENCODE_WORKERS", "3")
+    monkeypatch.setenv("IJT_ENCODE_OFFLOAD_SAMPLES", "10")
+    pool = EncodePool.from_env()
+    assert pool.workers == 3 and pool.offloads(_event(1, 10).Result) and not pool.offloads(_event(1, 9).Result)
+    assert not EncodePool(workers=0, offload_samples=0).offloads(_event(1, 10).Result)
+
+
+@pytest.mark.asyncio
+async def test_offloaded_results_are_sent_in_arrival_order():
+    pool = EncodePool(workers=2, offload_samples=10)
+    events = [_event(0, 10), _event(1, 1), _event(2, 10), _event(3, 1)]
+    sent = await _deliver(pool, events)
+    assert [frame["data"]["EventId"] for frame in sent] == ["ev-0", "ev-1", "ev-2", "ev-3"] and pool.offloaded == 2
+
+
+@pytest.mark.asyncio
+async def test_offloaded_encoding_of_heavy_results_matches_inline_encoding():
+    # CPU-bound like real results: long traces and many step results, serialized for real.
+    events = [_event(number, 50_000, steps=5_000) for number in range(3)]
+    pool = EncodePool(workers=2, offload_samples=10)
+    offloaded = await _deliver(pool, events)
+    assert pool.offloaded == 3
+    assert offloaded == await _deliver(EncodePool(workers=0), events)
+    assert [frame["data"]["EventId"] for frame in offloaded] == ["ev-0", "ev-1", "ev-2"]
+
+
+@pytest.mark.asyncio
+async def test_failed_offloaded_encoding_is_skipped():
+    websocket = AsyncMock()
+    pool = EncodePool(workers=1, offload_samples=10)
+    handler = ResultEventHandler(websocket, EP, delivery=DeliveryOptions(), encode_pool=pool)
+    with patch("python.result_event_handler.serialize_compiled_event", side_effect=[RuntimeError("boom"), {"ok": 1}]):
+        await handler.process_event(_event(0, 10))
+        await handler.process_event(_event(1, 10))
+        await handler.close()
+    pool.close()
+    assert [json.loads(call.args[0])["data"] for call in websocket.send.call_args_list] == [{"ok": 1}]
+
+
+def test_loop_lag_statistics():
+    monitor = LoopLagMonitor(warn_ms=50)
+    assert monitor.as_dict()["samples"] == 0
+    for lag in (1.0, 2.0, 3.0, 80.0):
+        monitor.record(lag, now=0.0)
+    stats = monitor.as_dict()
+    assert stats == {"samples": 4, "last_ms": 80.0, "mean_ms": 21.5, "p99_ms": 80.0, "max_ms": 80.0}
+    assert not LoopLagMonitor(interval_ms=0).enabled
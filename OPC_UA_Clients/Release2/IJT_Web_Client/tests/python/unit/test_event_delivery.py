@@ -0,0 +1,156 @@
+"""Tests for python/event_delivery.py — queue policies, batching, frame assembly."""
+
+import asyncio
+import json
+
+import pytest
+
+from python.event_delivery import (
+    DeliveryOptions,
+    DeliveryStats,
+    collect_batch,
+    encode_frame,
+    enqueue_event,
+    strip_traces,
+)
+
+
+def test_options_default_to_unbatched_blocking_queue(monkeypatch):
+    for name in (
+        "IJT_EVENT_BATCH_SIZE",
+        "IJT_EVENT_BATCH_INTERVAL_MS",
+        "IJT_EVENT_QUEUE_SIZE",
+        "IJT_EVENT_QUEUE_POLICY",
+    ):
+        monkeypatch.delenv(name, raising=False)
+    options = DeliveryOptions.from_env()
+    assert options == DeliveryOptions()
+    assert not options.batching
+    assert options.queue_policy == "block"
+
+
+def test_options_from_env(monkeypatch):
+    monkeypatch.setenv("IJT_EVENT_BATCH_SIZE", "25")
+    monkeypatch.setenv("IJT_EVENT_BATCH_INTERVAL_MS", "10")
+    monkeypatch.setenv("IJT_EVENT_QUEUE_SIZE", "50")
+    monkeypatch.setenv("IJT_EVENT_QUEUE_POLICY", "Drop-Oldest")
+    options = DeliveryOptions.from_env()
+    assert options == DeliveryOptions(batch_size=25, batch_interval_ms=10.0, queue_size=50, queue_policy="drop-oldest")
+    assert options.batching
+
+
+def test_options_from_env_ignores_invalid_values(monkeypatch):
+    monkeypatch.setenv("IJT_EVENT_BATCH_SIZE", "many")
+    monkeypatch.setenv("IJT_EVENT_QUEUE_SIZE", "0")
+    monkeypatch.setenv("IJT_EVENT_QUEUE_POLICY", "drop-newest")
+    options = DeliveryOptions.from_env()
+    assert options.batch_size == 0
+    assert options.queue_size == 1
+    assert options.queue_policy == "block"
+
+
+def test_options_reject_unknown_policy():
+    with pytest.raises(ValueError):
+        DeliveryOptions(queue_policy="drop-newest")
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_discards_head_and_counts():
+    queue: asyncio.Queue = asyncio.Queue(2)
+    options = DeliveryOptions(queue_size=2, queue_policy="drop-oldest")
+    stats = DeliveryStats()
+    for item in ("a", "b", "c"):
+        await enqueue_event(queue, item, options, stats)
+    assert [queue.get_nowait(), queue.get_nowait()] == ["b", "c"]
+    assert stats.dropped_events == 1
+    assert stats.events_enqueued == 3
+    assert stats.max_queue_depth == 2
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_keeps_shutdown_sentinel():
+    queue: asyncio.Queue = asyncio.Queue(1)
+    queue.put_nowait(None)
+    stats = DeliveryStats()
+    await enqueue_event(queue, "late", DeliveryOptions(queue_size=1, queue_policy="drop-oldest"), stats)
+    assert queue.get_nowait() is None
+    assert stats.dropped_events == 1
+
+
+@pytest.mark.asyncio
+async def test_block_policy_waits_for_room():
+    queue: asyncio.Queue = asyncio.Queue(1)
+    queue.put_nowait("a")
+    put = asyncio.create_task(enqueue_event(queue, "b", DeliveryOptions(queue_size=1), DeliveryStats()))
+    await asyncio.sleep(0.01)
+    assert not put.done()
+    assert queue.get_nowait() == "a"
+    await asyncio.wait_for(put, timeout=1.0)
+    assert queue.get_nowait() == "b"
+
+
+def test_strip_traces_clears_result_content_traces():
+    event = {"Result": {"ResultContent": [{"ResultId": "r1", "Trace": {"StepTraces": [1]}}]}}
+    assert strip_traces(event) is True
+    assert event["Result"]["ResultContent"][0] == {"ResultId": "r1", "Trace": None}
+    assert strip_traces(event) is False
+    assert strip_traces({"EventType": "x"}) is False
+
+
+@pytest.mark.asyncio
+async def test_collect_batch_unbatched_returns_single_item():
+    queue: asyncio.Queue = asyncio.Queue()
+    queue.put_nowait("b")
+    assert await collect_batch(queue, "a", DeliveryOptions()) == (["a"], False)
+    assert queue.qsize() == 1
+
+
+@pytest.mark.asyncio
+async def test_collect_batch_flushes_at_batch_size():
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in "bcde":
+        queue.put_nowait(item)
+    batch, stopping = await collect_batch(queue, "a", DeliveryOptions(batch_size=3, batch_interval_ms=1000))
+    assert batch == ["a", "b", "c"]
+    assert not stopping
+
+
+@pytest.mark.asyncio
+async def test_collect_batch_flushes_after_interval():
+    queue: asyncio.Queue = asyncio.Queue()
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    batch, stopping = await collect_batch(queue, "a", DeliveryOptions(batch_size=10, batch_interval_ms=20))
+    assert batch == ["a"]
+    assert not stopping
+    assert loop.time() - started < 0.5
+
+
+@pytest.mark.asyncio
+async def test_collect_batch_stops_at_sentinel():
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in ("b", None, "c"):
+        queue.put_nowait(item)
+    assert await collect_batch(queue, "a", DeliveryOptions(batch_size=10)) == (["a", "b"], True)
+
+
+def test_encode_frame_single_and_batched():
+    endpoint = b'"opc.tcp://x:4840"'
+    single = json.loads(encode_frame(endpoint, [b'{"n":1}']))
+    assert single == {"command": "event", "endpoint": "opc.tcp://x:4840", "data": {"n": 1}}
+    batched = json.loads(encode_frame(endpoint, [b'{"n":1}', b'{"n":2}']))
+    assert batched == {"command": "events", "endpoint": "opc.tcp://x:4840", "data": [{"n": 1}, {"n": 2}]}
+
+
+def test_stats_as_dict_reports_queue_depth():
+    queue: asyncio.Queue = asyncio.Queue()
+    queue.put_nowait("a")
+    stats = DeliveryStats()
+    stats.record_batch(3)
+    stats.record_batch(1)
+    report = stats.as_dict(queue)
+    assert report["queue_depth"] == 1
+    assert report["frames_sent"] == 2
+    assert report["events_sent"] == 4
+    assert report["last_batch_size"] == 1
+    assert report["max_batch_size"] == 3
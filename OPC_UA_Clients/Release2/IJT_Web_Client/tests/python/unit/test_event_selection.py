@@ -0,0 +1,132 @@
+"""Tests for python/event_selection.py — subscribe projections, filters and per-tab delivery."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from python.event_delivery import DeliveryOptions
+from python.event_selection import FULL, EventSelection
+from python.result_event_handler import ResultEventHandler, Short
+from python.session_pool import WebSocketFanout
+
+EP = "opc.tcp://controller:4840"
+
+
+def _result(classification=1, evaluation=1, entities=()):
+    content = SimpleNamespace(
+        OverallResultValues=[{"Value": 12.5}], StepResults=[{"Step": 1}], Trace={"Points": [1, 2]}
+    )
+    meta = SimpleNamespace(
+        Classification=classification, ResultEvaluation=evaluation, AssociatedEntities=list(entities)
+    )
+    return SimpleNamespace(ResultMetaData=meta, ResultContent=[content])
+
+
+def _entity(entity_id, entity_type):
+    return SimpleNamespace(EntityId=entity_id, EntityType=entity_type)
+
+
+def _short(event_id, result):
+    return Short(EventType="ns=4;i=1007", Result=result, Message="m", EventId=event_id)
+
+
+def test_from_request_defaults_and_validation():
+    assert EventSelection.from_request({"command": "subscribe"}) == FULL
+    selection = EventSelection.from_request(
+        {"projection": "Overall", "filter": {"classification": 1, "evaluation": ["2"], "jointid": ["J7"]}}
+    )
+    assert selection.projection == "overall"
+    assert selection.classification == {1} and selection.evaluation == {2} and selection.jointid == {"J7"}
+    with pytest.raises(ValueError):
+        EventSelection.from_request({"projection": "everything"})
+    with pytest.raises(ValueError):
+        EventSelection.from_request({"filter": {"colour": "red"}})
+    with pytest.raises(ValueError):
+        EventSelection.from_request({"filter": {"evaluation": "OK"}})
+
+
+def test_filters_match_result_metadata_and_entities():
+    result = _result(classification=1, evaluation=2, entities=[_entity("T-1", 4), _entity("J7", 23)])
+    assert EventSelection(evaluation=frozenset({2})).matches_result(result)
+    assert not EventSelection(evaluation=frozenset({1})).matches_result(result)
+    assert not EventSelection(classification=frozenset({3})).matches_result(result)
+    assert EventSelection(asset=frozenset({"T-1"}), jointid=frozenset({"J7"})).matches_result(result)
+    # A joint id is not an asset id.
+    assert not EventSelection(asset=frozenset({"J7"})).matches_result(result)
+    system_event = SimpleNamespace(AssociatedEntities=[_entity("T-1", 2)])
+    assert EventSelection(asset=frozenset({"T-1"}), evaluation=frozenset({1})).matches_system_event(system_event)
+
+
+def test_projection_copies_instead_of_mutating():
+    result = _result()
+    overall = EventSelection(projection="overall").project_result(result)
+    no_traces = EventSelection(projection="no-traces").project_result(result)
+
+    assert overall.ResultContent[0].Trace is None and overall.ResultContent[0].StepResults == []
+    assert overall.ResultContent[0].OverallResultValues == [{"Value": 12.5}]
+    assert no_traces.ResultContent[0].Trace is None and no_traces.ResultContent[0].StepResults == [{"Step": 1}]
+    assert result.ResultContent[0].Trace == {"Points": [1, 2]}
+    assert FULL.project_result(result) is result
+
+
+def test_projection_unwraps_variant_content():
+    inner = SimpleNamespace(Trace={"Points": [1]}, StepResults=[])
+    variant = SimpleNamespace(Value=inner)
+    result = SimpleNamespace(ResultMetaData=None, ResultContent=[variant])
+    projected = EventSelection(projection="no-traces").project_result(result)
+    assert projected.ResultContent[0].Value.Trace is None
+    assert variant.Value is inner and inner.Trace == {"Points": [1]}
+
+
+@pytest.mark.asyncio
+async def test_single_socket_gets_projected_and_filtered_results():
+    ws = AsyncMock()
+    handler = ResultEventHandler(ws, EP, delivery=DeliveryOptions())
+    handler.selection = EventSelection(projection="no-traces", evaluation=frozenset({2}))
+
+    await handler.process_event(_short("ok", _result(evaluation=1)))
+    await handler.process_event(_short("nok", _result(evaluation=2)))
+    await asyncio.sleep(0.05)
+
+    ws.send.assert_awaited_once()
+    frame = json.loads(ws.send.call_args[0][0])
+    assert frame["data"]["EventId"] == "nok"
+    assert frame["data"]["Result"]["ResultContent"][0]["Trace"] is None
+    assert handler.delivery_stats()["filtered_events"] == 1
+    await handler.close()
+
+
+class _Tab:
+    def __init__(self) -> None:
+        self.frames: list = []
+
+    async def send(self, payload, text=None):
+        self.frames.append(json.loads(payload))
+
+    async def close(self):
+        return None
+
+
+@pytest.mark.asyncio
+async def test_shared_connection_delivers_each_tab_its_own_selection():
+    fanout = WebSocketFanout()
+    full_tab, dashboard, nok_only = _Tab(), _Tab(), _Tab()
+    fanout.attach("full", full_tab)
+    fanout.attach("dashboard", dashboard)
+    fanout.attach("nok", nok_only)
+    fanout.select("dashboard", EventSelection(projection="overall"))
+    fanout.select("nok", EventSelection(projection="overall", evaluation=frozenset({2})))
+    handler = ResultEventHandler(fanout, EP, delivery=DeliveryOptions())
+
+    await handler.process_event(_short("r1", _result(evaluation=1)))
+    await asyncio.sleep(0.05)
+    await fanout.drain()
+
+    assert full_tab.frames[0]["data"]["Result"]["ResultContent"][0]["Trace"] == {"Points": [1, 2]}
+    assert dashboard.frames[0]["data"]["Result"]["ResultContent"][0]["Trace"] is None
+    assert nok_only.frames == []
+    await handler.close()
+    await fanout.close()
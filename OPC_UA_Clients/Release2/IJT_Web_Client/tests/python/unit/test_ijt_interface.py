@@ -19,8 +19,11 @@ REQUIRED_CONNECTION_METHODS = [
     "subscribe",
     "read",
     "pathtoid",
+    "pathstoids",
     "namespaces",
     "browse",
+    "readmany",
+    "browsemany",
     "methodcall",
     "read_product_instance_uri",
     "is_connection_open",
@@ -0,0 +1,71 @@
+"""Tests for python/json_codec.py — backend selection, bytes output, stdlib fallback."""
+
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from python import json_codec
+
+_PAYLOAD = {"command": "event", "endpoint": "opc.tcp://x:4840", "data": {"Values": [0.5, 1.5], "Name": "Å"}}
+
+
+@pytest.fixture(params=["orjson", "msgspec", "json"])
+def backend(request, monkeypatch):
+    """Run a test once per backend that is installed in this environment."""
+    name = request.param
+    if name != "json" and getattr(json_codec, name) is None:
+        pytest.skip(f"{name} not installed")
+    monkeypatch.setattr(json_codec, "BACKEND", name)
+    if name == "msgspec":
+        monkeypatch.setattr(json_codec, "_msgspec_encoder", json_codec.msgspec.json.Encoder())
+        monkeypatch.setattr(json_codec, "_msgspec_decoder", json_codec.msgspec.json.Decoder())
+    return name
+
+
+@pytest.mark.core
+def test_dumps_returns_utf8_bytes_that_round_trip(backend):
+    encoded = json_codec.dumps(_PAYLOAD)
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == _PAYLOAD
+    assert json_codec.loads(encoded) == _PAYLOAD
+    assert json_codec.loads(encoded.decode("utf-8")) == _PAYLOAD
+
+
+@pytest.mark.core
+def test_loads_raises_stdlib_decode_error_for_every_backend(backend):
+    with pytest.raises(json.JSONDecodeError):
+        json_codec.loads("not valid json {{{")
+
+
+@pytest.mark.core
+def test_dumps_falls_back_to_stdlib_for_values_native_backend_rejects(backend):
+    huge = 2**70
+    assert json.loads(json_codec.dumps({"n": huge})) == {"n": huge}
+
+
+@pytest.mark.core
+def test_dumps_unserializable_raises_type_error(backend):
+    with pytest.raises(TypeError):
+        json_codec.dumps({"obj": object()})
+
+
+def test_select_backend_honours_env_override(monkeypatch):
+    monkeypatch.setenv("IJT_JSON_BACKEND", "json")
+    assert json_codec._select_backend() == "json"
+
+
+def test_select_backend_unknown_env_falls_back_to_auto(monkeypatch):
+    monkeypatch.setenv("IJT_JSON_BACKEND", "simdjson")
+    expected = "orjson" if json_codec.orjson else "msgspec" if json_codec.msgspec else "json"
+    assert json_codec._select_backend() == expected
+
+
+@pytest.mark.asyncio
+async def test_send_json_sends_bytes_as_text_frame():
+    ws = AsyncMock()
+    await json_codec.send_json(ws, _PAYLOAD)
+    frame = ws.send.await_args.args[0]
+    assert isinstance(frame, bytes)
+    assert ws.send.await_args.kwargs == {"text": True}
+    assert json.loads(frame) == _PAYLOAD
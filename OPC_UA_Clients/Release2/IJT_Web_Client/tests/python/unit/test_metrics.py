@@ -0,0 +1,103 @@
+"""Tests for python/metrics.py — command latency, OPC UA round trips, socket traffic and Prometheus text."""
+
+import asyncio
+import json
+import socket
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from python import metrics as metrics_module
+from python.ijt_interface import IJTInterface
+from python.loop_lag import LoopLagMonitor
+from python.metrics import Histogram, Metrics, observe_client, serve_prometheus
+
+EP = "opc.tcp://controller:4840"
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    fresh = Metrics()
+    monkeypatch.setattr(metrics_module, "metrics", fresh)
+    monkeypatch.setattr("python.ijt_interface.metrics", fresh)
+    return fresh
+
+
+def test_histogram_quantiles():
+    hist = Histogram()
+    for seconds in (0.0004, 0.003, 0.003, 0.2, 75.0):
+        hist.observe(seconds, failed=seconds > 60)
+    stats = hist.as_dict()
+    assert stats["count"] == 5 and stats["errors"] == 1
+    assert stats["p50_ms"] == 5.0 and stats["p95_ms"] == stats["max_ms"] == 75000.0
+    assert Histogram().as_dict()["p99_ms"] == 0.0
+
+
+def test_observer_records_round_trips_per_service(registry):
+    pytest.importorskip("asyncua.observer", reason="asyncua without request observers")
+    client = SimpleNamespace(uaclient=SimpleNamespace(observer=None))
+    observe_client(client, EP)
+    request = type("ReadRequest", (), {})()
+    with client.uaclient.observer.observe_request(request):
+        pass
+    with pytest.raises(TimeoutError), client.uaclient.observer.observe_request(request):
+        raise TimeoutError
+    client.uaclient.observer.on_notification(1, 3)
+    read = registry.snapshot()["opcua"][EP]["Read"]
+    assert read["count"] == 2 and read["errors"] == 1 and registry.notifications == {EP: 3}
+
+
+@pytest.mark.asyncio
+async def test_get_metrics_command_reports_latency_and_socket_traffic(registry):
+    registry.loop_lag = LoopLagMonitor()
+    websocket = AsyncMock()
+    websocket.remote_address = ("10.0.0.7", 51000)
+    metered = registry.meter_socket(websocket)
+    interface = IJTInterface()
+    await interface.handle(metered, {"command": "read", "endpoint": EP, "uniqueid": 1})
+    await interface.handle(metered, {"command": "no such command", "endpoint": EP})
+    await interface.handle(metered, {"command": "get metrics", "uniqueid": 2})
+
+    data = json.loads(websocket.send.call_args.args[0])["data"]
+    assert data["commands"]["read"]["count"] == 1 and data["commands"]["read"]["errors"] == 1
+    assert data["commands"]["other"]["count"] == 1 and data["loop_lag"]["samples"] == 0
+    first_two = sum(len(call.args[0]) for call in websocket.send.call_args_list[:2])
+    assert data["sockets"]["10.0.0.7:51000"] == {"bytes_sent": first_two, "frames_sent": 2}
+
+    registry.release_socket(metered)
+    assert registry.snapshot()["sockets"] == {} and registry.snapshot()["bytes_sent_total"] == metered.bytes_sent
+
+
+def test_prometheus_text(registry):
+    registry.observe_command('say "hi"', 0.02, False)
+    registry.observer(EP).on_request("BrowseRequest", 0.004, None)
+    text = registry.prometheus_text({EP: {"result": {"queue_depth": 3}, "send": {"queue_depth": 1}}})
+    assert 'ijt_command_latency_seconds_bucket{command="say \\"hi\\"",le="0.025"} 1' in text
+    assert 'ijt_command_latency_seconds_bucket{command="say \\"hi\\"",le="+Inf"} 1' in text
+    assert f'ijt_opcua_request_seconds_count{{endpoint="{EP}",service="Browse"}} 1' in text
+    assert f'ijt_event_queue_depth{{endpoint="{EP}",queue="result"}} 3' in text
+
+
+@pytest.mark.asyncio
+async def test_prometheus_endpoint(monkeypatch):
+    monkeypatch.delenv("IJT_METRICS_PORT", raising=False)
+    assert await serve_prometheus(lambda: "") is None
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    monkeypatch.setenv("IJT_METRICS_PORT", str(port))
+    server = await serve_prometheus(lambda: "ijt_up 1\n")
+    assert server is not None
+
+    async def get(path):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        response = await reader.read()
+        writer.close()
+        return response
+
+    assert (await get("/metrics")).endswith(b"\r\n\r\nijt_up 1\n")
+    assert (await get("/other")).startswith(b"HTTP/1.1 404")
+    server.close()
+    await server.wait_closed()
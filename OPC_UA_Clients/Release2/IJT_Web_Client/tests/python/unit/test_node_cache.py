@@ -0,0 +1,107 @@
+"""Tests for python/node_cache.py — LRU bound, TTL expiry, counters, model-change and asset-change handlers."""
+
+from unittest.mock import MagicMock
+
+from python.node_cache import MISSING, AssetChangeHandler, ModelChangeHandler, NodeCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_miss_then_hit_counts():
+    cache = NodeCache(max_entries=4, ttl_s=10)
+    assert cache.get("attributes", "ns=1;i=1") is MISSING
+    cache.put("attributes", "ns=1;i=1", [])
+    assert cache.get("attributes", "ns=1;i=1") == []
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1, "evictions": 0, "invalidations": 0}
+
+
+def test_kinds_are_cached_independently():
+    cache = NodeCache()
+    cache.put("attributes", "ns=1;i=1", ["a"])
+    assert cache.get("references", "ns=1;i=1") is MISSING
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = NodeCache(max_entries=2)
+    cache.put("references", "a", 1)
+    cache.put("references", "b", 2)
+    cache.get("references", "a")  # "b" becomes least recently used
+    cache.put("references", "c", 3)
+    assert cache.get("references", "b") is MISSING
+    assert cache.get("references", "a") == 1
+    assert cache.get("references", "c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl():
+    clock = _Clock()
+    cache = NodeCache(max_entries=4, ttl_s=5, clock=clock)
+    cache.put("references", "a", 1)
+    clock.now = 4.9
+    assert cache.get("references", "a") == 1
+    clock.now = 10.0
+    assert cache.get("references", "a") is MISSING
+    assert cache.stats()["entries"] == 0
+
+
+def test_zero_size_disables_cache():
+    cache = NodeCache(max_entries=0)
+    cache.put("references", "a", 1)
+    assert not cache.enabled
+    assert cache.get("references", "a") is MISSING
+
+
+def test_from_env(monkeypatch):
+    monkeypatch.setenv("IJT_NODE_CACHE_SIZE", "16")
+    monkeypatch.setenv("IJT_NODE_CACHE_TTL_SEC", "2.5")
+    cache = NodeCache.from_env()
+    assert (cache.max_entries, cache.ttl_s) == (16, 2.5)
+
+
+def test_from_env_invalid_values_use_defaults(monkeypatch):
+    monkeypatch.setenv("IJT_NODE_CACHE_SIZE", "lots")
+    monkeypatch.setenv("IJT_NODE_CACHE_TTL_SEC", "soon")
+    cache = NodeCache.from_env()
+    assert cache.enabled
+    assert cache.ttl_s > 0
+
+
+def test_model_change_handler_clears_cache():
+    cache = NodeCache()
+    cache.put("references", "a", 1)
+    handler = ModelChangeHandler(cache)
+    handler.event_notification(MagicMock())
+    assert cache.get("references", "a") is MISSING
+    assert cache.stats()["invalidations"] == 1
+    cache.put("references", "a", 1)
+    handler.status_change_notification(MagicMock(Status="BadTimeout"))
+    assert cache.stats()["entries"] == 0
+
+
+def test_model_change_handler_clears_all_caches_when_namespace_array_changes():
+    nodes, paths = NodeCache(), NodeCache()
+    handler = ModelChangeHandler(nodes, paths)
+    assert handler.note_namespace_array(["ua", "urn:a"]) is False
+    nodes.put("references", "a", 1)
+    paths.put("path", "p", "n")
+    handler.datachange_notification(MagicMock(), ["ua", "urn:a"], MagicMock())
+    assert paths.get("path", "p") == "n"
+    handler.datachange_notification(MagicMock(), ["ua", "urn:b", "urn:a"], MagicMock())
+    assert nodes.stats()["entries"] == 0
+    assert paths.stats()["entries"] == 0
+
+
+def test_asset_change_handler_clears_only_on_asset_conditions():
+    cache = NodeCache()
+    handler = AssetChangeHandler(cache)
+    cache.put("tools", "", [])
+    handler.event_notification(MagicMock(ConditionSubClassName=[MagicMock(Text="ToolErrorConditionClassType")]))
+    assert cache.get("tools", "") == []
+    handler.event_notification(MagicMock(ConditionSubClassName=[MagicMock(Text="AssetDisconnectedConditionClassType")]))
+    assert cache.get("tools", "") is MISSING
@@ -0,0 +1,75 @@
+"""Tests for python/result_log.py — batched, rolling NDJSON result segments."""
+
+import gzip
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from python.result_log import ResultLog
+
+
+def _event(number, samples=8):
+    meta = SimpleNamespace(ResultId=f"R-{number}")
+    trace = SimpleNamespace(Values=[float(v) for v in range(samples)])
+    return SimpleNamespace(
+        Result=SimpleNamespace(ResultMetaData=meta, ResultContent=[trace]),
+        Message=SimpleNamespace(Text=f"result {number}"),
+        EventId=f"ev-{number}",
+    )
+
+
+@pytest.mark.asyncio
+async def test_results_are_appended_to_one_segment(tmp_path):
+    result_log = ResultLog(tmp_path)
+    for number in range(20):
+        assert result_log.add(_event(number))
+    await result_log.close()
+
+    segments = sorted(tmp_path.glob("results-*.ndjson"))
+    assert len(segments) == 1 and result_log.written == 20
+    lines = [json.loads(line) for line in segments[0].read_text().splitlines()]
+    assert [line["resultid"] for line in lines] == [f"R-{n}" for n in range(20)]
+    assert lines[3]["message"] == "result 3" and lines[3]["eventid"] == "ev-3"
+    assert lines[0]["result"]["ResultMetaData"]["ResultId"] == "R-0"
+
+
+@pytest.mark.asyncio
+async def test_segments_rotate_by_size_and_index_points_at_lines(tmp_path):
+    result_log = ResultLog(tmp_path, segment_bytes=600, index=True)
+    for number in range(6):
+        result_log.add(_event(number))
+    await result_log.close()
+
+    segments = sorted(tmp_path.glob("results-*Z.ndjson"))
+    assert len(segments) == result_log.segments > 1
+    for segment in segments:
+        data = segment.read_bytes()
+        entries = [json.loads(line) for line in segment.with_suffix(".idx.ndjson").read_text().splitlines()]
+        assert entries
+        for entry in entries:
+            line = json.loads(data[entry["offset"] : entry["offset"] + entry["length"]])
+            assert line["resultid"] == entry["resultid"]
+
+
+@pytest.mark.asyncio
+async def test_compressed_segments_and_full_queue(tmp_path):
+    result_log = ResultLog(tmp_path, compress=True, queue_size=2)
+    accepted = [result_log.add(_event(number)) for number in range(3)]
+    assert accepted == [True, True, False] and result_log.dropped == 1
+    await result_log.close()
+
+    (segment,) = tmp_path.glob("*.ndjson.gz")
+    with gzip.open(segment, "rt") as handle:
+        assert [json.loads(line)["resultid"] for line in handle] == ["R-0", "R-1"]
+
+
+@pytest.mark.asyncio
+async def test_from_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("IJT_RESULT_LOG_DIR", str(tmp_path / "segments"))
+    monkeypatch.setenv("IJT_RESULT_LOG_SEGMENT_MB", "2")
+    monkeypatch.setenv("IJT_RESULT_LOG_SEGMENT_SEC", "bad")
+    monkeypatch.setenv("IJT_RESULT_LOG_COMPRESS", "1")
+    result_log = ResultLog.from_env()
+    assert result_log.directory == tmp_path / "segments" and result_log.segment_bytes == 2 * 1024 * 1024
+    assert result_log.segment_seconds == 3600 and result_log.compress and not result_log.index
@@ -0,0 +1,127 @@
+"""Tests for python/result_store.py — SQLite result history and the queryresults command."""
+
+import asyncio
+import datetime
+import sqlite3
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from asyncua import ua
+
+from python.event_delivery import DeliveryOptions
+from python.ijt_interface import IJTInterface
+from python.result_event_handler import ResultEventHandler, Short
+from python.result_store import ResultStore
+
+EP = "opc.tcp://controller:4840"
+START = datetime.datetime(2026, 10, 18, 6, 0, tzinfo=datetime.UTC)
+
+
+def _result(number, classification=1, evaluation=1, joint="J1", asset="urn:tool:1"):
+    entities = [
+        SimpleNamespace(EntityId=asset, EntityType=4),
+        SimpleNamespace(EntityId=joint, EntityType=23),
+    ]
+    meta = SimpleNamespace(
+        ResultId=f"R-{number}",
+        CreationTime=START + datetime.timedelta(minutes=number),
+        Classification=classification,
+        ResultEvaluation=evaluation,
+        AssociatedEntities=entities,
+    )
+    channels = [
+        SimpleNamespace(Name="TORQUE", Values=[0.5, 1.5, 2.5]),
+        SimpleNamespace(Name="LABEL", Values=["a", "b"]),
+    ]
+    trace = SimpleNamespace(TraceId="T", StepTraces=[SimpleNamespace(StepTraceId="s1", StepTraceContent=channels)])
+    content = SimpleNamespace(OverallResultValues=[{"Value": 12.5}], Trace=trace)
+    return SimpleNamespace(ResultMetaData=meta, ResultContent=[content])
+
+
+def _event(number, **kwargs):
+    return Short(
+        EventType="e",
+        Result=_result(number, **kwargs),
+        Message=ua.LocalizedText(f"result {number}", "en"),
+        EventId=f"ev-{number}",
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    result_store = ResultStore(tmp_path / "results.sqlite3", batch_size=4)
+    yield result_store
+    result_store.close()
+
+
+@pytest.mark.asyncio
+async def test_results_are_batched_into_wal_database(store):
+    for number in range(10):
+        assert store.add(EP, _event(number, evaluation=1 if number % 3 else 2))
+    store.flush()
+
+    assert store.written == 10
+    db = sqlite3.connect(store.path)
+    assert db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert db.execute("SELECT count(*) FROM trace_channels").fetchone()[0] == 20
+    db.close()
+
+    page = await store.query({"evaluation": 2})
+    assert [row["resultid"] for row in page["results"]] == ["R-9", "R-6", "R-3", "R-0"]
+    assert page["results"][0]["time"] == "2026-10-18T06:09:00Z"
+    assert page["results"][0]["assets"] == ["urn:tool:1"] and page["results"][0]["jointid"] == "J1"
+    assert "result" not in page["results"][0] and page["next"] is None
+    assert page["results"][0]["message"] == "result 9"
+
+
+@pytest.mark.asyncio
+async def test_query_pages_and_filters(store):
+    for number in range(7):
+        store.add(EP, _event(number, joint="J7" if number < 5 else "J8", asset=f"urn:tool:{number % 2}"))
+    store.add("opc.tcp://other:4840", _event(99))
+    store.flush()
+
+    first = await store.query({"jointid": "J7", "limit": 2})
+    second = await store.query({"jointid": "J7", "limit": 2, "cursor": first["next"]})
+    third = await store.query({"jointid": "J7", "limit": 2, "cursor": second["next"]})
+    pages = [[row["resultid"] for row in page["results"]] for page in (first, second, third)]
+    assert pages == [["R-4", "R-3"], ["R-2", "R-1"], ["R-0"]] and third["next"] is None
+
+    window = await store.query({"from": "2026-10-18T06:02:00Z", "to": "2026-10-18T06:04:00Z", "asset": "urn:tool:1"})
+    assert [row["resultid"] for row in window["results"]] == ["R-3"]
+    assert [row["resultid"] for row in (await store.query({"endpoint": "opc.tcp://other:4840"}))["results"]] == ["R-99"]
+    assert "exception" in await store.query({"classification": "batch"})
+    assert "exception" in await store.query({"cursor": "page-2"})
+
+
+@pytest.mark.asyncio
+async def test_details_restore_traces_from_channel_table(store):
+    store.add(EP, _event(1))
+    store.flush()
+    row = (await store.query({"resultid": "R-1", "details": True}))["results"][0]
+    channels = row["result"]["ResultContent"][0]["Trace"]["StepTraces"][0]["StepTraceContent"]
+    assert [channel["Values"] for channel in channels] == [[0.5, 1.5, 2.5], ["a", "b"]]
+    assert row["result"]["ResultContent"][0]["OverallResultValues"] == [{"Value": 12.5}]
+
+
+@pytest.mark.asyncio
+async def test_disabled_store_and_queryresults_command(tmp_path, monkeypatch):
+    monkeypatch.setenv("IJT_RESULT_STORE", "0")
+    disabled = ResultStore.from_env()
+    assert not disabled.enabled and disabled.add(EP, _event(1)) is False
+    assert "exception" in await disabled.query({})
+
+    store = ResultStore(tmp_path / "results.sqlite3")
+    tab = AsyncMock()
+    handler = ResultEventHandler(tab, EP, delivery=DeliveryOptions(), result_store=store)
+    await handler.process_event(_event(5))
+    await asyncio.sleep(0.05)
+    await asyncio.to_thread(store.flush)
+
+    interface = IJTInterface(result_store=store)
+    websocket = AsyncMock()
+    await interface.handle(websocket, {"command": "queryresults", "endpoint": EP, "uniqueid": 3})
+    assert b'"resultid":"R-5"' in websocket.send.call_args.args[0].replace(b" ", b"")
+    await handler.close()
+    store.close()
@@ -1,10 +1,13 @@
 import json
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 
 import pytest
 
+from python import serialize_data
 from python.serialize_data import (
     serialize_class_instance_as_dict,
+    serialize_compiled_event,
     serialize_full_event,
     serialize_tuple,
     serialize_value,
@@ -103,3 +106,79 @@ def test_serialize_class_instance_as_dict_slotted_branch():
     assert result["pythonclass"] == "_SlottedWithWeakref"
     assert result["value"] == "data"
     assert "broken" not in result
+
+
+# ---------------------------------------------------------------------------
+# serialize_compiled_event — must match serialize_full_event exactly
+# ---------------------------------------------------------------------------
+
+
+@dataclass(slots=True)
+class _TraceValues:
+    PhysicalQuantity: int = 0
+    Values: list = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class _Result:
+    ResultId: str = ""
+    Traces: list = field(default_factory=list)
+    Extra: dict = field(default_factory=dict)
+
+
+def _equivalence_cases():
+    from asyncua import ua
+
+    now = datetime(2026, 3, 16, 12, 30, tzinfo=timezone.utc)
+    return [
+        None,
+        "text",
+        42,
+        1.5,
+        True,
+        now,
+        b"raw",
+        ("a", 1),
+        [1, 2.5, None, "x"],
+        {"time": now, "obj": Custom()},
+        ua.NodeId(1007, 2),
+        ua.LocalizedText("OK", "en"),
+        ua.NodeClass.Variable,
+        ua.DataValue(ua.Variant(3.0)),
+        _SlottedWithGap(),
+        _EmptySlotted(),
+        _SlottedWithWeakref(),
+        _Result("r-1", [_TraceValues(1, [0.1, 0.2, 0.3]), _TraceValues(2, [1, 2.0, "mixed", now])], {"k": (1, 2)}),
+    ]
+
+
+@pytest.mark.core
+@pytest.mark.parametrize("value", _equivalence_cases(), ids=lambda v: type(v).__name__)
+def test_serialize_compiled_event_matches_reference(value):
+    assert serialize_compiled_event(value) == serialize_full_event(value)
+
+
+@pytest.mark.core
+def test_serialize_compiled_event_caches_one_encoder_per_type():
+    result = _Result("r-2", [_TraceValues(1, [0.5])])
+    serialize_compiled_event(result)
+    encoder = serialize_data._ENCODERS[_Result]
+    serialize_compiled_event(_Result("r-3"))
+    assert serialize_data._ENCODERS[_Result] is encoder
+
+
+@pytest.mark.core
+def test_serialize_compiled_event_bulk_copies_primitive_arrays():
+    values = [float(i) for i in range(1000)]
+    encoded = serialize_compiled_event(_TraceValues(1, values))
+    assert encoded["Values"] == values
+    assert encoded["Values"] is not values
+
+
+@pytest.mark.core
+def test_serialize_compiled_event_unset_slot_after_compilation_is_skipped():
+    serialize_compiled_event(_SlottedWithWeakref())  # compile while "broken" is unset
+    obj = _SlottedWithWeakref()
+    obj.broken = "now set"
+    assert serialize_compiled_event(obj) == serialize_full_event(obj)
+    assert serialize_compiled_event(_SlottedWithGap()) == {"pythonclass": "_SlottedWithGap", "name": "ok"}
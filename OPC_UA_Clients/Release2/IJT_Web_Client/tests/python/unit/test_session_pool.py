@@ -0,0 +1,181 @@
+"""Tests for python/session_pool.py — shared sessions, per-tab send queues and idle reaping."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from python.ijt_interface import IJTInterface
+from python.session_pool import SessionPool, WebSocketFanout
+
+EP = "opc.tcp://controller:4840"
+
+
+class _Socket:
+    def __init__(self, fail: bool = False, gate: asyncio.Event | None = None) -> None:
+        self.frames: list = []
+        self.fail = fail
+        self.gate = gate
+
+    async def send(self, payload, text=None):
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.fail:
+            raise ConnectionError("tab gone")
+        self.frames.append(payload)
+
+    async def close(self):
+        return None
+
+
+def _factory(created: list):
+    def _make(endpoint, websocket):
+        connection = MagicMock()
+        connection.websocket = websocket
+        connection.connect = AsyncMock(return_value={"command": "connection established", "endpoint": endpoint})
+        connection.is_connection_open = AsyncMock(return_value=True)
+        connection.terminate = AsyncMock()
+        created.append(connection)
+        return connection
+
+    return _make
+
+
+@pytest.mark.asyncio
+async def test_tabs_share_one_connection_and_receive_each_frame():
+    pool = SessionPool(idle_grace_s=0)
+    created: list = []
+    tab_a, tab_b = _Socket(), _Socket()
+
+    first, result_a = await pool.acquire(EP, "a", tab_a, _factory(created))
+    second, result_b = await pool.acquire(EP, "b", tab_b, _factory(created))
+
+    assert first is second and len(created) == 1
+    first.connect.assert_awaited_once()
+    assert result_a == result_b == {"command": "connection established", "endpoint": EP}
+
+    frame = b'{"command":"event"}'
+    await first.websocket.send(frame, text=True)
+    await first.websocket.drain()
+    assert json.loads(tab_b.frames[0])["command"] == "connection established"
+    assert tab_a.frames[-1] is frame and tab_b.frames[-1] is frame
+    assert pool.stats() == {
+        "sessions": 1,
+        "attached": 2,
+        "created": 1,
+        "reused": 1,
+        "reaped": 0,
+        "pending_frames": 0,
+        "dropped_frames": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_last_release_closes_session_without_grace():
+    pool = SessionPool(idle_grace_s=0)
+    created: list = []
+    connection, _ = await pool.acquire(EP, "a", _Socket(), _factory(created))
+    await pool.acquire(EP, "b", _Socket(), _factory(created))
+
+    await pool.release(EP, "a", connection)
+    connection.terminate.assert_not_awaited()
+    await pool.release(EP, "b", connection)
+    connection.terminate.assert_awaited_once()
+    assert pool.get(EP) is None
+
+
+@pytest.mark.asyncio
+async def test_idle_session_is_reaped_after_grace_unless_reattached():
+    pool = SessionPool(idle_grace_s=0.05)
+    created: list = []
+    connection, _ = await pool.acquire(EP, "a", _Socket(), _factory(created))
+
+    await pool.release(EP, "a", connection)
+    again, _ = await pool.acquire(EP, "a", _Socket(), _factory(created))
+    await asyncio.sleep(0.1)
+    assert again is connection and len(created) == 1
+    connection.terminate.assert_not_awaited()
+
+    await pool.release(EP, "a", connection)
+    await asyncio.sleep(0.1)
+    connection.terminate.assert_awaited_once()
+    assert pool.stats()["reaped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_closed_session_is_replaced_and_keeps_attached_tabs():
+    pool = SessionPool(idle_grace_s=0)
+    created: list = []
+    tab_a = _Socket()
+    stale, _ = await pool.acquire(EP, "a", tab_a, _factory(created))
+    stale.is_connection_open.return_value = False
+
+    fresh, _ = await pool.acquire(EP, "b", _Socket(), _factory(created))
+
+    assert fresh is not stale
+    stale.terminate.assert_awaited_once()
+    assert set(fresh.websocket.sockets) == {"a", "b"}
+
+
+@pytest.mark.asyncio
+async def test_fanout_detaches_failing_socket():
+    fanout = WebSocketFanout()
+    healthy = _Socket()
+    fanout.attach("ok", healthy)
+    fanout.attach("gone", _Socket(fail=True))
+
+    await fanout.send("frame", text=True)
+    await fanout.drain()
+
+    assert healthy.frames == ["frame"]
+    assert list(fanout.sockets) == ["ok"]
+
+
+@pytest.mark.asyncio
+async def test_slow_tab_drops_its_oldest_frames_without_delaying_others():
+    fanout = WebSocketFanout(queue_size=2)
+    gate = asyncio.Event()
+    fast, slow = _Socket(), _Socket(gate=gate)
+    fanout.attach("fast", fast)
+    fanout.attach("slow", slow)
+
+    for n in range(5):
+        await fanout.send(f"frame-{n}", text=True)
+        await asyncio.sleep(0)
+
+    assert fast.frames == [f"frame-{n}" for n in range(5)]
+    assert slow.frames == []
+    gate.set()
+    await fanout.drain()
+    # The first frame was already in flight; of the rest only the newest two survive.
+    assert slow.frames == ["frame-0", "frame-3", "frame-4"]
+    assert fanout.dropped() == 2
+    await fanout.close()
+    assert fanout.sockets == {}
+
+
+@pytest.mark.asyncio
+async def test_release_terminates_connection_not_owned_by_pool():
+    pool = SessionPool()
+    stray = AsyncMock()
+    await pool.release(EP, "a", stray)
+    stray.terminate.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_interfaces_with_shared_pool_use_one_connection(monkeypatch):
+    created: list = []
+    monkeypatch.setattr(IJTInterface, "_new_connection", staticmethod(_factory(created)))
+    pool = SessionPool(idle_grace_s=0)
+    tab_a, tab_b = IJTInterface(pool), IJTInterface(pool)
+
+    await tab_a.handle_connect_to(EP, _Socket())
+    await tab_b.handle_connect_to(EP, _Socket())
+    assert tab_a.connection_list[EP] is tab_b.connection_list[EP]
+
+    await tab_a.disconnect()
+    created[0].terminate.assert_not_awaited()
+    await tab_b.disconnect()
+    created[0].terminate.assert_awaited_once()
+    await pool.close()
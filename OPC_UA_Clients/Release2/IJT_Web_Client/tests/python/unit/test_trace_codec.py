@@ -0,0 +1,90 @@
+"""Tests for python/trace_codec.py — packed trace samples in JSON and binary frames."""
+
+import base64
+import json
+import struct
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from python.connection import Connection
+from python.event_selection import EventSelection
+from python.trace_codec import BufferSink, binary_frame, pack_values, packed_field
+from python.trace_store import TraceStore
+
+EP = "opc.tcp://controller:4840"
+
+
+def _result(values):
+    content = [SimpleNamespace(Name="TORQUE", Values=values), SimpleNamespace(Name="LABEL", Values=["a", "b"])]
+    step = SimpleNamespace(StepTraceId="s1", SamplingInterval=1.0, StepTraceContent=content)
+    trace = SimpleNamespace(TraceId="T", StepTraces=[step])
+    entry = SimpleNamespace(OverallResultValues=[], Trace=trace)
+    return SimpleNamespace(ResultMetaData=SimpleNamespace(ResultId="R-1"), ResultContent=[entry])
+
+
+def test_pack_values_is_little_endian():
+    assert struct.unpack("<3f", pack_values([1.5, -2.25, 3], "float32")) == (1.5, -2.25, 3.0)
+    assert struct.unpack("<2d", pack_values([0.1, 2], "float64")) == (0.1, 2.0)
+    with pytest.raises(TypeError):
+        pack_values([1.0, "x"], "float32")
+
+
+def test_packed_field_base64_and_aligned_offsets():
+    field = packed_field([1.0, 2.0, 3.0], "float32")
+    assert field["dtype"] == "float32" and field["length"] == 3
+    assert struct.unpack("<3f", base64.b64decode(field["b64"])) == (1.0, 2.0, 3.0)
+
+    sink = BufferSink()
+    assert packed_field([1.0, 2.0, 3.0], "float32", sink) == {"dtype": "float32", "length": 3, "offset": 0}
+    assert packed_field([4.0], "float64", sink)["offset"] == 16
+    assert sink.size == 24
+
+
+def test_binary_frame_layout():
+    sink = BufferSink()
+    sink.add(pack_values([0.5, 1.0, 2.0], "float64"))
+    frame = binary_frame({"command": "trace chunk", "data": {"n": 1}}, sink)
+
+    (header_length,) = struct.unpack_from("<I", frame)
+    assert (4 + header_length) % 8 == 0
+    assert json.loads(frame[4 : 4 + header_length]) == {"command": "trace chunk", "data": {"n": 1}}
+    assert struct.unpack_from("<3d", frame, 4 + header_length) == (0.5, 1.0, 2.0)
+
+
+def test_packed_projection_copies_and_keeps_non_numeric_channels():
+    result = _result([1.0, 2.0])
+    projected = EventSelection(traceencoding="float32").project_result(result)
+    torque, label = projected.ResultContent[0].Trace.StepTraces[0].StepTraceContent
+
+    assert torque.Values["dtype"] == "float32" and torque.Values["length"] == 2
+    assert label.Values == ["a", "b"]
+    assert result.ResultContent[0].Trace.StepTraces[0].StepTraceContent[0].Values == [1.0, 2.0]
+    assert (
+        EventSelection(projection="no-traces", traceencoding="float64").project_result(result).ResultContent[0].Trace
+        is None
+    )
+    with pytest.raises(ValueError):
+        EventSelection.from_request({"traceencoding": "int8"})
+
+
+@pytest.mark.asyncio
+async def test_gettrace_sends_binary_frames():
+    tab = AsyncMock()
+    connection = Connection(EP, tab)
+    connection.trace_store = TraceStore()
+    connection.trace_store.keep(_result([1.0, 2.0, 4.0]))
+
+    assert await connection.gettrace({"resultid": "R-1", "binary": True, "traceencoding": "float32"}) == {
+        "resultid": "R-1",
+        "chunks": 1,
+    }
+    frame = tab.send.call_args.args[0]
+    assert tab.send.call_args.kwargs["text"] is False
+    (header_length,) = struct.unpack_from("<I", frame)
+    header = json.loads(frame[4 : 4 + header_length])
+    values = header["data"]["steptraces"][0][1]["StepTraceContent"][0]["Values"]
+    assert values == {"dtype": "float32", "length": 3, "offset": 0}
+    assert struct.unpack_from("<3f", frame, 4 + header_length) == (1.0, 2.0, 4.0)
+    assert "exception" in await connection.gettrace({"resultid": "R-1", "traceencoding": "int8"})
@@ -0,0 +1,128 @@
+"""Tests for python/trace_downsample.py — LTTB/min-max trace reduction and per-request resolution."""
+
+import asyncio
+import json
+import math
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from python import trace_downsample
+from python.connection import Connection
+from python.event_delivery import DeliveryOptions
+from python.event_selection import EventSelection
+from python.result_event_handler import ResultEventHandler, Short
+from python.trace_downsample import downsample_step_trace, downsample_trace, lttb_indices, minmax_indices
+from python.trace_store import TraceStore
+
+EP = "opc.tcp://controller:4840"
+
+# A smooth ramp with one narrow spike at sample 500.
+SIGNAL = [math.sin(n / 150) + (5.0 if n == 500 else 0.0) for n in range(1000)]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy" and trace_downsample.np is None:
+        pytest.skip("NumPy is not installed")
+    if request.param == "python":
+        monkeypatch.setattr(trace_downsample, "np", None)
+    return request.param
+
+
+def _step(samples, time=False):
+    torque = SimpleNamespace(Name="TORQUE", PhysicalQuantity=2, Values=list(SIGNAL[:samples]))
+    angle = SimpleNamespace(Name="ANGLE", PhysicalQuantity=3, Values=[float(n) for n in range(samples)])
+    contents = [torque, angle]
+    if time:
+        contents.append(SimpleNamespace(Name="TIME", PhysicalQuantity=1, Values=[n * 0.5 for n in range(samples)]))
+    return SimpleNamespace(StepTraceId="s", SamplingInterval=0.5, StepTraceContent=contents)
+
+
+def _result(samples=1000):
+    trace = SimpleNamespace(TraceId="T", StepTraces=[_step(samples)])
+    content = SimpleNamespace(OverallResultValues=[], Trace=trace)
+    return SimpleNamespace(ResultMetaData=SimpleNamespace(ResultId="R-1"), ResultContent=[content])
+
+
+def test_lttb_keeps_endpoints_and_spike(backend):
+    indices = lttb_indices(range(len(SIGNAL)), SIGNAL, 50)
+    assert len(indices) == 50 and indices[0] == 0 and indices[-1] == 999
+    assert indices == sorted(indices) and 500 in indices
+    assert lttb_indices(range(10), SIGNAL[:10], 20) == list(range(10))
+
+
+def test_minmax_keeps_bucket_extremes(backend):
+    indices = minmax_indices(SIGNAL, 40)
+    assert indices[0] == 0 and indices[-1] == 999 and 500 in indices
+    assert len(indices) <= 42 and indices == sorted(set(indices))
+
+
+def test_backends_agree(monkeypatch):
+    if trace_downsample.np is None:
+        pytest.skip("NumPy is not installed")
+    expected = (lttb_indices(range(1000), SIGNAL, 64), minmax_indices(SIGNAL, 64))
+    monkeypatch.setattr(trace_downsample, "np", None)
+    assert (lttb_indices(range(1000), SIGNAL, 64), minmax_indices(SIGNAL, 64)) == expected
+
+
+def test_step_trace_channels_stay_aligned_with_a_time_channel(backend):
+    step = _step(1000)
+    reduced = downsample_step_trace(step, 100)
+    torque, angle, time = reduced.StepTraceContent
+
+    assert len(torque.Values) == len(angle.Values) == len(time.Values) <= 100
+    assert time.Name == "TIME" and time.PhysicalQuantity == 1
+    # Angle equals the sample index here, so it tells which samples were kept.
+    assert time.Values == [index * 0.5 for index in angle.Values]
+    assert torque.Values == [SIGNAL[int(index)] for index in angle.Values]
+    assert len(step.StepTraceContent) == 2 and len(step.StepTraceContent[0].Values) == 1000
+
+    with_time = downsample_step_trace(_step(1000, time=True), 100)
+    assert [content.Name for content in with_time.StepTraceContent] == ["TORQUE", "ANGLE", "TIME"]
+    assert downsample_step_trace(_step(50), 100).StepTraceContent[0].Values == SIGNAL[:50]
+
+
+def test_trace_budget_is_shared_by_sample_count():
+    trace = SimpleNamespace(StepTraces=[_step(900), _step(100)])
+    reduced = downsample_trace(trace, 100, "minmax")
+    assert [len(step.StepTraceContent[0].Values) for step in reduced.StepTraces][1] <= 10
+    assert len(reduced.StepTraces[0].StepTraceContent[0].Values) <= 90
+    assert downsample_trace(trace, 0) is trace
+
+
+def test_selection_validates_tracepoints():
+    selection = EventSelection.from_request({"tracepoints": "800", "downsample": "MinMax"})
+    assert (selection.tracepoints, selection.downsample) == (800, "minmax") and selection.keeps_traces
+    for bad in ({"tracepoints": 2}, {"tracepoints": -5}, {"tracepoints": "many"}, {"downsample": "average"}):
+        with pytest.raises(ValueError):
+            EventSelection.from_request(bad)
+
+
+@pytest.mark.asyncio
+async def test_downsampled_result_keeps_full_trace_for_gettrace():
+    tab = AsyncMock()
+    connection = Connection(EP, tab)
+    connection.trace_store = TraceStore()
+    handler = ResultEventHandler(tab, EP, delivery=DeliveryOptions(), trace_store=connection.trace_store)
+    handler.selection = EventSelection(tracepoints=100)
+
+    await handler.process_event(Short(EventType="e", Result=_result(), Message="m", EventId="ev"))
+    await asyncio.sleep(0.05)
+    sent = json.loads(tab.send.call_args_list[0].args[0])
+    assert (
+        len(sent["data"]["Result"]["ResultContent"][0]["Trace"]["StepTraces"][0]["StepTraceContent"][0]["Values"])
+        <= 100
+    )
+
+    tab.send.reset_mock()
+    assert await connection.gettrace({"resultid": "R-1"}) == {"resultid": "R-1", "chunks": 1}
+    full = json.loads(tab.send.call_args.args[0])["data"]["steptraces"][0][1]["StepTraceContent"]
+    assert len(full[0]["Values"]) == 1000
+
+    await connection.gettrace({"resultid": "R-1", "tracepoints": 20, "downsample": "minmax"})
+    zoomed = json.loads(tab.send.call_args.args[0])["data"]["steptraces"][0][1]["StepTraceContent"]
+    assert len(zoomed[0]["Values"]) <= 20 and zoomed[-1]["Name"] == "TIME"
+    assert "exception" in await connection.gettrace({"resultid": "R-1", "tracepoints": 1})
+    await handler.close()
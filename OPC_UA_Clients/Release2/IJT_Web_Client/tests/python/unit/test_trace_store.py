@@ -0,0 +1,86 @@
+"""Tests for python/trace_store.py — lazy-trace projection, storage and chunked gettrace."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from python.connection import Connection
+from python.event_delivery import DeliveryOptions
+from python.event_selection import EventSelection
+from python.result_event_handler import ResultEventHandler, Short
+from python.session_pool import WebSocketFanout
+from python.trace_store import TraceStore
+
+EP = "opc.tcp://controller:4840"
+
+
+def _step(step_id, samples):
+    content = [SimpleNamespace(Name="TORQUE", Values=[float(n) for n in range(samples)])]
+    return SimpleNamespace(StepTraceId=step_id, SamplingInterval=1.0, StepTraceContent=content)
+
+
+def _result(result_id="R-1", steps=(("s1", 3), ("s2", 3), ("s3", 5))):
+    trace = SimpleNamespace(TraceId="T", StepTraces=[_step(step_id, samples) for step_id, samples in steps])
+    content = SimpleNamespace(OverallResultValues=[], Trace=trace)
+    return SimpleNamespace(ResultMetaData=SimpleNamespace(ResultId=result_id), ResultContent=[content])
+
+
+def test_chunks_group_whole_steps_by_sample_budget():
+    store = TraceStore(size=2, chunk_samples=6)
+    assert store.keep(_result()) is True
+    chunks = store.chunks("R-1")
+    assert [[step.StepTraceId for _, step in chunk] for chunk in chunks] == [["s1", "s2"], ["s3"]]
+    assert store.chunks("unknown") is None
+    assert store.keep(SimpleNamespace(ResultMetaData=SimpleNamespace(ResultId="R-2"), ResultContent=[])) is False
+
+
+def test_store_is_bounded_and_can_be_disabled():
+    store = TraceStore(size=1)
+    store.keep(_result("R-1"))
+    store.keep(_result("R-2"))
+    assert store.chunks("R-1") is None and store.chunks("R-2") is not None
+    assert TraceStore(size=0).keep(_result()) is False
+
+
+def test_lazy_projection_keeps_step_structure_without_samples():
+    result = _result()
+    projected = EventSelection(projection="lazy-traces").project_result(result)
+    step = projected.ResultContent[0].Trace.StepTraces[0]
+    assert step.StepTraceId == "s1" and step.StepTraceContent[0].Name == "TORQUE"
+    assert step.StepTraceContent[0].Values == []
+    assert result.ResultContent[0].Trace.StepTraces[0].StepTraceContent[0].Values == [0.0, 1.0, 2.0]
+
+
+@pytest.mark.asyncio
+async def test_lazy_result_is_stored_and_streamed_to_requesting_tab():
+    lazy_tab, other_tab = AsyncMock(), AsyncMock()
+    fanout = WebSocketFanout()
+    fanout.attach("lazy", lazy_tab)
+    fanout.attach("other", other_tab)
+    fanout.select("lazy", EventSelection(projection="lazy-traces"))
+    fanout.select("other", EventSelection(projection="no-traces"))
+    connection = Connection(EP, fanout)
+    connection.trace_store = TraceStore(chunk_samples=6)
+    handler = ResultEventHandler(fanout, EP, delivery=DeliveryOptions(), trace_store=connection.trace_store)
+
+    await handler.process_event(Short(EventType="e", Result=_result(), Message="m", EventId="ev"))
+    await asyncio.sleep(0.05)
+    await fanout.drain()
+    sent = json.loads(lazy_tab.send.call_args_list[0].args[0])
+    assert sent["data"]["Result"]["ResultContent"][0]["Trace"]["StepTraces"][2]["StepTraceContent"][0]["Values"] == []
+
+    lazy_tab.send.reset_mock()
+    other_tab.send.reset_mock()
+    reply = await connection.gettrace({"resultid": "R-1"}, owner="lazy")
+
+    assert reply == {"resultid": "R-1", "chunks": 2}
+    frames = [json.loads(call.args[0]) for call in lazy_tab.send.call_args_list]
+    assert [frame["command"] for frame in frames] == ["trace chunk", "trace chunk"]
+    assert frames[1]["data"]["steptraces"][0][1]["StepTraceContent"][0]["Values"] == [0.0, 1.0, 2.0, 3.0, 4.0]
+    other_tab.send.assert_not_awaited()
+    assert "exception" in await connection.gettrace({"resultid": "R-9"}, owner="lazy")
+    await handler.close()
+    await fanout.close()
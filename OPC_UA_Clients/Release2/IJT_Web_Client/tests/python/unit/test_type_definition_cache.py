@@ -0,0 +1,195 @@
+"""Tests for python/type_definition_cache.py — recording, validating and restoring cached data types."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+pytest.importorskip("asyncua", reason="asyncua not installed")
+
+from asyncua import ua  # noqa: E402
+
+from python.type_definition_cache import (  # noqa: E402
+    _FORMAT,
+    RegistrySnapshot,
+    TypeDefinitionCache,
+    _asyncua_version,
+    _encode,
+    _encode_definition,
+)
+
+_NAMESPACES = ["http://opcfoundation.org/UA/", "http://opcfoundation.org/UA/IJT/"]
+_METADATA = {"http://opcfoundation.org/UA/IJT/": ["1.01.0", "2024-06-01T00:00:00+00:00"]}
+
+_LEGACY_XML = """<opc:TypeDictionary xmlns:opc="http://opcfoundation.org/BinarySchema/"
+ xmlns:ua="http://opcfoundation.org/UA/" DefaultByteOrder="LittleEndian" TargetNamespace="urn:cache-test">
+  <opc:StructuredType Name="CacheTestLegacyStruct" BaseType="ua:ExtensionObject">
+    <opc:Field Name="Count" TypeName="opc:Int32"/>
+  </opc:StructuredType>
+</opc:TypeDictionary>"""
+
+
+def _field(name, data_type):
+    field = ua.StructureField()
+    field.Name = name
+    field.DataType = data_type
+    field.ValueRank = -1
+    field.IsOptional = False
+    return field
+
+
+def _enum_definition():
+    edef = ua.EnumDefinition()
+    for value, name in enumerate(("Idle", "Running")):
+        field = ua.EnumField()
+        field.Name = name
+        field.Value = value
+        edef.Fields.append(field)
+    return edef
+
+
+def _structure_definition(enum_type):
+    sdef = ua.StructureDefinition()
+    sdef.BaseDataType = ua.NodeId(ua.ObjectIds.Structure)
+    sdef.Fields = [_field("Name", ua.NodeId(ua.ObjectIds.String)), _field("State", enum_type)]
+    return sdef
+
+
+def _payload(namespaces=_NAMESPACES, metadata=_METADATA, **sections):
+    payload = {
+        "format": _FORMAT,
+        "asyncua": _asyncua_version(),
+        "namespaces": namespaces,
+        "metadata": metadata,
+        "legacy": {"dictionaries": [], "typeids": {}},
+        "basetypes": [],
+        "enums": [],
+        "structures": [],
+    }
+    payload.update(sections)
+    return payload
+
+
+def _write(cache, payload):
+    path = cache.path_for(payload["namespaces"])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload), encoding="utf-8")
+    return path
+
+
+def test_from_env_directory_and_disable(monkeypatch, tmp_path):
+    monkeypatch.setenv("IJT_TYPE_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("IJT_TYPE_CACHE", raising=False)
+    assert TypeDefinitionCache.from_env().directory == tmp_path
+    monkeypatch.setenv("IJT_TYPE_CACHE", "0")
+    cache = TypeDefinitionCache.from_env()
+    assert not cache.enabled
+    assert cache.restore(_NAMESPACES, _METADATA) is False
+
+
+def test_restore_requires_matching_namespace_versions(tmp_path):
+    cache = TypeDefinitionCache(tmp_path)
+    assert cache.restore(_NAMESPACES, _METADATA) is False  # no file yet
+    _write(cache, _payload())
+    assert cache.restore(_NAMESPACES, {}) is False  # unversioned servers are never cached
+    assert cache.restore(_NAMESPACES, {"http://opcfoundation.org/UA/IJT/": ["1.02.0", "2025-01-01"]}) is False
+    assert cache.restore(_NAMESPACES, _METADATA) is True
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_restore_rebuilds_legacy_enum_and_structure_classes(tmp_path):
+    enum_type = ua.NodeId(9001, 1)
+    struct_type = ua.NodeId(9002, 1)
+    cache = TypeDefinitionCache(tmp_path)
+    _write(
+        cache,
+        _payload(
+            legacy={
+                "dictionaries": [_encode(_LEGACY_XML.encode("utf-8"))],
+                "typeids": {"CacheTestLegacyStruct": "ns=1;i=9100"},
+            },
+            enums=[
+                {
+                    "name": "CacheTestState",
+                    "data_type": enum_type.to_string(),
+                    "option_set": False,
+                    "definition": _encode_definition(_enum_definition()),
+                }
+            ],
+            structures=[
+                {
+                    "name": "CacheTestStruct",
+                    "data_type": struct_type.to_string(),
+                    "encoding_id": "ns=1;i=9003",
+                    "definition": _encode_definition(_structure_definition(enum_type)),
+                }
+            ],
+        ),
+    )
+
+    assert cache.restore(_NAMESPACES, _METADATA) is True
+
+    assert ua.extension_objects_by_typeid[ua.NodeId(9100, 1)].__name__ == "CacheTestLegacyStruct"
+    assert ua.enums_by_datatype[enum_type].Running == 1
+    struct_cls = ua.extension_objects_by_datatype[struct_type]
+    assert ua.extension_objects_by_typeid[ua.NodeId(9003, 1)] is struct_cls
+    assert struct_cls(Name="x").State == ua.enums_by_datatype[enum_type].Idle
+    # Already-registered types are kept on a second restore.
+    assert cache.restore(_NAMESPACES, _METADATA) is True
+    assert ua.extension_objects_by_datatype[struct_type] is struct_cls
+
+
+def test_restore_rejects_unresolvable_structures(tmp_path):
+    cache = TypeDefinitionCache(tmp_path)
+    missing_enum = ua.NodeId(9999, 1)
+    _write(
+        cache,
+        _payload(
+            structures=[
+                {
+                    "name": "CacheTestBrokenStruct",
+                    "data_type": "ns=1;i=9010",
+                    "encoding_id": "ns=1;i=9011",
+                    "definition": _encode_definition(_structure_definition(missing_enum)),
+                }
+            ]
+        ),
+    )
+    assert cache.restore(_NAMESPACES, _METADATA) is False
+
+
+@pytest.mark.asyncio
+async def test_record_writes_types_registered_by_the_live_load(tmp_path):
+    enum_type = ua.NodeId(9020, 1)
+    struct_type = ua.NodeId(9021, 1)
+    before = RegistrySnapshot.take()
+    from asyncua.common.structures104 import make_enum, make_structure
+
+    ua.register_enum(
+        "CacheTestRecordedState",
+        enum_type,
+        make_enum("CacheTestRecordedState", _enum_definition(), False)["CacheTestRecordedState"],
+    )
+    sdef = _structure_definition(enum_type)
+    struct_cls = make_structure(struct_type, "CacheTestRecordedStruct", sdef)["CacheTestRecordedStruct"]
+    ua.register_extension_object("CacheTestRecordedStruct", ua.NodeId(9022, 1), struct_cls, struct_type)
+
+    client = MagicMock()
+    client.uaclient.read = AsyncMock(
+        return_value=[ua.DataValue(ua.Variant(_enum_definition())), ua.DataValue(ua.Variant(sdef))]
+    )
+    cache = TypeDefinitionCache(tmp_path)
+
+    assert await cache.record(client, _NAMESPACES, {}, before) is False  # unversioned
+    with patch("python.type_definition_cache._BUILTIN_TYPES", before):
+        assert await cache.record(client, _NAMESPACES, _METADATA, before) is True
+    assert await cache.record(client, _NAMESPACES, _METADATA, before) is False  # other models already loaded
+
+    payload = json.loads(cache.path_for(_NAMESPACES).read_text(encoding="utf-8"))
+    assert payload["metadata"] == _METADATA
+    assert [e["name"] for e in payload["enums"]] == ["CacheTestRecordedState"]
+    assert [(e["name"], e["encoding_id"]) for e in payload["structures"]] == [
+        ("CacheTestRecordedStruct", "ns=1;i=9022")
+    ]
+    assert len(client.uaclient.read.await_args.args[0].NodesToRead) == 2
+    assert cache.writes == 1
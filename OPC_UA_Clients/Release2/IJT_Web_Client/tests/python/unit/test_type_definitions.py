@@ -0,0 +1,113 @@
+"""Tests for python/type_definitions.py — model key and process-wide load sharing."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+pytest.importorskip("asyncua", reason="asyncua not installed")
+
+from python.type_definitions import (  # noqa: E402
+    TypeDefinitionRegistry,
+    read_namespace_metadata,
+    type_definition_key,
+)
+
+
+def test_key_changes_with_namespace_array_and_versions():
+    base = type_definition_key(["ua", "ijt"], {"ijt": ["1.00", "2024-01-01"]})
+    assert base == type_definition_key(["ua", "ijt"], {"ijt": ["1.00", "2024-01-01"]})
+    assert base != type_definition_key(["ua", "ijt", "x"], {"ijt": ["1.00", "2024-01-01"]})
+    assert base != type_definition_key(["ua", "ijt"], {"ijt": ["1.01", "2024-01-01"]})
+    assert base != type_definition_key(["ua", "ijt"], {"ijt": ["1.00", "2025-01-01"]})
+
+
+@pytest.mark.asyncio
+async def test_read_namespace_metadata_batches_property_reads():
+    from asyncua import ua
+
+    def _found(identifier):
+        result = ua.BrowsePathResult()
+        target = ua.BrowsePathTarget()
+        target.TargetId = ua.ExpandedNodeId(identifier, 1)
+        result.Targets = [target]
+        return result
+
+    client = MagicMock()
+    client.get_node.return_value.get_children = AsyncMock(return_value=[MagicMock()])
+    client.uaclient.translate_browsepaths_to_nodeids = AsyncMock(
+        return_value=[_found(1), _found(2), ua.BrowsePathResult(StatusCode=ua.StatusCode(ua.StatusCodes.BadNoMatch))]
+    )
+    client.uaclient.read = AsyncMock(
+        return_value=[ua.DataValue(ua.Variant("urn:ijt")), ua.DataValue(ua.Variant("1.00.0"))]
+    )
+
+    assert await read_namespace_metadata(client) == {"urn:ijt": ["1.00.0", ""]}
+    assert len(client.uaclient.read.await_args.args[0].NodesToRead) == 2
+
+
+@pytest.mark.asyncio
+async def test_same_model_is_loaded_once():
+    registry = TypeDefinitionRegistry()
+    loader = AsyncMock()
+    with patch("python.type_definitions.read_type_definition_model", AsyncMock(return_value=(["ua"], {}))):
+        assert await registry.ensure_loaded(MagicMock(), "a", loader) is True
+        assert await registry.ensure_loaded(MagicMock(), "b", loader) is False
+    loader.assert_awaited_once()
+    assert (registry.loads, registry.reuses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_wait_for_the_first_load():
+    registry = TypeDefinitionRegistry()
+    release = asyncio.Event()
+
+    async def _slow_loader(_client, _label):
+        await release.wait()
+
+    loader = AsyncMock(side_effect=_slow_loader)
+    with patch("python.type_definitions.read_type_definition_model", AsyncMock(return_value=(["ua"], {}))):
+        first = asyncio.create_task(registry.ensure_loaded(MagicMock(), "a", loader))
+        second = asyncio.create_task(registry.ensure_loaded(MagicMock(), "b", loader))
+        await asyncio.sleep(0)
+        release.set()
+        assert sorted(await asyncio.gather(first, second)) == [False, True]
+    loader.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_load_is_retried_and_unknown_key_loads_without_sharing():
+    registry = TypeDefinitionRegistry()
+    loader = AsyncMock(side_effect=[RuntimeError("timeout"), None])
+    with patch("python.type_definitions.read_type_definition_model", AsyncMock(return_value=(["ua"], {}))):
+        with pytest.raises(RuntimeError):
+            await registry.ensure_loaded(MagicMock(), "a", loader)
+        assert await registry.ensure_loaded(MagicMock(), "a", loader) is True
+
+    loader = AsyncMock()
+    with patch("python.type_definitions.read_type_definition_model", AsyncMock(side_effect=RuntimeError("no"))):
+        assert await registry.ensure_loaded(MagicMock(), "a", loader) is True
+        assert await registry.ensure_loaded(MagicMock(), "a", loader) is True
+    assert loader.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_model_is_restored_and_live_loads_are_recorded():
+    cache = MagicMock()
+    cache.restore.side_effect = [True, False]
+    cache.record = AsyncMock(return_value=True)
+    loader = AsyncMock()
+    metadata = {"urn:ijt": ["1.00", "2024-01-01"]}
+
+    registry = TypeDefinitionRegistry(cache)
+    with patch("python.type_definitions.read_type_definition_model", AsyncMock(return_value=(["ua"], metadata))):
+        assert await registry.ensure_loaded(MagicMock(), "a", loader) is False
+    loader.assert_not_awaited()
+    assert registry.restores == 1
+
+    registry = TypeDefinitionRegistry(cache)
+    client = MagicMock()
+    with patch("python.type_definitions.read_type_definition_model", AsyncMock(return_value=(["ua"], metadata))):
+        assert await registry.ensure_loaded(client, "a", loader) is True
+    loader.assert_awaited_once()
+    assert cache.record.await_args.args[:3] == (client, ["ua"], metadata)
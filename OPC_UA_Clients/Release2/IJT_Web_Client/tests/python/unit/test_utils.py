@@ -610,32 +610,33 @@ async def test_log_result_to_file_does_nothing_when_disabled():
 
 @pytest.mark.skipif(not HAS_ASYNCUA, reason="asyncua or pytz not installed")
 @pytest.mark.asyncio
-async def test_log_result_to_file_writes_file_when_enabled(tmp_path, monkeypatch):
-    """log_result_to_file writes a JSON file when ENABLE_RESULT_FILE_LOGGING is True."""
+async def test_log_result_to_file_writes_file_when_enabled(tmp_path):
+    """log_result_to_file appends the result to a segment when ENABLE_RESULT_FILE_LOGGING is True."""
     import types
 
+    from python.result_log import ResultLog
+
     event = types.SimpleNamespace(
         Result=types.SimpleNamespace(Value="test"),
         Message=types.SimpleNamespace(Text="MyResult"),
     )
-
-    # Redirect logs/results/ to tmp_path
-    monkeypatch.chdir(tmp_path)
+    result_log = ResultLog(tmp_path / "results")
 
     with patch("python.utils.ENABLE_RESULT_FILE_LOGGING", True):
-        with patch("python.utils.serialize_full_event", return_value={"key": "value"}):
+        with patch("python.utils.default_result_log", return_value=result_log):
             await log_result_to_file(event)
+    await result_log.close()
 
-    # Check that a .json file was created
-    results_dir = tmp_path / "logs" / "results"
-    json_files = list(results_dir.glob("*.json"))
-    assert len(json_files) == 1, f"Expected 1 JSON file, found: {json_files}"
+    # Check that one segment holding the result was created
+    segments = list((tmp_path / "results").glob("*.ndjson"))
+    assert len(segments) == 1, f"Expected 1 segment, found: {segments}"
+    assert b'"message":"MyResult"' in segments[0].read_bytes().replace(b" ", b"")
 
 
 @pytest.mark.skipif(not HAS_ASYNCUA, reason="asyncua or pytz not installed")
 @pytest.mark.asyncio
 async def test_log_result_to_file_handles_exception_gracefully():
-    """log_result_to_file catches exceptions from serialize_full_event and logs."""
+    """log_result_to_file catches exceptions from the result log and logs."""
     import types
 
     event = types.SimpleNamespace(
@@ -645,8 +646,69 @@ async def test_log_result_to_file_handles_exception_gracefully():
 
     with patch("python.utils.ENABLE_RESULT_FILE_LOGGING", True):
         with patch(
-            "python.utils.serialize_full_event",
-            side_effect=RuntimeError("serialization failed"),
+            "python.utils.default_result_log",
+            side_effect=RuntimeError("result log unavailable"),
         ):
             # Should not raise — exception is caught internally
             await log_result_to_file(event)
+
+
+# ---------------------------------------------------------------------------
+# Event records — built lazily, pretty or structured
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.skipif(not HAS_ASYNCUA, reason="asyncua or pytz not installed")
+def test_joining_event_record_is_rendered_lazily(monkeypatch):
+    """The event's fields are read when the record is formatted, not when it is logged."""
+    import json
+    import types
+
+    class _BadFormat:
+        def __format__(self, spec: str) -> str:
+            raise TypeError("deliberate format failure")
+
+    event = types.SimpleNamespace(
+        Message=types.SimpleNamespace(Text="E"),
+        EventType=ua.NodeId(2041, 0),  # type: ignore[arg-type]
+        EventId="ev-1",
+        SourceName="",
+        SourceNode=ua.NodeId(0, 0),  # type: ignore[arg-type]
+        Severity=0,
+        Time=None,
+        ReceiveTime=None,
+        LocalTime=None,
+        ConditionClassId=ua.NodeId(0, 0),  # type: ignore[arg-type]
+        ConditionClassName=ua.LocalizedText("", ""),  # type: ignore[union-attr]
+        ConditionSubClassId=[ua.NodeId(9999, 0)],  # type: ignore[arg-type]
+        ConditionSubClassName=[],
+        EventCode="EC1",
+        EventText="",
+        JoiningTechnology="",
+        AssociatedEntities=[types.SimpleNamespace(Name=_BadFormat())],
+        ReportedValues=None,
+    )
+    with patch("python.utils.ijt_log") as mock_log:
+        log_joining_system_event(event)
+    record = mock_log.info.call_args.args[1]
+    event.EventCode = "EC2"
+
+    assert "EventCode                           : EC2" in str(record).splitlines()
+    assert "  Error logging entity" in str(record)
+    monkeypatch.setattr("python.ijt_logger.EVENT_LOG_FORMAT", "structured")
+    structured = json.loads(str(record))
+    assert structured["event"] == "joining_system" and structured["condition_subclass_ids"] == ["ns=0;i=9999"]
+    assert structured["associated_entities"][0]["error"] == "deliberate format failure"
+
+
+@pytest.mark.asyncio
+async def test_result_event_record_is_skipped_below_info():
+    """No record is built or queued when INFO is disabled."""
+    import types
+
+    event = types.SimpleNamespace(EventId=b"ev-2")
+    with patch("python.utils.ijt_log") as mock_log, patch("python.utils._result_event_fields") as fields:
+        mock_log.isEnabledFor.return_value = False
+        assert await log_result_event_details(event, "opc.tcp://x:1", datetime.now()) == "ev-2"
+    mock_log.info.assert_not_called()
+    fields.assert_not_called()
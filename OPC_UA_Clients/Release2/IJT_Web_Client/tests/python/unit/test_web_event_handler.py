@@ -22,7 +22,9 @@ import pytest
 pytest.importorskip("asyncua", reason="asyncua not installed")
 from asyncua import ua  # noqa: E402
 
+from python.event_delivery import DeliveryOptions  # noqa: E402
 from python.event_handler import EventHandler, Short  # noqa: E402
+from python.event_selection import EventSelection  # noqa: E402
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -270,7 +272,7 @@ async def test_handle_queue_sends_json_with_correct_structure():
 
     with (
         patch("python.event_handler.log_joining_system_event"),
-        patch("python.event_handler.serialize_full_event", return_value={"key": "value"}),
+        patch("python.event_handler.serialize_compiled_event", return_value={"key": "value"}),
     ):
         handler = EventHandler(ws, server_url)
         await handler.event_notification(_fake_raw_event("TighteningOK"))
@@ -294,7 +296,7 @@ async def test_handle_queue_breaks_on_connection_closed_ok():
 
     with (
         patch("python.event_handler.log_joining_system_event"),
-        patch("python.event_handler.serialize_full_event", return_value={"x": 1}),
+        patch("python.event_handler.serialize_compiled_event", return_value={"x": 1}),
     ):
         handler = EventHandler(ws, "opc.tcp://localhost:40451")
         await handler.event_notification(_fake_raw_event())
@@ -308,7 +310,7 @@ async def test_handle_queue_breaks_and_closes_ws_on_exception():
 
     with (
         patch("python.event_handler.log_joining_system_event"),
-        patch("python.event_handler.serialize_full_event", return_value={"x": 1}),
+        patch("python.event_handler.serialize_compiled_event", return_value={"x": 1}),
     ):
         handler = EventHandler(ws, "opc.tcp://localhost:40451")
         await handler.event_notification(_fake_raw_event())
@@ -326,7 +328,7 @@ async def test_handle_queue_ws_close_also_raises_is_silenced():
 
     with (
         patch("python.event_handler.log_joining_system_event"),
-        patch("python.event_handler.serialize_full_event", return_value={"x": 1}),
+        patch("python.event_handler.serialize_compiled_event", return_value={"x": 1}),
     ):
         handler = EventHandler(ws, "opc.tcp://localhost:40451")
         await handler.event_notification(_fake_raw_event())
@@ -359,3 +361,52 @@ async def test_event_notification_short_constructor_exception_is_logged():
         await handler.event_notification(_fake_raw_event())  # must not raise
 
     await handler.shutdown()
+
+
+# ---------------------------------------------------------------------------
+# EventHandler — batched delivery
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_batching_sends_events_frame_and_counts():
+    ws = AsyncMock()
+    server_url = "opc.tcp://localhost:40451"
+    delivery = DeliveryOptions(batch_size=3, batch_interval_ms=1000)
+
+    with patch("python.event_handler.serialize_compiled_event", side_effect=lambda s: {"id": s.EventId}):
+        handler = EventHandler(ws, server_url, delivery=delivery)
+        for index in range(3):
+            await handler.process_event(Short(_fake_raw_event(event_id_bytes=f"e{index}".encode())))
+        await asyncio.sleep(0.05)
+
+    ws.send.assert_awaited_once()
+    payload = json.loads(ws.send.call_args[0][0])
+    assert payload == {"command": "events", "endpoint": server_url, "data": [{"id": "e0"}, {"id": "e1"}, {"id": "e2"}]}
+    stats = handler.delivery_stats()
+    assert stats["frames_sent"] == 1
+    assert stats["events_sent"] == 3
+    assert stats["last_batch_size"] == 3
+    await handler.close()
+
+
+@pytest.mark.asyncio
+async def test_filtered_batch_is_not_counted_as_sent():
+    ws = AsyncMock()
+    handler = EventHandler(ws, "opc.tcp://localhost:40451", delivery=DeliveryOptions(batch_size=2))
+    handler.selection = EventSelection(asset=frozenset({"urn:tool:other"}))
+    for index in range(2):
+        await handler.process_event(Short(_fake_raw_event(event_id_bytes=f"e{index}".encode())))
+    await asyncio.sleep(0.05)
+
+    ws.send.assert_not_awaited()
+    stats = handler.delivery_stats()
+    assert (stats["frames_sent"], stats["events_sent"], stats["filtered_events"]) == (0, 0, 2)
+    await handler.close()
+
+
+@pytest.mark.asyncio
+async def test_queue_is_bounded_by_delivery_options():
+    handler = EventHandler(AsyncMock(), "opc.tcp://localhost:40451", delivery=DeliveryOptions(queue_size=7))
+    assert handler.queue.maxsize == 7
+    await handler.close()
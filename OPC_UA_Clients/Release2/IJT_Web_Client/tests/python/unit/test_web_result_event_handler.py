@@ -22,6 +22,7 @@ import pytest
 pytest.importorskip("asyncua", reason="asyncua not installed")
 from asyncua import ua  # noqa: E402
 
+from python.event_delivery import DeliveryOptions  # noqa: E402
 from python.result_event_handler import ResultEventHandler, Short  # noqa: E402
 
 # ---------------------------------------------------------------------------
@@ -100,7 +101,7 @@ async def test_process_event_enqueues_json_string():
 
     short = Short(ua.NodeId(1007, 2), {"result": 1}, ua.LocalizedText("OK", "en"), "id-1")  # type: ignore[arg-type]
 
-    with patch("python.result_event_handler.serialize_full_event", return_value={"serialized": True}):
+    with patch("python.result_event_handler.serialize_compiled_event", return_value={"serialized": True}):
         await handler.process_event(short)
         await asyncio.sleep(0)  # let queue task pick it up
 
@@ -135,7 +136,7 @@ async def test_process_event_exception_caught():
     handler = ResultEventHandler(ws, "opc.tcp://localhost:40451")
 
     short = Short(ua.NodeId(0, 0), {}, ua.LocalizedText("", "en"), "id-0")  # type: ignore[arg-type]
-    with patch("python.result_event_handler.serialize_full_event", side_effect=ValueError("bad")):
+    with patch("python.result_event_handler.serialize_compiled_event", side_effect=ValueError("bad")):
         # Must not raise
         await handler.process_event(short)
     await handler.close()
@@ -249,7 +250,7 @@ async def test_handle_queue_breaks_on_connection_closed_ok():
     handler = ResultEventHandler(ws, server_url)
 
     short = Short(ua.NodeId(0, 0), {}, ua.LocalizedText("msg", "en"), "id-ok")  # type: ignore[arg-type]
-    with patch("python.result_event_handler.serialize_full_event", return_value={}):
+    with patch("python.result_event_handler.serialize_compiled_event", return_value={}):
         await handler.process_event(short)
     await asyncio.wait_for(handler._queue_task, timeout=2.0)
 
@@ -261,7 +262,7 @@ async def test_handle_queue_breaks_on_exception():
     handler = ResultEventHandler(ws, "opc.tcp://localhost:40451")
 
     short = Short(ua.NodeId(0, 0), {}, ua.LocalizedText("msg", "en"), "id-err")  # type: ignore[arg-type]
-    with patch("python.result_event_handler.serialize_full_event", return_value={}):
+    with patch("python.result_event_handler.serialize_compiled_event", return_value={}):
         await handler.process_event(short)
     await asyncio.wait_for(handler._queue_task, timeout=2.0)
 
@@ -275,7 +276,7 @@ async def test_handle_queue_ws_close_also_raises_is_silenced():
     handler = ResultEventHandler(ws, "opc.tcp://localhost:40451")
 
     short = Short(ua.NodeId(0, 0), {}, ua.LocalizedText("msg", "en"), "id-close-err")  # type: ignore[arg-type]
-    with patch("python.result_event_handler.serialize_full_event", return_value={}):
+    with patch("python.result_event_handler.serialize_compiled_event", return_value={}):
         await handler.process_event(short)
     await asyncio.wait_for(handler._queue_task, timeout=2.0)
 
@@ -362,3 +363,73 @@ async def test_concurrent_live_and_requested_result_event_notifications():
         f"Expected {len(events)} events sent, got {ws.send.call_count} — concurrent event notifications failed"
     )
     await handler.close()
+
+
+# ---------------------------------------------------------------------------
+# ResultEventHandler — batching and full-queue policies
+# ---------------------------------------------------------------------------
+
+
+def _short(event_id):
+    return Short(ua.NodeId(1007, 2), None, ua.LocalizedText("OK", "en"), event_id)  # type: ignore[arg-type]
+
+
+def _traced(event_obj):
+    return {"EventId": event_obj.EventId, "Result": {"ResultContent": [{"Trace": {"StepTraces": [1, 2]}}]}}
+
+
+@pytest.mark.asyncio
+async def test_batching_groups_results_into_one_frame():
+    ws = AsyncMock()
+    delivery = DeliveryOptions(batch_size=10, batch_interval_ms=20)
+    handler = ResultEventHandler(ws, "opc.tcp://localhost:40451", delivery=delivery)
+
+    with patch("python.result_event_handler.serialize_compiled_event", side_effect=lambda s: {"id": s.EventId}):
+        for index in range(4):
+            await handler.process_event(_short(f"r{index}"))
+    await asyncio.sleep(0.1)
+
+    ws.send.assert_awaited_once()
+    payload = json.loads(ws.send.call_args[0][0])
+    assert payload["command"] == "events"
+    assert [item["id"] for item in payload["data"]] == ["r0", "r1", "r2", "r3"]
+    assert handler.delivery_stats()["max_batch_size"] == 4
+    await handler.close()
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_policy_counts_dropped_results():
+    ws = AsyncMock()
+    delivery = DeliveryOptions(queue_size=2, queue_policy="drop-oldest")
+    handler = ResultEventHandler(ws, "opc.tcp://localhost:40451", delivery=delivery)
+    handler._queue_task.cancel()  # stall the consumer so the queue fills up
+
+    with patch("python.result_event_handler.serialize_compiled_event", side_effect=lambda s: {"id": s.EventId}):
+        for index in range(5):
+            await handler.process_event(_short(f"r{index}"))
+
+    assert [json.loads(handler.queue.get_nowait())["id"] for _ in range(2)] == ["r3", "r4"]
+    assert handler.delivery_stats()["dropped_events"] == 3
+    handler.closed = True
+
+
+@pytest.mark.asyncio
+async def test_drop_traces_policy_strips_traces_when_full():
+    ws = AsyncMock()
+    delivery = DeliveryOptions(queue_size=1, queue_policy="drop-traces")
+    handler = ResultEventHandler(ws, "opc.tcp://localhost:40451", delivery=delivery)
+    handler._queue_task.cancel()
+
+    with patch("python.result_event_handler.serialize_compiled_event", side_effect=_traced):
+        await handler.process_event(_short("r0"))
+        pending = asyncio.create_task(handler.process_event(_short("r1")))
+        await asyncio.sleep(0.01)
+        assert not pending.done()  # waits for room like "block"
+        first = json.loads(handler.queue.get_nowait())
+        await asyncio.wait_for(pending, timeout=1.0)
+
+    second = json.loads(handler.queue.get_nowait())
+    assert first["Result"]["ResultContent"][0]["Trace"] == {"StepTraces": [1, 2]}
+    assert second["Result"]["ResultContent"][0]["Trace"] is None
+    assert handler.delivery_stats()["stripped_traces"] == 1
+    handler.closed = True